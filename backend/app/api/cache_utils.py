@@ -0,0 +1,107 @@
+"""
+Helper für gecachte GET-Endpoints: Antwort aus dem HTTP Response Cache
+(oder frisch gebaut), mit ETag, Cache-Control und 304 bei If-None-Match.
+"""
+from typing import Callable, Iterable, Iterator
+
+from fastapi import Request, Response, status
+from fastapi.responses import StreamingResponse
+
+from app.config import Settings
+from app.services.http_cache import CachedResponse, get_http_cache
+
+
+def cached_response(
+    request: Request,
+    settings: Settings,
+    key: str,
+    tags: Iterable[str],
+    ttl_s: float,
+    cache_control: str,
+    build: Callable[[], CachedResponse]
+) -> Response:
+    """
+    Liefert die gecachte Antwort oder baut sie über build() neu.
+
+    Args:
+        request: Eingehender Request (If-None-Match)
+        settings: App Settings
+        key: Cache-Key des Endpoints inkl. Parametern
+        tags: Invalidierungs-Tags (z.B. scan:<id>, industry:<id>)
+        ttl_s: Lebensdauer im Cache
+        cache_control: Cache-Control-Header für Browser/CDN
+        build: Erstellt die Antwort; HTTPExceptions werden nicht gecacht
+
+    Returns:
+        200 mit Body oder 304 ohne Body
+    """
+    tags = list(tags)
+    cache = get_http_cache(settings) if settings.RESPONSE_CACHE_ENABLED else None
+
+    # Key vor build() auflösen — eine Invalidierung während build() macht den Eintrag sofort ungültig
+    resolved_key = cache.resolve_key(key, tags) if cache is not None else None
+    cached = cache.get(resolved_key) if cache is not None else None
+    if cached is None:
+        cached = build()
+        if cache is not None:
+            cache.set(resolved_key, cached, ttl_s)
+
+    headers = {"ETag": cached.etag, "Cache-Control": cache_control}
+    if cached.matches(request.headers.get("if-none-match")):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=cached.body, media_type=cached.media_type, headers=headers)
+
+
+def streamed_cached_response(
+    request: Request,
+    settings: Settings,
+    key: str,
+    tags: Iterable[str],
+    ttl_s: float,
+    cache_control: str,
+    media_type: str,
+    stream: Callable[[], Iterator[str]]
+) -> Response:
+    """
+    Wie cached_response, aber bei einem Cache-Miss wird die Antwort direkt
+    gestreamt und erst nach dem letzten Chunk gecacht.
+
+    Der gestreamten Antwort fehlt der ETag (der Body ist noch nicht bekannt);
+    ab dem nächsten Abruf kommt sie mit ETag aus dem Cache.
+
+    Args:
+        request: Eingehender Request (If-None-Match)
+        settings: App Settings
+        key: Cache-Key des Endpoints
+        tags: Invalidierungs-Tags
+        ttl_s: Lebensdauer im Cache
+        cache_control: Cache-Control-Header für Browser/CDN
+        media_type: Content-Type der Antwort
+        stream: Prüft die Daten (HTTPExceptions vor dem ersten Byte) und liefert die Chunks
+
+    Returns:
+        200/304 aus dem Cache oder StreamingResponse
+    """
+    tags = list(tags)
+    cache = get_http_cache(settings) if settings.RESPONSE_CACHE_ENABLED else None
+
+    resolved_key = cache.resolve_key(key, tags) if cache is not None else None
+    cached = cache.get(resolved_key) if cache is not None else None
+    if cached is not None:
+        headers = {"ETag": cached.etag, "Cache-Control": cache_control}
+        if cached.matches(request.headers.get("if-none-match")):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(content=cached.body, media_type=cached.media_type, headers=headers)
+
+    chunks = stream()
+
+    def encode_and_cache() -> Iterator[bytes]:
+        parts: list[bytes] = []
+        for chunk in chunks:
+            data = chunk.encode("utf-8")
+            parts.append(data)
+            yield data
+        if cache is not None:
+            cache.set(resolved_key, CachedResponse(b"".join(parts), media_type), ttl_s)
+
+    return StreamingResponse(encode_and_cache(), media_type=media_type, headers={"Cache-Control": cache_control})
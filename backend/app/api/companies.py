@@ -9,8 +9,11 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 
-from app.dependencies import get_db
-from app.models import Company
+from app.config import Settings
+from app.dependencies import get_db, get_settings
+from app.models import Company, RankingSnapshot
+from app.services.http_cache import get_http_cache, industry_tag
+from app.services.industry_stats import refresh_industry_stats
 from app.schemas import CompanyCreate, CompanyResponse, CompanyImport
 
 router = APIRouter()
@@ -45,6 +48,7 @@ def create_company(
     )
 
     db.add(company)
+    refresh_industry_stats(db, [company.industry_id])
     db.commit()
     db.refresh(company)
 
@@ -155,6 +159,7 @@ def import_companies(
         db.add(company)
         created_companies.append(company)
 
+    refresh_industry_stats(db, [industry_id] if created_companies else [])
     db.commit()
 
     # Refresh all created companies
@@ -179,7 +184,8 @@ def import_companies(
 @router.delete("/{company_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_company(
     company_id: str,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    settings: Settings = Depends(get_settings)
 ) -> None:
     """
     Löscht ein Unternehmen aus der Datenbank.
@@ -193,5 +199,8 @@ def delete_company(
             detail=f"Company with id '{company_id}' not found"
         )
 
+    db.query(RankingSnapshot).filter(RankingSnapshot.company_id == company_id).delete(synchronize_session=False)
     db.delete(company)
+    refresh_industry_stats(db, [company.industry_id])
     db.commit()
+    get_http_cache(settings).invalidate(industry_tag(company.industry_id))
@@ -5,7 +5,7 @@ Endpunkte für Kostenübersicht, Scan-Details, Plattform-Breakdown und Budget-Ve
 from datetime import datetime, timezone
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy import func
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 
 from app.dependencies import get_db
 from app.models import ApiCallCost, CostBudget, Scan, Company
@@ -37,38 +37,54 @@ def get_scan_cost_list(
     else:
         month_end = datetime(int(year), int(m) + 1, 1, tzinfo=timezone.utc)
 
+    # Nur die Spalten der Tabelle — keine Antworttexte/Analysen laden
     scans = (
-        db.query(Scan)
+        db.query(
+            Scan.id, Scan.status, Scan.started_at, Scan.completed_at, Scan.query_version,
+            Company.name, Company.domain,
+        )
         .join(Company, Scan.company_id == Company.id)
         .filter(Scan.started_at >= month_start, Scan.started_at < month_end)
         .order_by(Scan.started_at.desc())
         .all()
     )
+    month_scan_ids = (
+        db.query(Scan.id)
+        .filter(Scan.started_at >= month_start, Scan.started_at < month_end)
+        .scalar_subquery()
+    )
 
-    result = []
-    for scan in scans:
-        company = db.query(Company).filter(Company.id == scan.company_id).first()
-
-        cost_agg = db.query(
+    # Kosten aller Scans des Monats in zwei gruppierten Queries statt zwei pro Scan
+    cost_aggs = {
+        row[0]: row[1:]
+        for row in db.query(
+            ApiCallCost.scan_id,
             func.sum(ApiCallCost.cost_usd),
             func.sum(ApiCallCost.total_tokens),
             func.count(ApiCallCost.id),
-        ).filter(ApiCallCost.scan_id == scan.id).first()
+        ).filter(ApiCallCost.scan_id.in_(month_scan_ids)).group_by(ApiCallCost.scan_id)
+    }
+    platform_breakdowns: dict[str, dict[str, float]] = {}
+    for scan_id, platform, cost in db.query(
+        ApiCallCost.scan_id,
+        ApiCallCost.platform,
+        func.sum(ApiCallCost.cost_usd),
+    ).filter(ApiCallCost.scan_id.in_(month_scan_ids)).group_by(ApiCallCost.scan_id, ApiCallCost.platform):
+        platform_breakdowns.setdefault(scan_id, {})[platform] = round(cost, 6)
 
-        platform_rows = db.query(
-            ApiCallCost.platform,
-            func.sum(ApiCallCost.cost_usd),
-        ).filter(ApiCallCost.scan_id == scan.id).group_by(ApiCallCost.platform).all()
+    result = []
+    for scan in scans:
+        cost_agg = cost_aggs.get(scan.id, (None, None, 0))
 
         result.append(ScanCostListEntry(
             scan_id=scan.id,
-            company_name=company.name if company else "Unbekannt",
-            company_domain=company.domain if company else "",
+            company_name=scan.name or "Unbekannt",
+            company_domain=scan.domain or "",
             status=scan.status,
             total_cost_usd=round(cost_agg[0] or 0.0, 6),
             total_tokens=int(cost_agg[1] or 0),
             total_calls=cost_agg[2] or 0,
-            platform_breakdown={row[0]: round(row[1], 6) for row in platform_rows},
+            platform_breakdown=platform_breakdowns.get(scan.id, {}),
             started_at=scan.started_at,
             completed_at=scan.completed_at,
             query_version=scan.query_version,
@@ -134,6 +150,15 @@ def get_cost_summary(
 
     daily_costs = [{"date": str(row[0]), "cost": round(row[1], 6)} for row in daily_rows]
 
+    cache_totals = db.query(
+        func.count(ApiCallCost.id),
+        func.sum(ApiCallCost.saved_cost_usd),
+    ).filter(
+        ApiCallCost.created_at >= month_start,
+        ApiCallCost.created_at < month_end,
+        ApiCallCost.cache_hit.is_(True),
+    ).first()
+
     return CostSummary(
         month=month,
         total_cost_usd=round(total_cost, 6),
@@ -142,19 +167,27 @@ def get_cost_summary(
         avg_cost_per_scan=round(avg_cost_per_scan, 6),
         platform_breakdown=platform_breakdown,
         daily_costs=daily_costs,
+        cache_hits=cache_totals[0] or 0,
+        cache_savings_usd=round(cache_totals[1] or 0.0, 6),
     )
 
 
 @router.get("/by-scan/{scan_id}", response_model=ScanCostDetail)
 def get_scan_costs(scan_id: str, db: Session = Depends(get_db)):
     """Kosten-Details eines einzelnen Scans."""
-    scan = db.query(Scan).filter(Scan.id == scan_id).first()
+    scan = db.query(Scan.company_id).filter(Scan.id == scan_id).first()
     if not scan:
         raise HTTPException(status_code=404, detail="Scan nicht gefunden")
 
     company = db.query(Company).filter(Company.id == scan.company_id).first()
 
-    costs = db.query(ApiCallCost).filter(ApiCallCost.scan_id == scan_id).order_by(ApiCallCost.created_at).all()
+    costs = (
+        db.query(ApiCallCost)
+        .options(selectinload(ApiCallCost.query_blob))
+        .filter(ApiCallCost.scan_id == scan_id)
+        .order_by(ApiCallCost.created_at)
+        .all()
+    )
 
     total_cost = sum(c.cost_usd for c in costs)
     total_tokens = sum(c.total_tokens for c in costs)
@@ -5,15 +5,14 @@ Liefert Informationen über verfügbare Industries.
 from typing import List
 from pathlib import Path
 
-import yaml
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 
 from app.dependencies import get_db, get_settings
-from app.models import Company, Scan
 from app.schemas import IndustryInfo
 from app.config import Settings
+from app.services.industry_registry import IndustryConfigError, get_registry
+from app.services.industry_stats import get_industry_stats
 
 router = APIRouter()
 
@@ -22,6 +21,10 @@ def load_industry_config(industry_id: str, config_dir: str) -> dict:
     """
     Lädt die Industry-Konfiguration aus einer YAML-Datei.
 
+    Die Datei wird über die Industry Registry nur einmal geparst und validiert
+    und erst nach einer Änderung (mtime) neu geladen. Das zurückgegebene Dict
+    ist geteilt und darf nicht verändert werden.
+
     Args:
         industry_id: ID der Industry (z.B. "cybersecurity")
         config_dir: Pfad zum Verzeichnis mit den YAML-Dateien
@@ -31,13 +34,28 @@ def load_industry_config(industry_id: str, config_dir: str) -> dict:
 
     Raises:
         FileNotFoundError: Wenn die Config-Datei nicht existiert
+        IndustryConfigError: Wenn die Config ungültig ist
     """
-    path = Path(config_dir) / f"{industry_id}.yaml"
-    if not path.exists():
-        raise FileNotFoundError(f"Industry config not found: {industry_id}")
+    return get_registry(config_dir).get(industry_id).raw
 
-    with open(path) as f:
-        return yaml.safe_load(f)
+
+def load_industry_config_or_404(industry_id: str, config_dir: str) -> dict:
+    """
+    Wie load_industry_config, aber mit HTTP-Fehlern für Endpoints:
+    404 für unbekannte Industries, 500 mit Hinweis für ungültige Configs.
+    """
+    try:
+        return load_industry_config(industry_id, config_dir)
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Industry '{industry_id}' not found"
+        )
+    except IndustryConfigError as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
 
 
 @router.get("/", response_model=List[IndustryInfo])
@@ -47,9 +65,10 @@ def list_industries(
 ) -> List[IndustryInfo]:
     """
     Listet alle verfügbaren Industries auf.
-    Liest YAML-Dateien aus dem INDUSTRY_CONFIG_DIR.
+    Liest die YAML-Dateien aus dem INDUSTRY_CONFIG_DIR über die Industry Registry.
     """
     config_dir = Path(settings.INDUSTRY_CONFIG_DIR)
+    registry = get_registry(settings.INDUSTRY_CONFIG_DIR)
 
     if not config_dir.exists():
         raise HTTPException(
@@ -57,44 +76,14 @@ def list_industries(
             detail=f"Industry config directory not found: {settings.INDUSTRY_CONFIG_DIR}"
         )
 
+    # Stats aller Industries aus einem gecachten Rollup statt 2 Queries pro Datei
+    stats = get_industry_stats(db, settings.INDUSTRY_STATS_CACHE_TTL_S)
     industries = []
 
-    # Alle YAML-Dateien im Verzeichnis durchgehen
-    for yaml_file in config_dir.glob("*.yaml"):
-        industry_id = yaml_file.stem
-
+    for industry_id in registry.industry_ids():
         try:
-            config = load_industry_config(industry_id, str(config_dir))
-
-            # Statistiken aus DB holen
-            total_companies = (
-                db.query(func.count(Company.id))
-                .filter(Company.industry_id == industry_id)
-                .scalar()
-            )
-
-            # Durchschnittlichen Score berechnen (nur completed Scans)
-            avg_score_result = (
-                db.query(func.avg(Scan.overall_score))
-                .join(Company)
-                .filter(Company.industry_id == industry_id)
-                .filter(Scan.status == "completed")
-                .filter(Scan.overall_score.isnot(None))
-                .scalar()
-            )
-
-            avg_score = float(avg_score_result) if avg_score_result else None
-
-            industries.append(
-                IndustryInfo(
-                    id=industry_id,
-                    name=config.get("name", industry_id),
-                    display_name=config.get("display_name", industry_id),
-                    description=config.get("description", ""),
-                    total_companies=total_companies,
-                    avg_score=avg_score
-                )
-            )
+            config = registry.get(industry_id).raw
+            industries.append(_industry_info(industry_id, config, stats.get(industry_id)))
         except Exception as e:
             # Fehlerhafte Configs überspringen
             print(f"Error loading industry config {industry_id}: {e}")
@@ -112,38 +101,20 @@ def get_industry(
     """
     Holt Details einer einzelnen Industry.
     """
-    try:
-        config = load_industry_config(industry_id, settings.INDUSTRY_CONFIG_DIR)
-    except FileNotFoundError:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Industry '{industry_id}' not found"
-        )
+    config = load_industry_config_or_404(industry_id, settings.INDUSTRY_CONFIG_DIR)
 
-    # Statistiken aus DB holen
-    total_companies = (
-        db.query(func.count(Company.id))
-        .filter(Company.industry_id == industry_id)
-        .scalar()
-    )
-
-    # Durchschnittlichen Score berechnen (nur completed Scans)
-    avg_score_result = (
-        db.query(func.avg(Scan.overall_score))
-        .join(Company)
-        .filter(Company.industry_id == industry_id)
-        .filter(Scan.status == "completed")
-        .filter(Scan.overall_score.isnot(None))
-        .scalar()
-    )
+    stats = get_industry_stats(db, settings.INDUSTRY_STATS_CACHE_TTL_S)
+    return _industry_info(industry_id, config, stats.get(industry_id))
 
-    avg_score = float(avg_score_result) if avg_score_result else None
 
+def _industry_info(industry_id: str, config: dict, stats: dict | None) -> IndustryInfo:
+    """IndustryInfo aus Config und Rollup-Stats (avg_score nur über den neuesten Scan pro Company)."""
+    stats = stats or {}
     return IndustryInfo(
         id=industry_id,
         name=config.get("name", industry_id),
         display_name=config.get("display_name", industry_id),
         description=config.get("description", ""),
-        total_companies=total_companies,
-        avg_score=avg_score
+        total_companies=stats.get("total_companies", 0),
+        avg_score=stats.get("avg_score")
     )
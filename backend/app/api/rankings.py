@@ -2,17 +2,22 @@
 Rankings API Endpoints.
 Erstellt Rankings von Companies basierend auf ihren Scan-Scores.
 """
-from typing import Optional
-from datetime import datetime
+from typing import List, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, status
+import numpy as np
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import desc, func
 
 from app.dependencies import get_db
-from app.models import Company, Scan
-from app.schemas import RankingResponse, RankingEntry
-from app.api.industries import load_industry_config
+from app.models import Company, RankingSnapshot, Scan, ScanResult
+from app.schemas import RankingResponse, RankingEntry, WhatIfEntry, WhatIfRequest, WhatIfResponse
+from app.services.http_cache import CachedResponse, industry_tag
+from app.services.ranking_snapshot import rebuild_industry_snapshot
+from app.services.score_matrix import ScoreMatrix, cached_industry_matrix
+from app.services.scorer import Scorer
+from app.api.industries import load_industry_config_or_404
+from app.api.cache_utils import cached_response
 from app.api.contract_utils import normalize_platform_scores
 from app.dependencies import get_settings
 from app.config import Settings
@@ -23,123 +28,225 @@ router = APIRouter()
 @router.get("/{industry_id}", response_model=RankingResponse)
 def get_industry_ranking(
     industry_id: str,
+    request: Request,
     limit: int = 50,
     offset: int = 0,
     db: Session = Depends(get_db),
     settings: Settings = Depends(get_settings)
-) -> RankingResponse:
+) -> Response:
     """
     Holt das Ranking aller Companies einer Industry.
 
-    Für jede Company wird der neueste completed Scan verwendet.
+    Für jede Company wird der neueste completed Scan verwendet (bevorzugt
+    mit der aktuellen query_version), gelesen aus dem ranking_snapshot,
+    der bei jedem Scan-Abschluss aktualisiert wird.
     Sortierung nach overall_score (höchster Score = Rang 1).
+
+    Die Antwort wird bis zum nächsten Scan-Abschluss der Industry gecacht
+    (ETag, Revalidierung per If-None-Match).
     """
+    return cached_response(
+        request, settings,
+        key=f"ranking:{industry_id}:{limit}:{offset}",
+        tags=[industry_tag(industry_id)],
+        ttl_s=settings.RESPONSE_CACHE_RANKING_TTL_S,
+        cache_control="no-cache",
+        build=lambda: _build_ranking(db, settings, industry_id, limit, offset),
+    )
+
+
+def _build_ranking(db: Session, settings: Settings, industry_id: str, limit: int, offset: int) -> CachedResponse:
+    """Serialisierte Ranking-Seite aus dem ranking_snapshot."""
     # Industry Config laden für Display Name
-    try:
-        industry_config = load_industry_config(industry_id, settings.INDUSTRY_CONFIG_DIR)
-        industry_name = industry_config.get("display_name", industry_id)
-    except FileNotFoundError:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Industry '{industry_id}' not found"
+    industry_config = load_industry_config_or_404(industry_id, settings.INDUSTRY_CONFIG_DIR)
+    industry_name = industry_config.get("display_name", industry_id)
+
+    # Ein indizierter Read auf den materialisierten Snapshot (Total + Stand per Window)
+    rows = _snapshot_page(db, industry_id, limit, offset)
+
+    if not rows and offset == 0 and _backfill_snapshot(db, industry_id):
+        rows = _snapshot_page(db, industry_id, limit, offset)
+
+    if rows:
+        total_companies, last_updated = rows[0].total, rows[0].last_updated
+    else:
+        total_companies = (
+            db.query(func.count(RankingSnapshot.company_id))
+            .filter(RankingSnapshot.industry_id == industry_id)
+            .scalar()
         )
+        last_updated = None
 
-    # Alle Companies der Industry holen
-    companies = db.query(Company).filter(Company.industry_id == industry_id).all()
+    # Ränge berechnen (basierend auf Position nach Pagination)
+    entries = [
+        RankingEntry(
+            rank=offset + idx + 1,
+            company_name=row.RankingSnapshot.company_name,
+            domain=row.RankingSnapshot.domain,
+            overall_score=row.RankingSnapshot.overall_score,
+            platform_scores=normalize_platform_scores(row.RankingSnapshot.platform_scores),
+            industry_id=row.RankingSnapshot.industry_id,
+            scan_id=row.RankingSnapshot.scan_id
+        )
+        for idx, row in enumerate(rows)
+    ]
 
-    if not companies:
-        return RankingResponse(
-            industry_id=industry_id,
-            industry_name=industry_name,
-            total_companies=0,
-            entries=[],
-            last_updated=None
+    ranking = RankingResponse(
+        industry_id=industry_id,
+        industry_name=industry_name,
+        total_companies=total_companies,
+        entries=entries,
+        last_updated=last_updated
+    )
+    return CachedResponse(ranking.model_dump_json().encode(), "application/json")
+
+
+def _snapshot_page(db: Session, industry_id: str, limit: int, offset: int) -> list:
+    """Eine Seite des Rankings, sortiert nach overall_score (höchster Score = Rang 1)."""
+    return (
+        db.query(
+            RankingSnapshot,
+            func.count().over().label("total"),
+            func.max(RankingSnapshot.completed_at).over().label("last_updated"),
         )
+        .filter(RankingSnapshot.industry_id == industry_id)
+        .order_by(desc(RankingSnapshot.overall_score), RankingSnapshot.company_name)
+        .offset(offset)
+        .limit(limit)
+        .all()
+    )
+
 
-    # Für jede Company den neuesten completed Scan holen
-    ranking_data = []
-    last_updated = None
+def _backfill_snapshot(db: Session, industry_id: str) -> bool:
+    """
+    Baut den Snapshot auf, wenn es completed Scans mit Score gibt, aber noch
+    keine Snapshot-Zeilen (z.B. Scans von vor Einführung der Tabelle).
 
-    # Aktuelle Query-Version ermitteln (die am häufigsten bei completed Scans vorkommt)
-    from sqlalchemy import func
-    latest_version_row = (
-        db.query(Scan.query_version, func.count(Scan.id))
-        .filter(Scan.industry_id == industry_id)
+    Returns:
+        True, wenn neu aufgebaut wurde
+    """
+    has_snapshot = db.query(
+        db.query(RankingSnapshot.company_id).filter(RankingSnapshot.industry_id == industry_id).exists()
+    ).scalar()
+    if has_snapshot:
+        return False
+    has_scans = db.query(
+        db.query(Scan.id)
+        .join(Company, Company.id == Scan.company_id)
+        .filter(Company.industry_id == industry_id)
         .filter(Scan.status == "completed")
-        .filter(Scan.query_version.isnot(None))
-        .group_by(Scan.query_version)
-        .order_by(func.count(Scan.id).desc())
-        .first()
-    )
-    current_version = latest_version_row[0] if latest_version_row else None
-
-    for company in companies:
-        # Neuesten completed Scan holen, bevorzugt mit aktueller query_version
-        scan_query = (
-            db.query(Scan)
-            .filter(Scan.company_id == company.id)
-            .filter(Scan.status == "completed")
+        .filter(Scan.overall_score.isnot(None))
+        .exists()
+    ).scalar()
+    if not has_scans:
+        return False
+    rebuild_industry_snapshot(db, industry_id)
+    db.commit()
+    return True
+
+
+@router.post("/{industry_id}/what-if", response_model=WhatIfResponse)
+def what_if_ranking(
+    industry_id: str,
+    request: WhatIfRequest,
+    db: Session = Depends(get_db),
+    settings: Settings = Depends(get_settings)
+) -> WhatIfResponse:
+    """
+    Berechnet das Ranking einer Industry mit alternativen Scoring-Gewichten
+    (scoring.mention_types und Plattform-weight), ohne Scans zu verändern.
+
+    Die Ergebnisse der Scans im Ranking-Snapshot werden als ScoreMatrix im
+    Prozess gecacht; pro Anfrage wird nur neu gewichtet.
+    """
+    industry_config = load_industry_config_or_404(industry_id, settings.INDUSTRY_CONFIG_DIR)
+
+    weights = list((request.mention_types or {}).values()) + list((request.platform_weights or {}).values())
+    if any(weight < 0 for weight in weights):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Weights must not be negative"
         )
 
-        if current_version:
-            # Erst nach Scan mit aktueller Version suchen
-            latest_scan = (
-                scan_query
-                .filter(Scan.query_version == current_version)
-                .order_by(desc(Scan.completed_at))
-                .first()
-            )
-        else:
-            latest_scan = None
-
-        # Fallback: beliebiger completed Scan
-        if not latest_scan:
-            latest_scan = (
-                scan_query
-                .order_by(desc(Scan.completed_at))
-                .first()
-            )
-
-        if latest_scan and latest_scan.overall_score is not None:
-            ranking_data.append({
-                "scan_id": latest_scan.id,
-                "company_name": company.name,
-                "domain": company.domain,
-                "overall_score": latest_scan.overall_score,
-                "platform_scores": normalize_platform_scores(latest_scan.platform_scores),
-                "industry_id": company.industry_id,
-                "completed_at": latest_scan.completed_at,
-                "query_version": latest_scan.query_version,
-            })
-
-            # Last updated tracken
-            if last_updated is None or latest_scan.completed_at > last_updated:
-                last_updated = latest_scan.completed_at
-
-    # Nach Score sortieren (höchster zuerst)
-    ranking_data.sort(key=lambda x: x["overall_score"], reverse=True)
-
-    # Pagination anwenden
-    paginated_data = ranking_data[offset:offset + limit]
+    _backfill_snapshot(db, industry_id)
+
+    # Matrix nur neu bauen, wenn sich der Ranking-Snapshot der Industry geändert hat
+    fingerprint = tuple(
+        db.query(
+            func.count(RankingSnapshot.company_id),
+            func.max(RankingSnapshot.updated_at),
+            func.sum(RankingSnapshot.overall_score)
+        )
+        .filter(RankingSnapshot.industry_id == industry_id)
+        .one()
+    )
+    matrix, entries_meta = cached_industry_matrix(
+        industry_id, fingerprint, lambda: _build_score_matrix(db, industry_id)
+    )
+
+    scorer = Scorer(industry_config)
+    baseline = scorer.score_matrix(matrix)
+    scenario = scorer.score_matrix(matrix, request.mention_types, request.platform_weights)
+
+    baseline_ranks = _ranks(baseline["overall"])
+    order = np.argsort(-scenario["overall"], kind="stable")
 
-    # Ränge berechnen (basierend auf Position nach Pagination)
     entries = [
-        RankingEntry(
-            rank=offset + idx + 1,
-            company_name=item["company_name"],
-            domain=item["domain"],
-            overall_score=item["overall_score"],
-            platform_scores=item["platform_scores"],
-            industry_id=item["industry_id"],
-            scan_id=item["scan_id"]
+        WhatIfEntry(
+            rank=rank + 1,
+            baseline_rank=int(baseline_ranks[row]),
+            company_name=entries_meta[row]["company_name"],
+            domain=entries_meta[row]["domain"],
+            overall_score=float(scenario["overall"][row]),
+            baseline_score=float(baseline["overall"][row]),
+            platform_scores=normalize_platform_scores(matrix.platform_dict(scenario["platform"], row)),
+            category_scores=matrix.category_dict(scenario["category"], row),
+            scan_id=matrix.keys[row],
         )
-        for idx, item in enumerate(paginated_data)
+        for rank, row in enumerate(order[:request.limit].tolist())
     ]
 
-    return RankingResponse(
+    return WhatIfResponse(
         industry_id=industry_id,
-        industry_name=industry_name,
-        total_companies=len(ranking_data),
-        entries=entries,
-        last_updated=last_updated
+        total_companies=matrix.n_scans,
+        mention_types={**scorer.mention_type_weights, **(request.mention_types or {})},
+        platform_weights={**scorer.platform_weights, **(request.platform_weights or {})},
+        entries=entries
     )
+
+
+def _build_score_matrix(db: Session, industry_id: str) -> Tuple[ScoreMatrix, List[dict]]:
+    """ScoreMatrix über die Scans des Ranking-Snapshots der Industry."""
+    rows = (
+        db.query(RankingSnapshot.scan_id, RankingSnapshot.company_name, RankingSnapshot.domain)
+        .filter(RankingSnapshot.industry_id == industry_id)
+        # Gleiche Reihenfolge wie /rankings: der stabile Sort bricht Gleichstände danach auf
+        .order_by(desc(RankingSnapshot.overall_score), RankingSnapshot.company_name)
+        .all()
+    )
+
+    # Nur die für das Scoring nötigen Spalten der Ergebnisse, ein Query für alle Scans
+    results: dict[str, list[dict]] = {row.scan_id: [] for row in rows}
+    result_rows = (
+        db.query(
+            ScanResult.scan_id, ScanResult.platform, ScanResult.category, ScanResult.mentioned,
+            ScanResult.mention_type, ScanResult.position, ScanResult.sentiment,
+        )
+        .join(RankingSnapshot, RankingSnapshot.scan_id == ScanResult.scan_id)
+        .filter(RankingSnapshot.industry_id == industry_id)
+        .order_by(ScanResult.scan_id, ScanResult.result_index)
+    )
+    for result in result_rows:
+        results[result.scan_id].append(result._asdict())
+
+    matrix = ScoreMatrix((row.scan_id, results[row.scan_id]) for row in rows)
+    entries_meta = [{"company_name": row.company_name, "domain": row.domain} for row in rows]
+    return matrix, entries_meta
+
+
+def _ranks(scores: np.ndarray) -> np.ndarray:
+    """Rang (1 = höchster Score) pro Zeile."""
+    ranks = np.empty(len(scores), dtype=int)
+    ranks[np.argsort(-scores, kind="stable")] = np.arange(1, len(scores) + 1)
+    return ranks
+
@@ -2,29 +2,69 @@
 Reports API Endpoints.
 Liefert vollständige Reports mit Company- und Scan-Daten.
 """
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import HTMLResponse
-from sqlalchemy.orm import Session
-
-from app.dependencies import get_db
-from app.models import Scan, Company
-from app.schemas import ReportResponse, CompanyResponse, ScanResponse
+import gzip
+import logging
+from typing import Iterator
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import HTMLResponse, StreamingResponse
+from sqlalchemy.orm import Session, undefer_group
+
+from app.dependencies import get_db, get_settings
+from app.config import Settings
+from app.models import SCAN_DETAILS, Scan, Company
+from app.schemas import ReportResponse, CompanyResponse, ScanResponse, ScanResultsSummary
+from app.services.http_cache import CachedResponse, scan_tag
+from app.services.industry_registry import IndustryConfigError
+from app.services.rendered_reports import (
+    HTML_MEDIA_TYPE,
+    get_rendered_report,
+    rendered_report_key,
+    tee_rendered_report,
+)
+from app.services.report_generator import ReportGenerator
+from app.services.scan_results import results_page, summarize_results
+from app.api.cache_utils import cached_response
+from app.api.industries import load_industry_config
 from app.api.contract_utils import extract_competitors, normalize_platform_scores
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
+# Anzahl Query-Ergebnisse in der Tabelle des HTML-Reports (siehe report.html.j2)
+REPORT_HTML_RESULT_LIMIT = 50
+
 
 @router.get("/{scan_id}", response_model=ReportResponse)
 def get_report(
     scan_id: str,
-    db: Session = Depends(get_db)
-) -> ReportResponse:
+    request: Request,
+    db: Session = Depends(get_db),
+    settings: Settings = Depends(get_settings)
+) -> Response:
     """
     Holt den vollständigen Report für einen Scan.
-    Enthält Company-Daten, Scan-Ergebnisse und Recommendations.
+    Enthält Company-Daten, Scores, Analyse, Kennzahlen der Query-Ergebnisse
+    und Recommendations. Die einzelnen Ergebnisse liefert /scans/{id}/results.
+
+    Reports abgeschlossener Scans werden mit ETag gecacht; Wiederholungen
+    mit If-None-Match bekommen ein 304 ohne DB-Zugriff.
     """
+    return cached_response(
+        request, settings,
+        key=f"report:{scan_id}",
+        tags=[scan_tag(scan_id)],
+        ttl_s=settings.RESPONSE_CACHE_REPORT_TTL_S,
+        cache_control=f"public, max-age={settings.REPORT_CACHE_MAX_AGE_S}",
+        build=lambda: _build_report(db, scan_id),
+    )
+
+
+def _build_report(db: Session, scan_id: str) -> CachedResponse:
+    """Serialisierter ReportResponse eines abgeschlossenen Scans."""
     # Scan holen
-    scan = db.query(Scan).filter(Scan.id == scan_id).first()
+    scan = db.query(Scan).options(undefer_group(SCAN_DETAILS)).filter(Scan.id == scan_id).first()
 
     if not scan:
         raise HTTPException(
@@ -66,7 +106,7 @@ def get_report(
         status=scan.status,
         overall_score=scan.overall_score,
         platform_scores=normalize_platform_scores(scan.platform_scores),
-        query_results=scan.query_results,
+        results_summary=ScanResultsSummary(**summarize_results(db, scan.id)),
         analysis=scan.analysis,
         competitors=extract_competitors(scan.analysis),
         recommendations=scan.recommendations,
@@ -74,24 +114,89 @@ def get_report(
         completed_at=scan.completed_at
     )
 
-    return ReportResponse(
+    report = ReportResponse(
         company=company_response,
         scan=scan_response,
         recommendations=scan.recommendations
     )
+    return CachedResponse(report.model_dump_json().encode(), "application/json")
 
 
 @router.get("/{scan_id}/html", response_class=HTMLResponse)
 def get_report_html(
     scan_id: str,
-    db: Session = Depends(get_db)
-) -> str:
+    request: Request,
+    db: Session = Depends(get_db),
+    settings: Settings = Depends(get_settings)
+) -> Response:
     """
     Liefert den HTML-Report direkt als HTML-Response.
     Kann direkt im Browser angezeigt werden.
+
+    Der Report wird bei Bedarf aus den Scan-Daten gerendert und gestreamt,
+    danach gzip-komprimiert im Prozess gecacht (Schlüssel: Scan-ID +
+    Template-Version). Cache-Treffer kommen mit ETag, gzip bei
+    Accept-Encoding und 304 bei passendem If-None-Match — ohne DB-Zugriff.
+    """
+    cache_control = f"public, max-age={settings.REPORT_CACHE_MAX_AGE_S}"
+    key = rendered_report_key(settings, scan_id)
+
+    report = get_rendered_report(settings, key)
+    if report is None:
+        chunks = _stream_report_html(db, settings, scan_id)
+        return StreamingResponse(
+            tee_rendered_report(settings, key, chunks),
+            media_type=HTML_MEDIA_TYPE,
+            headers={"Cache-Control": cache_control}
+        )
+
+    # Eigener (starker) ETag pro Kodierung
+    gzip_accepted = _accepts_gzip(request.headers.get("accept-encoding"))
+    etag = report.etag[:-1] + '-gzip"' if gzip_accepted else report.etag
+    headers = {"ETag": etag, "Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+
+    if CachedResponse(b"", HTML_MEDIA_TYPE, etag).matches(request.headers.get("if-none-match")):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    if gzip_accepted:
+        return Response(content=report.body, media_type=HTML_MEDIA_TYPE, headers={**headers, "Content-Encoding": "gzip"})
+    return Response(content=gzip.decompress(report.body), media_type=HTML_MEDIA_TYPE, headers=headers)
+
+
+def _accepts_gzip(accept_encoding: str | None) -> bool:
+    """
+    True, wenn der Accept-Encoding-Header gzip mit q > 0 erlaubt
+    (explizit oder über "*", sofern gzip nicht eigens ausgeschlossen ist).
+    """
+    qualities: dict[str, float] = {}
+    for part in (accept_encoding or "").lower().split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        qualities[coding] = q
+
+    if "gzip" in qualities:
+        return qualities["gzip"] > 0
+    return qualities.get("*", 0.0) > 0
+
+
+def _stream_report_html(db: Session, settings: Settings, scan_id: str) -> Iterator[str]:
+    """
+    Prüft den Scan und liefert die HTML-Chunks des Reports.
+
+    Alle Daten werden vorab gelesen — der Generator läuft erst nach dem
+    Schließen der DB-Session.
     """
     # Scan holen
-    scan = db.query(Scan).filter(Scan.id == scan_id).first()
+    scan = db.query(Scan).options(undefer_group(SCAN_DETAILS)).filter(Scan.id == scan_id).first()
 
     if not scan:
         raise HTTPException(
@@ -106,11 +211,32 @@ def get_report_html(
             detail=f"Scan is not completed yet (status: {scan.status})"
         )
 
-    # Prüfen ob HTML-Report existiert
-    if not scan.report_html:
+    company = db.query(Company).filter(Company.id == scan.company_id).first()
+
+    if not company:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"HTML report not available for this scan"
+            detail=f"Company with id '{scan.company_id}' not found"
         )
 
-    return scan.report_html
+    try:
+        industry_config = load_industry_config(scan.industry_id, settings.INDUSTRY_CONFIG_DIR)
+    except FileNotFoundError:
+        industry_config = {}
+    except IndustryConfigError as e:
+        # Report trotzdem rendern (ohne Industry-Angaben), Fehler nur loggen
+        logger.warning(f"Report {scan.id}: {e}")
+        industry_config = {}
+
+    # Das Template zeigt nur die ersten Ergebnisse
+    _, first_results = results_page(db, scan.id, limit=REPORT_HTML_RESULT_LIMIT, offset=0)
+
+    scan_data = {
+        "overall_score": scan.overall_score,
+        "platform_scores": scan.platform_scores,
+        "query_results": [result.to_dict() for result in first_results],
+        "analysis": scan.analysis,
+        "recommendations": scan.recommendations,
+        "completed_at": scan.completed_at,
+    }
+    return ReportGenerator().stream_report_html(company.name, company.domain, scan_data, industry_config)
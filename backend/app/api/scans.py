@@ -5,15 +5,15 @@ Verwaltet Scans und führt sie aus.
 from typing import List
 from uuid import uuid4
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session, undefer_group
 
-from app.dependencies import get_db, get_settings
-from app.models import Company, Scan
-from app.schemas import ScanCreate, ScanResponse
+from app.dependencies import get_db
+from app.models import SCAN_DETAILS, Company, Scan, ScanJob
+from app.schemas import JobResponse, ScanCreate, ScanResponse, ScanResultPage, ScanResultResponse, ScanResultsSummary
 from app.api.contract_utils import extract_competitors, normalize_platform_scores
-from app.workers.scan_worker import run_scan
-from app.config import Settings
+from app.services.job_queue import JobQueue
+from app.services.scan_results import results_page, summarize_results
 
 router = APIRouter()
 
@@ -43,10 +43,8 @@ def create_scan(
         status="pending",
         overall_score=None,
         platform_scores={},
-        query_results=[],
         analysis={},
         recommendations=[],
-        report_html=None,
         error_message=None
     )
 
@@ -60,7 +58,6 @@ def create_scan(
         status=scan.status,
         overall_score=scan.overall_score,
         platform_scores=normalize_platform_scores(scan.platform_scores),
-        query_results=scan.query_results,
         analysis=scan.analysis,
         competitors=extract_competitors(scan.analysis),
         recommendations=scan.recommendations,
@@ -97,10 +94,8 @@ def create_bulk_scans(
             status="pending",
             overall_score=None,
             platform_scores={},
-            query_results=[],
             analysis={},
             recommendations=[],
-            report_html=None,
             error_message=None
         )
 
@@ -120,7 +115,6 @@ def create_bulk_scans(
             status=s.status,
             overall_score=s.overall_score,
             platform_scores=normalize_platform_scores(s.platform_scores),
-            query_results=s.query_results,
             analysis=s.analysis,
             competitors=extract_competitors(s.analysis),
             recommendations=s.recommendations,
@@ -131,6 +125,51 @@ def create_bulk_scans(
     ]
 
 
+@router.post("/sweep", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+def run_sweep_endpoint(
+    industry_id: str,
+    batch: bool = False,
+    db: Session = Depends(get_db)
+) -> JobResponse:
+    """
+    Reiht einen Industry-Sweep ein: Generic Queries werden einmal pro Plattform
+    gestellt und für alle Companies der Industry analysiert, danach laufen nur
+    noch die Brand Queries pro Company.
+
+    Ersetzt /bulk + N× /{scan_id}/run für ein komplettes Re-Ranking. Der Sweep
+    läuft im Worker (python -m app.workers); die Scan-IDs stehen nach Abschluss
+    in result.scan_ids des Jobs. batch=true nutzt die Provider-Batch-APIs.
+    """
+    companies_exist = db.query(Company.id).filter(Company.industry_id == industry_id).first()
+    if not companies_exist:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No companies found for industry '{industry_id}'"
+        )
+
+    job = JobQueue(db).enqueue_sweep(industry_id, batch=batch)
+    return JobResponse.model_validate(job)
+
+
+@router.get("/jobs/{job_id}", response_model=JobResponse)
+def get_job(
+    job_id: str,
+    db: Session = Depends(get_db)
+) -> JobResponse:
+    """
+    Status eines eingereihten Scan- oder Sweep-Jobs.
+    """
+    job = db.get(ScanJob, job_id)
+
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job with id '{job_id}' not found"
+        )
+
+    return JobResponse.model_validate(job)
+
+
 @router.get("/{scan_id}", response_model=ScanResponse)
 def get_scan(
     scan_id: str,
@@ -139,7 +178,7 @@ def get_scan(
     """
     Holt den aktuellen Status und die Ergebnisse eines Scans.
     """
-    scan = db.query(Scan).filter(Scan.id == scan_id).first()
+    scan = db.query(Scan).options(undefer_group(SCAN_DETAILS)).filter(Scan.id == scan_id).first()
 
     if not scan:
         raise HTTPException(
@@ -153,7 +192,7 @@ def get_scan(
         status=scan.status,
         overall_score=scan.overall_score,
         platform_scores=normalize_platform_scores(scan.platform_scores),
-        query_results=scan.query_results,
+        results_summary=ScanResultsSummary(**summarize_results(db, scan.id)),
         analysis=scan.analysis,
         competitors=extract_competitors(scan.analysis),
         recommendations=scan.recommendations,
@@ -162,25 +201,69 @@ def get_scan(
     )
 
 
-@router.post("/{scan_id}/run", response_model=ScanResponse)
-async def run_scan_endpoint(
+@router.get("/{scan_id}/results", response_model=ScanResultPage)
+def get_scan_results(
     scan_id: str,
-    db: Session = Depends(get_db),
-    settings: Settings = Depends(get_settings)
-) -> ScanResponse:
+    limit: int = Query(default=50, ge=1, le=500),
+    offset: int = Query(default=0, ge=0),
+    platform: str | None = None,
+    category: str | None = None,
+    mentioned: bool | None = None,
+    include_response: bool = False,
+    db: Session = Depends(get_db)
+) -> ScanResultPage:
     """
-    Führt einen Scan aus.
-
-    Der komplette Workflow wird synchron ausgeführt:
-    1. Queries generieren
-    2. LLMs abfragen
-    3. Responses analysieren
-    4. Scores berechnen
-    5. Report generieren
-    6. Status auf 'completed' setzen
-
-    In Production würde man BackgroundTasks oder Celery verwenden.
-    Für MVP ist synchrone Ausführung ok.
+    Seitenweise Query-Ergebnisse eines Scans in Query-Reihenfolge.
+    Filterbar nach Plattform, Kategorie und Erwähnung; die Antworttexte
+    sind nur mit include_response=true enthalten.
+    """
+    scan_exists = db.query(Scan.id).filter(Scan.id == scan_id).first()
+
+    if not scan_exists:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Scan with id '{scan_id}' not found"
+        )
+
+    total, results = results_page(
+        db, scan_id, limit, offset,
+        platform=platform, category=category, mentioned=mentioned, include_response=include_response
+    )
+
+    return ScanResultPage(
+        scan_id=scan_id,
+        total=total,
+        limit=limit,
+        offset=offset,
+        items=[
+            ScanResultResponse(
+                id=result.id,
+                result_index=result.result_index,
+                query_id=result.query_id,
+                **result.to_dict(include_response=include_response)
+            )
+            for result in results
+        ]
+    )
+
+
+@router.post("/{scan_id}/run", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+def run_scan_endpoint(
+    scan_id: str,
+    batch: bool = False,
+    db: Session = Depends(get_db)
+) -> JobResponse:
+    """
+    Reiht einen Scan zur Ausführung ein.
+
+    Der Workflow (Queries generieren, LLMs abfragen, analysieren, Scores
+    berechnen, Report generieren) läuft im Worker-Prozess (python -m app.workers).
+    Die Antwort enthält den Job; Fortschritt über GET /scans/jobs/{job_id}
+    bzw. den Scan-Status über GET /scans/{scan_id}.
+
+    Ein fehlgeschlagener Scan kann erneut gestartet werden — bereits
+    gespeicherte Ergebnisse bleiben erhalten, nur fehlende (Query, Plattform)-
+    Paare werden abgefragt.
     """
     # Prüfen ob Scan existiert
     scan = db.query(Scan).filter(Scan.id == scan_id).first()
@@ -204,22 +287,5 @@ async def run_scan_endpoint(
             detail=f"Scan is already completed"
         )
 
-    # Scan ausführen
-    await run_scan(scan_id, db, settings)
-
-    # Scan neu laden
-    db.refresh(scan)
-
-    return ScanResponse(
-        id=scan.id,
-        company_id=scan.company_id,
-        status=scan.status,
-        overall_score=scan.overall_score,
-        platform_scores=normalize_platform_scores(scan.platform_scores),
-        query_results=scan.query_results,
-        analysis=scan.analysis,
-        competitors=extract_competitors(scan.analysis),
-        recommendations=scan.recommendations,
-        started_at=scan.started_at,
-        completed_at=scan.completed_at
-    )
+    job = JobQueue(db).enqueue_scan(scan_id, batch=batch)
+    return JobResponse.model_validate(job)
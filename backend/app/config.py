@@ -7,10 +7,82 @@ class Settings(BaseSettings):
     ANTHROPIC_API_KEY: str = ""
     GOOGLE_API_KEY: str = ""
     PERPLEXITY_API_KEY: str = ""
+    OPENAI_BASE_URL: str = "https://api.openai.com/v1"
+    ANTHROPIC_BASE_URL: str = "https://api.anthropic.com"
     INDUSTRY_CONFIG_DIR: str = "./industries"
     CORS_ORIGINS: list[str] = ["http://localhost:3000", "http://localhost:3001"]
     API_PREFIX: str = "/api/v1"
 
+    # LLM Response Cache (geteilt über alle Scans)
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_DEFAULT_TTL_HOURS: float = 168.0
+    LLM_CACHE_MAX_ENTRIES: int = 10_000
+
+    # Industry-Übersicht: Cache der Stats-Rollups (Änderungen aus dem Worker nach spätestens so vielen Sekunden)
+    INDUSTRY_STATS_CACHE_TTL_S: float = 30.0
+
+    # HTTP Response Cache für Rankings und Reports: "memory" (LRU pro Prozess) oder
+    # "shared" (Redis unter RESPONSE_CACHE_URL, für mehrere Replicas und Worker-Invalidierung)
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_BACKEND: str = "memory"
+    RESPONSE_CACHE_URL: str = "redis://localhost:6379/0"
+    RESPONSE_CACHE_MAX_ENTRIES: int = 1000
+    # Scan-Worker und cli.reanalyze invalidieren das memory-Backend der API nicht
+    # (eigene Prozesse) → kurze TTLs; mit dem shared-Backend können sie länger sein.
+    # Rankings ändern sich mit jedem Scan
+    RESPONSE_CACHE_RANKING_TTL_S: float = 30.0
+    # Reports abgeschlossener Scans (JSON und gerendertes HTML) ändern sich nur durch eine Re-Analyse
+    RESPONSE_CACHE_REPORT_TTL_S: float = 120.0
+    REPORT_CACHE_MAX_AGE_S: int = 300
+    # HTML-Reports werden bei Bedarf gerendert; LRU der gzip-komprimierten Ergebnisse pro Prozess
+    REPORT_RENDER_CACHE_MAX_ENTRIES: int = 256
+    REPORT_RENDER_GZIP_LEVEL: int = 6
+
+    # Parallelität innerhalb eines Scans
+    SCAN_MAX_CONCURRENCY: int = 8
+    SCAN_PLATFORM_CONCURRENCY: int = 4
+
+    # Provider Rate Limits (prozessweit, pro Plattform + Modell)
+    LLM_RATE_LIMIT_ENABLED: bool = True
+    LLM_DEFAULT_RPM: int = 500
+    LLM_DEFAULT_TPM: int = 200_000
+    LLM_MAX_IN_FLIGHT: int = 16
+    LLM_MIN_IN_FLIGHT: int = 1
+    # platform -> {"rpm": ..., "tpm": ..., "max_in_flight": ...}
+    LLM_RATE_LIMITS: dict[str, dict[str, int]] = {}
+
+    # Retries mit Backoff und Circuit Breaker pro Plattform
+    LLM_RETRY_MAX_ATTEMPTS: int = 4
+    LLM_RETRY_BASE_DELAY_S: float = 1.0
+    LLM_RETRY_MAX_DELAY_S: float = 30.0
+    LLM_CALL_DEADLINE_S: float = 120.0
+    # model -> Deadline in Sekunden (überschreibt LLM_CALL_DEADLINE_S; YAML timeout_s hat Vorrang)
+    LLM_MODEL_TIMEOUTS: dict[str, float] = {}
+    LLM_CIRCUIT_BREAKER_ENABLED: bool = True
+    LLM_CIRCUIT_FAILURE_RATE: float = 0.5
+    LLM_CIRCUIT_MIN_CALLS: int = 5
+    LLM_CIRCUIT_WINDOW_S: float = 60.0
+    LLM_CIRCUIT_COOLDOWN_S: float = 30.0
+
+    # Connection-Pools der Provider-Clients (ein Pool pro Provider und Prozess)
+    LLM_HTTP2: bool = True
+    LLM_HTTP_TIMEOUT_S: float = 60.0
+    LLM_HTTP_MAX_CONNECTIONS: int = 100
+    LLM_HTTP_MAX_KEEPALIVE: int = 20
+    LLM_HTTP_KEEPALIVE_EXPIRY_S: float = 30.0
+
+    # Batch-Modus (OpenAI Batch / Anthropic Message Batches) für geplante Sweeps
+    LLM_BATCH_POLL_INTERVAL_S: float = 60.0
+    LLM_BATCH_MAX_WAIT_S: float = 24 * 3600.0
+
+    # Scan-Job-Queue (python -m app.workers)
+    WORKER_CONCURRENCY: int = 4
+    WORKER_POLL_INTERVAL_S: float = 2.0
+    WORKER_HEARTBEAT_S: float = 30.0
+    # Jobs ohne Heartbeat seit dieser Zeit gelten als verwaist und werden neu eingereiht
+    WORKER_STALE_AFTER_S: float = 300.0
+    WORKER_MAX_ATTEMPTS: int = 3
+
     model_config = {
         "env_file": ".env",
         "extra": "ignore"
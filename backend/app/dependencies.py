@@ -11,3 +11,4 @@ def get_db():
 @lru_cache
 def get_settings() -> Settings:
     return Settings()
+
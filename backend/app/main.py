@@ -11,6 +11,8 @@ settings = Settings()
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     create_tables()
+    # Provider-Calls laufen nur im Worker-Prozess (python -m app.workers) —
+    # die API reiht Scans nur ein und braucht keine Provider-Clients
     yield
 
 
@@ -0,0 +1,263 @@
+"""
+Manuelle Schema-Migrationen.
+Neue Tabellen entstehen über create_all. create_all ändert aber keine
+bestehenden Tabellen: Hinzufügen und Entfernen von Spalten in bestehenden
+Datenbanken läuft explizit über die Funktionen hier (CLI: python -m cli.migrate).
+"""
+import gzip
+import json
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import Engine, bindparam, inspect, text
+from sqlalchemy.orm import Session
+
+from app.models import ScanJob, ScanResult, TextBlob
+from app.services.text_store import TextStore, prune_unreferenced
+
+
+def add_cost_cache_columns(engine: Engine) -> dict[str, Any]:
+    """
+    Ergänzt api_call_costs um die Cache-Spalten cache_hit und saved_cost_usd
+    (Response-Cache). Bereits vorhandene Spalten werden übersprungen.
+
+    Args:
+        engine: SQLAlchemy Engine der Datenbank
+
+    Returns:
+        Statistik {added: [Spaltennamen]}
+    """
+    additions = [
+        ("cache_hit", "BOOLEAN DEFAULT 0"),
+        ("saved_cost_usd", "FLOAT DEFAULT 0"),
+    ]
+    inspector = inspect(engine)
+    if "api_call_costs" not in inspector.get_table_names():
+        return {"added": []}
+
+    columns = {column["name"] for column in inspector.get_columns("api_call_costs")}
+    added = []
+    with engine.begin() as connection:
+        for name, ddl in additions:
+            if name not in columns:
+                connection.execute(text(f"ALTER TABLE api_call_costs ADD COLUMN {name} {ddl}"))
+                added.append(name)
+    return {"added": added}
+
+
+def add_active_job_indexes(engine: Engine) -> dict[str, Any]:
+    """
+    Legt die partiellen Unique-Indexe auf aktive scan_jobs an (höchstens ein
+    aktiver Job pro Scan bzw. Sweep pro Industry). Bereits doppelt aktive Jobs
+    werden vorher bis auf den ältesten als fehlgeschlagen markiert.
+
+    Args:
+        engine: SQLAlchemy Engine der Datenbank
+
+    Returns:
+        Statistik {created: [Indexnamen], failed_duplicates: n}
+    """
+    if "scan_jobs" not in inspect(engine).get_table_names():
+        return {"created": [], "failed_duplicates": 0}
+
+    existing = {index["name"] for index in inspect(engine).get_indexes("scan_jobs")}
+    missing = sorted(
+        (index for index in ScanJob.__table__.indexes if index.unique and index.name not in existing),
+        key=lambda index: index.name,
+    )
+    if not missing:
+        return {"created": [], "failed_duplicates": 0}
+
+    with engine.begin() as connection:
+        active = connection.execute(text(
+            "SELECT id, kind, scan_id, industry_id FROM scan_jobs "
+            "WHERE status IN ('queued', 'running') "
+            "ORDER BY CASE WHEN status = 'running' THEN 0 ELSE 1 END, created_at"
+        )).all()
+        seen: set[tuple[str, str]] = set()
+        duplicates = []
+        for job_id, kind, scan_id, industry_id in active:
+            key = ("scan", scan_id) if scan_id else (kind, industry_id)
+            if key in seen:
+                duplicates.append(job_id)
+            seen.add(key)
+        if duplicates:
+            connection.execute(
+                text(
+                    "UPDATE scan_jobs SET status = 'failed', "
+                    "error_message = 'Doppelter aktiver Job (Migration)' WHERE id IN :ids"
+                ).bindparams(bindparam("ids", expanding=True)),
+                {"ids": duplicates},
+            )
+        for index in missing:
+            index.create(connection)
+
+    return {"created": [index.name for index in missing], "failed_duplicates": len(duplicates)}
+
+
+def drop_report_html(engine: Engine, archive_path: str | None = None, vacuum: bool = True) -> dict[str, Any]:
+    """
+    Entfernt die Spalte scans.report_html — HTML-Reports werden inzwischen
+    bei Bedarf aus den Scan-Daten gerendert.
+
+    Args:
+        engine: SQLAlchemy Engine der Datenbank
+        archive_path: Optional: gespeicherte Reports vorher als gzip-JSONL
+            ({"scan_id", "report_html"} pro Zeile) sichern
+        vacuum: Datei danach verkleinern (nur SQLite)
+
+    Returns:
+        Statistik {dropped, archived}
+    """
+    columns = {column["name"] for column in inspect(engine).get_columns("scans")}
+    if "report_html" not in columns:
+        return {"dropped": False, "archived": 0}
+
+    archived = 0
+    with engine.begin() as connection:
+        if archive_path is not None:
+            Path(archive_path).parent.mkdir(parents=True, exist_ok=True)
+            rows = connection.execute(
+                text("SELECT id, report_html FROM scans WHERE report_html IS NOT NULL")
+            )
+            with gzip.open(archive_path, "wt", encoding="utf-8") as archive:
+                for scan_id, report_html in rows:
+                    archive.write(json.dumps({"scan_id": scan_id, "report_html": report_html}) + "\n")
+                    archived += 1
+        connection.execute(text("ALTER TABLE scans DROP COLUMN report_html"))
+
+    if vacuum and engine.dialect.name == "sqlite":
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            connection.execute(text("VACUUM"))
+
+    return {"dropped": True, "archived": archived}
+
+
+def migrate_query_results(engine: Engine, batch_size: int = 200, vacuum: bool = True) -> dict[str, Any]:
+    """
+    Überführt die JSON-Spalte scans.query_results in die Tabelle scan_results
+    (eine Zeile pro Query-Ergebnis) und entfernt die Spalte.
+
+    Scans, für die bereits Zeilen existieren, werden übersprungen — ein
+    abgebrochener Lauf kann erneut gestartet werden.
+
+    Args:
+        engine: SQLAlchemy Engine der Datenbank
+        batch_size: Scans pro Commit
+        vacuum: Datei danach verkleinern (nur SQLite)
+
+    Returns:
+        Statistik {migrated, scans, results}
+    """
+    columns = {column["name"] for column in inspect(engine).get_columns("scans")}
+    if "query_results" not in columns:
+        return {"migrated": False, "scans": 0, "results": 0}
+
+    TextBlob.__table__.create(engine, checkfirst=True)
+    ScanResult.__table__.create(engine, checkfirst=True)
+
+    stats = {"migrated": True, "scans": 0, "results": 0}
+    with Session(engine) as session:
+        store = TextStore(session)
+        done = {scan_id for (scan_id,) in session.query(ScanResult.scan_id).distinct()}
+        scan_ids = [
+            scan_id for (scan_id,) in session.execute(text("SELECT id FROM scans WHERE query_results IS NOT NULL"))
+            if scan_id not in done
+        ]
+        for offset in range(0, len(scan_ids), batch_size):
+            batch = scan_ids[offset:offset + batch_size]
+            rows = session.execute(
+                text("SELECT id, query_results FROM scans WHERE id IN :ids").bindparams(
+                    bindparam("ids", expanding=True)
+                ),
+                {"ids": batch},
+            )
+            for scan_id, query_results in rows:
+                if isinstance(query_results, str):
+                    query_results = json.loads(query_results)
+                for index, result in enumerate(query_results or []):
+                    row = ScanResult.from_result(
+                        index, result, response_hash=store.put(result.get("response_text", ""))
+                    )
+                    row.scan_id = scan_id
+                    session.add(row)
+                    stats["results"] += 1
+                stats["scans"] += 1
+            session.commit()
+
+    with engine.begin() as connection:
+        connection.execute(text("ALTER TABLE scans DROP COLUMN query_results"))
+
+    if vacuum and engine.dialect.name == "sqlite":
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            connection.execute(text("VACUUM"))
+
+    return stats
+
+
+def migrate_texts_to_store(engine: Engine, batch_size: int = 1000, vacuum: bool = True) -> dict[str, Any]:
+    """
+    Verschiebt scan_results.response_text und api_call_costs.query in den
+    inhaltsadressierten Text-Store (text_blobs) und ersetzt die Spalten durch
+    response_hash bzw. query_hash.
+
+    Args:
+        engine: SQLAlchemy Engine der Datenbank
+        batch_size: Zeilen pro Commit
+        vacuum: Datei danach verkleinern (nur SQLite)
+
+    Returns:
+        Statistik {migrated, rows, texts}
+    """
+    moves = [
+        # (Tabelle, alte Text-Spalte, neue Hash-Spalte)
+        ("scan_results", "response_text", "response_hash"),
+        ("api_call_costs", "query", "query_hash"),
+    ]
+    inspector = inspect(engine)
+    tables = set(inspector.get_table_names())
+    pending = [
+        move for move in moves
+        if move[0] in tables and move[1] in {c["name"] for c in inspector.get_columns(move[0])}
+    ]
+    if not pending:
+        return {"migrated": False, "rows": 0, "texts": 0}
+
+    TextBlob.__table__.create(engine, checkfirst=True)
+
+    stats = {"migrated": True, "rows": 0, "texts": 0}
+    for table, text_column, hash_column in pending:
+        with engine.begin() as connection:
+            if hash_column not in {c["name"] for c in inspect(connection).get_columns(table)}:
+                connection.execute(text(f"ALTER TABLE {table} ADD COLUMN {hash_column} VARCHAR"))
+
+        with Session(engine) as session:
+            store = TextStore(session)
+            while True:
+                rows = session.execute(
+                    text(f"SELECT id, {text_column} FROM {table} WHERE {hash_column} IS NULL LIMIT :limit"),
+                    {"limit": batch_size},
+                ).all()
+                if not rows:
+                    break
+                for row_id, value in rows:
+                    session.execute(
+                        text(f"UPDATE {table} SET {hash_column} = :hash WHERE id = :id"),
+                        {"hash": store.put(value or ""), "id": row_id},
+                    )
+                stats["rows"] += len(rows)
+                session.commit()
+
+        with engine.begin() as connection:
+            connection.execute(text(f"ALTER TABLE {table} DROP COLUMN {text_column}"))
+
+    with Session(engine) as session:
+        prune_unreferenced(session)
+        session.commit()
+        stats["texts"] = session.query(TextBlob).count()
+
+    if vacuum and engine.dialect.name == "sqlite":
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            connection.execute(text("VACUUM"))
+
+    return stats
@@ -1,6 +1,8 @@
+import hashlib
+import zlib
 from datetime import datetime, timezone
 from uuid import uuid4
-from sqlalchemy import String, Text, Float, Integer, Boolean, DateTime, JSON, ForeignKey, Index
+from sqlalchemy import String, Text, Float, Integer, Boolean, DateTime, JSON, ForeignKey, Index, LargeBinary, text
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
@@ -33,6 +35,10 @@ class Company(Base):
     )
 
 
+# Deferred-Gruppe der großen Scan-Spalten
+SCAN_DETAILS = "scan_details"
+
+
 class Scan(Base):
     __tablename__ = "scans"
 
@@ -42,10 +48,11 @@ class Scan(Base):
     status: Mapped[str] = mapped_column(String, default="pending")
     overall_score: Mapped[float | None] = mapped_column(Float, nullable=True)
     platform_scores: Mapped[dict] = mapped_column(JSON, default=dict)
-    query_results: Mapped[list] = mapped_column(JSON, default=list)
-    analysis: Mapped[dict] = mapped_column(JSON, default=dict)
-    recommendations: Mapped[list] = mapped_column(JSON, default=list)
-    report_html: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Große JSON-Spalten (Analyse, Recommendations) werden nur auf Anfrage geladen:
+    # .options(undefer_group(SCAN_DETAILS)) dort, wo sie gebraucht werden.
+    # Die einzelnen Query-Ergebnisse liegen in scan_results (Scan.results).
+    analysis: Mapped[dict] = mapped_column(JSON, default=dict, deferred=True, deferred_group=SCAN_DETAILS)
+    recommendations: Mapped[list] = mapped_column(JSON, default=list, deferred=True, deferred_group=SCAN_DETAILS)
     error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
     started_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
     completed_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
@@ -55,6 +62,12 @@ class Scan(Base):
     query_version: Mapped[str | None] = mapped_column(String, nullable=True)
 
     company: Mapped["Company"] = relationship("Company", back_populates="scans")
+    results: Mapped[list["ScanResult"]] = relationship(
+        "ScanResult",
+        back_populates="scan",
+        order_by="ScanResult.result_index",
+        cascade="all, delete-orphan"
+    )
 
     __table_args__ = (
         Index("ix_scans_company_id", "company_id"),
@@ -62,6 +75,140 @@ class Scan(Base):
     )
 
 
+# Texte ab dieser Größe (Bytes) werden komprimiert; darunter lohnt zlib nicht
+TEXT_COMPRESS_MIN_BYTES = 128
+
+
+class TextBlob(Base):
+    """
+    Inhaltsadressierter Text (LLM-Antworten, Queries), Schlüssel = SHA-256.
+    Gleiche Texte werden nur einmal gespeichert (siehe services/text_store.py).
+    """
+    __tablename__ = "text_blobs"
+
+    hash: Mapped[str] = mapped_column(String, primary_key=True)
+    # "zlib" oder "raw" (UTF-8 unkomprimiert)
+    codec: Mapped[str] = mapped_column(String, nullable=False)
+    # Länge des unkomprimierten UTF-8-Texts in Bytes
+    size: Mapped[int] = mapped_column(Integer, nullable=False)
+    data: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(timezone.utc))
+
+    @staticmethod
+    def hash_for(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def from_text(cls, text: str, level: int = 6) -> "TextBlob":
+        """Erstellt den Blob eines Texts (komprimiert, wenn es sich lohnt)."""
+        raw = text.encode("utf-8")
+        codec, data = "raw", raw
+        if len(raw) >= TEXT_COMPRESS_MIN_BYTES:
+            compressed = zlib.compress(raw, level)
+            if len(compressed) < len(raw):
+                codec, data = "zlib", compressed
+        return cls(hash=hashlib.sha256(raw).hexdigest(), codec=codec, size=len(raw), data=data)
+
+    @property
+    def text(self) -> str:
+        raw = zlib.decompress(self.data) if self.codec == "zlib" else self.data
+        return raw.decode("utf-8")
+
+
+class ScanResult(Base):
+    """Ein (Query, Plattform)-Ergebnis eines Scans mit seiner Analyse."""
+    __tablename__ = "scan_results"
+
+    id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid4()))
+    scan_id: Mapped[str] = mapped_column(String, ForeignKey("scans.id"), nullable=False)
+    # Position in der ursprünglichen Query-Reihenfolge des Scans
+    result_index: Mapped[int] = mapped_column(Integer, nullable=False)
+    # Stabile ID der Query (Hash des Query-Texts), gleich über alle Scans
+    query_id: Mapped[str] = mapped_column(String, nullable=False)
+    query: Mapped[str] = mapped_column(Text, nullable=False)
+    category: Mapped[str] = mapped_column(String, nullable=False, default="general")
+    intent: Mapped[str] = mapped_column(String, default="")
+    platform: Mapped[str] = mapped_column(String, nullable=False)
+    model: Mapped[str] = mapped_column(String, nullable=False)
+    mentioned: Mapped[bool] = mapped_column(Boolean, default=False)
+    mention_type: Mapped[str] = mapped_column(String, default="not_mentioned")
+    mention_count: Mapped[int] = mapped_column(Integer, default=0)
+    position: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    section: Mapped[str | None] = mapped_column(String, nullable=True)
+    context: Mapped[str] = mapped_column(Text, default="")
+    sentiment: Mapped[str] = mapped_column(String, default="neutral")
+    competitors_mentioned: Mapped[list] = mapped_column(JSON, default=list)
+    competitor_positions: Mapped[dict] = mapped_column(JSON, default=dict)
+    analyzer_version: Mapped[str | None] = mapped_column(String, nullable=True)
+    # Antworttext im Text-Store; laden mit .options(selectinload(ScanResult.response_blob))
+    response_hash: Mapped[str | None] = mapped_column(String, ForeignKey("text_blobs.hash"), nullable=True)
+
+    scan: Mapped["Scan"] = relationship("Scan", back_populates="results")
+    response_blob: Mapped["TextBlob | None"] = relationship("TextBlob", viewonly=True)
+
+    __table_args__ = (
+        Index("ix_scan_results_scan_id", "scan_id", "result_index"),
+        Index("ix_scan_results_platform", "platform"),
+        Index("ix_scan_results_category", "category"),
+    )
+
+    # Analyse-Felder (Analyzer.analyze_response), die als Spalten gespeichert werden
+    ANALYSIS_FIELDS = (
+        "mentioned", "mention_type", "mention_count", "position", "section", "context",
+        "sentiment", "competitors_mentioned", "competitor_positions", "analyzer_version",
+    )
+
+    @staticmethod
+    def query_id_for(query: str) -> str:
+        return hashlib.sha256(query.encode("utf-8")).hexdigest()[:16]
+
+    @property
+    def response_text(self) -> str:
+        return self.response_blob.text if self.response_blob is not None else ""
+
+    @classmethod
+    def from_result(cls, result_index: int, result: dict, response_hash: str | None = None) -> "ScanResult":
+        """
+        Erstellt eine Zeile aus einem Ergebnis-Dict (Query, Plattform-Antwort, Analyse).
+        Der Antworttext wird nur referenziert: response_hash = TextStore.put(response_text).
+        """
+        query = result.get("query", "")
+        return cls(
+            result_index=result_index,
+            query_id=cls.query_id_for(query),
+            query=query,
+            category=result.get("category", "general"),
+            intent=result.get("intent", ""),
+            platform=result.get("platform", "unknown"),
+            model=result.get("model", "unknown"),
+            response_hash=response_hash,
+            **{field: result[field] for field in cls.ANALYSIS_FIELDS if field in result},
+        )
+
+    def apply_analysis(self, analysis_result: dict) -> None:
+        """Übernimmt eine neue Analyse der gespeicherten Antwort."""
+        for field in self.ANALYSIS_FIELDS:
+            if field in analysis_result:
+                setattr(self, field, analysis_result[field])
+
+    def to_dict(self, include_response: bool = False) -> dict:
+        """
+        Ergebnis im Format von Analyzer/Scorer/ReportGenerator.
+        Der Antworttext ist nur mit include_response enthalten (lädt response_blob nach).
+        """
+        result = {
+            "query": self.query,
+            "category": self.category,
+            "intent": self.intent,
+            "platform": self.platform,
+            "model": self.model,
+            **{field: getattr(self, field) for field in self.ANALYSIS_FIELDS},
+        }
+        if include_response:
+            result["response_text"] = self.response_text
+        return result
+
+
 class ApiCallCost(Base):
     __tablename__ = "api_call_costs"
 
@@ -69,16 +216,20 @@ class ApiCallCost(Base):
     scan_id: Mapped[str] = mapped_column(String, ForeignKey("scans.id"), nullable=False)
     platform: Mapped[str] = mapped_column(String, nullable=False)
     model: Mapped[str] = mapped_column(String, nullable=False)
-    query: Mapped[str] = mapped_column(Text, nullable=False)
+    # Query-Text im Text-Store (TextStore.put)
+    query_hash: Mapped[str] = mapped_column(String, ForeignKey("text_blobs.hash"), nullable=False)
     input_tokens: Mapped[int] = mapped_column(Integer, default=0)
     output_tokens: Mapped[int] = mapped_column(Integer, default=0)
     total_tokens: Mapped[int] = mapped_column(Integer, default=0)
     cost_usd: Mapped[float] = mapped_column(Float, default=0.0)
     latency_ms: Mapped[int] = mapped_column(Integer, default=0)
     success: Mapped[bool] = mapped_column(Boolean, default=True)
+    cache_hit: Mapped[bool] = mapped_column(Boolean, default=False)
+    saved_cost_usd: Mapped[float] = mapped_column(Float, default=0.0)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(timezone.utc))
 
     scan: Mapped["Scan"] = relationship("Scan", backref="api_costs")
+    query_blob: Mapped["TextBlob"] = relationship("TextBlob", viewonly=True)
 
     __table_args__ = (
         Index("ix_api_call_costs_scan_id", "scan_id"),
@@ -86,6 +237,107 @@ class ApiCallCost(Base):
         Index("ix_api_call_costs_created_at", "created_at"),
     )
 
+    @property
+    def query(self) -> str:
+        return self.query_blob.text if self.query_blob is not None else ""
+
+
+class LLMResponseCache(Base):
+    __tablename__ = "llm_response_cache"
+
+    cache_key: Mapped[str] = mapped_column(String, primary_key=True)
+    platform: Mapped[str] = mapped_column(String, nullable=False)
+    model: Mapped[str] = mapped_column(String, nullable=False)
+    query: Mapped[str] = mapped_column(Text, nullable=False)
+    category: Mapped[str | None] = mapped_column(String, nullable=True)
+    response_text: Mapped[str] = mapped_column(Text, nullable=False)
+    input_tokens: Mapped[int] = mapped_column(Integer, default=0)
+    output_tokens: Mapped[int] = mapped_column(Integer, default=0)
+    total_tokens: Mapped[int] = mapped_column(Integer, default=0)
+    hit_count: Mapped[int] = mapped_column(Integer, default=0)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(timezone.utc))
+    last_accessed_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(timezone.utc))
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index("ix_llm_response_cache_expires_at", "expires_at"),
+        Index("ix_llm_response_cache_last_accessed_at", "last_accessed_at"),
+    )
+
+
+# Aktive Jobs (JobQueue.ACTIVE_STATUSES) für die partiellen Unique-Indexe
+ACTIVE_JOB_CONDITION = "status IN ('queued', 'running')"
+
+
+class ScanJob(Base):
+    __tablename__ = "scan_jobs"
+
+    id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid4()))
+    # "scan" (ein Scan) oder "sweep" (alle Companies einer Industry)
+    kind: Mapped[str] = mapped_column(String, nullable=False, default="scan")
+    scan_id: Mapped[str | None] = mapped_column(String, ForeignKey("scans.id"), nullable=True)
+    industry_id: Mapped[str | None] = mapped_column(String, nullable=True)
+    batch: Mapped[bool] = mapped_column(Boolean, default=False)
+    status: Mapped[str] = mapped_column(String, default="queued")
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    worker_id: Mapped[str | None] = mapped_column(String, nullable=True)
+    result: Mapped[dict] = mapped_column(JSON, default=dict)
+    error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(timezone.utc))
+    started_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    heartbeat_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("ix_scan_jobs_status_created_at", "status", "created_at"),
+        Index("ix_scan_jobs_scan_id", "scan_id"),
+        # Höchstens ein aktiver Job pro Scan bzw. Sweep pro Industry — macht das
+        # idempotente Einreihen (JobQueue.enqueue_*) auch bei parallelen Requests sicher
+        Index(
+            "ux_scan_jobs_active_scan", "scan_id", unique=True,
+            sqlite_where=text(ACTIVE_JOB_CONDITION), postgresql_where=text(ACTIVE_JOB_CONDITION),
+        ),
+        Index(
+            "ux_scan_jobs_active_sweep", "industry_id", unique=True,
+            sqlite_where=text(f"kind = 'sweep' AND {ACTIVE_JOB_CONDITION}"),
+            postgresql_where=text(f"kind = 'sweep' AND {ACTIVE_JOB_CONDITION}"),
+        ),
+    )
+
+
+class RankingSnapshot(Base):
+    """Materialisiertes Ranking: maßgeblicher Scan pro Company, aktualisiert bei Scan-Abschluss."""
+    __tablename__ = "ranking_snapshot"
+
+    company_id: Mapped[str] = mapped_column(String, ForeignKey("companies.id"), primary_key=True)
+    industry_id: Mapped[str] = mapped_column(String, nullable=False)
+    scan_id: Mapped[str] = mapped_column(String, ForeignKey("scans.id"), nullable=False)
+    company_name: Mapped[str] = mapped_column(String, nullable=False)
+    domain: Mapped[str] = mapped_column(String, nullable=False)
+    overall_score: Mapped[float] = mapped_column(Float, nullable=False)
+    platform_scores: Mapped[dict] = mapped_column(JSON, default=dict)
+    query_version: Mapped[str | None] = mapped_column(String, nullable=True)
+    # Die bei der Auswahl bevorzugte (häufigste) query_version der Industry
+    ranking_version: Mapped[str | None] = mapped_column(String, nullable=True)
+    completed_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(timezone.utc))
+
+    __table_args__ = (
+        Index("ix_ranking_snapshot_industry_score", "industry_id", "overall_score"),
+    )
+
+
+class IndustryStats(Base):
+    """Rollup pro Industry für die Übersicht, aktualisiert bei Scan-Abschluss und Company-Änderungen."""
+    __tablename__ = "industry_stats"
+
+    industry_id: Mapped[str] = mapped_column(String, primary_key=True)
+    total_companies: Mapped[int] = mapped_column(Integer, default=0)
+    # Companies mit Eintrag im ranking_snapshot (neuester completed Scan)
+    scored_companies: Mapped[int] = mapped_column(Integer, default=0)
+    avg_score: Mapped[float | None] = mapped_column(Float, nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(timezone.utc))
+
 
 class CostBudget(Base):
     __tablename__ = "cost_budgets"
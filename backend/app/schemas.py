@@ -37,6 +37,14 @@ class ScanCreate(BaseModel):
     industry_id: str
 
 
+class ScanResultsSummary(BaseModel):
+    """Kennzahlen der Query-Ergebnisse; die Ergebnisse selbst liefert /scans/{id}/results."""
+    total: int = 0
+    mentioned: int = 0
+    platforms: dict[str, int] = {}
+    categories: dict[str, int] = {}
+
+
 class ScanResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -45,7 +53,7 @@ class ScanResponse(BaseModel):
     status: str
     overall_score: float | None = None
     platform_scores: dict = {}
-    query_results: list = []
+    results_summary: ScanResultsSummary = ScanResultsSummary()
     analysis: dict = {}
     competitors: list[dict] = []
     recommendations: list = []
@@ -53,6 +61,54 @@ class ScanResponse(BaseModel):
     completed_at: datetime | None = None
 
 
+class ScanResultResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    result_index: int
+    query_id: str
+    query: str
+    category: str
+    intent: str = ""
+    platform: str
+    model: str
+    mentioned: bool = False
+    mention_type: str = "not_mentioned"
+    mention_count: int = 0
+    position: int | None = None
+    section: str | None = None
+    context: str = ""
+    sentiment: str = "neutral"
+    competitors_mentioned: list[str] = []
+    competitor_positions: dict = {}
+    response_text: str | None = None
+
+
+class ScanResultPage(BaseModel):
+    scan_id: str
+    total: int
+    limit: int
+    offset: int
+    items: list[ScanResultResponse]
+
+
+class JobResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    kind: str
+    scan_id: str | None = None
+    industry_id: str | None = None
+    batch: bool = False
+    status: str
+    attempts: int = 0
+    result: dict = {}
+    error_message: str | None = None
+    created_at: datetime | None = None
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+
+
 class RankingEntry(BaseModel):
     rank: int
     company_name: str
@@ -71,6 +127,33 @@ class RankingResponse(BaseModel):
     last_updated: datetime | None = None
 
 
+class WhatIfRequest(BaseModel):
+    """Alternative Gewichte; nicht angegebene Werte kommen aus der Industry Config."""
+    mention_types: dict[str, float] | None = None
+    platform_weights: dict[str, float] | None = None
+    limit: int = 50
+
+
+class WhatIfEntry(BaseModel):
+    rank: int
+    baseline_rank: int
+    company_name: str
+    domain: str
+    overall_score: float
+    baseline_score: float
+    platform_scores: dict
+    category_scores: dict
+    scan_id: str
+
+
+class WhatIfResponse(BaseModel):
+    industry_id: str
+    total_companies: int
+    mention_types: dict[str, float]
+    platform_weights: dict[str, float]
+    entries: list[WhatIfEntry]
+
+
 class ReportResponse(BaseModel):
     company: CompanyResponse
     scan: ScanResponse
@@ -119,6 +202,8 @@ class ApiCallCostResponse(BaseModel):
     cost_usd: float
     latency_ms: int
     success: bool
+    cache_hit: bool = False
+    saved_cost_usd: float = 0.0
     created_at: datetime
 
 
@@ -130,6 +215,8 @@ class CostSummary(BaseModel):
     avg_cost_per_scan: float
     platform_breakdown: dict[str, float]
     daily_costs: list[dict[str, str | float]]
+    cache_hits: int = 0
+    cache_savings_usd: float = 0.0
 
 
 class ScanCostDetail(BaseModel):
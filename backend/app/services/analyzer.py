@@ -1,17 +1,70 @@
-import re
+import hashlib
+import json
 from typing import Any
 from collections import defaultdict
 
+from app.services.mention_matcher import (
+    DEFAULT_COMPETITORS,
+    MentionMatcher,
+    clean_domain,
+)
+from app.services.lexicon import (
+    NEGATIVE_SENTIMENT,
+    POSITIVE_MENTION,
+    POSITIVE_SENTIMENT,
+    RECOMMENDATION,
+    CompiledLexicon,
+    lexicon_categories,
+)
+from app.services.response_parser import ResponseStructure, parse_response
+
+# Bei Änderungen an den Analyse-Regeln erhöhen — gespeicherte Ergebnisse
+# mit älterer Version werden von cli.reanalyze neu berechnet
+ANALYZER_VERSION = "2026-10-v1"
+
+# Bei gleicher Position gewinnt der Name vor Domain und Variante
+MENTION_KIND_PRIORITY = {"name": 0, "domain": 1, "variant": 2}
+
+
+def analyzer_version(known_competitors: list[str], lexicons: dict[str, list[str]]) -> str:
+    """
+    Version einer Analyse: Regel-Version plus Hash über Wettbewerber und Lexika.
+
+    Args:
+        known_competitors: Bekannte Wettbewerber der Industry
+        lexicons: Schlagwörter pro Kategorie
+
+    Returns:
+        Versions-String (z.B. "2026-10-v1:3f2a…")
+    """
+    payload = json.dumps([known_competitors, lexicons], sort_keys=True, ensure_ascii=False)
+    return f"{ANALYZER_VERSION}:{hashlib.sha256(payload.encode('utf-8')).hexdigest()[:12]}"
+
 
 class Analyzer:
     """Analysiert LLM-Antworten auf Firmen-Erwähnungen und Kontext."""
 
-    def __init__(self, known_competitors: list[str] | None = None):
+    def __init__(
+        self,
+        known_competitors: list[str] | None = None,
+        matcher: MentionMatcher | None = None,
+        lexicons: dict[str, list[str]] | None = None
+    ):
         """
         Args:
             known_competitors: Liste bekannter Wettbewerber aus Industry Config.
+            matcher: Vorgebauter Industry-Matcher (siehe get_industry_matcher).
+                Firmen, die er nicht kennt, bekommen einen eigenen Matcher.
+            lexicons: Schlagwörter pro Kategorie (siehe lexicon_categories),
+                Default: eingebaute deutsche + englische Listen.
         """
         self._known_competitors = known_competitors or []
+        lexicons = lexicons or lexicon_categories(None)
+        self._lexicon = CompiledLexicon(lexicons)
+        self.version = analyzer_version(self._known_competitors, lexicons)
+        self._matcher = matcher
+        self._company_matchers: dict[tuple[str, str], MentionMatcher] = {}
+        self._last_structure: tuple[str, ResponseStructure] | None = None
 
     def analyze_response(
         self,
@@ -35,10 +88,14 @@ class Analyzer:
             Dictionary mit Analyse-Ergebnissen
         """
         # Bereinige Domain (ohne www./https://)
-        clean_domain = company_domain.replace("www.", "").replace("https://", "").replace("http://", "")
+        domain = clean_domain(company_domain)
+
+        # Ein Durchlauf über die Antwort liefert Firmen- und Wettbewerber-Treffer
+        matcher = self._matcher_for(company_name, domain)
+        hits = matcher.find(response_text)
 
         # Suche nach Erwähnungen
-        mentions = self._find_mentions(company_name, clean_domain, response_text)
+        mentions = self._find_mentions(company_name, response_text, hits)
 
         if not mentions:
             return {
@@ -46,90 +103,103 @@ class Analyzer:
                 "mention_type": "not_mentioned",
                 "mention_count": 0,
                 "position": None,
+                "section": None,
                 "context": "",
                 "sentiment": "neutral",
                 "competitors_mentioned": [],
+                "competitor_positions": {},
+                "analyzer_version": self.version,
             }
 
+        # Listen-Ränge aller Entitäten aus denselben Treffern
+        structure = self._parse_structure(response_text)
+        company_hits = [hit for hit in hits if hit["entity"] == company_name and hit["kind"] in MENTION_KIND_PRIORITY]
+        company_position = structure.entity_positions(company_hits).get(company_name, {})
+        competitor_ranks = structure.entity_positions(hit for hit in hits if hit["kind"] == "competitor")
+
         # Analysiere erste/beste Erwähnung
         best_mention = mentions[0]
+        position = company_position.get("rank")
 
-        mention_type = self._determine_mention_type(best_mention["context"], response_text)
-        position = self._extract_position(best_mention["context"], response_text)
-        sentiment = self._analyze_sentiment(best_mention["context"])
-        competitors = self._extract_competitors(response_text, company_name)
+        keywords = self._lexicon.categories_in(best_mention["context"])
+        mention_type = self._determine_mention_type(keywords, position)
+        sentiment = self._analyze_sentiment(keywords)
+        competitors = self._extract_competitors(matcher, hits, company_name)
 
         return {
             "mentioned": True,
             "mention_type": mention_type,
             "mention_count": len(mentions),
             "position": position,
+            "section": company_position.get("section"),
             "context": best_mention["context"][:400],  # Limit context length
             "sentiment": sentiment,
             "competitors_mentioned": competitors,
+            "competitor_positions": {
+                competitor: competitor_ranks[competitor]["rank"] for competitor in competitors
+            },
+            "analyzer_version": self.version,
         }
 
+    def _parse_structure(self, response_text: str) -> ResponseStructure:
+        """Parst die Listen-Struktur; im Sweep wird dieselbe Antwort mehrfach analysiert."""
+        if self._last_structure is not None and self._last_structure[0] == response_text:
+            return self._last_structure[1]
+        structure = parse_response(response_text)
+        self._last_structure = (response_text, structure)
+        return structure
+
+    def _matcher_for(self, company_name: str, clean_domain: str) -> MentionMatcher:
+        """
+        Liefert den Matcher für eine Firma: den geteilten Industry-Matcher,
+        falls er die Firma kennt, sonst einen eigenen (pro Analyzer gecacht).
+        """
+        if self._matcher is not None and self._matcher.companies.get(company_name) == clean_domain:
+            return self._matcher
+
+        key = (company_name, clean_domain)
+        matcher = self._company_matchers.get(key)
+        if matcher is None:
+            matcher = MentionMatcher(
+                companies=[key],
+                competitors=self._known_competitors or DEFAULT_COMPETITORS,
+            )
+            self._company_matchers[key] = matcher
+        return matcher
+
     def _find_mentions(
         self,
         company_name: str,
-        clean_domain: str,
-        response_text: str
+        response_text: str,
+        hits: list[dict[str, Any]]
     ) -> list[dict[str, Any]]:
         """
-        Findet alle Erwähnungen der Firma im Text.
+        Findet alle Erwähnungen der Firma (Name, Domain, Varianten) im Text.
 
         Args:
             company_name: Firmenname
-            clean_domain: Bereinigte Domain
-            response_text: Zu durchsuchender Text
+            response_text: Durchsuchter Text (für den Kontext)
+            hits: Treffer des Matchers für response_text
 
         Returns:
             Liste von Mention-Dictionaries mit position und context
         """
-        mentions = []
-
-        # Suche nach Firmenname (case-insensitive)
-        name_pattern = re.compile(re.escape(company_name), re.IGNORECASE)
-        for match in name_pattern.finditer(response_text):
-            start = match.start()
-            context = self._extract_context(response_text, start)
-            mentions.append({
-                "position": start,
-                "type": "name",
-                "context": context
-            })
-
-        # Suche nach Domain
-        domain_pattern = re.compile(re.escape(clean_domain), re.IGNORECASE)
-        for match in domain_pattern.finditer(response_text):
-            start = match.start()
-            context = self._extract_context(response_text, start)
-            mentions.append({
-                "position": start,
-                "type": "domain",
-                "context": context
-            })
-
-        # Suche nach Varianten (z.B. "Crowd Strike" für "CrowdStrike")
-        name_variants = self._generate_name_variants(company_name)
-        for variant in name_variants:
-            variant_pattern = re.compile(re.escape(variant), re.IGNORECASE)
-            for match in variant_pattern.finditer(response_text):
-                start = match.start()
-                context = self._extract_context(response_text, start)
-                mentions.append({
-                    "position": start,
-                    "type": "variant",
-                    "context": context
-                })
+        hits = [
+            hit for hit in hits
+            if hit["entity"] == company_name and hit["kind"] in MENTION_KIND_PRIORITY
+        ]
 
         # Sortiere nach Position, entferne Duplikate (gleiche Position)
         seen_positions = set()
         unique_mentions = []
-        for mention in sorted(mentions, key=lambda x: x["position"]):
-            if mention["position"] not in seen_positions:
-                unique_mentions.append(mention)
-                seen_positions.add(mention["position"])
+        for hit in sorted(hits, key=lambda x: (x["start"], MENTION_KIND_PRIORITY[x["kind"]])):
+            if hit["start"] not in seen_positions:
+                unique_mentions.append({
+                    "position": hit["start"],
+                    "type": hit["kind"],
+                    "context": self._extract_context(response_text, hit["start"]),
+                })
+                seen_positions.add(hit["start"])
 
         return unique_mentions
 
@@ -158,179 +228,70 @@ class Analyzer:
 
         return context.strip()
 
-    def _generate_name_variants(self, company_name: str) -> list[str]:
+    def _determine_mention_type(self, keywords: set[str], position: int | None) -> str:
         """
-        Generiert Varianten des Firmennamens.
+        Bestimmt den Typ der Erwähnung basierend auf Kontext und Listen-Rang.
 
         Args:
-            company_name: Ursprünglicher Firmenname
-
-        Returns:
-            Liste von Namens-Varianten
-        """
-        variants = []
-
-        # CamelCase -> Space-separated (z.B. "CrowdStrike" -> "Crowd Strike")
-        spaced = re.sub(r'([a-z])([A-Z])', r'\1 \2', company_name)
-        if spaced != company_name:
-            variants.append(spaced)
-
-        # Mit/ohne Bindestriche
-        if "-" in company_name:
-            variants.append(company_name.replace("-", " "))
-        elif " " in company_name:
-            variants.append(company_name.replace(" ", "-"))
-
-        return variants
-
-    def _determine_mention_type(self, context: str, full_text: str) -> str:
-        """
-        Bestimmt den Typ der Erwähnung basierend auf Kontext.
-
-        Args:
-            context: Lokaler Kontext um die Erwähnung
-            full_text: Gesamter Response-Text
+            keywords: Im Kontext getroffene Lexikon-Kategorien
+            position: Listen-Rang der Firma (siehe response_parser) oder None
 
         Returns:
             Mention-Type (direct_recommendation, listed_among_top, mentioned_positively, mentioned_neutrally)
         """
-        context_lower = context.lower()
-
-        # Direct recommendation keywords
-        recommendation_keywords = [
-            "empfehle", "empfehlenswert", "empfohlen", "führend", "top", "beste",
-            "hervorragend", "ausgezeichnet", "ideal", "perfekt", "sollten sie",
-            "rate ich", "beste wahl", "first choice", "recommend", "leading"
-        ]
-
-        if any(keyword in context_lower for keyword in recommendation_keywords):
+        if RECOMMENDATION in keywords:
             return "direct_recommendation"
 
-        # Check if in numbered/bulleted list
-        list_patterns = [
-            r'\d+\.\s',  # 1. 2. 3.
-            r'[•\-\*]\s',  # • - *
-            r'\n\s*\d+\)',  # 1) 2) 3)
-        ]
-
-        for pattern in list_patterns:
-            if re.search(pattern, context):
-                # Prüfe ob in Top-3
-                position = self._extract_position(context, full_text)
-                if position and position <= 3:
-                    return "listed_among_top"
-
-        # Positive keywords
-        positive_keywords = [
-            "gut", "sehr gut", "stark", "solide", "zuverlässig", "bewährt",
-            "erfolgreich", "innovativ", "leistungsstark", "effektiv",
-            "good", "great", "strong", "reliable", "effective"
-        ]
+        # In einer Liste unter den Top-3
+        if position and position <= 3:
+            return "listed_among_top"
 
-        if any(keyword in context_lower for keyword in positive_keywords):
+        if POSITIVE_MENTION in keywords:
             return "mentioned_positively"
 
         return "mentioned_neutrally"
 
-    def _extract_position(self, context: str, full_text: str) -> int | None:
-        """
-        Extrahiert Position in Liste (falls vorhanden).
-
-        Args:
-            context: Lokaler Kontext
-            full_text: Gesamter Text
-
-        Returns:
-            Position (1-basiert) oder None
-        """
-        # Suche nach Listennummer im Kontext
-        patterns = [
-            r'(\d+)\.\s',  # 1. 2. 3.
-            r'\n\s*(\d+)\)',  # 1) 2) 3)
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, context)
-            if match:
-                try:
-                    return int(match.group(1))
-                except (ValueError, IndexError):
-                    pass
-
-        # Suche nach "Platz X" oder "Rang X"
-        rank_match = re.search(r'(?:platz|rang|position)\s+(\d+)', context.lower())
-        if rank_match:
-            try:
-                return int(rank_match.group(1))
-            except ValueError:
-                pass
-
-        return None
-
-    def _analyze_sentiment(self, context: str) -> str:
+    def _analyze_sentiment(self, keywords: set[str]) -> str:
         """
         Analysiert Sentiment der Erwähnung.
 
         Args:
-            context: Kontext-String
+            keywords: Im Kontext getroffene Lexikon-Kategorien
 
         Returns:
             Sentiment: positive, neutral, negative
         """
-        context_lower = context.lower()
-
-        # Negative keywords
-        negative_keywords = [
-            "schlecht", "schwach", "mangelhaft", "unzureichend", "problematisch",
-            "kritisch", "negativ", "nachteil", "nicht empfehlenswert",
-            "bad", "poor", "weak", "problematic", "issues", "problems"
-        ]
-
-        if any(keyword in context_lower for keyword in negative_keywords):
+        if NEGATIVE_SENTIMENT in keywords:
             return "negative"
 
-        # Positive keywords
-        positive_keywords = [
-            "empfehle", "gut", "sehr gut", "beste", "führend", "hervorragend",
-            "ausgezeichnet", "stark", "innovativ", "zuverlässig", "erfolgreich",
-            "recommend", "great", "excellent", "best", "leading", "strong"
-        ]
-
-        if any(keyword in context_lower for keyword in positive_keywords):
+        if POSITIVE_SENTIMENT in keywords:
             return "positive"
 
         return "neutral"
 
-    def _extract_competitors(self, response_text: str, company_name: str) -> list[str]:
+    def _extract_competitors(
+        self,
+        matcher: MentionMatcher,
+        hits: list[dict[str, Any]],
+        company_name: str
+    ) -> list[str]:
         """
-        Extrahiert erwähnte Wettbewerber aus der Antwort.
+        Extrahiert erwähnte Wettbewerber aus den Treffern einer Antwort.
 
         Args:
-            response_text: Gesamter Response-Text
+            matcher: Matcher, der die Treffer geliefert hat (Reihenfolge der Wettbewerber)
+            hits: Treffer des Matchers für die Antwort
             company_name: Eigener Firmenname (wird ausgeschlossen)
 
         Returns:
-            Liste erkannter Wettbewerber-Namen
+            Liste erkannter Wettbewerber-Namen (in Reihenfolge der Config)
         """
-        # Bekannte Wettbewerber aus Industry Config (oder Fallback)
-        competitors_list = self._known_competitors or [
-            "CrowdStrike", "Palo Alto Networks", "Fortinet", "Check Point",
-            "Cisco", "SentinelOne", "Trend Micro", "Sophos", "McAfee",
-            "Symantec", "FireEye", "Proofpoint", "Zscaler", "Okta",
-            "Tenable", "Rapid7", "Qualys", "Carbon Black", "Cylance"
-        ]
-
-        mentioned = []
+        found = {hit["entity"] for hit in hits if hit["kind"] == "competitor"}
 
-        for competitor in competitors_list:
-            if competitor.lower() == company_name.lower():
-                continue
-
-            # Case-insensitive Suche
-            if re.search(re.escape(competitor), response_text, re.IGNORECASE):
-                mentioned.append(competitor)
-
-        return mentioned
+        return [
+            competitor for competitor in matcher.competitors
+            if competitor in found and competitor.lower() != company_name.lower()
+        ]
 
     def aggregate_analysis(
         self,
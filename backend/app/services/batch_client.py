@@ -0,0 +1,276 @@
+"""
+Batch Client.
+Asynchrone Batch-APIs der Provider (OpenAI Batch, Anthropic Message Batches)
+für nicht latenzkritische Sweeps — rund halber Preis gegenüber Einzel-Calls.
+"""
+import asyncio
+import json
+import logging
+import time
+from abc import ABC, abstractmethod
+from typing import Any
+
+import httpx
+
+from app.services.provider_clients import ProviderClients
+
+logger = logging.getLogger(__name__)
+
+
+class BatchAPI(ABC):
+    """Gemeinsamer Ablauf: Requests einreichen, pollen bis fertig, Ergebnisse einsammeln."""
+
+    platform = ""
+
+    def __init__(self, http: httpx.AsyncClient, max_output_tokens: int = 1000):
+        """
+        Args:
+            http: HTTP-Client mit Base-URL und Auth-Headern des Providers
+            max_output_tokens: Maximale Antwortlänge pro Request
+        """
+        self.http = http
+        self.max_output_tokens = max_output_tokens
+
+    async def run(
+        self,
+        requests: list[dict[str, str]],
+        poll_interval_s: float = 60.0,
+        max_wait_s: float = 24 * 3600.0
+    ) -> dict[str, dict[str, Any]]:
+        """
+        Führt einen kompletten Batch aus.
+
+        Args:
+            requests: Liste von {custom_id, model, system_prompt, query}
+            poll_interval_s: Abstand zwischen Status-Abfragen
+            max_wait_s: Maximale Wartezeit, danach wird der Batch abgebrochen
+
+        Returns:
+            Dict custom_id -> {response_text, success, error, input_tokens, output_tokens, total_tokens}
+        """
+        batch_id = await self.submit(requests)
+        logger.info(f"{self.platform}: Batch {batch_id} mit {len(requests)} Requests eingereicht")
+
+        deadline = time.monotonic() + max_wait_s
+        batch = await self.status(batch_id)
+        while not self.is_done(batch):
+            if time.monotonic() >= deadline:
+                await self.cancel(batch_id)
+                return _fill_missing({}, requests, f"Batch {batch_id} nicht innerhalb von {max_wait_s:.0f}s fertig")
+            await asyncio.sleep(poll_interval_s)
+            batch = await self.status(batch_id)
+
+        results = await self.results(batch)
+        return _fill_missing(results, requests, f"Kein Ergebnis in Batch {batch_id}")
+
+    @abstractmethod
+    async def submit(self, requests: list[dict[str, str]]) -> str:
+        """Reicht die Requests ein und liefert die Batch-ID."""
+
+    @abstractmethod
+    async def status(self, batch_id: str) -> dict[str, Any]:
+        """Liefert das Batch-Objekt des Providers."""
+
+    @abstractmethod
+    def is_done(self, batch: dict[str, Any]) -> bool:
+        """True, wenn der Batch abgeschlossen ist (erfolgreich oder nicht)."""
+
+    @abstractmethod
+    async def cancel(self, batch_id: str) -> None:
+        """Bricht einen laufenden Batch ab."""
+
+    @abstractmethod
+    async def results(self, batch: dict[str, Any]) -> dict[str, dict[str, Any]]:
+        """Lädt und parst die Ergebnisse eines abgeschlossenen Batches."""
+
+    async def _get_json(self, url: str) -> dict[str, Any]:
+        response = await self.http.get(url)
+        response.raise_for_status()
+        return response.json()
+
+    async def _get_jsonl(self, url: str) -> list[dict[str, Any]]:
+        response = await self.http.get(url)
+        response.raise_for_status()
+        return [json.loads(line) for line in response.text.splitlines() if line.strip()]
+
+
+class OpenAIBatchAPI(BatchAPI):
+    """OpenAI Batch API: JSONL-Datei hochladen, Batch für /v1/chat/completions anlegen."""
+
+    platform = "chatgpt"
+    FINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+    async def submit(self, requests: list[dict[str, str]]) -> str:
+        lines = [
+            json.dumps({
+                "custom_id": request["custom_id"],
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": request["model"],
+                    "messages": [
+                        {"role": "system", "content": request["system_prompt"]},
+                        {"role": "user", "content": request["query"]},
+                    ],
+                    "temperature": 0.7,
+                    "max_completion_tokens": self.max_output_tokens,
+                },
+            }, ensure_ascii=False)
+            for request in requests
+        ]
+        content = "\n".join(lines).encode("utf-8")
+
+        upload = await self.http.post(
+            "/files",
+            data={"purpose": "batch"},
+            files={"file": ("batch.jsonl", content, "application/jsonl")},
+        )
+        upload.raise_for_status()
+
+        response = await self.http.post("/batches", json={
+            "input_file_id": upload.json()["id"],
+            "endpoint": "/v1/chat/completions",
+            "completion_window": "24h",
+        })
+        response.raise_for_status()
+        return response.json()["id"]
+
+    async def status(self, batch_id: str) -> dict[str, Any]:
+        return await self._get_json(f"/batches/{batch_id}")
+
+    def is_done(self, batch: dict[str, Any]) -> bool:
+        return batch.get("status") in self.FINAL_STATUSES
+
+    async def cancel(self, batch_id: str) -> None:
+        await self.http.post(f"/batches/{batch_id}/cancel")
+
+    async def results(self, batch: dict[str, Any]) -> dict[str, dict[str, Any]]:
+        results: dict[str, dict[str, Any]] = {}
+        for file_key in ("output_file_id", "error_file_id"):
+            file_id = batch.get(file_key)
+            if not file_id:
+                continue
+            for line in await self._get_jsonl(f"/files/{file_id}/content"):
+                results[line["custom_id"]] = self._parse_line(line)
+        return results
+
+    def _parse_line(self, line: dict[str, Any]) -> dict[str, Any]:
+        response = line.get("response") or {}
+        body = response.get("body") or {}
+        if line.get("error") or response.get("status_code") != 200:
+            error = line.get("error") or body.get("error") or {}
+            return _error_result(error.get("message") or f"HTTP {response.get('status_code')}")
+
+        usage = body.get("usage") or {}
+        return {
+            "response_text": body["choices"][0]["message"].get("content") or "",
+            "success": True,
+            "error": None,
+            "input_tokens": usage.get("prompt_tokens", 0),
+            "output_tokens": usage.get("completion_tokens", 0),
+            "total_tokens": usage.get("total_tokens", 0),
+        }
+
+
+class AnthropicBatchAPI(BatchAPI):
+    """Anthropic Message Batches API."""
+
+    platform = "claude"
+
+    async def submit(self, requests: list[dict[str, str]]) -> str:
+        response = await self.http.post("/v1/messages/batches", json={
+            "requests": [
+                {
+                    "custom_id": request["custom_id"],
+                    "params": {
+                        "model": request["model"],
+                        "max_tokens": self.max_output_tokens,
+                        "system": request["system_prompt"],
+                        "messages": [{"role": "user", "content": request["query"]}],
+                    },
+                }
+                for request in requests
+            ],
+        })
+        response.raise_for_status()
+        return response.json()["id"]
+
+    async def status(self, batch_id: str) -> dict[str, Any]:
+        return await self._get_json(f"/v1/messages/batches/{batch_id}")
+
+    def is_done(self, batch: dict[str, Any]) -> bool:
+        return batch.get("processing_status") == "ended"
+
+    async def cancel(self, batch_id: str) -> None:
+        await self.http.post(f"/v1/messages/batches/{batch_id}/cancel")
+
+    async def results(self, batch: dict[str, Any]) -> dict[str, dict[str, Any]]:
+        results_url = batch.get("results_url")
+        if not results_url:
+            return {}
+        return {
+            line["custom_id"]: self._parse_line(line)
+            for line in await self._get_jsonl(results_url)
+        }
+
+    def _parse_line(self, line: dict[str, Any]) -> dict[str, Any]:
+        result = line.get("result") or {}
+        if result.get("type") != "succeeded":
+            error = (result.get("error") or {}).get("error") or result.get("error") or {}
+            return _error_result(error.get("message") or f"Batch-Request {result.get('type', 'unbekannt')}")
+
+        message = result["message"]
+        usage = message.get("usage") or {}
+        input_tokens = usage.get("input_tokens", 0)
+        output_tokens = usage.get("output_tokens", 0)
+        return {
+            "response_text": " ".join(
+                block["text"] for block in message.get("content", []) if block.get("type") == "text"
+            ),
+            "success": True,
+            "error": None,
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+        }
+
+
+def create_batch_apis(clients: ProviderClients, max_output_tokens: int = 1000) -> dict[str, BatchAPI]:
+    """
+    Batch-APIs für alle Plattformen mit Batch-Unterstützung und API-Key.
+
+    Args:
+        clients: Geteilte Provider-Clients
+        max_output_tokens: Maximale Antwortlänge pro Request
+
+    Returns:
+        Dict platform -> BatchAPI
+    """
+    apis: dict[str, BatchAPI] = {}
+    if clients.openai_http is not None:
+        apis["chatgpt"] = OpenAIBatchAPI(clients.openai_http, max_output_tokens)
+    if clients.anthropic_http is not None:
+        apis["claude"] = AnthropicBatchAPI(clients.anthropic_http, max_output_tokens)
+    return apis
+
+
+def _error_result(error: str) -> dict[str, Any]:
+    return {
+        "response_text": "",
+        "success": False,
+        "error": error,
+        "input_tokens": 0,
+        "output_tokens": 0,
+        "total_tokens": 0,
+    }
+
+
+def _fill_missing(
+    results: dict[str, dict[str, Any]],
+    requests: list[dict[str, str]],
+    error: str
+) -> dict[str, dict[str, Any]]:
+    """Ergänzt Fehler-Ergebnisse für Requests, die im Batch fehlen."""
+    for request in requests:
+        results.setdefault(request["custom_id"], _error_result(error))
+    return results
@@ -4,21 +4,22 @@ Maps model names + token counts to USD costs.
 """
 
 # Pricing per 1M tokens (USD)
+# batch_input/batch_output: Preise der Batch-APIs (OpenAI Batch, Anthropic Message Batches)
 MODEL_PRICING: dict[str, dict[str, float]] = {
     # OpenAI (current)
-    "gpt-5.2": {"input": 1.75, "output": 14.00},
-    "gpt-5.2-pro": {"input": 21.00, "output": 168.00},
+    "gpt-5.2": {"input": 1.75, "output": 14.00, "batch_input": 0.875, "batch_output": 7.00},
+    "gpt-5.2-pro": {"input": 21.00, "output": 168.00, "batch_input": 10.50, "batch_output": 84.00},
     # OpenAI (legacy)
-    "gpt-4.1": {"input": 2.00, "output": 8.00},
-    "gpt-4.1-mini": {"input": 0.40, "output": 1.60},
-    "gpt-4o": {"input": 2.50, "output": 10.00},
-    "gpt-4o-mini": {"input": 0.15, "output": 0.60},
+    "gpt-4.1": {"input": 2.00, "output": 8.00, "batch_input": 1.00, "batch_output": 4.00},
+    "gpt-4.1-mini": {"input": 0.40, "output": 1.60, "batch_input": 0.20, "batch_output": 0.80},
+    "gpt-4o": {"input": 2.50, "output": 10.00, "batch_input": 1.25, "batch_output": 5.00},
+    "gpt-4o-mini": {"input": 0.15, "output": 0.60, "batch_input": 0.075, "batch_output": 0.30},
     # Anthropic (current)
-    "claude-sonnet-4-6": {"input": 3.00, "output": 15.00},
-    "claude-opus-4-6": {"input": 15.00, "output": 75.00},
+    "claude-sonnet-4-6": {"input": 3.00, "output": 15.00, "batch_input": 1.50, "batch_output": 7.50},
+    "claude-opus-4-6": {"input": 15.00, "output": 75.00, "batch_input": 7.50, "batch_output": 37.50},
     # Anthropic (legacy)
-    "claude-sonnet-4-5-20250929": {"input": 3.00, "output": 15.00},
-    "claude-haiku-4-5-20251001": {"input": 0.80, "output": 4.00},
+    "claude-sonnet-4-5-20250929": {"input": 3.00, "output": 15.00, "batch_input": 1.50, "batch_output": 7.50},
+    "claude-haiku-4-5-20251001": {"input": 0.80, "output": 4.00, "batch_input": 0.40, "batch_output": 2.00},
     # Google (current)
     "gemini-3-flash-preview": {"input": 0.50, "output": 3.00},
     "gemini-3-pro": {"input": 1.50, "output": 10.00},
@@ -32,16 +33,23 @@ MODEL_PRICING: dict[str, dict[str, float]] = {
 }
 
 FALLBACK_PRICING = {"input": 5.00, "output": 15.00}
+# Rabatt für Batch-Calls, wenn ein Modell keine eigenen batch_* Preise hat
+BATCH_DISCOUNT = 0.5
 CHARS_PER_TOKEN = 4
 
 
 class CostCalculator:
     """Berechnet API-Kosten basierend auf Token-Verbrauch und Modell-Preislisten."""
 
-    def calculate_cost(self, model: str, input_tokens: int, output_tokens: int) -> float:
+    def calculate_cost(self, model: str, input_tokens: int, output_tokens: int, batch: bool = False) -> float:
         pricing = MODEL_PRICING.get(model, FALLBACK_PRICING)
-        input_cost = input_tokens * pricing["input"] / 1_000_000
-        output_cost = output_tokens * pricing["output"] / 1_000_000
+        input_price = pricing["input"]
+        output_price = pricing["output"]
+        if batch:
+            input_price = pricing.get("batch_input", input_price * BATCH_DISCOUNT)
+            output_price = pricing.get("batch_output", output_price * BATCH_DISCOUNT)
+        input_cost = input_tokens * input_price / 1_000_000
+        output_cost = output_tokens * output_price / 1_000_000
         return input_cost + output_cost
 
     def estimate_tokens(self, text: str) -> int:
@@ -0,0 +1,246 @@
+"""
+HTTP Response Cache.
+Fertig serialisierte Antworten lesestarker Endpoints (Rankings, Reports)
+mit starkem ETag, austauschbar hinter einem kleinen Backend-Interface:
+
+- MemoryCacheBackend: LRU im Prozess (Default)
+- SharedCacheBackend: geteilter Key-Value-Store (Redis-kompatibler Client),
+  damit mehrere Replicas denselben Cache und dieselben Invalidierungen sehen
+
+Invalidiert wird über Tags ("scan:<id>", "industry:<id>"): jeder Tag hat
+einen Generationszähler, der Teil des Cache-Keys ist. Ein Scan-Abschluss
+erhöht die Zähler, ältere Einträge werden nie wieder gelesen und laufen
+über LRU bzw. TTL aus.
+
+Beim memory-Backend sind die Zähler prozesslokal: Scan-Worker und
+cli.reanalyze laufen in eigenen Prozessen und invalidieren den Cache der
+API nicht. Dort begrenzen nur die (kurzen) TTLs RESPONSE_CACHE_RANKING_TTL_S
+und RESPONSE_CACHE_REPORT_TTL_S, wie lange ein veralteter Stand ausgeliefert
+wird. Sofortige Invalidierung über Prozessgrenzen braucht das shared-Backend.
+"""
+import hashlib
+import logging
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Iterable
+
+from app.config import Settings
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend(ABC):
+    """Minimales Key-Value-Interface für den Response Cache."""
+
+    @abstractmethod
+    def get(self, key: str) -> bytes | None:
+        """Wert zu einem Key oder None (fehlt oder abgelaufen)."""
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, ttl_s: float) -> None:
+        """Speichert einen Wert für ttl_s Sekunden."""
+
+    @abstractmethod
+    def counter(self, key: str) -> int:
+        """Aktueller Wert eines Zählers (0, wenn nicht gesetzt)."""
+
+    @abstractmethod
+    def incr(self, key: str) -> int:
+        """Erhöht einen Zähler um 1 und liefert den neuen Wert."""
+
+
+class MemoryCacheBackend(CacheBackend):
+    """LRU mit TTL im Prozess."""
+
+    def __init__(self, max_entries: int = 1000):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._counters: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: bytes, ttl_s: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl_s, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def counter(self, key: str) -> int:
+        return self._counters.get(key, 0)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            value = self._counters.get(key, 0) + 1
+            self._counters[key] = value
+            return value
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SharedCacheBackend(CacheBackend):
+    """Geteilter Store über einen Redis-kompatiblen Client (get/set(ex=)/incr)."""
+
+    def __init__(self, client: Any):
+        """
+        Args:
+            client: z.B. redis.Redis oder ein lokaler Stand-in mit derselben API
+        """
+        self.client = client
+
+    @classmethod
+    def from_url(cls, url: str) -> "SharedCacheBackend":
+        """Erstellt das Backend aus einer Redis-URL (optionales Paket `redis`)."""
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("RESPONSE_CACHE_BACKEND=shared benötigt das Paket 'redis'") from e
+        return cls(redis.Redis.from_url(url))
+
+    def get(self, key: str) -> bytes | None:
+        return self.client.get(key)
+
+    def set(self, key: str, value: bytes, ttl_s: float) -> None:
+        self.client.set(key, value, ex=max(1, math.ceil(ttl_s)))
+
+    def counter(self, key: str) -> int:
+        value = self.client.get(key)
+        return int(value) if value is not None else 0
+
+    def incr(self, key: str) -> int:
+        return int(self.client.incr(key))
+
+
+class CachedResponse:
+    """Serialisierte Antwort mit starkem ETag."""
+
+    def __init__(self, body: bytes, media_type: str, etag: str | None = None):
+        self.body = body
+        self.media_type = media_type
+        self.etag = etag or '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+    def dump(self) -> bytes:
+        return f"{self.etag}\n{self.media_type}\n".encode() + self.body
+
+    @classmethod
+    def load(cls, raw: bytes) -> "CachedResponse":
+        etag, media_type, body = raw.split(b"\n", 2)
+        return cls(body, media_type.decode(), etag.decode())
+
+    def matches(self, if_none_match: str | None) -> bool:
+        """True, wenn der If-None-Match-Header den ETag enthält (schwacher Vergleich)."""
+        if not if_none_match:
+            return False
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in candidates or self.etag in candidates
+
+
+class HttpResponseCache:
+    """Response Cache mit Tag-basierter Invalidierung."""
+
+    def __init__(self, backend: CacheBackend, namespace: str = "http"):
+        self.backend = backend
+        self.namespace = namespace
+
+    def generation(self, tag: str) -> int:
+        """Aktuelle Generation eines Tags (steigt mit jeder Invalidierung)."""
+        try:
+            return self.backend.counter(f"{self.namespace}:tag:{tag}")
+        except Exception:
+            logger.exception("Response Cache: Lesen fehlgeschlagen")
+            return 0
+
+    def resolve_key(self, key: str, tags: Iterable[str]) -> str:
+        """
+        Cache-Key inkl. der aktuellen Generationen der Tags.
+
+        Einmal vor dem Bauen der Antwort auflösen und für get() und set()
+        verwenden: wird währenddessen invalidiert, landet die Antwort unter
+        der alten Generation und wird nie als aktuell ausgeliefert.
+        """
+        generations = ".".join(str(self.generation(tag)) for tag in tags)
+        return f"{self.namespace}:{key}:{generations}"
+
+    def get(self, resolved_key: str) -> CachedResponse | None:
+        try:
+            raw = self.backend.get(resolved_key)
+        except Exception:
+            logger.exception("Response Cache: Lesen fehlgeschlagen")
+            return None
+        return CachedResponse.load(raw) if raw is not None else None
+
+    def set(self, resolved_key: str, response: CachedResponse, ttl_s: float) -> None:
+        try:
+            self.backend.set(resolved_key, response.dump(), ttl_s)
+        except Exception:
+            logger.exception("Response Cache: Schreiben fehlgeschlagen")
+
+    def invalidate(self, *tags: str) -> None:
+        """Macht alle Einträge mit einem der Tags ungültig."""
+        for tag in tags:
+            try:
+                self.backend.incr(f"{self.namespace}:tag:{tag}")
+            except Exception:
+                logger.exception(f"Response Cache: Invalidierung von '{tag}' fehlgeschlagen")
+
+
+def scan_tag(scan_id: str) -> str:
+    return f"scan:{scan_id}"
+
+
+def industry_tag(industry_id: str) -> str:
+    return f"industry:{industry_id}"
+
+
+# Prozessweiter Cache (ein Backend pro Prozess bzw. Verbindung zum geteilten Store)
+_http_cache: HttpResponseCache | None = None
+_http_cache_lock = threading.Lock()
+
+
+def get_http_cache(settings: Settings) -> HttpResponseCache:
+    """
+    Liefert den prozessweiten Response Cache gemäß RESPONSE_CACHE_BACKEND.
+
+    Args:
+        settings: App Settings
+
+    Returns:
+        HttpResponseCache
+    """
+    global _http_cache
+    if _http_cache is None:
+        with _http_cache_lock:
+            if _http_cache is None:
+                if settings.RESPONSE_CACHE_BACKEND == "shared":
+                    backend: CacheBackend = SharedCacheBackend.from_url(settings.RESPONSE_CACHE_URL)
+                else:
+                    backend = MemoryCacheBackend(settings.RESPONSE_CACHE_MAX_ENTRIES)
+                _http_cache = HttpResponseCache(backend)
+    return _http_cache
+
+
+def notify_scan_completed(settings: Settings, scan_id: str, industry_id: str) -> None:
+    """
+    Invalidiert Report und Rankings nach Abschluss (oder Re-Analyse) eines Scans.
+    Nach dem Commit aufrufen, damit kein Leser den alten Stand neu cached.
+
+    Args:
+        settings: App Settings
+        scan_id: ID des Scans
+        industry_id: Industry des Scans
+    """
+    get_http_cache(settings).invalidate(scan_tag(scan_id), industry_tag(industry_id))
@@ -0,0 +1,184 @@
+"""
+Industry Registry.
+Parst jede Industry-YAML einmal, validiert sie gegen typisierte Modelle und
+hält das Ergebnis im Prozess. Neu geladen wird nur, wenn sich mtime oder
+Größe der Datei ändern — Requests zahlen nur noch ein stat().
+"""
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any
+
+import yaml
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, field_validator
+
+logger = logging.getLogger(__name__)
+
+# Default-Gewicht einer Plattform ohne `weight` (wie Scorer)
+DEFAULT_PLATFORM_WEIGHT = 0.25
+
+
+class IndustryConfigError(ValueError):
+    """Industry-YAML ist nicht lesbar oder verletzt das Schema."""
+
+
+class PlatformConfig(BaseModel):
+    """Eintrag unter `platforms:` (weitere Quoten-Felder bleiben erhalten)."""
+    model_config = ConfigDict(extra="allow")
+
+    weight: float = Field(default=DEFAULT_PLATFORM_WEIGHT, ge=0)
+    model: str | None = None
+    rpm: int | None = Field(default=None, gt=0)
+    tpm: int | None = Field(default=None, gt=0)
+    max_in_flight: int | None = Field(default=None, gt=0)
+    max_concurrency: int | None = Field(default=None, gt=0)
+    timeout_s: float | None = Field(default=None, gt=0)
+
+
+class ScoringConfig(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    mention_types: dict[str, float] = Field(default_factory=dict)
+
+    @field_validator("mention_types")
+    @classmethod
+    def _weights_in_range(cls, value: dict[str, float]) -> dict[str, float]:
+        for mention_type, weight in value.items():
+            if not 0 <= weight <= 1:
+                raise ValueError(f"mention_types.{mention_type} muss zwischen 0 und 1 liegen")
+        return value
+
+
+class QueryConfig(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    query: str
+    category: str | None = None
+    intent: str = ""
+
+
+class QueriesConfig(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    version: str = "unknown"
+    generic: list[QueryConfig] = Field(default_factory=list)
+    brand: list[QueryConfig] = Field(default_factory=list)
+
+    @field_validator("brand")
+    @classmethod
+    def _brand_placeholders(cls, value: list[QueryConfig]) -> list[QueryConfig]:
+        # Brand Queries dürfen nur {company_name} enthalten (str.format beim Scan)
+        for entry in value:
+            try:
+                entry.query.format(company_name="")
+            except (KeyError, IndexError, ValueError) as e:
+                raise ValueError(f"Ungültiger Platzhalter in Brand Query '{entry.query}': {e}") from e
+        return value
+
+
+class IndustryConfig(BaseModel):
+    """Typisierte Industry Config (unbekannte Top-Level-Keys bleiben erhalten)."""
+    model_config = ConfigDict(extra="allow")
+
+    id: str | None = None
+    name: str | None = None
+    display_name: str | None = None
+    description: str = ""
+    language: str = "de"
+    region: str | None = None
+    platforms: dict[str, PlatformConfig] = Field(default_factory=dict)
+    scoring: ScoringConfig = Field(default_factory=ScoringConfig)
+    queries: QueriesConfig = Field(default_factory=QueriesConfig)
+    known_competitors: list[str] = Field(default_factory=list)
+    lexicons: dict[str, dict[str, list[str]]] = Field(default_factory=dict)
+    cache: dict[str, Any] = Field(default_factory=dict)
+
+
+class IndustryEntry:
+    """Eine geladene Industry: Rohdaten und validiertes Modell."""
+
+    def __init__(self, industry_id: str, raw: dict[str, Any], stamp: tuple[int, int]):
+        """
+        Args:
+            industry_id: ID der Industry (Dateiname ohne .yaml)
+            raw: Geparste YAML (wird von den Services als Dict genutzt, nicht verändern)
+            stamp: (mtime_ns, size) der Datei beim Laden
+
+        Raises:
+            pydantic.ValidationError: Wenn die Config ungültig ist
+        """
+        self.industry_id = industry_id
+        self.raw = raw
+        self.stamp = stamp
+        self.config = IndustryConfig.model_validate(raw)
+        self.display_name = self.config.display_name or industry_id
+
+
+class IndustryRegistry:
+    """Cache der Industry Configs eines Verzeichnisses."""
+
+    def __init__(self, config_dir: str):
+        """
+        Args:
+            config_dir: Pfad zum Verzeichnis mit den YAML-Dateien
+        """
+        self.config_dir = Path(config_dir)
+        self._entries: dict[str, IndustryEntry] = {}
+        self._lock = threading.Lock()
+
+    def get(self, industry_id: str) -> IndustryEntry:
+        """
+        Liefert die Industry; parst die YAML nur beim ersten Zugriff oder nach
+        einer Änderung der Datei.
+
+        Args:
+            industry_id: ID der Industry (z.B. "cybersecurity")
+
+        Returns:
+            IndustryEntry
+
+        Raises:
+            FileNotFoundError: Wenn die Config-Datei nicht existiert
+            IndustryConfigError: Wenn die Config ungültig ist
+        """
+        path = self.config_dir / f"{industry_id}.yaml"
+        try:
+            stat = os.stat(path)
+        except (FileNotFoundError, NotADirectoryError):
+            self._entries.pop(industry_id, None)
+            raise FileNotFoundError(f"Industry config not found: {industry_id}")
+        stamp = (stat.st_mtime_ns, stat.st_size)
+
+        entry = self._entries.get(industry_id)
+        if entry is not None and entry.stamp == stamp:
+            return entry
+
+        with self._lock:
+            entry = self._entries.get(industry_id)
+            if entry is None or entry.stamp != stamp:
+                try:
+                    with open(path) as f:
+                        raw = yaml.safe_load(f) or {}
+                    entry = IndustryEntry(industry_id, raw, stamp)
+                except (yaml.YAMLError, ValidationError) as e:
+                    raise IndustryConfigError(f"Invalid industry config '{industry_id}': {e}") from e
+                self._entries[industry_id] = entry
+                logger.info(f"Industry Config geladen: {industry_id} (Queries {entry.config.queries.version})")
+            return entry
+
+    def industry_ids(self) -> list[str]:
+        """IDs aller YAML-Dateien im Verzeichnis (sortiert)."""
+        return sorted(path.stem for path in self.config_dir.glob("*.yaml"))
+
+
+# Config-Verzeichnis -> Registry
+_registries: dict[str, IndustryRegistry] = {}
+
+
+def get_registry(config_dir: str) -> IndustryRegistry:
+    """Prozessweite Registry für ein Config-Verzeichnis."""
+    registry = _registries.get(config_dir)
+    if registry is None:
+        registry = _registries.setdefault(config_dir, IndustryRegistry(config_dir))
+    return registry
@@ -0,0 +1,151 @@
+"""
+Industry Stats.
+Anzahl Companies und Durchschnitts-Score pro Industry als Rollup-Tabelle
+(industry_stats), gepflegt bei Scan-Abschluss und Company-Änderungen. Der
+Durchschnitt basiert auf dem ranking_snapshot, also nur auf dem maßgeblichen
+Scan pro Company statt auf der gesamten Scan-Historie.
+"""
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Iterable
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from app.models import Company, IndustryStats, RankingSnapshot, Scan
+
+# Prozess-Cache der Rollup-Tabelle: (Zeitpunkt, industry_id -> Stats)
+_cache: tuple[float, dict[str, dict[str, Any]]] | None = None
+_cache_lock = threading.Lock()
+
+
+def _grouped_stats(db: Session, industry_ids: Iterable[str] | None = None) -> dict[str, dict[str, Any]]:
+    """Stats aller (oder der angegebenen) Industries in einer gruppierten Query."""
+    query = (
+        select(
+            Company.industry_id,
+            func.count(Company.id),
+            func.count(RankingSnapshot.company_id),
+            func.avg(RankingSnapshot.overall_score),
+        )
+        .outerjoin(RankingSnapshot, RankingSnapshot.company_id == Company.id)
+        .group_by(Company.industry_id)
+    )
+    if industry_ids is not None:
+        query = query.where(Company.industry_id.in_(list(industry_ids)))
+    return {
+        industry_id: {
+            "total_companies": total,
+            "scored_companies": scored,
+            "avg_score": float(avg_score) if avg_score is not None else None,
+        }
+        for industry_id, total, scored, avg_score in db.execute(query)
+    }
+
+
+def _backfill_snapshots(db: Session, industry_ids: set[str]) -> set[str]:
+    """
+    Baut den ranking_snapshot für Industries auf, die completed Scans mit
+    Score, aber noch keine Snapshot-Zeilen haben (Scans von vor Einführung
+    der Tabelle). Der Aufbau aktualisiert die Stats dieser Industries mit.
+
+    Returns:
+        Die neu aufgebauten Industries
+    """
+    from app.services.ranking_snapshot import rebuild_industry_snapshot  # Zyklus: Snapshot pflegt die Stats
+
+    missing = {
+        industry_id
+        for (industry_id,) in (
+            db.query(Company.industry_id)
+            .join(Scan, Scan.company_id == Company.id)
+            .filter(Company.industry_id.in_(industry_ids))
+            .filter(Scan.status == "completed")
+            .filter(Scan.overall_score.isnot(None))
+            .filter(Company.industry_id.not_in(select(RankingSnapshot.industry_id).distinct()))
+            .distinct()
+        )
+    }
+    for industry_id in missing:
+        rebuild_industry_snapshot(db, industry_id)
+    return missing
+
+
+def refresh_industry_stats(db: Session, industry_ids: Iterable[str]) -> None:
+    """
+    Berechnet die Rollup-Zeilen der Industries neu (ohne Commit).
+
+    Fehlt einer Industry noch der ranking_snapshot, wird er vorher aufgebaut.
+
+    Args:
+        db: SQLAlchemy Session
+        industry_ids: Betroffene Industries
+    """
+    industry_ids = set(industry_ids)
+    if not industry_ids:
+        return
+    db.flush()
+    industry_ids -= _backfill_snapshots(db, industry_ids)
+    if not industry_ids:
+        return
+    stats = _grouped_stats(db, industry_ids)
+
+    db.execute(delete(IndustryStats).where(IndustryStats.industry_id.in_(industry_ids)))
+    now = datetime.now(timezone.utc)
+    db.add_all(
+        IndustryStats(industry_id=industry_id, updated_at=now, **values)
+        for industry_id, values in stats.items()
+    )
+    db.flush()
+    invalidate_industry_stats_cache()
+
+
+def get_industry_stats(db: Session, max_age_s: float = 30.0) -> dict[str, dict[str, Any]]:
+    """
+    Stats aller Industries aus dem Rollup, im Prozess gecacht.
+
+    Schreibzugriffe im selben Prozess invalidieren den Cache sofort;
+    Änderungen aus anderen Prozessen (Scan-Worker) werden nach spätestens
+    max_age_s sichtbar. Industries mit Companies, aber ohne Rollup-Zeile
+    (bestehende Datenbank), werden dabei einmalig nachgezogen.
+
+    Args:
+        db: SQLAlchemy Session
+        max_age_s: Maximales Alter des Caches in Sekunden
+
+    Returns:
+        Dict industry_id -> {total_companies, scored_companies, avg_score}
+    """
+    global _cache
+    cached = _cache
+    if cached is not None and time.monotonic() - cached[0] < max_age_s:
+        return cached[1]
+
+    with _cache_lock:
+        loaded_at = time.monotonic()
+        rows = db.query(IndustryStats).all()
+        missing = (
+            {industry_id for (industry_id,) in db.query(Company.industry_id).distinct()}
+            - {row.industry_id for row in rows}
+        )
+        if missing:
+            refresh_industry_stats(db, missing)
+            db.commit()
+            rows = db.query(IndustryStats).all()
+        stats = {
+            row.industry_id: {
+                "total_companies": row.total_companies,
+                "scored_companies": row.scored_companies,
+                "avg_score": row.avg_score,
+            }
+            for row in rows
+        }
+        _cache = (loaded_at, stats)
+        return stats
+
+
+def invalidate_industry_stats_cache() -> None:
+    """Verwirft den Prozess-Cache (nach Änderungen an Companies oder Scores)."""
+    global _cache
+    _cache = None
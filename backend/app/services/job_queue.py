@@ -0,0 +1,246 @@
+"""
+Job Queue.
+DB-gestützte Warteschlange für Scans und Sweeps — die API reiht Jobs ein,
+der Worker-Prozess (python -m app.workers) arbeitet sie ab.
+"""
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models import Scan, ScanJob
+
+ACTIVE_STATUSES = ("queued", "running")
+
+
+def _utcnow() -> datetime:
+    # SQLite speichert naive Timestamps — konsistent naive UTC verwenden
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class JobQueue:
+    """Einreihen, Claimen und Abschließen von ScanJobs."""
+
+    def __init__(self, db: Session, max_attempts: int = 3):
+        """
+        Args:
+            db: SQLAlchemy Session
+            max_attempts: Maximale Anzahl Versuche pro Job (inkl. Requeue verwaister Jobs)
+        """
+        self.db = db
+        self.max_attempts = max_attempts
+
+    def enqueue_scan(self, scan_id: str, batch: bool = False) -> ScanJob:
+        """
+        Reiht einen Scan ein. Ist für den Scan bereits ein aktiver Job vorhanden,
+        wird dieser zurückgegeben (idempotent bei doppeltem /run).
+
+        Args:
+            scan_id: ID des Scans
+            batch: Provider-Batch-APIs nutzen
+
+        Returns:
+            ScanJob
+        """
+        return self._enqueue(
+            ScanJob(kind="scan", scan_id=scan_id, batch=batch, status="queued", created_at=_utcnow()),
+            ScanJob.scan_id == scan_id,
+        )
+
+    def enqueue_sweep(self, industry_id: str, batch: bool = False) -> ScanJob:
+        """
+        Reiht einen Industry-Sweep ein (idempotent pro Industry).
+
+        Args:
+            industry_id: ID der Industry
+            batch: Provider-Batch-APIs nutzen
+
+        Returns:
+            ScanJob
+        """
+        return self._enqueue(
+            ScanJob(kind="sweep", industry_id=industry_id, batch=batch, status="queued", created_at=_utcnow()),
+            ScanJob.kind == "sweep",
+            ScanJob.industry_id == industry_id,
+        )
+
+    def _enqueue(self, job: ScanJob, *active_filter) -> ScanJob:
+        """
+        Reiht job ein, sofern kein aktiver Job zu active_filter existiert.
+
+        Die Prüfung vorab spart im Normalfall den Insert; gegen parallele
+        Requests sichern die partiellen Unique-Indexe auf aktive Jobs ab
+        (ux_scan_jobs_active_*) — der unterlegene Insert liefert den Job des
+        anderen Requests.
+        """
+        existing = self._active_job(*active_filter)
+        if existing is not None:
+            return existing
+
+        try:
+            # Savepoint, damit ein paralleler Insert nicht die äußere Transaktion kippt
+            with self.db.begin_nested():
+                self.db.add(job)
+        except IntegrityError:
+            existing = self._active_job(*active_filter)
+            if existing is None:
+                raise
+            return existing
+        self.db.commit()
+        return job
+
+    def _active_job(self, *active_filter) -> ScanJob | None:
+        return (
+            self.db.query(ScanJob)
+            .filter(*active_filter, ScanJob.status.in_(ACTIVE_STATUSES))
+            .first()
+        )
+
+    def claim(self, worker_id: str) -> ScanJob | None:
+        """
+        Übernimmt den ältesten wartenden Job.
+
+        Das Claimen ist ein bedingtes UPDATE (status='queued' → 'running'),
+        damit mehrere Worker-Prozesse denselben Job nie doppelt bekommen.
+
+        Args:
+            worker_id: Kennung des Workers
+
+        Returns:
+            Geclaimter ScanJob oder None, wenn die Queue leer ist
+        """
+        candidates = (
+            self.db.query(ScanJob.id)
+            .filter(ScanJob.status == "queued")
+            .order_by(ScanJob.created_at)
+            .limit(10)
+            .all()
+        )
+        for (job_id,) in candidates:
+            now = _utcnow()
+            claimed = self.db.execute(
+                update(ScanJob)
+                .where(ScanJob.id == job_id, ScanJob.status == "queued")
+                .values(
+                    status="running",
+                    worker_id=worker_id,
+                    started_at=now,
+                    heartbeat_at=now,
+                    attempts=ScanJob.attempts + 1,
+                )
+            ).rowcount
+            self.db.commit()
+            if claimed:
+                return self.db.get(ScanJob, job_id)
+        return None
+
+    def heartbeat(self, job_id: str) -> None:
+        """Markiert einen laufenden Job als lebendig."""
+        self.db.execute(
+            update(ScanJob)
+            .where(ScanJob.id == job_id, ScanJob.status == "running")
+            .values(heartbeat_at=_utcnow())
+        )
+        self.db.commit()
+
+    def complete(self, job: ScanJob, result: dict | None = None) -> None:
+        """Schließt einen Job erfolgreich ab."""
+        job.status = "completed"
+        job.result = result or {}
+        job.error_message = None
+        job.finished_at = _utcnow()
+        self.db.commit()
+
+    def fail(self, job: ScanJob, error: str) -> None:
+        """Markiert einen Job als endgültig fehlgeschlagen."""
+        job.status = "failed"
+        job.error_message = error
+        job.finished_at = _utcnow()
+        self.db.commit()
+
+    def take_over_scans(self, scan_ids: list[str]) -> set[str]:
+        """
+        Übernimmt Scans für einen Sweep: wartende Jobs der Scans werden
+        abgebrochen (status='cancelled', ohne Commit — zusammen mit der
+        Übernahme committen), damit kein Call doppelt bezahlt wird.
+
+        Args:
+            scan_ids: IDs der zu übernehmenden Scans
+
+        Returns:
+            IDs der Scans, deren Job bereits von einem Worker bearbeitet wird
+            (nicht übernehmbar)
+        """
+        if not scan_ids:
+            return set()
+
+        self.db.execute(
+            update(ScanJob)
+            .where(ScanJob.scan_id.in_(scan_ids), ScanJob.status == "queued")
+            .values(status="cancelled", error_message="Von Industry-Sweep übernommen", finished_at=_utcnow())
+        )
+        return {
+            scan_id for (scan_id,) in (
+                self.db.query(ScanJob.scan_id)
+                .filter(ScanJob.scan_id.in_(scan_ids), ScanJob.status == "running")
+            )
+        }
+
+    def requeue_stale(self, stale_after_s: float) -> int:
+        """
+        Reiht Jobs neu ein, deren Worker keinen Heartbeat mehr sendet
+        (z.B. Prozess-Neustart). Jobs ohne verbleibende Versuche schlagen fehl.
+
+        Args:
+            stale_after_s: Sekunden ohne Heartbeat, ab denen ein Job als verwaist gilt
+
+        Returns:
+            Anzahl der neu eingereihten Jobs
+        """
+        cutoff = _utcnow() - timedelta(seconds=stale_after_s)
+        stale = (
+            self.db.query(ScanJob)
+            .filter(ScanJob.status == "running", ScanJob.heartbeat_at < cutoff)
+            .all()
+        )
+
+        requeued = 0
+        for job in stale:
+            if job.attempts >= self.max_attempts:
+                job.status = "failed"
+                job.error_message = f"Worker nach {job.attempts} Versuchen nicht mehr erreichbar"
+                job.finished_at = _utcnow()
+            else:
+                job.status = "queued"
+                job.worker_id = None
+                requeued += 1
+        self.db.commit()
+        return requeued
+
+    def requeue_orphaned_scans(self) -> int:
+        """
+        Reiht Scans neu ein, die als "running" markiert sind, aber von keinem
+        aktiven Job (Scan oder Sweep ihrer Industry) mehr bearbeitet werden —
+        z.B. nach einem Absturz vor Einführung der Queue oder nach manuellem
+        Eingriff. Der Worker setzt dann am letzten Checkpoint fort.
+
+        Returns:
+            Anzahl der neu eingereihten Scans
+        """
+        active_jobs = (
+            self.db.query(ScanJob.scan_id, ScanJob.industry_id)
+            .filter(ScanJob.status.in_(ACTIVE_STATUSES))
+            .all()
+        )
+        active_scan_ids = {scan_id for scan_id, _ in active_jobs if scan_id}
+        active_industries = {industry_id for _, industry_id in active_jobs if industry_id}
+
+        orphaned = self.db.query(Scan).filter(Scan.status == "running").all()
+        requeued = 0
+        for scan in orphaned:
+            if scan.id in active_scan_ids or scan.industry_id in active_industries:
+                continue
+            self.enqueue_scan(scan.id)
+            requeued += 1
+        return requeued
@@ -0,0 +1,135 @@
+"""
+Keyword Lexicon.
+Schlagwort-Listen für Mention-Type und Sentiment, pro Sprache in der
+Industry Config (`lexicons:`) pflegbar und einmal zu einer Regex kompiliert.
+
+Begriffe matchen als ganze Wörter; ein `*` am Ende erlaubt beliebige
+Endungen (z.B. "führend*" für "führende", "führender", "empfehl*" für
+"empfehle", "empfehlen").
+"""
+import re
+from typing import Any
+
+# Kategorien, die der Analyzer auswertet
+RECOMMENDATION = "recommendation"
+POSITIVE_MENTION = "positive_mention"
+NEGATIVE_SENTIMENT = "negative_sentiment"
+POSITIVE_SENTIMENT = "positive_sentiment"
+
+# LLM-Antworten enthalten auch bei deutschen Queries oft englische Begriffe
+FALLBACK_LANGUAGE = "en"
+
+DEFAULT_LEXICONS: dict[str, dict[str, list[str]]] = {
+    "de": {
+        RECOMMENDATION: [
+            "empfehl*", "empfehlenswert*", "empfohlen*", "führend*", "top", "beste*",
+            "hervorragend*", "ausgezeichnet*", "ideal*", "perfekt*", "sollten sie",
+            "rate ich", "beste wahl",
+        ],
+        POSITIVE_MENTION: [
+            "gut", "gute", "guten", "guter", "gutes", "sehr gut", "stark*", "solide*",
+            "zuverlässig*", "bewährt*", "erfolgreich*", "innovativ*", "leistungsstark*", "effektiv*",
+        ],
+        NEGATIVE_SENTIMENT: [
+            "schlecht*", "schwach*", "mangelhaft*", "unzureichend*", "problematisch*",
+            "kritisch*", "negativ*", "nachteil*", "nicht empfehlenswert",
+        ],
+        POSITIVE_SENTIMENT: [
+            "empfehl*", "gut", "gute", "guten", "guter", "gutes", "sehr gut", "beste*", "führend*",
+            "hervorragend*", "ausgezeichnet*", "stark*", "innovativ*", "zuverlässig*", "erfolgreich*",
+        ],
+    },
+    "en": {
+        RECOMMENDATION: ["first choice", "recommend*", "leading", "top", "best"],
+        POSITIVE_MENTION: ["good", "great", "strong", "reliable", "effective"],
+        NEGATIVE_SENTIMENT: ["bad", "poor", "weak", "problematic", "issues", "problems"],
+        POSITIVE_SENTIMENT: ["recommend*", "great", "excellent", "best", "leading", "strong"],
+    },
+}
+
+
+def _normalize(term: str) -> str:
+    return " ".join(term.lower().split())
+
+
+class CompiledLexicon:
+    """Alle Kategorien in einer Regex — ein Durchlauf liefert alle getroffenen Kategorien."""
+
+    def __init__(self, categories: dict[str, list[str]]):
+        """
+        Args:
+            categories: Dict Kategorie -> Begriffe (optional mit `*` am Ende)
+        """
+        self._exact: dict[str, set[str]] = {}
+        self._prefixes: dict[str, set[str]] = {}
+        for category, terms in categories.items():
+            for term in terms:
+                normalized = _normalize(term)
+                if normalized.endswith("*"):
+                    self._prefixes.setdefault(normalized.rstrip("*"), set()).add(category)
+                elif normalized:
+                    self._exact.setdefault(normalized, set()).add(category)
+
+        alternatives = [
+            (term, r"\s+".join(map(re.escape, term.split())))
+            for term in self._exact
+        ] + [
+            (prefix, r"\s+".join(map(re.escape, prefix.split())) + r"\w*")
+            for prefix in self._prefixes
+        ]
+        # Längere Begriffe zuerst, damit "nicht empfehlenswert" vor "empfehlenswert" greift
+        alternatives.sort(key=lambda item: len(item[0]), reverse=True)
+        self._pattern = re.compile(
+            r"(?<!\w)(?:" + "|".join(regex for _, regex in alternatives) + r")(?!\w)",
+            re.IGNORECASE,
+        ) if alternatives else None
+        self._sorted_prefixes = sorted(self._prefixes, key=len, reverse=True)
+
+    def categories_in(self, text: str) -> set[str]:
+        """
+        Liefert alle Kategorien, deren Begriffe im Text vorkommen.
+
+        Args:
+            text: Zu klassifizierender Text (z.B. Kontext einer Erwähnung)
+
+        Returns:
+            Menge der getroffenen Kategorien
+        """
+        found: set[str] = set()
+        if self._pattern is None:
+            return found
+        for match in self._pattern.finditer(text):
+            term = _normalize(match.group(0))
+            categories = self._exact.get(term)
+            if categories is None:
+                # Alle passenden Präfixe zählen: "empfehlenswert" trifft "empfehl*" und "empfehlenswert*"
+                categories = set().union(
+                    *(self._prefixes[prefix] for prefix in self._sorted_prefixes if term.startswith(prefix))
+                )
+            found |= categories
+        return found
+
+
+def lexicon_categories(industry_config: dict[str, Any] | None) -> dict[str, list[str]]:
+    """
+    Stellt die Begriffe für die Sprache der Industry zusammen (plus Englisch).
+
+    Sprachen ohne Eintrag unter `lexicons:` in der Config nutzen die
+    eingebauten DEFAULT_LEXICONS.
+
+    Args:
+        industry_config: Industry Config mit `language` und optional `lexicons`
+
+    Returns:
+        Dict Kategorie -> Begriffe
+    """
+    industry_config = industry_config or {}
+    configured = industry_config.get("lexicons") or {}
+    language = industry_config.get("language", "de")
+
+    categories: dict[str, list[str]] = {}
+    for lang in dict.fromkeys([language, FALLBACK_LANGUAGE]):
+        lexicon = configured.get(lang) or DEFAULT_LEXICONS.get(lang, {})
+        for category, terms in lexicon.items():
+            categories.setdefault(category, []).extend(terms)
+    return categories
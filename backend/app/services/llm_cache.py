@@ -0,0 +1,184 @@
+"""
+LLM Response Cache.
+Persistenter Cache vor LLMClient.query_platform — Generic Queries sind für alle
+Firmen identisch und müssen pro Plattform/Modell nur einmal bezahlt werden.
+"""
+import hashlib
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models import LLMResponseCache
+
+
+def _utcnow() -> datetime:
+    # SQLite speichert naive Timestamps — konsistent naive UTC verwenden
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class ResponseCache:
+    """DB-gestützter LLM-Response-Cache mit TTL pro Query-Kategorie und LRU-Eviction."""
+
+    def __init__(
+        self,
+        db: Session,
+        default_ttl_hours: float = 168.0,
+        ttl_hours: dict[str, float] | None = None,
+        max_entries: int = 10_000,
+    ):
+        """
+        Args:
+            db: SQLAlchemy Session
+            default_ttl_hours: TTL für Kategorien ohne eigenen Eintrag
+            ttl_hours: TTL pro Kategorie (0 = Kategorie wird nicht gecacht)
+            max_entries: Maximale Anzahl Einträge, darüber werden die am längsten
+                nicht genutzten Einträge verdrängt
+        """
+        self.db = db
+        self.default_ttl_hours = default_ttl_hours
+        self.ttl_hours = ttl_hours or {}
+        self.max_entries = max_entries
+
+    @classmethod
+    def from_config(cls, db: Session, settings: Any, industry_config: dict[str, Any]) -> "ResponseCache":
+        """
+        Erstellt den Cache aus Settings und dem `cache:`-Block der Industry Config.
+
+        Args:
+            db: SQLAlchemy Session
+            settings: App Settings (LLM_CACHE_*)
+            industry_config: Geparste YAML-Config
+
+        Returns:
+            ResponseCache-Instanz
+        """
+        cache_config = industry_config.get("cache", {}) or {}
+        ttl_config = dict(cache_config.get("ttl_hours", {}) or {})
+        default_ttl = ttl_config.pop("default", settings.LLM_CACHE_DEFAULT_TTL_HOURS)
+
+        return cls(
+            db,
+            default_ttl_hours=float(default_ttl),
+            ttl_hours={k: float(v) for k, v in ttl_config.items()},
+            max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+        )
+
+    @staticmethod
+    def make_key(platform: str, model: str, system_prompt: str, query: str) -> str:
+        """Cache-Key: SHA-256 über (platform, model, system prompt, query)."""
+        raw = "\x1f".join([platform, model, system_prompt, query])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def ttl_for(self, category: str | None) -> float:
+        """TTL in Stunden für eine Query-Kategorie."""
+        if category and category in self.ttl_hours:
+            return self.ttl_hours[category]
+        return self.default_ttl_hours
+
+    def get(
+        self,
+        platform: str,
+        model: str,
+        system_prompt: str,
+        query: str
+    ) -> LLMResponseCache | None:
+        """
+        Liefert einen gültigen Cache-Eintrag oder None.
+        Abgelaufene Einträge werden dabei entfernt.
+        """
+        key = self.make_key(platform, model, system_prompt, query)
+        entry = self.db.get(LLMResponseCache, key)
+        if entry is None:
+            return None
+
+        now = _utcnow()
+        if entry.expires_at <= now:
+            self.db.delete(entry)
+            self.db.flush()
+            return None
+
+        entry.hit_count = (entry.hit_count or 0) + 1
+        entry.last_accessed_at = now
+        return entry
+
+    def put(
+        self,
+        platform: str,
+        model: str,
+        system_prompt: str,
+        query: str,
+        category: str | None,
+        response_text: str,
+        usage: dict[str, int],
+    ) -> None:
+        """
+        Speichert eine erfolgreiche Antwort im Cache.
+
+        Args:
+            platform: Plattform-Name
+            model: Model-ID
+            system_prompt: Verwendeter System Prompt
+            query: Query-Text
+            category: Query-Kategorie (bestimmt die TTL)
+            response_text: LLM-Antwort
+            usage: Token-Usage des ursprünglichen Calls
+        """
+        ttl = self.ttl_for(category)
+        if ttl <= 0 or not response_text:
+            return
+
+        now = _utcnow()
+        key = self.make_key(platform, model, system_prompt, query)
+        values = {
+            "platform": platform,
+            "model": model,
+            "query": query,
+            "category": category,
+            "response_text": response_text,
+            "input_tokens": usage.get("input_tokens", 0),
+            "output_tokens": usage.get("output_tokens", 0),
+            "total_tokens": usage.get("total_tokens", 0),
+            "last_accessed_at": now,
+            "expires_at": now + timedelta(hours=ttl),
+        }
+
+        entry = self.db.get(LLMResponseCache, key)
+        if entry is not None:
+            for field, value in values.items():
+                setattr(entry, field, value)
+        else:
+            try:
+                # Savepoint, damit ein paralleler Insert nicht die ganze Scan-Transaktion kippt
+                with self.db.begin_nested():
+                    self.db.add(LLMResponseCache(cache_key=key, hit_count=0, created_at=now, **values))
+            except IntegrityError:
+                return
+
+        self._evict()
+
+    def _evict(self) -> None:
+        """Entfernt abgelaufene Einträge und verdrängt LRU-Einträge über max_entries."""
+        now = _utcnow()
+        self.db.query(LLMResponseCache).filter(
+            LLMResponseCache.expires_at <= now
+        ).delete(synchronize_session=False)
+
+        count = self.db.query(func.count(LLMResponseCache.cache_key)).scalar() or 0
+        overflow = count - self.max_entries
+        if overflow <= 0:
+            return
+
+        stale_keys = [
+            row[0] for row in (
+                self.db.query(LLMResponseCache.cache_key)
+                .order_by(LLMResponseCache.last_accessed_at.asc())
+                .limit(overflow)
+                .all()
+            )
+        ]
+        self.db.query(LLMResponseCache).filter(
+            LLMResponseCache.cache_key.in_(stale_keys)
+        ).delete(synchronize_session=False)
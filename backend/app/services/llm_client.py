@@ -1,38 +1,70 @@
 import asyncio
 import time
-from typing import Any
-
-import httpx
-from openai import AsyncOpenAI
-from anthropic import AsyncAnthropic
-from google import genai
+from typing import Any, AsyncIterator, Callable
 
 from app.config import Settings
+from app.services.llm_cache import ResponseCache
+from app.services.provider_errors import (
+    ProviderTimeoutError,
+    is_rate_limit_error,
+    is_retryable_error,
+    retry_after_of,
+)
+from app.services.provider_clients import ProviderClients
+from app.services.rate_limiter import ProviderRateLimiter, get_rate_limiter
+from app.services.resilience import CircuitBreakerRegistry, RetryPolicy, get_circuit_breakers
+from app.services.session_runner import SessionRunner
+
+MAX_OUTPUT_TOKENS = 1000
+CHARS_PER_TOKEN = 4
 
 
 class LLMClient:
     """Client für parallele Queries an ChatGPT, Claude, Gemini, Perplexity."""
 
-    def __init__(self, settings: Settings):
+    def __init__(
+        self,
+        settings: Settings,
+        cache: ResponseCache | None = None,
+        rate_limiter: ProviderRateLimiter | None = None,
+        retry_policy: RetryPolicy | None = None,
+        circuit_breakers: CircuitBreakerRegistry | None = None,
+        clients: ProviderClients | None = None,
+        db_runner: SessionRunner | None = None
+    ):
         """
-        Initialisiert API-Clients für alle Plattformen.
+        Initialisiert den Client auf Basis der geteilten Provider-Clients.
 
         Args:
             settings: Settings-Objekt mit API-Keys
+            cache: Optionaler Response-Cache vor den Provider-Calls
+            rate_limiter: Rate Limiter (Default: prozessweiter Limiter aus Settings)
+            retry_policy: Retry-Strategie (Default: aus Settings)
+            circuit_breakers: Circuit Breaker pro Plattform (Default: prozessweite Registry)
+            clients: Gepoolte Provider-Clients (Default: eigene Instanz, z.B. für CLI-Skripte;
+                dann mit aclose() schließen)
+            db_runner: Führt die Cache-Zugriffe auf die DB-Session außerhalb des
+                Event-Loops aus (Default: direkt im Event-Loop)
         """
         self.settings = settings
-
-        # OpenAI Client
-        self.openai_client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY) if settings.OPENAI_API_KEY else None
-
-        # Anthropic Client
-        self.anthropic_client = AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY) if settings.ANTHROPIC_API_KEY else None
-
-        # Google Gemini
-        self.gemini_client = genai.Client(api_key=settings.GOOGLE_API_KEY) if settings.GOOGLE_API_KEY else None
-
-        # Perplexity (HTTP Client)
-        self.perplexity_api_key = settings.PERPLEXITY_API_KEY
+        self.cache = cache
+        self.db_runner = db_runner
+        if rate_limiter is None and settings.LLM_RATE_LIMIT_ENABLED:
+            rate_limiter = get_rate_limiter(settings)
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy or RetryPolicy.from_settings(settings)
+        if circuit_breakers is None and settings.LLM_CIRCUIT_BREAKER_ENABLED:
+            circuit_breakers = get_circuit_breakers(settings)
+        self.circuit_breakers = circuit_breakers
+
+        # Provider-Clients (Connection-Pools) werden prozessweit geteilt;
+        # eigene Clients (ohne clients-Argument) schließt aclose()
+        self._owns_clients = clients is None
+        self.clients = clients or ProviderClients(settings)
+        self.openai_client = self.clients.openai
+        self.anthropic_client = self.clients.anthropic
+        self.gemini_client = self.clients.gemini
+        self.perplexity_client = self.clients.perplexity
 
         # System Prompt für alle Plattformen
         self.system_prompt = (
@@ -40,38 +72,95 @@ class LLMClient:
             "ausführlich und nenne konkrete Unternehmen/Anbieter wenn möglich."
         )
 
+    async def aclose(self) -> None:
+        """Schließt die Provider-Clients, wenn sie nicht von außen übergeben wurden."""
+        if self._owns_clients:
+            await self.clients.aclose()
+
     async def query_platform(
         self,
         platform: str,
         query: str,
-        model: str
+        model: str,
+        category: str | None = None,
+        timeout_s: float | None = None
     ) -> dict[str, Any]:
         """
         Sendet eine Query an eine spezifische Plattform.
 
+        Ist ein Cache konfiguriert, werden gültige Cache-Einträge ohne
+        Provider-Call zurückgegeben (cache_hit=True, Token-Verbrauch 0).
+
+        Vorübergehende Fehler (429, 5xx, Timeouts) werden mit Jitter-Backoff
+        wiederholt, Retry-After wird respektiert, alle Versuche zusammen
+        bleiben innerhalb der Deadline (timeout_s bzw. LLM_CALL_DEADLINE_S).
+        Ist der Circuit Breaker der Plattform offen, schlägt der Call sofort fehl.
+
+        Läuft die Deadline ab, enthält das Fehler-Ergebnis den bis dahin
+        bekannten Token-Verbrauch (gesendete Prompts), damit die Kosten
+        trotzdem erfasst werden.
+
         Args:
             platform: Name der Plattform (chatgpt, claude, gemini, perplexity)
             query: Die zu stellende Frage
             model: Model-ID für die Plattform
+            category: Query-Kategorie (steuert die Cache-TTL)
+            timeout_s: Deadline für diesen Call inkl. Retries (Default: LLM_CALL_DEADLINE_S)
 
         Returns:
             Dictionary mit Ergebnis und Metadaten
         """
+        cached = await self.cached_response(platform, query, model)
+        if cached is not None:
+            return cached
+
+        breaker = self.circuit_breakers.for_platform(platform) if self.circuit_breakers else None
         start_time = time.time()
+        deadline = time.monotonic() + (timeout_s or self.retry_policy.deadline_s)
+        attempt = 0
+        # Token-Verbrauch abgebrochener Versuche (z.B. Timeout nach gesendetem Prompt)
+        partial_usage = {"input_tokens": 0, "output_tokens": 0, "total_tokens": 0}
+
+        while True:
+            if breaker is not None and not breaker.allow_request():
+                return self._error_result(
+                    platform, query, model,
+                    f"Circuit Breaker offen für {platform} (nächster Versuch in {breaker.retry_in():.0f}s)",
+                    start_time, attempt, partial_usage,
+                )
+
+            attempt += 1
+            try:
+                response_text, usage = await self._call_provider(platform, query, model, deadline)
+            except Exception as e:
+                for field, value in getattr(e, "usage", {}).items():
+                    partial_usage[field] = partial_usage.get(field, 0) + value
+
+                retryable = is_retryable_error(e)
+                if breaker is not None:
+                    # Dauerhafte Fehler (400, 401, ...) zeigen, dass der Provider erreichbar ist
+                    if retryable:
+                        breaker.record_failure()
+                    else:
+                        breaker.record_success()
+
+                delay = self.retry_policy.backoff(attempt, retry_after_of(e))
+                if (
+                    not retryable
+                    or attempt >= self.retry_policy.max_attempts
+                    or time.monotonic() + delay >= deadline
+                ):
+                    return self._error_result(
+                        platform, query, model, str(e) or type(e).__name__, start_time, attempt, partial_usage
+                    )
+
+                await asyncio.sleep(delay)
+                continue
 
-        try:
-            if platform == "chatgpt":
-                response_text, usage = await self._query_chatgpt(query, model)
-            elif platform == "claude":
-                response_text, usage = await self._query_claude(query, model)
-            elif platform == "gemini":
-                response_text, usage = await self._query_gemini(query, model)
-            elif platform == "perplexity":
-                response_text, usage = await self._query_perplexity(query, model)
-            else:
-                raise ValueError(f"Unbekannte Plattform: {platform}")
+            if breaker is not None:
+                breaker.record_success()
 
-            latency_ms = int((time.time() - start_time) * 1000)
+            await self.store_response(platform, query, model, category, response_text, usage)
 
             return {
                 "platform": platform,
@@ -80,96 +169,267 @@ class LLMClient:
                 "response_text": response_text,
                 "success": True,
                 "error": None,
-                "latency_ms": latency_ms,
+                "latency_ms": int((time.time() - start_time) * 1000),
                 "input_tokens": usage.get("input_tokens", 0),
                 "output_tokens": usage.get("output_tokens", 0),
                 "total_tokens": usage.get("total_tokens", 0),
+                "cache_hit": False,
+                "attempts": attempt,
             }
 
+    async def cached_response(self, platform: str, query: str, model: str) -> dict[str, Any] | None:
+        """
+        Liefert das Ergebnis aus dem Response-Cache (oder None ohne Cache/Treffer).
+
+        Args:
+            platform: Name der Plattform
+            query: Die zu stellende Frage
+            model: Model-ID für die Plattform
+
+        Returns:
+            Ergebnis-Dictionary mit cache_hit=True oder None
+        """
+        if self.cache is None:
+            return None
+
+        entry = await self._run_db(self.cache.get, platform, model, self.system_prompt, query)
+        if entry is None:
+            return None
+
+        return {
+            "platform": platform,
+            "query": query,
+            "model": model,
+            "response_text": entry.response_text,
+            "success": True,
+            "error": None,
+            "latency_ms": 0,
+            "input_tokens": 0,
+            "output_tokens": 0,
+            "total_tokens": 0,
+            "cache_hit": True,
+            "cached_usage": {
+                "input_tokens": entry.input_tokens,
+                "output_tokens": entry.output_tokens,
+                "total_tokens": entry.total_tokens,
+            },
+        }
+
+    async def store_response(
+        self,
+        platform: str,
+        query: str,
+        model: str,
+        category: str | None,
+        response_text: str,
+        usage: dict[str, int]
+    ) -> None:
+        """Legt eine erfolgreiche Antwort im Response-Cache ab (falls konfiguriert)."""
+        if self.cache is not None:
+            await self._run_db(
+                self.cache.put, platform, model, self.system_prompt, query, category, response_text, usage
+            )
+
+    async def _run_db(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Cache-Zugriff über den db_runner (oder direkt, ohne Runner)."""
+        if self.db_runner is None:
+            return fn(*args)
+        return await self.db_runner.run(fn, *args)
+
+    async def _call_provider(
+        self,
+        platform: str,
+        query: str,
+        model: str,
+        deadline: float
+    ) -> tuple[str, dict[str, int]]:
+        """
+        Ein einzelner Provider-Call durch den Rate Limiter, begrenzt durch die Deadline.
+
+        Args:
+            platform: Name der Plattform
+            query: Die zu stellende Frage
+            model: Model-ID für die Plattform
+            deadline: Spätester Zeitpunkt (time.monotonic) für das Ergebnis
+
+        Returns:
+            Tuple aus Response-Text und Token-Usage-Dict
+        """
+        limiter = self.rate_limiter.for_model(platform, model) if self.rate_limiter else None
+        estimated_tokens = self._estimate_tokens(query)
+        actual_tokens: int | None = None
+
+        if limiter is not None:
+            try:
+                await asyncio.wait_for(limiter.acquire(estimated_tokens), max(0.0, deadline - time.monotonic()))
+            except asyncio.TimeoutError:
+                raise ProviderTimeoutError("Timeout beim Warten auf das Rate Limit") from None
+
+        try:
+            if platform == "chatgpt":
+                call = self._query_chatgpt(query, model)
+            elif platform == "claude":
+                call = self._query_claude(query, model)
+            elif platform == "gemini":
+                call = self._query_gemini(query, model)
+            elif platform == "perplexity":
+                call = self._query_perplexity(query, model)
+            else:
+                raise ValueError(f"Unbekannte Plattform: {platform}")
+
+            remaining = max(0.0, deadline - time.monotonic())
+            try:
+                response_text, usage = await asyncio.wait_for(call, remaining)
+            except asyncio.TimeoutError:
+                # Der Prompt wurde gesendet und wird berechnet, der Output ist unbekannt
+                prompt_tokens = self._estimate_prompt_tokens(query)
+                raise ProviderTimeoutError(
+                    f"Timeout nach {remaining:.0f}s",
+                    {"input_tokens": prompt_tokens, "output_tokens": 0, "total_tokens": prompt_tokens},
+                ) from None
+            actual_tokens = usage.get("total_tokens") or estimated_tokens
+
+            if limiter is not None:
+                limiter.on_success()
+
+            return response_text, usage
+
         except Exception as e:
-            latency_ms = int((time.time() - start_time) * 1000)
+            if limiter is not None and is_rate_limit_error(e):
+                # Abgelehnte Calls verbrauchen keine Tokens → Reservierung zurückgeben
+                actual_tokens = 0
+                limiter.on_rate_limited(retry_after_of(e))
+            raise
 
-            return {
-                "platform": platform,
-                "query": query,
-                "model": model,
-                "response_text": "",
-                "success": False,
-                "error": str(e),
-                "latency_ms": latency_ms,
-                "input_tokens": 0,
-                "output_tokens": 0,
-                "total_tokens": 0,
-            }
+        finally:
+            if limiter is not None:
+                limiter.release(estimated_tokens, actual_tokens)
+
+    def _error_result(
+        self,
+        platform: str,
+        query: str,
+        model: str,
+        error: str,
+        start_time: float,
+        attempts: int,
+        usage: dict[str, int]
+    ) -> dict[str, Any]:
+        """Ergebnis-Dictionary für einen endgültig fehlgeschlagenen Call (mit bekanntem Token-Verbrauch)."""
+        return {
+            "platform": platform,
+            "query": query,
+            "model": model,
+            "response_text": "",
+            "success": False,
+            "error": error,
+            "latency_ms": int((time.time() - start_time) * 1000),
+            "input_tokens": usage.get("input_tokens", 0),
+            "output_tokens": usage.get("output_tokens", 0),
+            "total_tokens": usage.get("total_tokens", 0),
+            "cache_hit": False,
+            "attempts": attempts,
+        }
 
     async def query_all_platforms(
         self,
         query: str,
-        platforms: dict[str, dict[str, Any]]
+        platforms: dict[str, dict[str, Any]],
+        category: str | None = None
     ) -> list[dict[str, Any]]:
         """
         Queries alle Plattformen parallel.
 
+        Jede Plattform hat ihre eigene Deadline (siehe timeout_for); ein
+        hängender Provider kostet daher nur sein eigenes Ergebnis.
+
         Args:
             query: Die zu stellende Frage
             platforms: Dict mit platform -> {model, weight} aus Industry Config
+            category: Query-Kategorie (steuert die Cache-TTL)
 
         Returns:
-            Liste von Ergebnis-Dictionaries
+            Liste von Ergebnis-Dictionaries (in Reihenfolge der Fertigstellung)
         """
-        tasks = []
-        attempted_platforms: list[str] = []
+        return [result async for result in self.iter_platforms(query, platforms, category)]
 
-        for platform_name, platform_config in platforms.items():
-            model = platform_config.get("model", "")
+    async def iter_platforms(
+        self,
+        query: str,
+        platforms: dict[str, dict[str, Any]],
+        category: str | None = None
+    ) -> AsyncIterator[dict[str, Any]]:
+        """
+        Queries alle Plattformen parallel und liefert jedes Ergebnis, sobald es vorliegt.
 
-            # Überspringe Plattform wenn kein API-Key vorhanden
-            if not self._has_api_key(platform_name):
-                continue
+        Args:
+            query: Die zu stellende Frage
+            platforms: Dict mit platform -> {model, weight, timeout_s} aus Industry Config
+            category: Query-Kategorie (steuert die Cache-TTL)
 
-            task = self.query_platform(platform_name, query, model)
-            tasks.append(task)
-            attempted_platforms.append(platform_name)
+        Yields:
+            Ergebnis-Dictionaries in Reihenfolge der Fertigstellung
+        """
+        tasks = [
+            asyncio.create_task(self.query_platform(
+                platform_name,
+                query,
+                platform_config.get("model", ""),
+                category,
+                self.timeout_for(platform_config),
+            ))
+            for platform_name, platform_config in self.available_platforms(platforms).items()
+        ]
 
-        # Parallel ausführen mit 60s Timeout
-        timeout_s = 60.0
         try:
-            results = await asyncio.wait_for(
-                asyncio.gather(*tasks, return_exceptions=True),
-                timeout=timeout_s
-            )
-        except asyncio.TimeoutError:
-            results = [
-                {
-                    "platform": p,
-                    "query": query,
-                    "model": platforms[p].get("model", ""),
-                    "response_text": "",
-                    "success": False,
-                    "error": f"Timeout nach {int(timeout_s)}s",
-                    "latency_ms": int(timeout_s * 1000),
-                }
-                for p in attempted_platforms
-            ]
-
-        # Filter exceptions
-        processed_results = []
-        for result in results:
-            if isinstance(result, dict):
-                processed_results.append(result)
-            elif isinstance(result, Exception):
-                # Exception wurde von gather() returned
-                processed_results.append({
-                    "platform": "unknown",
-                    "query": query,
-                    "model": "",
-                    "response_text": "",
-                    "success": False,
-                    "error": str(result),
-                    "latency_ms": 0,
-                })
-
-        return processed_results
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def timeout_for(self, platform_config: dict[str, Any]) -> float:
+        """
+        Deadline pro Call für eine Plattform-Konfiguration.
+
+        Reihenfolge: `timeout_s` aus der Industry Config, LLM_MODEL_TIMEOUTS
+        für das Modell, LLM_CALL_DEADLINE_S.
+
+        Args:
+            platform_config: {model, weight, timeout_s} aus Industry Config
+
+        Returns:
+            Deadline in Sekunden
+        """
+        timeout_s = platform_config.get("timeout_s")
+        if timeout_s:
+            return float(timeout_s)
+        model = platform_config.get("model", "")
+        return float(self.settings.LLM_MODEL_TIMEOUTS.get(model) or self.settings.LLM_CALL_DEADLINE_S)
+
+    def available_platforms(self, platforms: dict[str, dict[str, Any]]) -> dict[str, dict[str, Any]]:
+        """
+        Filtert die konfigurierten Plattformen auf die mit vorhandenem API-Key.
+
+        Args:
+            platforms: Dict mit platform -> {model, weight} aus Industry Config
+
+        Returns:
+            Gefiltertes Dict
+        """
+        return {
+            name: config for name, config in platforms.items()
+            if self._has_api_key(name)
+        }
+
+    def _estimate_prompt_tokens(self, query: str) -> int:
+        """Grobe Token-Schätzung für System Prompt + Query."""
+        return (len(self.system_prompt) + len(query)) // CHARS_PER_TOKEN
+
+    def _estimate_tokens(self, query: str) -> int:
+        """Konservative Token-Schätzung für die TPM-Reservierung (Prompt + maximaler Output)."""
+        return self._estimate_prompt_tokens(query) + MAX_OUTPUT_TOKENS
 
     def _has_api_key(self, platform: str) -> bool:
         """Prüft ob API-Key für Plattform vorhanden ist."""
@@ -180,7 +440,7 @@ class LLMClient:
         elif platform == "gemini":
             return bool(self.settings.GOOGLE_API_KEY)
         elif platform == "perplexity":
-            return bool(self.perplexity_api_key)
+            return bool(self.settings.PERPLEXITY_API_KEY)
         return False
 
     async def _query_chatgpt(self, query: str, model: str) -> tuple[str, dict[str, int]]:
@@ -204,7 +464,7 @@ class LLMClient:
                 {"role": "user", "content": query}
             ],
             temperature=0.7,
-            max_completion_tokens=1000,
+            max_completion_tokens=MAX_OUTPUT_TOKENS,
         )
 
         usage = {}
@@ -233,7 +493,7 @@ class LLMClient:
 
         message = await self.anthropic_client.messages.create(
             model=model,
-            max_tokens=1000,
+            max_tokens=MAX_OUTPUT_TOKENS,
             system=self.system_prompt,
             messages=[
                 {"role": "user", "content": query}
@@ -267,26 +527,22 @@ class LLMClient:
         if not self.gemini_client:
             raise ValueError("Google API Key nicht konfiguriert")
 
-        loop = asyncio.get_event_loop()
-
-        def sync_query():
-            full_prompt = f"{self.system_prompt}\n\n{query}"
-            response = self.gemini_client.models.generate_content(
-                model=model,
-                contents=full_prompt,
-            )
-
-            usage = {}
-            if response.usage_metadata:
-                usage = {
-                    "input_tokens": response.usage_metadata.prompt_token_count or 0,
-                    "output_tokens": response.usage_metadata.candidates_token_count or 0,
-                    "total_tokens": response.usage_metadata.total_token_count or 0,
-                }
+        # Native async API des SDKs — läuft auf dem Event Loop statt im Default-Threadpool
+        full_prompt = f"{self.system_prompt}\n\n{query}"
+        response = await self.gemini_client.aio.models.generate_content(
+            model=model,
+            contents=full_prompt,
+        )
 
-            return response.text, usage
+        usage = {}
+        if response.usage_metadata:
+            usage = {
+                "input_tokens": response.usage_metadata.prompt_token_count or 0,
+                "output_tokens": response.usage_metadata.candidates_token_count or 0,
+                "total_tokens": response.usage_metadata.total_token_count or 0,
+            }
 
-        return await loop.run_in_executor(None, sync_query)
+        return response.text or "", usage
 
     async def _query_perplexity(self, query: str, model: str) -> tuple[str, dict[str, int]]:
         """
@@ -299,16 +555,9 @@ class LLMClient:
         Returns:
             Tuple aus Response-Text und Token-Usage-Dict
         """
-        if not self.perplexity_api_key:
+        if not self.perplexity_client:
             raise ValueError("Perplexity API Key nicht konfiguriert")
 
-        url = "https://api.perplexity.ai/chat/completions"
-
-        headers = {
-            "Authorization": f"Bearer {self.perplexity_api_key}",
-            "Content-Type": "application/json",
-        }
-
         payload = {
             "model": model,
             "messages": [
@@ -316,22 +565,21 @@ class LLMClient:
                 {"role": "user", "content": query}
             ],
             "temperature": 0.7,
-            "max_tokens": 1000,
+            "max_tokens": MAX_OUTPUT_TOKENS,
         }
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(url, json=payload, headers=headers)
-            response.raise_for_status()
+        response = await self.perplexity_client.post("/chat/completions", json=payload)
+        response.raise_for_status()
 
-            data = response.json()
-            text = data["choices"][0]["message"]["content"]
+        data = response.json()
+        text = data["choices"][0]["message"]["content"]
 
-            usage = {}
-            if "usage" in data:
-                usage = {
-                    "input_tokens": data["usage"].get("prompt_tokens", 0),
-                    "output_tokens": data["usage"].get("completion_tokens", 0),
-                    "total_tokens": data["usage"].get("total_tokens", 0),
-                }
+        usage = {}
+        if "usage" in data:
+            usage = {
+                "input_tokens": data["usage"].get("prompt_tokens", 0),
+                "output_tokens": data["usage"].get("completion_tokens", 0),
+                "total_tokens": data["usage"].get("total_tokens", 0),
+            }
 
-            return text, usage
+        return text, usage
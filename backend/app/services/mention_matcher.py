@@ -0,0 +1,215 @@
+"""
+Mention Matcher.
+Aho-Corasick-Automat über alle Firmennamen, Domains, Namensvarianten und
+bekannten Wettbewerber einer Industry — jede Antwort wird genau einmal
+durchlaufen, statt pro Firma und Pattern eine Regex zu kompilieren.
+"""
+import hashlib
+import json
+import re
+from collections import deque
+from typing import Any, Iterable
+
+# Fallback, wenn die Industry Config keine known_competitors enthält
+DEFAULT_COMPETITORS = [
+    "CrowdStrike", "Palo Alto Networks", "Fortinet", "Check Point",
+    "Cisco", "SentinelOne", "Trend Micro", "Sophos", "McAfee",
+    "Symantec", "FireEye", "Proofpoint", "Zscaler", "Okta",
+    "Tenable", "Rapid7", "Qualys", "Carbon Black", "Cylance"
+]
+
+
+def clean_domain(domain: str) -> str:
+    """Bereinigt eine Domain (ohne www./https://)."""
+    return domain.replace("www.", "").replace("https://", "").replace("http://", "")
+
+
+def generate_name_variants(company_name: str) -> list[str]:
+    """
+    Generiert Varianten des Firmennamens.
+
+    Args:
+        company_name: Ursprünglicher Firmenname
+
+    Returns:
+        Liste von Namens-Varianten
+    """
+    variants = []
+
+    # CamelCase -> Space-separated (z.B. "CrowdStrike" -> "Crowd Strike")
+    spaced = re.sub(r'([a-z])([A-Z])', r'\1 \2', company_name)
+    if spaced != company_name:
+        variants.append(spaced)
+
+    # Mit/ohne Bindestriche
+    if "-" in company_name:
+        variants.append(company_name.replace("-", " "))
+    elif " " in company_name:
+        variants.append(company_name.replace(" ", "-"))
+
+    return variants
+
+
+def _fold(text: str) -> str:
+    """Case-Folding, das die Zeichen-Offsets erhält (wie re.IGNORECASE)."""
+    folded = text.lower()
+    if len(folded) != len(text):
+        # z.B. "İ".lower() ergibt zwei Zeichen — dann zeichenweise falten
+        folded = "".join(ch.lower()[:1] for ch in text)
+    return folded
+
+
+class MentionMatcher:
+    """Findet alle registrierten Entitäten in einem Text in einem Durchlauf."""
+
+    def __init__(
+        self,
+        companies: Iterable[tuple[str, str]] = (),
+        competitors: Iterable[str] = ()
+    ):
+        """
+        Baut den Automaten.
+
+        Args:
+            companies: (Name, Domain)-Paare; Name, bereinigte Domain und
+                Namensvarianten werden als Patterns registriert
+            competitors: Namen bekannter Wettbewerber
+        """
+        # Pattern-Index -> (Länge, Entität, Typ)
+        self._patterns: list[tuple[int, str, str]] = []
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[list[int]] = [[]]
+        self.companies: dict[str, str] = {}
+        self.competitors: list[str] = []
+        self._last: tuple[str, list[dict[str, Any]]] | None = None
+
+        for name, domain in companies:
+            self.companies[name] = clean_domain(domain)
+            self._add(name, name, "name")
+            self._add(self.companies[name], name, "domain")
+            for variant in generate_name_variants(name):
+                self._add(variant, name, "variant")
+
+        for competitor in competitors:
+            self.competitors.append(competitor)
+            self._add(competitor, competitor, "competitor")
+
+        self._build()
+
+    def _add(self, pattern: str, entity: str, kind: str) -> None:
+        if not pattern:
+            return
+        node = 0
+        for ch in _fold(pattern):
+            next_node = self._goto[node].get(ch)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][ch] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = next_node
+        self._out[node].append(len(self._patterns))
+        self._patterns.append((len(pattern), entity, kind))
+
+    def _build(self) -> None:
+        """Fail-Links per Breitensuche setzen, Outputs entlang der Fail-Kette übernehmen."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(ch, 0)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def find(self, text: str) -> list[dict[str, Any]]:
+        """
+        Durchsucht den Text einmal nach allen Patterns (case-insensitive).
+
+        Überlappende Treffer desselben Patterns werden wie bei re.finditer
+        übersprungen. Das Ergebnis für den zuletzt durchsuchten Text wird
+        gemerkt — im Sweep wird dieselbe Antwort für jede Firma analysiert.
+        Der Matcher wird von Scans in mehreren Threads geteilt: das Memo wird
+        deshalb nur einmal gelesen und als Ganzes ersetzt.
+
+        Args:
+            text: Zu durchsuchender Text
+
+        Returns:
+            Liste von Treffern {entity, kind, start, end}, sortiert nach Position
+        """
+        last = self._last
+        if last is not None and last[0] == text:
+            return last[1]
+
+        goto, fail, out, patterns = self._goto, self._fail, self._out, self._patterns
+        last_end: dict[int, int] = {}
+        hits: list[dict[str, Any]] = []
+        node = 0
+        for i, ch in enumerate(_fold(text)):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for index in out[node]:
+                length, entity, kind = patterns[index]
+                start = i - length + 1
+                if start < last_end.get(index, 0):
+                    continue
+                last_end[index] = i + 1
+                hits.append({"entity": entity, "kind": kind, "start": start, "end": i + 1})
+
+        hits.sort(key=lambda hit: hit["start"])
+        self._last = (text, hits)
+        return hits
+
+
+# Industry -> (Fingerprint, Matcher); es wird nur die aktuelle Version gehalten
+_industry_matchers: dict[str, tuple[str, MentionMatcher]] = {}
+
+
+def matcher_fingerprint(industry_config: dict[str, Any], companies: Iterable[tuple[str, str]]) -> str:
+    """Hash über Config-Version, Wettbewerber und Firmenliste."""
+    payload = json.dumps(
+        [
+            industry_config.get("queries", {}).get("version", "unknown"),
+            industry_config.get("known_competitors") or [],
+            sorted(companies),
+        ],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def get_industry_matcher(
+    industry_id: str,
+    industry_config: dict[str, Any],
+    companies: Iterable[tuple[str, str]]
+) -> MentionMatcher:
+    """
+    Liefert den gecachten Matcher einer Industry. Neu gebaut wird nur,
+    wenn sich Firmen, Wettbewerber oder die Config-Version geändert haben.
+
+    Args:
+        industry_id: ID der Industry
+        industry_config: Industry Config (known_competitors, queries.version)
+        companies: (Name, Domain)-Paare aller Firmen der Industry
+
+    Returns:
+        MentionMatcher
+    """
+    companies = list(companies)
+    fingerprint = matcher_fingerprint(industry_config, companies)
+    cached = _industry_matchers.get(industry_id)
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+
+    matcher = MentionMatcher(
+        companies=companies,
+        competitors=industry_config.get("known_competitors") or DEFAULT_COMPETITORS,
+    )
+    _industry_matchers[industry_id] = (fingerprint, matcher)
+    return matcher
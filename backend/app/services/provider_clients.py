@@ -0,0 +1,106 @@
+"""
+Provider Clients.
+Langlebige, gepoolte SDK-Clients pro Provider — einmal pro Prozess erstellt
+(FastAPI-Lifespan bzw. Worker) und von allen Scans geteilt.
+"""
+import importlib.util
+import logging
+from typing import Any, Callable
+
+import anthropic
+import httpx
+import openai
+from google import genai
+from google.genai import types as genai_types
+
+from app.config import Settings
+
+logger = logging.getLogger(__name__)
+
+PERPLEXITY_BASE_URL = "https://api.perplexity.ai"
+ANTHROPIC_VERSION = "2023-06-01"
+
+
+def http2_available() -> bool:
+    """HTTP/2 benötigt das optionale Paket `h2` (httpx[http2])."""
+    return importlib.util.find_spec("h2") is not None
+
+
+class ProviderClients:
+    """Hält einen Client (mit eigenem Connection-Pool) pro Provider."""
+
+    def __init__(self, settings: Settings):
+        """
+        Erstellt die Clients für alle Provider mit API-Key.
+
+        Args:
+            settings: Settings mit API-Keys und LLM_HTTP_* Pool-Einstellungen
+        """
+        self.settings = settings
+        self.http2 = settings.LLM_HTTP2 and http2_available()
+        if settings.LLM_HTTP2 and not self.http2:
+            logger.info("LLM_HTTP2 aktiv, aber Paket 'h2' fehlt — nutze HTTP/1.1")
+
+        self._http_clients: list[Any] = []
+
+        # SDK-interne Retries sind deaktiviert, Retries übernimmt LLMClient.query_platform
+        # (die SDKs bringen ihre eigene httpx-Client-Klasse mit)
+        self.openai = openai.AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            base_url=settings.OPENAI_BASE_URL,
+            max_retries=0,
+            http_client=self._http_client(openai.DefaultAsyncHttpxClient),
+        ) if settings.OPENAI_API_KEY else None
+
+        self.anthropic = anthropic.AsyncAnthropic(
+            api_key=settings.ANTHROPIC_API_KEY,
+            base_url=settings.ANTHROPIC_BASE_URL,
+            max_retries=0,
+            http_client=self._http_client(anthropic.DefaultAsyncHttpxClient),
+        ) if settings.ANTHROPIC_API_KEY else None
+
+        self.gemini = genai.Client(
+            api_key=settings.GOOGLE_API_KEY,
+            http_options=genai_types.HttpOptions(httpx_async_client=self._http_client()),
+        ) if settings.GOOGLE_API_KEY else None
+
+        self.perplexity = self._http_client(
+            base_url=PERPLEXITY_BASE_URL,
+            headers={"Authorization": f"Bearer {settings.PERPLEXITY_API_KEY}"},
+        ) if settings.PERPLEXITY_API_KEY else None
+
+        # Rohe HTTP-Clients für die Batch-Endpoints (Dateien/Batches), siehe batch_client.py
+        self.openai_http = self._http_client(
+            base_url=settings.OPENAI_BASE_URL,
+            headers={"Authorization": f"Bearer {settings.OPENAI_API_KEY}"},
+        ) if settings.OPENAI_API_KEY else None
+
+        self.anthropic_http = self._http_client(
+            base_url=settings.ANTHROPIC_BASE_URL,
+            headers={"x-api-key": settings.ANTHROPIC_API_KEY, "anthropic-version": ANTHROPIC_VERSION},
+        ) if settings.ANTHROPIC_API_KEY else None
+
+    def _http_client(self, factory: Callable[..., Any] = httpx.AsyncClient, **kwargs: Any) -> Any:
+        """Erstellt einen httpx-Client mit den konfigurierten Pool-Limits."""
+        client = factory(
+            http2=self.http2,
+            timeout=httpx.Timeout(self.settings.LLM_HTTP_TIMEOUT_S),
+            limits=httpx.Limits(
+                max_connections=self.settings.LLM_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=self.settings.LLM_HTTP_MAX_KEEPALIVE,
+                keepalive_expiry=self.settings.LLM_HTTP_KEEPALIVE_EXPIRY_S,
+            ),
+            **kwargs,
+        )
+        self._http_clients.append(client)
+        return client
+
+    async def aclose(self) -> None:
+        """Schließt alle Connection-Pools (beim Shutdown)."""
+        if self.openai is not None:
+            await self.openai.close()
+        if self.anthropic is not None:
+            await self.anthropic.close()
+        for client in self._http_clients:
+            if not client.is_closed:
+                await client.aclose()
@@ -0,0 +1,99 @@
+"""
+Provider Errors.
+Einheitliche Auswertung der Exceptions von OpenAI, Anthropic, Gemini und httpx.
+"""
+import asyncio
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any
+
+import anthropic
+import httpx
+import openai
+
+
+def status_code_of(exc: BaseException) -> int | None:
+    """
+    Liefert den HTTP-Statuscode einer Provider-Exception (falls vorhanden).
+
+    Unterstützt openai/anthropic (status_code), google-genai (code) und
+    httpx.HTTPStatusError (response.status_code).
+    """
+    for attr in ("status_code", "code"):
+        value = getattr(exc, attr, None)
+        if isinstance(value, int):
+            return value
+
+    response = getattr(exc, "response", None)
+    value = getattr(response, "status_code", None)
+    if isinstance(value, int):
+        return value
+
+    return None
+
+
+def is_rate_limit_error(exc: BaseException) -> bool:
+    """True bei HTTP 429 (Rate Limit / Quota erschöpft)."""
+    return status_code_of(exc) == 429
+
+
+def retry_after_of(exc: BaseException) -> float | None:
+    """
+    Liest den Retry-After-Header einer Provider-Exception in Sekunden.
+
+    Unterstützt sowohl Sekundenangaben als auch HTTP-Datumsangaben.
+    """
+    response = getattr(exc, "response", None)
+    headers: Any = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    raw = headers.get("retry-after-ms")
+    if raw:
+        try:
+            return max(0.0, float(raw) / 1000)
+        except ValueError:
+            pass
+
+    raw = headers.get("retry-after")
+    if not raw:
+        return None
+
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(raw)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+# Statuscodes, bei denen ein erneuter Versuch sinnvoll ist
+# (529 = Anthropic "overloaded")
+RETRYABLE_STATUS_CODES = {408, 409, 425, 429, 500, 502, 503, 504, 529}
+
+
+def is_retryable_error(exc: BaseException) -> bool:
+    """
+    True für vorübergehende Fehler: Rate Limits, 5xx, Timeouts und Verbindungsabbrüche.
+
+    Fehler wie 400/401/404 sind dauerhaft und werden nicht wiederholt.
+    """
+    if isinstance(exc, (asyncio.TimeoutError, httpx.TransportError)):
+        return True
+    if isinstance(exc, (openai.APIConnectionError, anthropic.APIConnectionError)):
+        return True
+    return status_code_of(exc) in RETRYABLE_STATUS_CODES
+
+
+class ProviderTimeoutError(asyncio.TimeoutError):
+    """Timeout eines Provider-Calls; `usage` enthält den bis dahin bekannten Token-Verbrauch."""
+
+    def __init__(self, message: str, usage: dict[str, int] | None = None):
+        super().__init__(message)
+        self.usage = usage or {}
@@ -36,25 +36,42 @@ class QueryGenerator:
         Returns:
             Liste von Query-Dictionaries mit query, category, intent
         """
-        queries = []
+        return self.generic_queries() + self.brand_queries(company_name)
 
-        # Generic Queries — identisch für alle Firmen
-        for q in self.query_config.get("generic", []):
-            queries.append({
+    def generic_queries(self) -> list[dict[str, str]]:
+        """
+        Gibt die Generic Queries zurück (identisch für alle Firmen).
+
+        Returns:
+            Liste von Query-Dictionaries mit query, category, intent
+        """
+        return [
+            {
                 "query": q["query"],
                 "category": q.get("category", "general"),
                 "intent": q.get("intent", ""),
-            })
+            }
+            for q in self.query_config.get("generic", [])
+        ]
+
+    def brand_queries(self, company_name: str) -> list[dict[str, str]]:
+        """
+        Gibt die Brand Queries mit eingesetztem Firmennamen zurück.
 
-        # Brand Queries — Firmenname einsetzen
-        for q in self.query_config.get("brand", []):
-            queries.append({
+        Args:
+            company_name: Name der Firma
+
+        Returns:
+            Liste von Query-Dictionaries mit query, category, intent
+        """
+        return [
+            {
                 "query": q["query"].format(company_name=company_name),
                 "category": q.get("category", "brand"),
                 "intent": q.get("intent", ""),
-            })
-
-        return queries
+            }
+            for q in self.query_config.get("brand", [])
+        ]
 
     @property
     def query_version(self) -> str:
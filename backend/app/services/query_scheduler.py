@@ -0,0 +1,300 @@
+"""
+Query Scheduler.
+Verteilt die (Query, Plattform)-Calls eines Scans mit begrenzter Parallelität
+bzw. über die Batch-APIs der Provider.
+"""
+import asyncio
+import inspect
+import logging
+import time
+from typing import Any, Awaitable, Callable
+
+from app.services.batch_client import BatchAPI, create_batch_apis
+from app.services.llm_client import MAX_OUTPUT_TOKENS, LLMClient
+
+logger = logging.getLogger(__name__)
+
+# Callback (job, platform_response); darf synchron sein oder ein Awaitable liefern
+ResultCallback = Callable[[dict[str, Any], dict[str, Any]], Awaitable[None] | None]
+
+
+async def _deliver(on_result: ResultCallback, job: dict[str, Any], response: dict[str, Any]) -> None:
+    outcome = on_result(job, response)
+    if inspect.isawaitable(outcome):
+        await outcome
+
+
+class QueryScheduler:
+    """Hält bis zu N (Query, Plattform)-Calls gleichzeitig in Flight, mit eigenem Limit pro Plattform."""
+
+    def __init__(
+        self,
+        llm_client: LLMClient,
+        max_concurrency: int = 8,
+        platform_limits: dict[str, int] | None = None,
+        default_platform_limit: int = 4,
+    ):
+        """
+        Args:
+            llm_client: LLMClient für die eigentlichen Provider-Calls
+            max_concurrency: Maximale Anzahl gleichzeitiger Calls insgesamt
+            platform_limits: Maximale gleichzeitige Calls pro Plattform
+            default_platform_limit: Limit für Plattformen ohne eigenen Eintrag
+        """
+        self.llm_client = llm_client
+        self.max_concurrency = max(1, max_concurrency)
+        self.platform_limits = platform_limits or {}
+        self.default_platform_limit = max(1, default_platform_limit)
+
+    @classmethod
+    def from_config(
+        cls,
+        llm_client: LLMClient,
+        settings: Any,
+        industry_config: dict[str, Any]
+    ) -> "QueryScheduler":
+        """
+        Erstellt den Scheduler aus Settings und `platforms.<name>.max_concurrency`.
+
+        Args:
+            llm_client: LLMClient
+            settings: App Settings (SCAN_*_CONCURRENCY)
+            industry_config: Geparste YAML-Config
+
+        Returns:
+            QueryScheduler-Instanz
+        """
+        platform_limits = {
+            platform: int(config["max_concurrency"])
+            for platform, config in industry_config.get("platforms", {}).items()
+            if config.get("max_concurrency")
+        }
+        return cls(
+            llm_client,
+            max_concurrency=settings.SCAN_MAX_CONCURRENCY,
+            platform_limits=platform_limits,
+            default_platform_limit=settings.SCAN_PLATFORM_CONCURRENCY,
+        )
+
+    def build_jobs(
+        self,
+        queries: list[dict[str, Any]],
+        platforms: dict[str, dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        """
+        Erzeugt einen Job pro (Query, Plattform) für alle Plattformen mit API-Key.
+
+        Args:
+            queries: Query-Dictionaries vom QueryGenerator
+            platforms: Dict mit platform -> {model, weight} aus Industry Config
+
+        Returns:
+            Liste von Job-Dictionaries (index, query_obj, platform, model, timeout_s)
+        """
+        available = self.llm_client.available_platforms(platforms)
+        jobs = []
+        for query_obj in queries:
+            for platform, config in available.items():
+                jobs.append({
+                    "index": len(jobs),
+                    "query_obj": query_obj,
+                    "platform": platform,
+                    "model": config.get("model", ""),
+                    "timeout_s": self.llm_client.timeout_for(config),
+                })
+        return jobs
+
+    async def run(
+        self,
+        jobs: list[dict[str, Any]],
+        on_result: ResultCallback
+    ) -> None:
+        """
+        Führt alle Jobs aus und ruft on_result auf, sobald ein Call fertig ist.
+
+        on_result läuft im aufrufenden Task (nicht parallel). Liefert er ein
+        Awaitable (z.B. DB-Arbeit über einen SessionRunner), wird es abgewartet,
+        bevor das nächste Ergebnis übergeben wird.
+
+        Args:
+            jobs: Jobs aus build_jobs()
+            on_result: Callback (job, platform_response)
+        """
+        if not jobs:
+            return
+
+        global_slots = asyncio.Semaphore(self.max_concurrency)
+        platform_slots = {
+            platform: asyncio.Semaphore(max(1, self.platform_limits.get(platform, self.default_platform_limit)))
+            for platform in {job["platform"] for job in jobs}
+        }
+
+        async def execute(job: dict[str, Any]) -> tuple[dict[str, Any], dict[str, Any]]:
+            # Erst Plattform-Slot, dann globalen Slot — sonst blockiert ein
+            # wartender Call einen globalen Slot, den eine andere Plattform nutzen könnte
+            async with platform_slots[job["platform"]]:
+                async with global_slots:
+                    query_obj = job["query_obj"]
+                    response = await self.llm_client.query_platform(
+                        job["platform"],
+                        query_obj.get("query", ""),
+                        job["model"],
+                        query_obj.get("category"),
+                        job.get("timeout_s"),
+                    )
+            return job, response
+
+        tasks = [asyncio.create_task(execute(job)) for job in jobs]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                job, response = await next_done
+                await _deliver(on_result, job, response)
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+
+class BatchScheduler(QueryScheduler):
+    """
+    Führt Jobs über die Batch-APIs der Provider aus (halber Preis, Latenz bis 24h).
+
+    Plattformen ohne Batch-API (oder ohne konfigurierten Batch-Client) laufen
+    weiter über die normale Parallel-Ausführung; Cache-Treffer werden ohne
+    Provider-Call beantwortet.
+    """
+
+    def __init__(
+        self,
+        llm_client: LLMClient,
+        batch_apis: dict[str, BatchAPI],
+        poll_interval_s: float = 60.0,
+        max_wait_s: float = 24 * 3600.0,
+        **kwargs: Any
+    ):
+        """
+        Args:
+            llm_client: LLMClient (Cache, System Prompt, Echtzeit-Fallback)
+            batch_apis: platform -> BatchAPI
+            poll_interval_s: Abstand zwischen Status-Abfragen
+            max_wait_s: Maximale Wartezeit pro Batch
+            **kwargs: Parameter für QueryScheduler (Echtzeit-Fallback)
+        """
+        super().__init__(llm_client, **kwargs)
+        self.batch_apis = batch_apis
+        self.poll_interval_s = poll_interval_s
+        self.max_wait_s = max_wait_s
+
+    @classmethod
+    def from_config(
+        cls,
+        llm_client: LLMClient,
+        settings: Any,
+        industry_config: dict[str, Any],
+        batch_apis: dict[str, BatchAPI] | None = None
+    ) -> "BatchScheduler":
+        """
+        Erstellt den Batch-Scheduler aus Settings und Industry Config.
+
+        Args:
+            llm_client: LLMClient
+            settings: App Settings (SCAN_*_CONCURRENCY, LLM_BATCH_*)
+            industry_config: Geparste YAML-Config
+            batch_apis: platform -> BatchAPI (Default: aus den Provider-Clients des LLMClient)
+
+        Returns:
+            BatchScheduler-Instanz
+        """
+        realtime = QueryScheduler.from_config(llm_client, settings, industry_config)
+        return cls(
+            llm_client,
+            batch_apis if batch_apis is not None else create_batch_apis(llm_client.clients, MAX_OUTPUT_TOKENS),
+            poll_interval_s=settings.LLM_BATCH_POLL_INTERVAL_S,
+            max_wait_s=settings.LLM_BATCH_MAX_WAIT_S,
+            max_concurrency=realtime.max_concurrency,
+            platform_limits=realtime.platform_limits,
+            default_platform_limit=realtime.default_platform_limit,
+        )
+
+    async def run(
+        self,
+        jobs: list[dict[str, Any]],
+        on_result: ResultCallback
+    ) -> None:
+        """
+        Führt alle Jobs aus; Batch-Ergebnisse werden nach Abschluss des jeweiligen
+        Provider-Batches an on_result übergeben (Antworten tragen batch=True).
+
+        Args:
+            jobs: Jobs aus build_jobs()
+            on_result: Callback (job, platform_response)
+        """
+        realtime_jobs: list[dict[str, Any]] = []
+        batch_jobs: dict[str, list[dict[str, Any]]] = {}
+
+        for job in jobs:
+            query = job["query_obj"].get("query", "")
+            cached = await self.llm_client.cached_response(job["platform"], query, job["model"])
+            if cached is not None:
+                await _deliver(on_result, job, cached)
+            elif job["platform"] in self.batch_apis:
+                batch_jobs.setdefault(job["platform"], []).append(job)
+            else:
+                realtime_jobs.append(job)
+
+        await asyncio.gather(
+            super().run(realtime_jobs, on_result),
+            *[self._run_batch(platform, platform_jobs, on_result) for platform, platform_jobs in batch_jobs.items()],
+        )
+
+    async def _run_batch(
+        self,
+        platform: str,
+        jobs: list[dict[str, Any]],
+        on_result: ResultCallback
+    ) -> None:
+        """Ein Provider-Batch pro Plattform; Fehler des Batches werden zu Fehler-Ergebnissen pro Job."""
+        requests = [
+            {
+                "custom_id": f"job-{job['index']}",
+                "model": job["model"],
+                "system_prompt": self.llm_client.system_prompt,
+                "query": job["query_obj"].get("query", ""),
+            }
+            for job in jobs
+        ]
+
+        started = time.monotonic()
+        try:
+            results = await self.batch_apis[platform].run(requests, self.poll_interval_s, self.max_wait_s)
+        except Exception as e:
+            logger.exception(f"{platform}: Batch fehlgeschlagen")
+            results = {request["custom_id"]: {"success": False, "error": str(e)} for request in requests}
+        latency_ms = int((time.monotonic() - started) * 1000)
+
+        for job, request in zip(jobs, requests):
+            result = results[request["custom_id"]]
+            query_obj = job["query_obj"]
+            usage = {
+                "input_tokens": result.get("input_tokens", 0),
+                "output_tokens": result.get("output_tokens", 0),
+                "total_tokens": result.get("total_tokens", 0),
+            }
+            if result.get("success"):
+                await self.llm_client.store_response(
+                    platform, request["query"], job["model"], query_obj.get("category"),
+                    result["response_text"], usage,
+                )
+
+            await _deliver(on_result, job, {
+                "platform": platform,
+                "query": request["query"],
+                "model": job["model"],
+                "response_text": result.get("response_text", ""),
+                "success": bool(result.get("success")),
+                "error": result.get("error"),
+                "latency_ms": latency_ms,
+                **usage,
+                "cache_hit": False,
+                "batch": True,
+            })
@@ -0,0 +1,147 @@
+"""
+Ranking Snapshot.
+Wählt den maßgeblichen completed Scan pro Company mit einer einzigen
+Window-Query aus und hält das Ergebnis in der Tabelle ranking_snapshot,
+damit /rankings/{industry_id} nur noch einen indizierten Read braucht.
+"""
+from datetime import datetime, timezone
+
+from sqlalchemy import case, delete, func, select
+from sqlalchemy.orm import Session
+
+from app.models import Company, RankingSnapshot, Scan
+from app.services.industry_stats import refresh_industry_stats
+
+
+def current_query_version(db: Session, industry_id: str) -> str | None:
+    """Die query_version, die bei completed Scans der Industry am häufigsten vorkommt."""
+    row = (
+        db.query(Scan.query_version, func.count(Scan.id))
+        .filter(Scan.industry_id == industry_id)
+        .filter(Scan.status == "completed")
+        .filter(Scan.query_version.isnot(None))
+        .group_by(Scan.query_version)
+        .order_by(func.count(Scan.id).desc())
+        .first()
+    )
+    return row[0] if row else None
+
+
+def latest_completed_scans(
+    db: Session,
+    industry_id: str,
+    current_version: str | None,
+    company_id: str | None = None
+) -> list[tuple[Company, Scan]]:
+    """
+    Neuester completed Scan pro Company in einer Query (ROW_NUMBER pro Company),
+    bevorzugt mit der aktuellen query_version.
+
+    Args:
+        db: SQLAlchemy Session
+        industry_id: ID der Industry
+        current_version: Bevorzugte query_version (siehe current_query_version)
+        company_id: Nur diese Company (inkrementelles Update)
+
+    Returns:
+        Liste von (Company, Scan)
+    """
+    version_first = case((Scan.query_version == current_version, 0), else_=1)
+    ranked = (
+        select(
+            Scan.id.label("scan_id"),
+            func.row_number().over(
+                partition_by=Scan.company_id,
+                order_by=[version_first, Scan.completed_at.desc()],
+            ).label("rn"),
+        )
+        .join(Company, Company.id == Scan.company_id)
+        .where(Company.industry_id == industry_id, Scan.status == "completed")
+    )
+    if company_id is not None:
+        ranked = ranked.where(Scan.company_id == company_id)
+    ranked = ranked.subquery()
+
+    rows = db.execute(
+        select(Company, Scan)
+        .join(Scan, Scan.company_id == Company.id)
+        .join(ranked, ranked.c.scan_id == Scan.id)
+        .where(ranked.c.rn == 1)
+    ).all()
+    return [(company, scan) for company, scan in rows]
+
+
+def _snapshot_row(company: Company, scan: Scan, ranking_version: str | None) -> RankingSnapshot:
+    return RankingSnapshot(
+        company_id=company.id,
+        industry_id=company.industry_id,
+        scan_id=scan.id,
+        company_name=company.name,
+        domain=company.domain,
+        overall_score=scan.overall_score,
+        platform_scores=scan.platform_scores or {},
+        query_version=scan.query_version,
+        ranking_version=ranking_version,
+        completed_at=scan.completed_at,
+        updated_at=datetime.now(timezone.utc),
+    )
+
+
+def rebuild_industry_snapshot(db: Session, industry_id: str) -> int:
+    """
+    Baut den Snapshot einer Industry komplett neu auf und aktualisiert die
+    Industry Stats (ohne Commit).
+
+    Returns:
+        Anzahl der Companies im Ranking
+    """
+    db.flush()
+    version = current_query_version(db, industry_id)
+    latest = latest_completed_scans(db, industry_id, version)
+
+    db.execute(delete(RankingSnapshot).where(RankingSnapshot.industry_id == industry_id))
+    db.add_all(
+        _snapshot_row(company, scan, version)
+        for company, scan in latest
+        if scan.overall_score is not None
+    )
+    db.flush()
+    refresh_industry_stats(db, [industry_id])
+    return sum(1 for _, scan in latest if scan.overall_score is not None)
+
+
+def update_snapshot_for_scan(db: Session, scan: Scan) -> None:
+    """
+    Aktualisiert Snapshot und Industry Stats nach Abschluss eines Scans (ohne Commit).
+
+    Nur die Zeile der Company wird neu bestimmt — außer die Industry hat
+    noch keinen Snapshot (z.B. Scans von vor Einführung der Tabelle) oder
+    die häufigste query_version hat sich geändert, dann wird die ganze
+    Industry neu aufgebaut.
+
+    Args:
+        db: SQLAlchemy Session
+        scan: Gerade abgeschlossener Scan
+    """
+    db.flush()
+    industry_id = db.get(Company, scan.company_id).industry_id
+    version = current_query_version(db, industry_id)
+
+    versions = {
+        ranking_version
+        for (ranking_version,) in (
+            db.query(RankingSnapshot.ranking_version)
+            .filter(RankingSnapshot.industry_id == industry_id)
+            .distinct()
+        )
+    }
+    if versions != {version}:
+        rebuild_industry_snapshot(db, industry_id)
+        return
+
+    db.execute(delete(RankingSnapshot).where(RankingSnapshot.company_id == scan.company_id))
+    for company, latest_scan in latest_completed_scans(db, industry_id, version, company_id=scan.company_id):
+        if latest_scan.overall_score is not None:
+            db.add(_snapshot_row(company, latest_scan, version))
+    db.flush()
+    refresh_industry_stats(db, [industry_id])
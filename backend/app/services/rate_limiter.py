@@ -0,0 +1,238 @@
+"""
+Provider Rate Limiter.
+Prozessweite Token-Buckets (Requests/min und Tokens/min) pro Plattform und Modell,
+kombiniert mit einem AIMD-gesteuerten Limit für gleichzeitige Calls.
+"""
+import asyncio
+import time
+from typing import Any, Callable
+
+# Poll-Intervall, wenn nur das Concurrency-Limit (nicht ein Bucket) blockiert
+_CONCURRENCY_POLL_S = 0.05
+
+
+class TokenBucket:
+    """Klassischer Token-Bucket, der pro Minute `rate_per_minute` Einheiten auffüllt."""
+
+    def __init__(
+        self,
+        rate_per_minute: float,
+        capacity: float | None = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            rate_per_minute: Nachfüllrate (z.B. RPM oder TPM des Accounts)
+            capacity: Maximale Füllmenge (Default: eine Minute Rate)
+            clock: Zeitquelle (für Tests austauschbar)
+        """
+        self.rate_per_minute = float(rate_per_minute)
+        self.capacity = float(capacity if capacity is not None else rate_per_minute)
+        self.clock = clock
+        self.tokens = self.capacity
+        self.updated_at = clock()
+
+    def _refill(self) -> None:
+        now = self.clock()
+        elapsed = now - self.updated_at
+        self.updated_at = now
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate_per_minute / 60.0)
+
+    def wait_time(self, amount: float) -> float:
+        """Sekunden bis `amount` verfügbar ist (0 = sofort)."""
+        self._refill()
+        # Anfragen größer als die Kapazität dürfen einen vollen Bucket leeren
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) * 60.0 / self.rate_per_minute
+
+    def consume(self, amount: float) -> None:
+        """Zieht `amount` ab (Kontostand darf durch Nachbuchungen negativ werden)."""
+        self._refill()
+        self.tokens -= amount
+
+    def refund(self, amount: float) -> None:
+        """Bucht zu viel reservierte Einheiten zurück."""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class ModelLimiter:
+    """Limiter für eine (Plattform, Modell)-Kombination: RPM, TPM und adaptives In-Flight-Limit."""
+
+    def __init__(
+        self,
+        rpm: float,
+        tpm: float,
+        max_in_flight: int = 16,
+        min_in_flight: int = 1,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            rpm: Requests pro Minute
+            tpm: Tokens pro Minute
+            max_in_flight: Obergrenze für gleichzeitige Calls
+            min_in_flight: Untergrenze, auf die AIMD maximal zurückfährt
+            clock: Zeitquelle (für Tests austauschbar)
+        """
+        self.clock = clock
+        self.requests = TokenBucket(rpm, clock=clock)
+        self.tokens = TokenBucket(tpm, clock=clock)
+        self.max_in_flight = max(1, max_in_flight)
+        self.min_in_flight = max(1, min(min_in_flight, self.max_in_flight))
+        self.limit = float(self.max_in_flight)
+        self.in_flight = 0
+        self.blocked_until = 0.0
+
+    def configure(self, rpm: float | None = None, tpm: float | None = None, max_in_flight: int | None = None) -> None:
+        """Übernimmt neue Quoten, ohne den aktuellen Zustand zu verlieren."""
+        if rpm and rpm != self.requests.rate_per_minute:
+            self.requests = TokenBucket(rpm, clock=self.clock)
+        if tpm and tpm != self.tokens.rate_per_minute:
+            self.tokens = TokenBucket(tpm, clock=self.clock)
+        if max_in_flight:
+            self.max_in_flight = max(1, max_in_flight)
+            self.limit = min(self.limit, float(self.max_in_flight))
+
+    def wait_time(self, estimated_tokens: int) -> float:
+        """Sekunden bis ein Call mit `estimated_tokens` starten darf (0 = sofort)."""
+        now = self.clock()
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        if self.in_flight >= int(self.limit):
+            return _CONCURRENCY_POLL_S
+        return max(self.requests.wait_time(1), self.tokens.wait_time(estimated_tokens))
+
+    def try_acquire(self, estimated_tokens: int) -> float:
+        """Reserviert einen Slot, falls möglich. Liefert 0 bei Erfolg, sonst die Wartezeit."""
+        wait = self.wait_time(estimated_tokens)
+        if wait > 0:
+            return wait
+        self.requests.consume(1)
+        self.tokens.consume(estimated_tokens)
+        self.in_flight += 1
+        return 0.0
+
+    async def acquire(self, estimated_tokens: int) -> None:
+        """Wartet, bis Buckets und Concurrency-Limit einen weiteren Call zulassen."""
+        while True:
+            wait = self.try_acquire(estimated_tokens)
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+    def release(self, estimated_tokens: int, actual_tokens: int | None) -> None:
+        """Gibt den Slot frei und gleicht die Token-Reservierung mit dem echten Verbrauch ab."""
+        self.in_flight = max(0, self.in_flight - 1)
+        if actual_tokens is None:
+            return
+        difference = estimated_tokens - actual_tokens
+        if difference > 0:
+            self.tokens.refund(difference)
+        elif difference < 0:
+            self.tokens.consume(-difference)
+
+    def on_success(self) -> None:
+        """Additive Increase: pro erfolgreichem Call wächst das Limit um ~1/limit."""
+        self.limit = min(float(self.max_in_flight), self.limit + 1.0 / max(self.limit, 1.0))
+
+    def on_rate_limited(self, retry_after: float | None = None) -> None:
+        """Multiplicative Decrease: Limit halbieren und ggf. bis Retry-After pausieren."""
+        self.limit = max(float(self.min_in_flight), self.limit / 2.0)
+        if retry_after:
+            self.blocked_until = max(self.blocked_until, self.clock() + retry_after)
+
+
+class ProviderRateLimiter:
+    """Registry der ModelLimiter — eine Instanz pro Prozess, geteilt von allen Scans."""
+
+    def __init__(
+        self,
+        default_rpm: float = 500,
+        default_tpm: float = 200_000,
+        max_in_flight: int = 16,
+        min_in_flight: int = 1,
+        platform_limits: dict[str, dict[str, Any]] | None = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            default_rpm: RPM für Plattformen ohne eigene Konfiguration
+            default_tpm: TPM für Plattformen ohne eigene Konfiguration
+            max_in_flight: Obergrenze gleichzeitiger Calls pro Modell
+            min_in_flight: Untergrenze für AIMD
+            platform_limits: platform -> {rpm, tpm, max_in_flight} (aus Settings)
+            clock: Zeitquelle (für Tests austauschbar)
+        """
+        self.default_rpm = default_rpm
+        self.default_tpm = default_tpm
+        self.max_in_flight = max_in_flight
+        self.min_in_flight = min_in_flight
+        self.platform_limits = platform_limits or {}
+        self.clock = clock
+        self._limiters: dict[tuple[str, str], ModelLimiter] = {}
+
+    def _limits_for(self, platform: str) -> dict[str, Any]:
+        limits = self.platform_limits.get(platform, {})
+        return {
+            "rpm": limits.get("rpm", self.default_rpm),
+            "tpm": limits.get("tpm", self.default_tpm),
+            "max_in_flight": limits.get("max_in_flight", self.max_in_flight),
+        }
+
+    def for_model(self, platform: str, model: str) -> ModelLimiter:
+        """Liefert (und erstellt bei Bedarf) den Limiter für Plattform + Modell."""
+        key = (platform, model)
+        limiter = self._limiters.get(key)
+        if limiter is None:
+            limits = self._limits_for(platform)
+            limiter = ModelLimiter(
+                rpm=limits["rpm"],
+                tpm=limits["tpm"],
+                max_in_flight=limits["max_in_flight"],
+                min_in_flight=self.min_in_flight,
+                clock=self.clock,
+            )
+            self._limiters[key] = limiter
+        return limiter
+
+    def configure_platforms(self, platforms: dict[str, dict[str, Any]]) -> None:
+        """
+        Übernimmt rpm/tpm/max_in_flight aus dem `platforms:`-Block einer Industry Config.
+
+        YAML-Werte haben Vorrang vor Settings; da der Limiter prozessweit ist,
+        gilt für dasselbe Modell die zuletzt geladene Konfiguration.
+        """
+        for platform, config in platforms.items():
+            if not any(k in config for k in ("rpm", "tpm", "max_in_flight")):
+                continue
+            limiter = self.for_model(platform, config.get("model", ""))
+            limiter.configure(
+                rpm=config.get("rpm"),
+                tpm=config.get("tpm"),
+                max_in_flight=config.get("max_in_flight"),
+            )
+
+
+_rate_limiter: ProviderRateLimiter | None = None
+
+
+def get_rate_limiter(settings: Any | None = None) -> ProviderRateLimiter:
+    """
+    Liefert den prozessweiten Rate Limiter (wird beim ersten Aufruf aus Settings erstellt).
+    """
+    global _rate_limiter
+    if _rate_limiter is None:
+        if settings is None:
+            from app.config import Settings
+            settings = Settings()
+        _rate_limiter = ProviderRateLimiter(
+            default_rpm=settings.LLM_DEFAULT_RPM,
+            default_tpm=settings.LLM_DEFAULT_TPM,
+            max_in_flight=settings.LLM_MAX_IN_FLIGHT,
+            min_in_flight=settings.LLM_MIN_IN_FLIGHT,
+            platform_limits=settings.LLM_RATE_LIMITS,
+        )
+    return _rate_limiter
@@ -0,0 +1,70 @@
+"""
+Rendered Reports.
+HTML-Reports werden nicht mehr im Scan gespeichert, sondern bei Bedarf aus
+den Scan-Daten gerendert. Das Ergebnis landet gzip-komprimiert in einem
+begrenzten LRU pro Prozess, Schlüssel: Scan-ID + Template-Version +
+Generation des Scan-Tags im Response Cache (steigt bei Re-Analyse).
+Template-Änderungen gelten so ohne Rescan auch für alte Reports.
+"""
+import hashlib
+import threading
+import zlib
+from typing import Iterable, Iterator
+
+from app.config import Settings
+from app.services.http_cache import CachedResponse, MemoryCacheBackend, get_http_cache, scan_tag
+from app.services.report_generator import report_template_version
+
+HTML_MEDIA_TYPE = "text/html; charset=utf-8"
+
+_rendered: MemoryCacheBackend | None = None
+_rendered_lock = threading.Lock()
+
+
+def get_rendered_reports(settings: Settings) -> MemoryCacheBackend:
+    """Prozessweiter LRU der gerenderten Reports (gzip)."""
+    global _rendered
+    if _rendered is None:
+        with _rendered_lock:
+            if _rendered is None:
+                _rendered = MemoryCacheBackend(settings.REPORT_RENDER_CACHE_MAX_ENTRIES)
+    return _rendered
+
+
+def rendered_report_key(settings: Settings, scan_id: str) -> str:
+    """Cache-Key eines gerenderten Reports."""
+    generation = get_http_cache(settings).generation(scan_tag(scan_id))
+    return f"report:{scan_id}:{report_template_version()}:{generation}"
+
+
+def get_rendered_report(settings: Settings, key: str) -> CachedResponse | None:
+    """Gerenderter Report (Body gzip-komprimiert, ETag über das unkomprimierte HTML)."""
+    raw = get_rendered_reports(settings).get(key)
+    return CachedResponse.load(raw) if raw is not None else None
+
+
+def tee_rendered_report(settings: Settings, key: str, chunks: Iterable[str]) -> Iterator[bytes]:
+    """
+    Reicht die HTML-Chunks kodiert weiter und legt den Report nach dem
+    letzten Chunk komprimiert im LRU ab.
+
+    Args:
+        settings: App Settings
+        key: Cache-Key (rendered_report_key)
+        chunks: HTML-Chunks aus ReportGenerator.stream_report_html
+
+    Returns:
+        Iterator über die unkomprimierten Bytes
+    """
+    compressor = zlib.compressobj(settings.REPORT_RENDER_GZIP_LEVEL, zlib.DEFLATED, 31)
+    digest = hashlib.sha256()
+    compressed: list[bytes] = []
+    for chunk in chunks:
+        data = chunk.encode("utf-8")
+        digest.update(data)
+        compressed.append(compressor.compress(data))
+        yield data
+    compressed.append(compressor.flush())
+
+    report = CachedResponse(b"".join(compressed), HTML_MEDIA_TYPE, '"' + digest.hexdigest()[:32] + '"')
+    get_rendered_reports(settings).set(key, report.dump(), settings.RESPONSE_CACHE_REPORT_TTL_S)
@@ -0,0 +1,200 @@
+"""
+Resilience.
+Retry-Strategie mit Jitter-Backoff und Circuit Breaker pro Plattform für die Provider-Calls.
+"""
+import random
+import time
+from collections import deque
+from typing import Any, Callable
+
+
+class RetryPolicy:
+    """Exponentielles Backoff mit Full Jitter, begrenzt durch Versuche und Gesamt-Deadline."""
+
+    def __init__(
+        self,
+        max_attempts: int = 4,
+        base_delay_s: float = 1.0,
+        max_delay_s: float = 30.0,
+        deadline_s: float = 120.0,
+        rng: Callable[[float, float], float] = random.uniform
+    ):
+        """
+        Args:
+            max_attempts: Maximale Anzahl Versuche pro Call (inkl. erstem)
+            base_delay_s: Basis-Wartezeit vor dem ersten Retry
+            max_delay_s: Obergrenze einer einzelnen Wartezeit
+            deadline_s: Gesamtbudget pro Call über alle Versuche
+            rng: Zufallsquelle für den Jitter (für Tests austauschbar)
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay_s = base_delay_s
+        self.max_delay_s = max_delay_s
+        self.deadline_s = deadline_s
+        self.rng = rng
+
+    @classmethod
+    def from_settings(cls, settings: Any) -> "RetryPolicy":
+        """Erstellt die Policy aus den LLM_RETRY_* Settings."""
+        return cls(
+            max_attempts=settings.LLM_RETRY_MAX_ATTEMPTS,
+            base_delay_s=settings.LLM_RETRY_BASE_DELAY_S,
+            max_delay_s=settings.LLM_RETRY_MAX_DELAY_S,
+            deadline_s=settings.LLM_CALL_DEADLINE_S,
+        )
+
+    def backoff(self, attempt: int, retry_after: float | None = None) -> float:
+        """
+        Wartezeit vor dem nächsten Versuch.
+
+        Args:
+            attempt: Nummer des fehlgeschlagenen Versuchs (1 = erster)
+            retry_after: Retry-After des Providers in Sekunden (Untergrenze)
+
+        Returns:
+            Wartezeit in Sekunden
+        """
+        ceiling = min(self.max_delay_s, self.base_delay_s * 2 ** (attempt - 1))
+        delay = self.rng(0.0, ceiling)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+
+class CircuitBreaker:
+    """
+    Circuit Breaker für eine Plattform.
+
+    closed: alle Calls laufen, Ergebnisse landen in einem Zeitfenster.
+    open: ab `failure_rate` Fehlerquote (bei mind. `min_calls` Calls) schlagen
+          alle Calls für `cooldown_s` sofort fehl.
+    half_open: nach dem Cooldown darf ein einzelner Probe-Call durch; Erfolg
+               schließt den Breaker, ein Fehler öffnet ihn erneut.
+    """
+
+    def __init__(
+        self,
+        failure_rate: float = 0.5,
+        min_calls: int = 5,
+        window_s: float = 60.0,
+        cooldown_s: float = 30.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            failure_rate: Fehlerquote im Fenster, ab der der Breaker öffnet
+            min_calls: Mindestanzahl Calls im Fenster für eine Entscheidung
+            window_s: Länge des gleitenden Fensters in Sekunden
+            cooldown_s: Dauer, für die der Breaker offen bleibt
+            clock: Zeitquelle (für Tests austauschbar)
+        """
+        self.failure_rate = failure_rate
+        self.min_calls = max(1, min_calls)
+        self.window_s = window_s
+        self.cooldown_s = cooldown_s
+        self.clock = clock
+        self.state = "closed"
+        self.opened_at = 0.0
+        self.probe_started_at: float | None = None
+        self._events: deque[tuple[float, bool]] = deque()
+
+    def allow_request(self) -> bool:
+        """True, wenn ein Call gestartet werden darf."""
+        now = self.clock()
+
+        if self.state == "open":
+            if now - self.opened_at < self.cooldown_s:
+                return False
+            self.state = "half_open"
+            self.probe_started_at = None
+
+        if self.state == "half_open":
+            # Nur ein Probe-Call gleichzeitig; hängt er, wird nach dem Cooldown ein neuer erlaubt
+            if self.probe_started_at is not None and now - self.probe_started_at < self.cooldown_s:
+                return False
+            self.probe_started_at = now
+
+        return True
+
+    def retry_in(self) -> float:
+        """Sekunden bis der Breaker wieder einen Probe-Call zulässt."""
+        if self.state != "open":
+            return 0.0
+        return max(0.0, self.opened_at + self.cooldown_s - self.clock())
+
+    def record_success(self) -> None:
+        """Verbucht einen erfolgreichen Call (schließt einen half_open Breaker)."""
+        if self.state == "half_open":
+            self._close()
+            return
+        self._record(True)
+
+    def record_failure(self) -> None:
+        """Verbucht einen vorübergehenden Fehler (öffnet ggf. den Breaker)."""
+        if self.state == "half_open":
+            self._open()
+            return
+        self._record(False)
+
+        failures = sum(1 for _, ok in self._events if not ok)
+        if len(self._events) >= self.min_calls and failures / len(self._events) >= self.failure_rate:
+            self._open()
+
+    def _record(self, ok: bool) -> None:
+        now = self.clock()
+        self._events.append((now, ok))
+        while self._events and now - self._events[0][0] > self.window_s:
+            self._events.popleft()
+
+    def _open(self) -> None:
+        self.state = "open"
+        self.opened_at = self.clock()
+        self.probe_started_at = None
+
+    def _close(self) -> None:
+        self.state = "closed"
+        self.probe_started_at = None
+        self._events.clear()
+
+
+class CircuitBreakerRegistry:
+    """Ein Circuit Breaker pro Plattform — prozessweit, damit alle Scans eines Batches profitieren."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic, **breaker_kwargs: Any):
+        """
+        Args:
+            clock: Zeitquelle (für Tests austauschbar)
+            **breaker_kwargs: Parameter für neue CircuitBreaker
+        """
+        self.clock = clock
+        self.breaker_kwargs = breaker_kwargs
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    def for_platform(self, platform: str) -> CircuitBreaker:
+        """Liefert (und erstellt bei Bedarf) den Breaker einer Plattform."""
+        breaker = self._breakers.get(platform)
+        if breaker is None:
+            breaker = CircuitBreaker(clock=self.clock, **self.breaker_kwargs)
+            self._breakers[platform] = breaker
+        return breaker
+
+
+_circuit_breakers: CircuitBreakerRegistry | None = None
+
+
+def get_circuit_breakers(settings: Any | None = None) -> CircuitBreakerRegistry:
+    """
+    Liefert die prozessweite Circuit-Breaker-Registry (wird beim ersten Aufruf aus Settings erstellt).
+    """
+    global _circuit_breakers
+    if _circuit_breakers is None:
+        if settings is None:
+            from app.config import Settings
+            settings = Settings()
+        _circuit_breakers = CircuitBreakerRegistry(
+            failure_rate=settings.LLM_CIRCUIT_FAILURE_RATE,
+            min_calls=settings.LLM_CIRCUIT_MIN_CALLS,
+            window_s=settings.LLM_CIRCUIT_WINDOW_S,
+            cooldown_s=settings.LLM_CIRCUIT_COOLDOWN_S,
+        )
+    return _circuit_breakers
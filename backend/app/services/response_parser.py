@@ -0,0 +1,127 @@
+"""
+Response Parser.
+Zerlegt eine LLM-Antwort in einem Durchlauf in Zeilen-Segmente mit
+Listen-Rang und Abschnitt (Überschrift), damit Positionen aller Entitäten
+aus den Matcher-Treffern abgelesen werden können.
+"""
+import re
+from bisect import bisect_right
+from typing import Any, Iterable
+
+# "1. Foo", "2) Foo", "- Foo", "* Foo", "• Foo", "+ Foo"
+LIST_ITEM_PATTERN = re.compile(r'^(\s*)(?:(\d+)[.)]|[-*•+])\s+')
+# "## Foo" oder eine Zeile nur aus "**Foo**" bzw. "**Foo:**"
+HEADING_PATTERN = re.compile(r'^\s*(?:#{1,6}\s+(.+?)\s*#*|\*\*(.+?)\*\*:?)\s*$')
+# "auf Platz 2", "Rang 3", "Position 1" außerhalb von Listen
+RANK_HINT_PATTERN = re.compile(r'(?:platz|rang|position)\s+(\d+)', re.IGNORECASE)
+
+
+class ResponseStructure:
+    """Zeilen-Segmente einer Antwort mit Offset-Suche."""
+
+    def __init__(self, segments: list[dict[str, Any]]):
+        """
+        Args:
+            segments: Liste von {start, end, rank, section, list_item}, nach start sortiert
+        """
+        self.segments = segments
+        self._starts = [segment["start"] for segment in segments]
+
+    def locate(self, offset: int) -> dict[str, Any] | None:
+        """
+        Liefert das Segment, das den Zeichen-Offset enthält.
+
+        Args:
+            offset: Position im Response-Text
+
+        Returns:
+            Segment-Dict oder None
+        """
+        index = bisect_right(self._starts, offset) - 1
+        if index < 0:
+            return None
+        segment = self.segments[index]
+        return segment if offset < segment["end"] else None
+
+    def entity_positions(self, hits: Iterable[dict[str, Any]]) -> dict[str, dict[str, Any]]:
+        """
+        Ordnet jeder gefundenen Entität Rang und Abschnitt zu.
+
+        Maßgeblich ist der erste Treffer mit Rang; hat keiner einen Rang,
+        der erste Treffer überhaupt.
+
+        Args:
+            hits: Matcher-Treffer {entity, kind, start, end}, nach start sortiert
+
+        Returns:
+            Dict entity -> {rank, section, list_item}
+        """
+        positions: dict[str, dict[str, Any]] = {}
+        for hit in hits:
+            known = positions.get(hit["entity"])
+            if known is not None and known["rank"] is not None:
+                continue
+            segment = self.locate(hit["start"]) or {"rank": None, "section": None, "list_item": False}
+            if known is None or segment["rank"] is not None:
+                positions[hit["entity"]] = {
+                    "rank": segment["rank"],
+                    "section": segment["section"],
+                    "list_item": segment["list_item"],
+                }
+        return positions
+
+
+def parse_response(text: str) -> ResponseStructure:
+    """
+    Erkennt nummerierte Listen, Aufzählungen und Markdown-Überschriften.
+
+    Nummerierte Einträge bekommen ihre Nummer als Rang, Aufzählungspunkte
+    ihre laufende Nummer innerhalb der Liste. Eingerückte Folgezeilen und
+    Unterpunkte erben den Rang des übergeordneten Eintrags.
+
+    Args:
+        text: Response-Text
+
+    Returns:
+        ResponseStructure
+    """
+    segments: list[dict[str, Any]] = []
+    section: str | None = None
+    list_indent: int | None = None
+    bullet_count = 0
+    current_rank: int | None = None
+
+    offset = 0
+    for line in text.splitlines(keepends=True):
+        start, offset = offset, offset + len(line)
+        stripped = line.strip()
+        if not stripped:
+            segments.append({"start": start, "end": offset, "rank": None, "section": section, "list_item": False})
+            continue
+
+        heading = HEADING_PATTERN.match(line)
+        item = LIST_ITEM_PATTERN.match(line)
+        indent = len(line) - len(line.lstrip())
+
+        if heading and not item:
+            section = (heading.group(1) or heading.group(2)).strip().rstrip(":")
+            list_indent, bullet_count, current_rank = None, 0, None
+            rank, list_item = None, False
+        elif item and (list_indent is None or indent <= list_indent):
+            # Neuer Eintrag auf oberster Listenebene
+            list_indent = indent
+            bullet_count += 1
+            current_rank = int(item.group(2)) if item.group(2) else bullet_count
+            rank, list_item = current_rank, True
+        elif list_indent is not None and indent > list_indent:
+            # Unterpunkt oder Folgezeile des aktuellen Eintrags
+            rank, list_item = current_rank, True
+        else:
+            # Fließtext beendet die Liste
+            list_indent, bullet_count, current_rank = None, 0, None
+            hint = RANK_HINT_PATTERN.search(line)
+            rank, list_item = (int(hint.group(1)) if hint else None), False
+
+        segments.append({"start": start, "end": offset, "rank": rank, "section": section, "list_item": list_item})
+
+    return ResponseStructure(segments)
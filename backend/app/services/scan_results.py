@@ -0,0 +1,72 @@
+"""
+Scan Results.
+Lesezugriffe auf die normalisierten Query-Ergebnisse (scan_results):
+Kennzahlen für Scan- und Report-Payloads und gefilterte Seiten für
+/scans/{id}/results.
+"""
+from typing import Any
+
+from sqlalchemy import Integer, cast, func
+from sqlalchemy.orm import Session, selectinload
+
+from app.models import ScanResult
+
+
+def summarize_results(db: Session, scan_id: str) -> dict[str, Any]:
+    """
+    Kennzahlen der Ergebnisse eines Scans aus einer gruppierten Abfrage.
+
+    Returns:
+        {total, mentioned, platforms: {platform: Anzahl}, categories: {category: Anzahl}}
+    """
+    rows = (
+        db.query(
+            ScanResult.platform,
+            ScanResult.category,
+            func.count(ScanResult.id),
+            func.sum(cast(ScanResult.mentioned, Integer)),
+        )
+        .filter(ScanResult.scan_id == scan_id)
+        .group_by(ScanResult.platform, ScanResult.category)
+        .all()
+    )
+
+    summary: dict[str, Any] = {"total": 0, "mentioned": 0, "platforms": {}, "categories": {}}
+    for platform, category, count, mentioned in rows:
+        summary["total"] += count
+        summary["mentioned"] += int(mentioned or 0)
+        summary["platforms"][platform] = summary["platforms"].get(platform, 0) + count
+        summary["categories"][category] = summary["categories"].get(category, 0) + count
+    return summary
+
+
+def results_page(
+    db: Session,
+    scan_id: str,
+    limit: int,
+    offset: int,
+    platform: str | None = None,
+    category: str | None = None,
+    mentioned: bool | None = None,
+    include_response: bool = False
+) -> tuple[int, list[ScanResult]]:
+    """
+    Eine gefilterte Seite der Ergebnisse eines Scans in Query-Reihenfolge.
+
+    Returns:
+        (Gesamtzahl passender Ergebnisse, Ergebnisse der Seite)
+    """
+    query = db.query(ScanResult).filter(ScanResult.scan_id == scan_id)
+    if platform is not None:
+        query = query.filter(ScanResult.platform == platform)
+    if category is not None:
+        query = query.filter(ScanResult.category == category)
+    if mentioned is not None:
+        query = query.filter(ScanResult.mentioned == mentioned)
+
+    total = query.count()
+    if include_response:
+        # Antworttexte aus dem Text-Store, je Hash nur einmal
+        query = query.options(selectinload(ScanResult.response_blob))
+    items = query.order_by(ScanResult.result_index).offset(offset).limit(limit).all()
+    return total, items
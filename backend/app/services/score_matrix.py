@@ -0,0 +1,178 @@
+"""
+Score Matrix.
+Hält die Analyse-Ergebnisse vieler Scans als kompakte NumPy-Arrays
+(eine Zeile pro Query-Ergebnis) und berechnet Plattform-, Kategorie- und
+Gesamt-Scores aller Scans in einem vektorisierten Durchlauf — Grundlage
+für schnelle What-if-Rankings mit alternativen Gewichten.
+"""
+from typing import Any, Callable, Hashable, Iterable
+
+import numpy as np
+
+# Wie Scorer.score_single_result: Bonus für Platz 1/2/3 (Index = Position)
+POSITION_BONUS = np.array([0.0, 0.20, 0.10, 0.05])
+SENTIMENT_MODIFIERS = {"positive": 1.0, "neutral": 0.8, "negative": 0.5}
+DEFAULT_SENTIMENT_MODIFIER = 0.8
+
+
+class _Vocabulary:
+    """Vergibt fortlaufende IDs für Strings (Plattformen, Kategorien, ...)."""
+
+    def __init__(self):
+        self.ids: dict[str, int] = {}
+        self.values: list[str] = []
+
+    def id_for(self, value: str) -> int:
+        index = self.ids.get(value)
+        if index is None:
+            index = len(self.values)
+            self.ids[value] = index
+            self.values.append(value)
+        return index
+
+
+class ScoreMatrix:
+    """Ergebnisse mehrerer Scans als Spalten-Arrays."""
+
+    def __init__(self, scans: Iterable[tuple[Hashable, list[dict[str, Any]]]]):
+        """
+        Args:
+            scans: (Schlüssel, query_results)-Paare, z.B. (scan_id, scan.query_results)
+        """
+        self.keys: list[Hashable] = []
+        self.mention_types = _Vocabulary()
+        self.sentiments = _Vocabulary()
+        self.platforms = _Vocabulary()
+        self.categories = _Vocabulary()
+
+        scan_idx: list[int] = []
+        mention_type: list[int] = []
+        position: list[int] = []
+        sentiment: list[int] = []
+        platform: list[int] = []
+        category: list[int] = []
+
+        for key, results in scans:
+            row = len(self.keys)
+            self.keys.append(key)
+            for result in results or []:
+                # Flache und verschachtelte ("analysis") Struktur unterstützen
+                analysis = result.get("analysis", result)
+                scan_idx.append(row)
+                mention_type.append(self.mention_types.id_for(analysis.get("mention_type", "not_mentioned")))
+                sentiment.append(self.sentiments.id_for(analysis.get("sentiment", "neutral")))
+                platform.append(self.platforms.id_for(result.get("platform", "unknown")))
+                category.append(self.categories.id_for(result.get("category", "unknown")))
+                rank = analysis.get("position") if analysis.get("mentioned", False) else None
+                position.append(int(rank) if rank in (1, 2, 3) else 0)
+
+        self.scan_idx = np.array(scan_idx, dtype=np.int32)
+        self.mention_type = np.array(mention_type, dtype=np.int16)
+        self.position = np.array(position, dtype=np.int8)
+        self.sentiment = np.array(sentiment, dtype=np.int8)
+        self.platform = np.array(platform, dtype=np.int16)
+        self.category = np.array(category, dtype=np.int16)
+
+    @property
+    def n_scans(self) -> int:
+        return len(self.keys)
+
+    def row_scores(self, mention_type_weights: dict[str, float]) -> np.ndarray:
+        """
+        Score (0-100) jeder Zeile, identisch zu Scorer.score_single_result.
+
+        Args:
+            mention_type_weights: mention_type -> Basis-Score (0-1)
+
+        Returns:
+            Array mit einem Score pro Zeile
+        """
+        base = np.array([mention_type_weights.get(t, 0.0) for t in self.mention_types.values], dtype=float)
+        modifiers = np.array(
+            [SENTIMENT_MODIFIERS.get(s, DEFAULT_SENTIMENT_MODIFIER) for s in self.sentiments.values], dtype=float
+        )
+        if not len(self.scan_idx):
+            return np.zeros(0)
+        scores = (base[self.mention_type] + POSITION_BONUS[self.position]) * modifiers[self.sentiment] * 100
+        return np.clip(scores, 0.0, 100.0)
+
+    def _group_means(self, scores: np.ndarray, group: np.ndarray, n_groups: int) -> np.ndarray:
+        """Mittelwert pro (Scan, Gruppe), NaN wo es keine Zeilen gibt (auf 2 Stellen gerundet)."""
+        flat = self.scan_idx.astype(np.int64) * n_groups + group
+        size = self.n_scans * n_groups
+        sums = np.bincount(flat, weights=scores, minlength=size)
+        counts = np.bincount(flat, minlength=size)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = np.where(counts > 0, sums / counts, np.nan)
+        return np.round(means, 2).reshape(self.n_scans, n_groups)
+
+    def score(
+        self,
+        mention_type_weights: dict[str, float],
+        platform_weights: dict[str, float]
+    ) -> dict[str, np.ndarray]:
+        """
+        Berechnet alle Scores aller Scans in einem Durchlauf.
+
+        Args:
+            mention_type_weights: mention_type -> Basis-Score (scoring.mention_types)
+            platform_weights: platform -> Gewicht (platforms.*.weight); nicht
+                konfigurierte Plattformen zählen nicht zum Gesamt-Score
+
+        Returns:
+            Dict mit "platform" (Scans × Plattformen), "category" (Scans × Kategorien)
+            und "overall" (Scans); NaN = keine Ergebnisse
+        """
+        scores = self.row_scores(mention_type_weights)
+        platform_scores = self._group_means(scores, self.platform, len(self.platforms.values))
+        category_scores = self._group_means(scores, self.category, len(self.categories.values))
+
+        weights = np.array([platform_weights.get(p, 0.0) for p in self.platforms.values], dtype=float)
+        present = ~np.isnan(platform_scores)
+        weight_totals = (present * weights).sum(axis=1)
+        weighted_sums = np.where(present, platform_scores, 0.0) @ weights
+        with np.errstate(invalid="ignore", divide="ignore"):
+            overall = np.where(weight_totals > 0, weighted_sums / weight_totals, 0.0)
+
+        return {
+            "platform": platform_scores,
+            "category": category_scores,
+            "overall": np.round(overall, 2),
+        }
+
+    def platform_dict(self, table: np.ndarray, row: int) -> dict[str, float]:
+        """Plattform-Scores eines Scans als Dict (nur Plattformen mit Ergebnissen)."""
+        return _row_dict(table[row], self.platforms.values)
+
+    def category_dict(self, table: np.ndarray, row: int) -> dict[str, float]:
+        """Kategorie-Scores eines Scans als Dict (nur Kategorien mit Ergebnissen)."""
+        return _row_dict(table[row], self.categories.values)
+
+
+def _row_dict(values: np.ndarray, names: list[str]) -> dict[str, float]:
+    return {name: float(value) for name, value in zip(names, values) if not np.isnan(value)}
+
+
+# Industry -> (Fingerprint, Payload); es wird nur die aktuelle Version gehalten
+_industry_matrices: dict[str, tuple[Hashable, Any]] = {}
+
+
+def cached_industry_matrix(industry_id: str, fingerprint: Hashable, build: Callable[[], Any]) -> Any:
+    """
+    Liefert die gecachte Matrix einer Industry oder baut sie neu, wenn sich
+    der Fingerprint (z.B. Anzahl + letzter Abschluss der Scans) geändert hat.
+
+    Args:
+        industry_id: ID der Industry
+        fingerprint: Vergleichswert für die Gültigkeit
+        build: Erstellt die Matrix (inkl. Metadaten) bei Bedarf
+
+    Returns:
+        Ergebnis von build()
+    """
+    cached = _industry_matrices.get(industry_id)
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+    payload = build()
+    _industry_matrices[industry_id] = (fingerprint, payload)
+    return payload
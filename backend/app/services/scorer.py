@@ -1,5 +1,7 @@
 from typing import Any
 
+from app.services.score_matrix import ScoreMatrix
+
 
 class Scorer:
     """Berechnet Scores für GEO Intelligence basierend auf Erwähnungen und Kontext."""
@@ -78,34 +80,9 @@ class Scorer:
         Returns:
             Dictionary: platform -> score
         """
-        platform_results = {}
-
-        # Gruppiere Results nach Plattform
-        for result in results:
-            platform = result.get("platform", "unknown")
-
-            if platform not in platform_results:
-                platform_results[platform] = []
-
-            platform_results[platform].append(result)
-
-        # Berechne Durchschnitt pro Plattform
-        platform_scores = {}
-
-        for platform, platform_res in platform_results.items():
-            # Support both flat and nested analysis structure
-            scores = [
-                self.score_single_result(r.get("analysis", r))
-                for r in platform_res
-            ]
-
-            if scores:
-                avg_score = sum(scores) / len(scores)
-                platform_scores[platform] = round(avg_score, 2)
-            else:
-                platform_scores[platform] = 0.0
-
-        return platform_scores
+        matrix = ScoreMatrix([(0, results)])
+        scores = self.score_matrix(matrix)
+        return matrix.platform_dict(scores["platform"], 0)
 
     def calculate_overall_score(
         self,
@@ -154,30 +131,31 @@ class Scorer:
         Returns:
             Dictionary: category -> score
         """
-        category_results = {}
-
-        # Gruppiere Results nach Kategorie
-        for result in results:
-            category = result.get("category", "unknown")
+        matrix = ScoreMatrix([(0, results)])
+        scores = self.score_matrix(matrix)
+        return matrix.category_dict(scores["category"], 0)
 
-            if category not in category_results:
-                category_results[category] = []
-
-            category_results[category].append(result)
-
-        # Berechne Durchschnitt pro Kategorie
-        category_scores = {}
-
-        for category, cat_res in category_results.items():
-            scores = [self.score_single_result(r) for r in cat_res]
+    def score_matrix(
+        self,
+        matrix: ScoreMatrix,
+        mention_type_weights: dict[str, float] | None = None,
+        platform_weights: dict[str, float] | None = None
+    ) -> dict[str, Any]:
+        """
+        Bewertet alle Scans einer ScoreMatrix in einem Durchlauf.
 
-            if scores:
-                avg_score = sum(scores) / len(scores)
-                category_scores[category] = round(avg_score, 2)
-            else:
-                category_scores[category] = 0.0
+        Args:
+            matrix: Ergebnisse mehrerer Scans
+            mention_type_weights: Alternative Gewichte (Default: Industry Config)
+            platform_weights: Alternative Plattform-Gewichte (Default: Industry Config)
 
-        return category_scores
+        Returns:
+            Dict mit "platform", "category" und "overall" Arrays (siehe ScoreMatrix.score)
+        """
+        return matrix.score(
+            {**self.mention_type_weights, **(mention_type_weights or {})},
+            {**self.platform_weights, **(platform_weights or {})},
+        )
 
     def get_score_breakdown(
         self,
@@ -0,0 +1,32 @@
+"""
+Session Runner.
+Führt die DB-Arbeit einer (synchronen) SQLAlchemy-Session in einem Thread
+aus, damit der Event-Loop — und mit ihm die anderen gleichzeitig laufenden
+Scans des Workers — währenddessen weiterläuft. Aufrufe für dieselbe Session
+laufen nacheinander, denn eine Session ist nicht threadsicher.
+"""
+import asyncio
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+
+class SessionRunner:
+    """Serialisierte Ausführung der DB-Aufrufe einer Session außerhalb des Event-Loops."""
+
+    def __init__(self):
+        self._lock = asyncio.Lock()
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Führt fn(*args, **kwargs) in einem Thread aus, nie parallel zu einem
+        anderen Aufruf desselben Runners.
+
+        Args:
+            fn: Synchrone Funktion, die die Session benutzt
+
+        Returns:
+            Rückgabewert von fn
+        """
+        async with self._lock:
+            return await asyncio.to_thread(fn, *args, **kwargs)
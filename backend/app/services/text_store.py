@@ -0,0 +1,88 @@
+"""
+Text Store.
+Inhaltsadressierter Speicher für LLM-Antworten und Query-Texte (text_blobs):
+Schlüssel ist der SHA-256 des Texts, gespeichert wird jeder Text genau einmal
+und zlib-komprimiert. Scan-Ergebnisse und Kosten-Records referenzieren Texte
+nur über den Hash — dieselbe Generic-Antwort für 100 Companies liegt einmal
+in der Datenbank statt 100-mal.
+"""
+from typing import Iterable
+
+from sqlalchemy import select, union
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models import ApiCallCost, ScanResult, TextBlob
+
+
+class TextStore:
+    """Dedupliziertes Schreiben und gebündeltes Lesen von Texten einer Session."""
+
+    def __init__(self, db: Session, level: int = 6):
+        """
+        Args:
+            db: SQLAlchemy Session
+            level: zlib-Kompressionsstufe (1 = schnell, 9 = klein)
+        """
+        self.db = db
+        self.level = level
+        # Hashes, deren Blob in dieser Session bereits existiert
+        self._known: set[str] = set()
+
+    def put(self, text: str) -> str:
+        """
+        Speichert einen Text (falls noch nicht vorhanden) und liefert seinen Hash.
+
+        Args:
+            text: Zu speichernder Text
+
+        Returns:
+            SHA-256-Hash (hex) des Texts
+        """
+        text_hash = TextBlob.hash_for(text)
+        if text_hash in self._known:
+            return text_hash
+
+        # Nur den Schlüssel prüfen, nicht den (großen) Blob laden
+        if self.db.query(TextBlob.hash).filter(TextBlob.hash == text_hash).first() is None:
+            try:
+                # Savepoint, damit ein paralleler Insert nicht die ganze Scan-Transaktion kippt
+                with self.db.begin_nested():
+                    self.db.add(TextBlob.from_text(text, self.level))
+            except IntegrityError:
+                pass
+
+        self._known.add(text_hash)
+        return text_hash
+
+    def get(self, text_hash: str) -> str | None:
+        """Text zu einem Hash oder None."""
+        blob = self.db.get(TextBlob, text_hash)
+        return blob.text if blob is not None else None
+
+    def get_many(self, hashes: Iterable[str | None]) -> dict[str, str]:
+        """Texte mehrerer Hashes in einer Abfrage ({hash: text}, fehlende fehlen)."""
+        wanted = {text_hash for text_hash in hashes if text_hash}
+        if not wanted:
+            return {}
+        blobs = self.db.query(TextBlob).filter(TextBlob.hash.in_(wanted)).all()
+        return {blob.hash: blob.text for blob in blobs}
+
+
+def prune_unreferenced(db: Session) -> int:
+    """
+    Entfernt Texte, die weder von scan_results noch von api_call_costs
+    referenziert werden (z.B. nach verworfenen Checkpoints). Ohne Commit.
+
+    Returns:
+        Anzahl entfernter Texte
+    """
+    referenced = union(
+        select(ScanResult.response_hash).where(ScanResult.response_hash.isnot(None)),
+        select(ApiCallCost.query_hash),
+    )
+    return (
+        db.query(TextBlob)
+        .filter(TextBlob.hash.not_in(select(referenced.subquery().c[0])))
+        .delete(synchronize_session=False)
+    )
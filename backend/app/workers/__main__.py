@@ -0,0 +1,47 @@
+"""
+Scan Worker-Prozess.
+
+Usage:
+    python -m app.workers [--concurrency N]
+
+Arbeitet die ScanJob-Queue ab, die von POST /scans/{scan_id}/run und
+POST /scans/sweep befüllt wird. SIGINT/SIGTERM beenden den Worker geordnet,
+laufende Scans werden noch abgeschlossen.
+"""
+import argparse
+import asyncio
+import logging
+import signal
+
+from app.config import Settings
+from app.database import create_tables
+from app.services.provider_clients import ProviderClients
+from app.workers.job_worker import JobWorker
+
+
+async def _run(settings: Settings, concurrency: int | None) -> None:
+    clients = ProviderClients(settings)
+    stop = asyncio.Event()
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    try:
+        await JobWorker(settings, clients, concurrency=concurrency).run(stop)
+    finally:
+        await clients.aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Scan Worker")
+    parser.add_argument("--concurrency", type=int, default=None, help="Gleichzeitige Scans (Default: WORKER_CONCURRENCY)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    create_tables()
+    asyncio.run(_run(Settings(), args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Job Worker.
+Arbeitet die ScanJob-Queue mit einem Pool gleichzeitiger Scans ab.
+"""
+import asyncio
+import logging
+import os
+import socket
+from typing import Callable
+
+from sqlalchemy.orm import Session
+
+from app.config import Settings
+from app.database import SessionLocal
+from app.models import ScanJob
+from app.services.job_queue import JobQueue
+from app.services.provider_clients import ProviderClients
+from app.workers.scan_worker import run_industry_sweep, run_scan
+
+logger = logging.getLogger(__name__)
+
+
+class JobWorker:
+    """Claimt Jobs aus der DB und führt bis zu `concurrency` davon gleichzeitig aus."""
+
+    def __init__(
+        self,
+        settings: Settings,
+        clients: ProviderClients,
+        session_factory: Callable[[], Session] = SessionLocal,
+        concurrency: int | None = None,
+        worker_id: str | None = None
+    ):
+        """
+        Args:
+            settings: App Settings (WORKER_*)
+            clients: Geteilte Provider-Clients des Worker-Prozesses
+            session_factory: Erzeugt eine eigene DB-Session pro Job
+            concurrency: Anzahl gleichzeitiger Jobs (Default: WORKER_CONCURRENCY)
+            worker_id: Kennung des Workers (Default: host:pid)
+        """
+        self.settings = settings
+        self.clients = clients
+        self.session_factory = session_factory
+        self.concurrency = max(1, concurrency or settings.WORKER_CONCURRENCY)
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """
+        Läuft bis `stop` gesetzt wird; laufende Jobs werden noch zu Ende geführt.
+
+        Args:
+            stop: Event für den geordneten Shutdown
+        """
+        logger.info(f"Worker {self.worker_id} gestartet ({self.concurrency} Slots)")
+        self.recover_orphaned_scans()
+        await asyncio.gather(*[self._slot(stop) for _ in range(self.concurrency)])
+        logger.info(f"Worker {self.worker_id} beendet")
+
+    def recover_orphaned_scans(self) -> int:
+        """Startup-Sweep: verwaiste "running"-Scans wieder einreihen (Resume ab Checkpoint)."""
+        db = self.session_factory()
+        try:
+            requeued = JobQueue(db, max_attempts=self.settings.WORKER_MAX_ATTEMPTS).requeue_orphaned_scans()
+        finally:
+            db.close()
+        if requeued:
+            logger.info(f"{requeued} verwaiste Scans wieder eingereiht")
+        return requeued
+
+    async def _slot(self, stop: asyncio.Event) -> None:
+        while not stop.is_set():
+            if await self.process_next():
+                continue
+            try:
+                await asyncio.wait_for(stop.wait(), self.settings.WORKER_POLL_INTERVAL_S)
+            except asyncio.TimeoutError:
+                pass
+
+    async def process_next(self) -> bool:
+        """
+        Claimt und verarbeitet einen Job.
+
+        Returns:
+            False, wenn die Queue leer war
+        """
+        # Die synchrone DB-Arbeit läuft in Threads, damit die anderen Slots
+        # im selben Event-Loop nicht blockiert werden
+        db = self.session_factory()
+        try:
+            queue = JobQueue(db, max_attempts=self.settings.WORKER_MAX_ATTEMPTS)
+            job = await asyncio.to_thread(self._claim, queue)
+            if job is None:
+                return False
+
+            heartbeat = asyncio.create_task(self._heartbeat(job.id))
+            try:
+                result = await self._execute(job, db)
+            except Exception as e:
+                logger.exception(f"Job {job.id} ({job.kind}) fehlgeschlagen")
+                await asyncio.to_thread(self._fail, queue, job, str(e))
+            else:
+                await asyncio.to_thread(queue.complete, job, result)
+            finally:
+                heartbeat.cancel()
+            return True
+        finally:
+            await asyncio.to_thread(db.close)
+
+    def _claim(self, queue: JobQueue) -> ScanJob | None:
+        queue.requeue_stale(self.settings.WORKER_STALE_AFTER_S)
+        return queue.claim(self.worker_id)
+
+    @staticmethod
+    def _fail(queue: JobQueue, job: ScanJob, error: str) -> None:
+        queue.db.rollback()
+        queue.fail(job, error)
+
+    async def _execute(self, job: ScanJob, db: Session) -> dict:
+        # Werte vorab lesen: run_scan committet im Thread und expired dabei den Job
+        kind, scan_id, industry_id, batch = job.kind, job.scan_id, job.industry_id, job.batch
+        if kind == "scan":
+            await run_scan(scan_id, db, self.settings, self.clients, batch=batch)
+            return {"scan_id": scan_id}
+        if kind == "sweep":
+            scan_ids = await run_industry_sweep(industry_id, db, self.settings, self.clients, batch=batch)
+            return {"scan_ids": scan_ids}
+        raise ValueError(f"Unbekannter Job-Typ: {kind}")
+
+    async def _heartbeat(self, job_id: str) -> None:
+        """Hält den Job als lebendig markiert, solange er läuft (eigene Session)."""
+        while True:
+            await asyncio.sleep(self.settings.WORKER_HEARTBEAT_S)
+            await asyncio.to_thread(self._send_heartbeat, job_id)
+
+    def _send_heartbeat(self, job_id: str) -> None:
+        db = self.session_factory()
+        try:
+            JobQueue(db).heartbeat(job_id)
+        except Exception:
+            logger.exception(f"Heartbeat für Job {job_id} fehlgeschlagen")
+        finally:
+            db.close()
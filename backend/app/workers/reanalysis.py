@@ -0,0 +1,237 @@
+"""
+Re-Analyse.
+Berechnet Analyse, Scores und Recommendations abgeschlossener Scans aus den
+gespeicherten Antworten neu — ohne neue LLM-Calls (z.B. nach geänderten
+Analyzer-Regeln oder zusätzlichen known_competitors). Die Analyse der
+einzelnen Antworten läuft in einem Prozess-Pool.
+"""
+import logging
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy.orm import Session, selectinload, undefer_group
+
+from app.api.industries import load_industry_config
+from app.config import Settings
+from app.models import SCAN_DETAILS, Company, Scan, ScanResult
+from app.services.analyzer import Analyzer
+from app.services.http_cache import get_http_cache, industry_tag, notify_scan_completed
+from app.services.industry_registry import IndustryConfigError
+from app.services.lexicon import lexicon_categories
+from app.services.ranking_snapshot import rebuild_industry_snapshot
+from app.services.text_store import TextStore
+from app.workers.scan_worker import apply_analysis
+
+logger = logging.getLogger(__name__)
+
+# (industry_id, company_name, company_domain, query, platform, response_text)
+AnalysisTask = Tuple[str, str, str, str, str, str]
+
+# Pro Worker-Prozess: Analyzer-Parameter und lazy erstellte Analyzer je Industry
+_worker_analyzer_args: Dict[str, Tuple[List[str], Dict[str, List[str]]]] = {}
+_worker_analyzers: Dict[str, Analyzer] = {}
+
+
+def _init_worker(analyzer_args: Dict[str, Tuple[List[str], Dict[str, List[str]]]]) -> None:
+    """Initializer der Pool-Prozesse."""
+    global _worker_analyzer_args
+    _worker_analyzer_args = analyzer_args
+    _worker_analyzers.clear()
+
+
+def _analyze_task(task: AnalysisTask) -> Dict[str, Any]:
+    """Analysiert eine gespeicherte Antwort (läuft im Pool-Prozess)."""
+    industry_id, company_name, company_domain, query, platform, response_text = task
+    analyzer = _worker_analyzers.get(industry_id)
+    if analyzer is None:
+        known_competitors, lexicons = _worker_analyzer_args[industry_id]
+        analyzer = Analyzer(known_competitors=known_competitors, lexicons=lexicons)
+        _worker_analyzers[industry_id] = analyzer
+    return analyzer.analyze_response(
+        company_name=company_name,
+        company_domain=company_domain,
+        query=query,
+        platform=platform,
+        response_text=response_text,
+    )
+
+
+def reanalyze_scans(
+    db: Session,
+    settings: Settings,
+    industry_id: str | None = None,
+    workers: int | None = None,
+    force: bool = False,
+    page_size: int = 50
+) -> Dict[str, int]:
+    """
+    Analysiert gespeicherte Antworten abgeschlossener Scans neu.
+
+    Ergebnisse, deren analyzer_version aktuell ist, werden übersprungen
+    (außer mit force). Innerhalb eines Laufs werden Analysen nach
+    (Response-Hash, Firma, Analyzer-Version) gemerkt, sodass identische
+    Antworten (z.B. aus dem LLM-Cache) nur einmal analysiert werden.
+    Scans werden seitenweise geladen und pro Seite committet.
+
+    Args:
+        db: SQLAlchemy Session
+        settings: App Settings (INDUSTRY_CONFIG_DIR)
+        industry_id: Nur Scans dieser Industry (Default: alle)
+        workers: Anzahl Pool-Prozesse (Default: CPU-Anzahl, 0 = im Prozess)
+        force: Auch aktuelle Ergebnisse neu analysieren
+        page_size: Scans pro Seite/Commit
+
+    Returns:
+        Statistik {scans, updated, responses, analyzed, memoized, skipped_scans}
+    """
+    scan_filter = [Scan.status == "completed"]
+    if industry_id is not None:
+        scan_filter.append(Scan.industry_id == industry_id)
+
+    # Industry Configs vorab laden (die Pool-Prozesse brauchen Wettbewerber + Lexika)
+    configs: Dict[str, Dict[str, Any]] = {}
+    for (scan_industry,) in db.query(Scan.industry_id).filter(*scan_filter).distinct():
+        try:
+            configs[scan_industry] = load_industry_config(scan_industry, settings.INDUSTRY_CONFIG_DIR)
+        except FileNotFoundError:
+            logger.warning(f"Re-Analyse: keine Config für Industry '{scan_industry}', Scans übersprungen")
+        except IndustryConfigError as e:
+            logger.warning(f"Re-Analyse: {e} — Scans übersprungen")
+
+    analyzer_args = {
+        industry: (config.get("known_competitors", []), lexicon_categories(config))
+        for industry, config in configs.items()
+    }
+    analyzers = {
+        industry: Analyzer(known_competitors=competitors, lexicons=lexicons)
+        for industry, (competitors, lexicons) in analyzer_args.items()
+    }
+
+    scan_ids = [
+        scan_id for (scan_id,) in (
+            db.query(Scan.id)
+            .filter(*scan_filter, Scan.industry_id.in_(list(configs)))
+            .order_by(Scan.completed_at)
+        )
+    ]
+
+    stats = {"scans": len(scan_ids), "updated": 0, "responses": 0, "analyzed": 0, "memoized": 0, "skipped_scans": 0}
+    memo: Dict[Tuple[str, str, str, str], Dict[str, Any]] = {}
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    executor: Executor | None = None
+    if workers > 0 and scan_ids:
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(analyzer_args,))
+    else:
+        _init_worker(analyzer_args)
+
+    try:
+        for offset in range(0, len(scan_ids), page_size):
+            page = (
+                db.query(Scan)
+                .options(
+                    undefer_group(SCAN_DETAILS),
+                    selectinload(Scan.results),
+                )
+                .filter(Scan.id.in_(scan_ids[offset:offset + page_size]))
+                .all()
+            )
+            updated = _reanalyze_page(db, page, configs, analyzers, memo, executor, workers, force, stats)
+            db.commit()
+            for scan in updated:
+                notify_scan_completed(settings, scan.id, scan.industry_id)
+            logger.info(f"Re-Analyse: {min(offset + page_size, len(scan_ids))}/{len(scan_ids)} Scans")
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    # Neue Scores in die Ranking-Snapshots übernehmen
+    if stats["updated"]:
+        for scan_industry in configs:
+            rebuild_industry_snapshot(db, scan_industry)
+        db.commit()
+        cache = get_http_cache(settings)
+        cache.invalidate(*(industry_tag(scan_industry) for scan_industry in configs))
+
+    return stats
+
+
+def _reanalyze_page(
+    db: Session,
+    scans: List[Scan],
+    configs: Dict[str, Dict[str, Any]],
+    analyzers: Dict[str, Analyzer],
+    memo: Dict[Tuple[str, str, str, str], Dict[str, Any]],
+    executor: Executor | None,
+    workers: int,
+    force: bool,
+    stats: Dict[str, int]
+) -> List[Scan]:
+    """
+    Analysiert die offenen Antworten einer Seite im Pool und aktualisiert die Scans.
+
+    Returns:
+        Die geänderten Scans
+    """
+    companies = {
+        company.id: company
+        for company in db.query(Company).filter(Company.id.in_({scan.company_id for scan in scans}))
+    }
+
+    # 1. Offene Analysen sammeln (Duplikate innerhalb der Seite nur einmal)
+    queued_results: List[Tuple[str, Company, ScanResult]] = []
+    task_keys: List[Tuple[str, str, str, str]] = []
+    queued: set[Tuple[str, str, str, str]] = set()
+    pending: Dict[str, List[Tuple[ScanResult, Tuple[str, str, str, str]]]] = {}
+    for scan in scans:
+        company = companies[scan.company_id]
+        version = analyzers[scan.industry_id].version
+        for result in scan.results:
+            stats["responses"] += 1
+            if not force and result.analyzer_version == version:
+                continue
+            # Der Hash aus dem Text-Store identifiziert die Antwort — Texte nur für echte Tasks laden
+            key = (result.response_hash or "", company.name, company.domain, version)
+            if key in memo or key in queued:
+                stats["memoized"] += 1
+            else:
+                queued_results.append((scan.industry_id, company, result))
+                task_keys.append(key)
+                queued.add(key)
+            pending.setdefault(scan.id, []).append((result, key))
+
+    texts = TextStore(db).get_many(result.response_hash for _, _, result in queued_results)
+    tasks: List[AnalysisTask] = [
+        (industry, company.name, company.domain, result.query, result.platform, texts.get(result.response_hash, ""))
+        for industry, company, result in queued_results
+    ]
+
+    # 2. Im Pool analysieren
+    if tasks:
+        if executor is not None:
+            chunksize = max(1, len(tasks) // (workers * 4))
+            results = executor.map(_analyze_task, tasks, chunksize=chunksize)
+        else:
+            results = map(_analyze_task, tasks)
+        memo.update(zip(task_keys, results))
+        stats["analyzed"] += len(tasks)
+
+    # 3. Scans mit geänderten Ergebnissen neu aggregieren und bewerten
+    updated: List[Scan] = []
+    for scan in scans:
+        updates = pending.get(scan.id)
+        if not updates:
+            stats["skipped_scans"] += 1
+            continue
+        for result, key in updates:
+            result.apply_analysis(memo[key])
+        all_results = [result.to_dict() for result in scan.results]
+        apply_analysis(
+            scan, companies[scan.company_id], all_results, configs[scan.industry_id], analyzers[scan.industry_id]
+        )
+        stats["updated"] += 1
+        updated.append(scan)
+
+    return updated
@@ -6,22 +6,39 @@ import logging
 from datetime import datetime
 from typing import List, Dict, Any
 
-from sqlalchemy.orm import Session
+from sqlalchemy import func
+from sqlalchemy.orm import Session, undefer_group
 
-from app.models import Scan, Company, ApiCallCost, CostBudget
+from app.models import SCAN_DETAILS, Scan, ScanResult, Company, ApiCallCost, CostBudget
 from app.config import Settings
 from app.services.query_generator import QueryGenerator
 from app.services.llm_client import LLMClient
+from app.services.provider_clients import ProviderClients
 from app.services.analyzer import Analyzer
+from app.services.lexicon import lexicon_categories
+from app.services.mention_matcher import get_industry_matcher
+from app.services.ranking_snapshot import rebuild_industry_snapshot, update_snapshot_for_scan
+from app.services.http_cache import notify_scan_completed
+from app.services.job_queue import JobQueue
 from app.services.scorer import Scorer
 from app.services.report_generator import ReportGenerator
 from app.services.cost_calculator import CostCalculator
+from app.services.llm_cache import ResponseCache
+from app.services.query_scheduler import BatchScheduler, QueryScheduler
+from app.services.session_runner import SessionRunner
+from app.services.text_store import TextStore
 from app.api.industries import load_industry_config
 
 logger = logging.getLogger(__name__)
 
 
-async def run_scan(scan_id: str, db: Session, settings: Settings) -> None:
+async def run_scan(
+    scan_id: str,
+    db: Session,
+    settings: Settings,
+    clients: ProviderClients | None = None,
+    batch: bool = False
+) -> None:
     """
     Führt den kompletten Scan-Workflow für eine Company aus.
 
@@ -30,206 +47,651 @@ async def run_scan(scan_id: str, db: Session, settings: Settings) -> None:
     2. Company laden
     3. Industry Config laden (YAML)
     4. QueryGenerator: Queries generieren
-    5. LLMClient: Für jede Query alle Plattformen abfragen
-    6. Analyzer: Jede Response analysieren
+    5. QueryScheduler/LLMClient: Alle (Query, Plattform)-Paare parallel abfragen
+    6. Analyzer: Jede Response analysieren, sobald sie eintrifft
     7. Scorer: Scores berechnen
-    8. ReportGenerator: Recommendations + HTML generieren
-    9. Scan updaten: query_results, platform_scores, overall_score, analysis, recommendations, report_html
+    8. ReportGenerator: Recommendations generieren (HTML wird bei Bedarf gerendert)
+    9. Scan updaten: platform_scores, overall_score, analysis, recommendations
     10. status → "completed" (oder "failed" bei Error)
 
+    Jedes fertige (Query, Plattform)-Ergebnis wird sofort als ScanResult-Zeile
+    committet. Ein erneuter Lauf (z.B. nach Absturz oder Fehler) fragt nur die
+    fehlenden Paare ab.
+
     Args:
         scan_id: ID des Scans
         db: SQLAlchemy Session
         settings: App Settings
+        clients: Geteilte Provider-Clients (aus dem App-Lifespan)
+        batch: Provider-Batch-APIs nutzen (günstiger, Ergebnisse nach bis zu 24h)
     """
+    # Alle DB-Arbeit läuft über den Runner in einem Thread, damit die anderen
+    # Scans im selben Event-Loop (Worker-Slots) währenddessen weiterlaufen
+    runner = SessionRunner()
+
     # 1. Scan laden und auf "running" setzen
-    scan = db.query(Scan).filter(Scan.id == scan_id).first()
-    if not scan:
-        raise ValueError(f"Scan with id '{scan_id}' not found")
+    def start() -> Scan:
+        scan = db.query(Scan).options(undefer_group(SCAN_DETAILS)).filter(Scan.id == scan_id).first()
+        if not scan:
+            raise ValueError(f"Scan with id '{scan_id}' not found")
 
-    scan.status = "running"
-    scan.started_at = datetime.utcnow()
-    db.commit()
+        scan.status = "running"
+        scan.started_at = datetime.utcnow()
+        db.commit()
+        return scan
+
+    scan = await runner.run(start)
 
     try:
-        # 2. Company laden
-        company = db.query(Company).filter(Company.id == scan.company_id).first()
-        if not company:
-            raise ValueError(f"Company with id '{scan.company_id}' not found")
-
-        # 3. Industry Config laden
-        industry_config = load_industry_config(scan.industry_id, settings.INDUSTRY_CONFIG_DIR)
-
-        # 4. Queries generieren
-        query_generator = QueryGenerator(industry_config)
-        queries = query_generator.generate_queries(
-            company_name=company.name,
-            company_domain=company.domain,
-            company_description=company.description,
-            company_location=company.location
-        )
+        def prepare() -> tuple[Company, Dict[str, Any], List[Dict[str, Any]], Analyzer, set]:
+            # 2. Company laden
+            company = db.query(Company).filter(Company.id == scan.company_id).first()
+            if not company:
+                raise ValueError(f"Company with id '{scan.company_id}' not found")
+
+            # 3. Industry Config laden
+            industry_config = load_industry_config(scan.industry_id, settings.INDUSTRY_CONFIG_DIR)
+
+            # 4. Queries generieren
+            query_generator = QueryGenerator(industry_config)
+            queries = query_generator.generate_queries(
+                company_name=company.name,
+                company_domain=company.domain,
+                company_description=company.description,
+                company_location=company.location
+            )
+
+            # Checkpoint eines abgebrochenen Laufs nur übernehmen, wenn die Queries gleich geblieben sind
+            if scan.query_version != query_generator.query_version:
+                scan.results = []
+
+            # Query-Version auf Scan setzen
+            scan.query_version = query_generator.query_version
+            scan.error_message = None
+            db.commit()
+
+            analyzer = _create_analyzer(db, scan.industry_id, industry_config)
+            done_pairs = {(r.query, r.platform) for r in scan.results}
+            return company, industry_config, queries, analyzer, done_pairs
 
-        # Query-Version auf Scan setzen
-        scan.query_version = query_generator.query_version
+        company, industry_config, queries, analyzer, done_pairs = await runner.run(prepare)
 
-        # 5. LLMs abfragen
-        llm_client = LLMClient(settings)
+        # 5. LLMs abfragen — bis zu N (Query, Plattform)-Calls gleichzeitig
+        cache = (
+            ResponseCache.from_config(db, settings, industry_config)
+            if settings.LLM_CACHE_ENABLED else None
+        )
+        llm_client = LLMClient(settings, cache=cache, clients=clients, db_runner=runner)
+        scheduler = _create_scheduler(llm_client, settings, industry_config, batch)
         cost_calculator = CostCalculator()
-        all_results: List[Dict[str, Any]] = []
-        known_competitors = industry_config.get("known_competitors", [])
-        analyzer = Analyzer(known_competitors=known_competitors)
+        text_store = TextStore(db)
 
         # Platform-Konfiguration aus Industry Config
         platforms_config = industry_config.get("platforms", {})
-
-        for query_obj in queries:
+        if llm_client.rate_limiter is not None:
+            llm_client.rate_limiter.configure_platforms(platforms_config)
+        jobs = scheduler.build_jobs(queries, platforms_config)
+
+        # Resume: bereits gespeicherte (Query, Plattform)-Paare nicht erneut abfragen
+        job_order = {(job["query_obj"].get("query", ""), job["platform"]): job["index"] for job in jobs}
+        jobs = [
+            job for job in jobs
+            if (job["query_obj"].get("query", ""), job["platform"]) not in done_pairs
+        ]
+
+        # 6. Jede Response analysieren, sobald sie eintrifft, und sofort speichern
+        def handle_result(job: Dict[str, Any], platform_response: Dict[str, Any]) -> None:
+            query_obj = job["query_obj"]
             query_text = query_obj.get("query", "")
-            category = query_obj.get("category", "general")
-            intent = query_obj.get("intent", "")
-
-            # Alle Plattformen für diese Query abfragen
-            platform_responses = await llm_client.query_all_platforms(
-                query=query_text,
-                platforms=platforms_config
-            )
 
-            # 6. Jede Response analysieren
-            for platform_response in platform_responses:
-                platform = platform_response.get("platform", "unknown")
-                response_text = platform_response.get("response_text", "")
-                model_used = platform_response.get("model", "unknown")
-
-                # Kosten erfassen (auch für fehlgeschlagene Calls)
-                api_cost = ApiCallCost(
-                    scan_id=scan_id,
-                    platform=platform,
-                    model=model_used,
-                    query=query_text,
-                    input_tokens=platform_response.get("input_tokens", 0),
-                    output_tokens=platform_response.get("output_tokens", 0),
-                    total_tokens=platform_response.get("total_tokens", 0),
-                    cost_usd=cost_calculator.calculate_cost(
-                        model=model_used,
-                        input_tokens=platform_response.get("input_tokens", 0),
-                        output_tokens=platform_response.get("output_tokens", 0),
-                    ),
-                    latency_ms=platform_response.get("latency_ms", 0),
-                    success=platform_response.get("success", False),
-                )
-                db.add(api_cost)
-
-                # Skip failed responses for analysis
-                if not platform_response.get("success", False):
-                    continue
+            # Kosten erfassen (auch für fehlgeschlagene Calls)
+            _record_api_cost(db, scan_id, text_store.put(query_text), platform_response, cost_calculator)
 
+            # Skip failed responses for analysis (werden beim Resume erneut abgefragt)
+            if platform_response.get("success", False):
                 analysis_result = analyzer.analyze_response(
                     company_name=company.name,
                     company_domain=company.domain,
                     query=query_text,
-                    platform=platform,
-                    response_text=response_text
+                    platform=platform_response.get("platform", "unknown"),
+                    response_text=platform_response.get("response_text", "")
+                )
+                # result_index = Position in der ursprünglichen Query-Reihenfolge (stabiler Report)
+                _checkpoint_result(
+                    scan,
+                    job_order[(query_text, job["platform"])],
+                    _build_result(query_obj, platform_response, analysis_result),
+                    text_store,
                 )
 
-                # Ergebnis anreichern
-                result = {
-                    "query": query_text,
-                    "category": category,
-                    "intent": intent,
-                    "platform": platform,
-                    "model": model_used,
-                    "response_text": response_text,
-                    **analysis_result,
-                }
+            # Checkpoint: Ergebnis + Kosten überleben einen Abbruch des Scans
+            db.commit()
 
-                all_results.append(result)
+        await scheduler.run(jobs, lambda job, response: runner.run(handle_result, job, response))
 
-        # Aggregierte Analyse erstellen
-        aggregated_analysis = analyzer.aggregate_analysis(
-            company_name=company.name,
-            all_results=all_results
-        )
+        def finish() -> str:
+            all_results = [
+                result.to_dict()
+                for result in sorted(scan.results, key=lambda r: r.result_index)
+            ]
 
-        # 7. Scores berechnen
-        scorer = Scorer(industry_config)
+            _finalize_scan(db, scan, company, all_results, industry_config, analyzer)
 
-        # Scores für jede Platform berechnen
-        platform_scores = scorer.calculate_platform_scores(all_results)
+            db.commit()
+            return scan.industry_id
 
-        # Overall Score berechnen
-        overall_score = scorer.calculate_overall_score(platform_scores)
+        industry_id = await runner.run(finish)
+        notify_scan_completed(settings, scan_id, industry_id)
 
-        # UI contract: always expose all known platforms, even if disabled/skipped.
-        for p in ("chatgpt", "claude", "gemini", "perplexity"):
-            platform_scores.setdefault(p, 0.0)
+    except Exception as e:
+        # Bei Fehler: Status auf "failed" setzen — gespeicherte Ergebnisse bleiben für resume erhalten
+        def mark_failed() -> None:
+            db.rollback()
+            scan.status = "failed"
+            scan.error_message = str(e)
+            scan.completed_at = datetime.utcnow()
+            db.commit()
+
+        await runner.run(mark_failed)
+        raise
 
-        # 8. Report generieren
-        report_generator = ReportGenerator()
 
-        # Recommendations generieren
-        recommendations = report_generator.generate_recommendations(
-            company_name=company.name,
-            analysis=aggregated_analysis,
-            platform_scores=platform_scores,
-            industry_config=industry_config
-        )
+async def run_industry_sweep(
+    industry_id: str,
+    db: Session,
+    settings: Settings,
+    clients: ProviderClients | None = None,
+    batch: bool = False
+) -> List[str]:
+    """
+    Führt einen Response-first Sweep für alle Companies einer Industry aus.
 
-        # HTML Report generieren
-        scan_data = {
-            "overall_score": overall_score,
-            "platform_scores": platform_scores,
-            "query_results": all_results,
-            "analysis": aggregated_analysis,
-            "recommendations": recommendations
-        }
-
-        report_html = report_generator.generate_report_html(
-            company_name=company.name,
-            company_domain=company.domain,
-            scan_data=scan_data,
-            industry_config=industry_config
-        )
+    Workflow:
+    1. Pro Company einen Scan anlegen (oder den neuesten offenen Scan —
+       pending, running oder failed — samt wartendem Job übernehmen;
+       Companies, deren Scan ein Worker schon bearbeitet, bleiben außen vor)
+    2. Jede Generic Query × Plattform genau einmal abfragen
+    3. Jede Antwort für alle Companies der Industry analysieren
+    4. Nur die Brand Queries pro Company einzeln abfragen
+    5. Pro Company einen completed Scan schreiben
+
+    Die Kosten der geteilten Generic Calls werden gleichmäßig auf die Scans
+    verteilt, für die der Call gemacht wurde.
+
+    Wie bei run_scan wird jedes Ergebnis sofort als ScanResult-Zeile
+    committet. Ein erneuter Lauf (z.B. der nach einem Absturz neu
+    eingereihte Sweep-Job) übernimmt die Scans und fragt nur die
+    (Query, Plattform)-Paare ab, die noch bei mindestens einer Company fehlen.
 
-        # 9. Scan updaten
-        scan.query_results = all_results
-        scan.platform_scores = platform_scores
-        scan.overall_score = overall_score
-        scan.analysis = aggregated_analysis
-        scan.recommendations = recommendations
-        scan.report_html = report_html
+    Args:
+        industry_id: ID der Industry
+        db: SQLAlchemy Session
+        settings: App Settings
+        clients: Geteilte Provider-Clients (aus dem App-Lifespan)
+        batch: Provider-Batch-APIs nutzen (günstiger, Ergebnisse nach bis zu 24h)
 
-        # Kosten aggregieren (flush damit die api_cost Records in der DB sind)
-        db.flush()
-        from sqlalchemy import func
-        cost_totals = db.query(
-            func.sum(ApiCallCost.cost_usd),
-            func.sum(ApiCallCost.total_tokens),
-        ).filter(ApiCallCost.scan_id == scan_id).first()
+    Returns:
+        Liste der Scan-IDs des Sweeps
+    """
+    # Alle DB-Arbeit läuft über den Runner in einem Thread (siehe run_scan)
+    runner = SessionRunner()
+    industry_config = load_industry_config(industry_id, settings.INDUSTRY_CONFIG_DIR)
+    query_generator = QueryGenerator(industry_config)
+
+    # 1. Scans anlegen bzw. offene Scans übernehmen
+    def start() -> tuple[List[Company], Dict[str, Scan]]:
+        companies = db.query(Company).filter(Company.industry_id == industry_id).all()
+        if not companies:
+            raise ValueError(f"No companies found for industry '{industry_id}'")
+
+        started_at = datetime.utcnow()
+        # Neuester offener Scan pro Company (running/failed: Checkpoint eines abgebrochenen Laufs)
+        open_scans: Dict[str, Scan] = {}
+        for scan in (
+            db.query(Scan)
+            .filter(Scan.industry_id == industry_id)
+            .filter(Scan.status.in_(("pending", "running", "failed")))
+            .order_by(Scan.created_at)
+        ):
+            open_scans[scan.company_id] = scan
+
+        # Wartende Jobs der übernommenen Scans im selben Commit abbrechen, sonst
+        # fragt der Job den Scan später noch einmal ab
+        busy = JobQueue(db).take_over_scans([scan.id for scan in open_scans.values()])
+        companies = [
+            company for company in companies
+            if company.id not in open_scans or open_scans[company.id].id not in busy
+        ]
+
+        scans: Dict[str, Scan] = {}
+        for company in companies:
+            scan = open_scans.get(company.id)
+            if scan is None:
+                scan = Scan(company_id=company.id, industry_id=industry_id)
+                db.add(scan)
+            # Checkpoint nur übernehmen, wenn die Queries gleich geblieben sind
+            elif scan.query_version != query_generator.query_version:
+                scan.results = []
+            scan.status = "running"
+            scan.started_at = started_at
+            scan.query_version = query_generator.query_version
+            scan.error_message = None
+            scans[company.id] = scan
+        db.commit()
+        return companies, scans
 
-        scan.total_cost_usd = cost_totals[0] or 0.0
-        scan.total_tokens_used = int(cost_totals[1] or 0)
+    companies, scans = await runner.run(start)
+    if not scans:
+        logger.info(f"Sweep {industry_id}: alle Companies werden bereits gescannt")
+        return []
 
-        # Budget-Warnung prüfen
-        _check_budget_warning(db)
+    try:
+        cache = (
+            ResponseCache.from_config(db, settings, industry_config)
+            if settings.LLM_CACHE_ENABLED else None
+        )
+        llm_client = LLMClient(settings, cache=cache, clients=clients, db_runner=runner)
+        scheduler = _create_scheduler(llm_client, settings, industry_config, batch)
+        cost_calculator = CostCalculator()
+        text_store = TextStore(db)
+        platforms_config = industry_config.get("platforms", {})
+        if llm_client.rate_limiter is not None:
+            llm_client.rate_limiter.configure_platforms(platforms_config)
+
+        def prepare() -> tuple[Analyzer, Dict[str, Company], List[str], List[Dict[str, Any]], Dict[str, Dict]]:
+            analyzer = _create_analyzer(db, industry_id, industry_config)
+            companies_by_id = {company.id: company for company in companies}
+            scan_ids = [scan.id for scan in scans.values()]
+            done_pairs = {
+                company_id: {(r.query, r.platform) for r in scan.results}
+                for company_id, scan in scans.items()
+            }
+
+            # Jobs: Generic Queries einmal (geteilt), Brand Queries pro Company
+            generic_jobs = scheduler.build_jobs(query_generator.generic_queries(), platforms_config)
+            brand_jobs = {
+                company.id: scheduler.build_jobs(query_generator.brand_queries(company.name), platforms_config)
+                for company in companies
+            }
+
+            # result_index pro Company = Position in ihrer Query-Reihenfolge (Generic, dann Brand)
+            result_order: Dict[str, Dict[tuple[str, str], int]] = {
+                company_id: {
+                    (job["query_obj"]["query"], job["platform"]): index
+                    for index, job in enumerate(generic_jobs + company_jobs)
+                }
+                for company_id, company_jobs in brand_jobs.items()
+            }
+
+            # Resume: Generic Calls nur für Companies, denen das Paar fehlt; Brand Calls nur, wenn es fehlt
+            jobs = []
+            for job in generic_jobs:
+                pair = (job["query_obj"]["query"], job["platform"])
+                job["company_ids"] = [company.id for company in companies if pair not in done_pairs[company.id]]
+                if job["company_ids"]:
+                    jobs.append(job)
+            for company_id, company_jobs in brand_jobs.items():
+                for job in company_jobs:
+                    if (job["query_obj"]["query"], job["platform"]) not in done_pairs[company_id]:
+                        job["company_id"] = company_id
+                        jobs.append(job)
+            for index, job in enumerate(jobs):
+                job["index"] = index
+            return analyzer, companies_by_id, scan_ids, jobs, result_order
+
+        analyzer, companies_by_id, scan_ids, jobs, result_order = await runner.run(prepare)
+
+        def checkpoint_for(company: Company, job: Dict[str, Any], platform_response: Dict[str, Any]) -> None:
+            query_obj = job["query_obj"]
+            analysis_result = analyzer.analyze_response(
+                company_name=company.name,
+                company_domain=company.domain,
+                query=query_obj["query"],
+                platform=platform_response.get("platform", "unknown"),
+                response_text=platform_response.get("response_text", "")
+            )
+            _checkpoint_result(
+                scans[company.id],
+                result_order[company.id][(query_obj["query"], job["platform"])],
+                _build_result(query_obj, platform_response, analysis_result),
+                text_store,
+            )
 
-        scan.status = "completed"
-        scan.completed_at = datetime.utcnow()
-        scan.error_message = None
+        def handle_result(job: Dict[str, Any], platform_response: Dict[str, Any]) -> None:
+            query_text = job["query_obj"]["query"]
+            company_id = job.get("company_id")
 
-        db.commit()
+            if company_id is None:
+                # 2./3. Geteilter Generic Call → Kosten verteilen, für jede Company analysieren
+                target_ids = job["company_ids"]
+                _record_shared_api_cost(
+                    db, [scans[cid].id for cid in target_ids], text_store.put(query_text),
+                    platform_response, cost_calculator,
+                )
+                if platform_response.get("success", False):
+                    for target_id in target_ids:
+                        checkpoint_for(companies_by_id[target_id], job, platform_response)
+            else:
+                # 4. Brand Call einer einzelnen Company
+                _record_api_cost(
+                    db, scans[company_id].id, text_store.put(query_text), platform_response, cost_calculator
+                )
+                if platform_response.get("success", False):
+                    checkpoint_for(companies_by_id[company_id], job, platform_response)
+
+            # Checkpoint: Ergebnisse + Kosten überleben einen Abbruch des Sweeps
+            db.commit()
+
+        await scheduler.run(jobs, lambda job, response: runner.run(handle_result, job, response))
+
+        def finish() -> List[tuple[str, str]]:
+            # 5. Pro Company abschließen — ein Fehler kippt nicht den ganzen Sweep
+            for company in companies:
+                scan = scans[company.id]
+                all_results = [
+                    result.to_dict()
+                    for result in sorted(scan.results, key=lambda r: r.result_index)
+                ]
+                try:
+                    _complete_scan(db, scan, company, all_results, industry_config, analyzer)
+                except Exception as e:
+                    logger.exception(f"Sweep: Scan {scan.id} für {company.name} fehlgeschlagen")
+                    scan.status = "failed"
+                    scan.error_message = str(e)
+                    scan.completed_at = datetime.utcnow()
+
+            # Snapshot, Stats und Budget einmal für die ganze Industry statt pro Company
+            rebuild_industry_snapshot(db, industry_id)
+            _check_budget_warning(db)
+            db.commit()
+            return [(scan.id, scan.industry_id) for scan in scans.values() if scan.status == "completed"]
+
+        for scan_id, scan_industry_id in await runner.run(finish):
+            notify_scan_completed(settings, scan_id, scan_industry_id)
 
     except Exception as e:
-        # Bei Fehler: Status auf "failed" setzen
-        scan.status = "failed"
-        scan.error_message = str(e)
-        scan.completed_at = datetime.utcnow()
-        db.commit()
+        def mark_failed() -> None:
+            db.rollback()
+            for scan in scans.values():
+                if scan.status == "running":
+                    scan.status = "failed"
+                    scan.error_message = str(e)
+                    scan.completed_at = datetime.utcnow()
+            db.commit()
+
+        await runner.run(mark_failed)
         raise
 
+    return scan_ids
+
+
+def _create_scheduler(
+    llm_client: LLMClient,
+    settings: Settings,
+    industry_config: Dict[str, Any],
+    batch: bool
+) -> QueryScheduler:
+    """Echtzeit-Scheduler oder — für geplante Sweeps — Batch-Scheduler."""
+    if batch:
+        return BatchScheduler.from_config(llm_client, settings, industry_config)
+    return QueryScheduler.from_config(llm_client, settings, industry_config)
+
+
+def _create_analyzer(db: Session, industry_id: str, industry_config: Dict[str, Any]) -> Analyzer:
+    """Analyzer mit dem gecachten Mention-Matcher und den Lexika der Industry."""
+    companies = db.query(Company.name, Company.domain).filter(Company.industry_id == industry_id).all()
+    matcher = get_industry_matcher(industry_id, industry_config, [(name, domain) for name, domain in companies])
+    return Analyzer(
+        known_competitors=industry_config.get("known_competitors", []),
+        matcher=matcher,
+        lexicons=lexicon_categories(industry_config),
+    )
+
+
+def _checkpoint_result(
+    scan: Scan,
+    result_index: int,
+    result: Dict[str, Any],
+    text_store: TextStore
+) -> None:
+    """
+    Hängt ein analysiertes Ergebnis als ScanResult-Zeile an den Scan
+    (Antworttext über den Text-Store). Der Aufrufer committet — danach
+    überspringt ein Resume das (Query, Plattform)-Paar.
+    """
+    scan.results.append(ScanResult.from_result(
+        result_index,
+        result,
+        response_hash=text_store.put(result.get("response_text", "")),
+    ))
+
+
+def _build_result(
+    query_obj: Dict[str, str],
+    platform_response: Dict[str, Any],
+    analysis_result: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Kombiniert Query, Plattform-Antwort und Analyse zu einem Scan-Ergebnis."""
+    return {
+        "query": query_obj.get("query", ""),
+        "category": query_obj.get("category", "general"),
+        "intent": query_obj.get("intent", ""),
+        "platform": platform_response.get("platform", "unknown"),
+        "model": platform_response.get("model", "unknown"),
+        "response_text": platform_response.get("response_text", ""),
+        **analysis_result,
+    }
+
+
+def _finalize_scan(
+    db: Session,
+    scan: Scan,
+    company: Company,
+    all_results: List[Dict[str, Any]],
+    industry_config: Dict[str, Any],
+    analyzer: Analyzer
+) -> None:
+    """
+    Aggregiert die Ergebnisse eines Scans, berechnet Scores, erstellt den Report,
+    setzt den Scan auf "completed" und aktualisiert den Ranking-Snapshot (ohne Commit).
+
+    Args:
+        db: SQLAlchemy Session
+        scan: Scan-Objekt
+        company: Zugehörige Company
+        all_results: Analysierte Query-Ergebnisse
+        industry_config: Geparste YAML-Config
+        analyzer: Analyzer-Instanz der Industry
+    """
+    _complete_scan(db, scan, company, all_results, industry_config, analyzer)
+
+    # Budget-Warnung prüfen
+    _check_budget_warning(db)
+
+    # Ranking-Snapshot der Industry nachziehen
+    update_snapshot_for_scan(db, scan)
+
+
+def _complete_scan(
+    db: Session,
+    scan: Scan,
+    company: Company,
+    all_results: List[Dict[str, Any]],
+    industry_config: Dict[str, Any],
+    analyzer: Analyzer
+) -> None:
+    """
+    Schreibt Analyse und Kosten-Summen auf den Scan und setzt ihn auf
+    "completed" (ohne Commit, ohne Snapshot/Budget — das erledigt der
+    Aufrufer einmal pro Scan bzw. Sweep).
+    """
+    apply_analysis(scan, company, all_results, industry_config, analyzer)
+
+    # Kosten aggregieren (flush damit die api_cost Records in der DB sind)
+    db.flush()
+    cost_totals = db.query(
+        func.sum(ApiCallCost.cost_usd),
+        func.sum(ApiCallCost.total_tokens),
+    ).filter(ApiCallCost.scan_id == scan.id).first()
+
+    scan.total_cost_usd = cost_totals[0] or 0.0
+    scan.total_tokens_used = int(cost_totals[1] or 0)
+
+    scan.status = "completed"
+    scan.completed_at = datetime.utcnow()
+    scan.error_message = None
+
+
+def apply_analysis(
+    scan: Scan,
+    company: Company,
+    all_results: List[Dict[str, Any]],
+    industry_config: Dict[str, Any],
+    analyzer: Analyzer
+) -> None:
+    """
+    Schreibt aggregierte Analyse, Scores und Recommendations auf den Scan
+    (ohne Commit). Die Ergebnis-Zeilen (scan.results) pflegt der Aufrufer.
+    Wird auch von der Offline-Re-Analyse (app/workers/reanalysis.py) genutzt.
+
+    Args:
+        scan: Scan-Objekt
+        company: Zugehörige Company
+        all_results: Analysierte Query-Ergebnisse
+        industry_config: Geparste YAML-Config
+        analyzer: Analyzer-Instanz der Industry
+    """
+    # Aggregierte Analyse erstellen
+    aggregated_analysis = analyzer.aggregate_analysis(
+        company_name=company.name,
+        all_results=all_results
+    )
+
+    # 7. Scores berechnen
+    scorer = Scorer(industry_config)
+
+    # Scores für jede Platform berechnen
+    platform_scores = scorer.calculate_platform_scores(all_results)
+
+    # Overall Score berechnen
+    overall_score = scorer.calculate_overall_score(platform_scores)
+
+    # UI contract: always expose all known platforms, even if disabled/skipped.
+    for p in ("chatgpt", "claude", "gemini", "perplexity"):
+        platform_scores.setdefault(p, 0.0)
+
+    # 8. Recommendations
+    report_generator = ReportGenerator()
+
+    # Recommendations generieren
+    recommendations = report_generator.generate_recommendations(
+        company_name=company.name,
+        analysis=aggregated_analysis,
+        platform_scores=platform_scores,
+        industry_config=industry_config
+    )
+
+    # HTML-Report wird bei Bedarf gerendert (/reports/{scan_id}/html)
+
+    # 9. Scan updaten
+    scan.platform_scores = platform_scores
+    scan.overall_score = overall_score
+    scan.analysis = aggregated_analysis
+    scan.recommendations = recommendations
+
+
+def _record_api_cost(
+    db: Session,
+    scan_id: str,
+    query_hash: str,
+    platform_response: Dict[str, Any],
+    cost_calculator: CostCalculator
+) -> ApiCallCost:
+    """
+    Erfasst einen API-Call als ApiCallCost-Record (Query-Text über den Text-Store).
+
+    Cache-Hits werden mit cache_hit=True und Kosten 0 erfasst; saved_cost_usd
+    enthält die Kosten, die der ursprüngliche Call verursacht hat.
+    """
+    api_cost = ApiCallCost(
+        scan_id=scan_id,
+        query_hash=query_hash,
+        **_api_cost_values(platform_response, cost_calculator)
+    )
+    db.add(api_cost)
+    return api_cost
+
+
+def _record_shared_api_cost(
+    db: Session,
+    scan_ids: List[str],
+    query_hash: str,
+    platform_response: Dict[str, Any],
+    cost_calculator: CostCalculator
+) -> None:
+    """
+    Verteilt einen geteilten API-Call (Sweep) gleichmäßig auf mehrere Scans.
+    Token-Reste werden dem ersten Scan zugeschlagen, damit die Summen exakt bleiben.
+    """
+    values = _api_cost_values(platform_response, cost_calculator)
+    share_count = len(scan_ids)
+
+    token_shares = {
+        field: divmod(values[field], share_count)
+        for field in ("input_tokens", "output_tokens", "total_tokens")
+    }
+
+    for idx, scan_id in enumerate(scan_ids):
+        share = dict(values)
+        for field, (quotient, remainder) in token_shares.items():
+            share[field] = quotient + (remainder if idx == 0 else 0)
+        share["cost_usd"] = values["cost_usd"] / share_count
+        share["saved_cost_usd"] = values["saved_cost_usd"] / share_count
+
+        db.add(ApiCallCost(scan_id=scan_id, query_hash=query_hash, **share))
+
+
+def _api_cost_values(
+    platform_response: Dict[str, Any],
+    cost_calculator: CostCalculator
+) -> Dict[str, Any]:
+    """Berechnet die ApiCallCost-Felder für eine Plattform-Antwort."""
+    model_used = platform_response.get("model", "unknown")
+    input_tokens = platform_response.get("input_tokens", 0)
+    output_tokens = platform_response.get("output_tokens", 0)
+    cache_hit = platform_response.get("cache_hit", False)
+    batch = platform_response.get("batch", False)
+
+    saved_cost = 0.0
+    if cache_hit:
+        cached_usage = platform_response.get("cached_usage", {})
+        saved_cost = cost_calculator.calculate_cost(
+            model=model_used,
+            input_tokens=cached_usage.get("input_tokens", 0),
+            output_tokens=cached_usage.get("output_tokens", 0),
+        )
+
+    return {
+        "platform": platform_response.get("platform", "unknown"),
+        "model": model_used,
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "total_tokens": platform_response.get("total_tokens", 0),
+        "cost_usd": 0.0 if cache_hit else cost_calculator.calculate_cost(
+            model=model_used,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            batch=batch,
+        ),
+        "latency_ms": platform_response.get("latency_ms", 0),
+        "success": platform_response.get("success", False),
+        "cache_hit": cache_hit,
+        "saved_cost_usd": saved_cost,
+    }
+
 
 def _check_budget_warning(db: Session) -> None:
     """Prüft ob Monatsbudget-Schwelle überschritten ist und loggt Warnung."""
-    from sqlalchemy import func
-
     now = datetime.utcnow()
     current_month = now.strftime("%Y-%m")
 
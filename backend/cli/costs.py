@@ -14,6 +14,7 @@ from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
 from sqlalchemy import func
+from sqlalchemy.orm import selectinload
 
 from app.database import SessionLocal
 from app.models import ApiCallCost, CostBudget, Scan, Company
@@ -61,6 +62,20 @@ def cmd_summary(month: str | None = None):
         console.print(f"  Scans:            [bold]{scan_count}[/bold]")
         if scan_count > 0:
             console.print(f"  Ø pro Scan:       [bold]${total_cost / scan_count:.4f}[/bold]")
+
+        cache_totals = db.query(
+            func.count(ApiCallCost.id),
+            func.sum(ApiCallCost.saved_cost_usd),
+        ).filter(
+            ApiCallCost.created_at >= month_start,
+            ApiCallCost.created_at < month_end,
+            ApiCallCost.cache_hit.is_(True),
+        ).first()
+        if cache_totals[0]:
+            console.print(
+                f"  Cache-Hits:       [bold]{cache_totals[0]}[/bold] "
+                f"(gespart: [green]${cache_totals[1] or 0.0:.4f}[/green])"
+            )
         console.print()
 
         platform_rows = db.query(
@@ -100,13 +115,19 @@ def cmd_detail(scan_id: str):
     """Kosten-Details eines Scans."""
     db = SessionLocal()
     try:
-        scan = db.query(Scan).filter(Scan.id == scan_id).first()
+        scan = db.query(Scan.company_id).filter(Scan.id == scan_id).first()
         if not scan:
             console.print(f"[red]Scan '{scan_id}' nicht gefunden[/red]")
             return
 
         company = db.query(Company).filter(Company.id == scan.company_id).first()
-        costs = db.query(ApiCallCost).filter(ApiCallCost.scan_id == scan_id).order_by(ApiCallCost.created_at).all()
+        costs = (
+            db.query(ApiCallCost)
+            .options(selectinload(ApiCallCost.query_blob))
+            .filter(ApiCallCost.scan_id == scan_id)
+            .order_by(ApiCallCost.created_at)
+            .all()
+        )
 
         console.print(Panel(
             f"[bold]{company.name if company else 'Unbekannt'}[/bold] — Scan {scan_id[:8]}...",
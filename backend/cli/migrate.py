@@ -0,0 +1,128 @@
+"""
+CLI Tool für manuelle Schema-Migrationen.
+
+Usage:
+    python -m cli.migrate cost-cache-columns
+    python -m cli.migrate active-job-indexes
+    python -m cli.migrate drop-report-html [--archive <pfad.jsonl.gz>]
+    python -m cli.migrate split-query-results
+    python -m cli.migrate store-texts
+
+cost-cache-columns: Ergänzt api_call_costs um cache_hit und saved_cost_usd
+(Kosten-Erfassung des Response-Caches). Muss vor dem ersten Scan bzw. vor
+/costs mit der neuen Version laufen.
+
+active-job-indexes: Legt die Unique-Indexe an, die höchstens einen aktiven
+Job pro Scan bzw. Sweep pro Industry erlauben (idempotentes Einreihen bei
+parallelen Requests). Doppelt aktive Jobs werden vorher als fehlgeschlagen
+markiert.
+
+drop-report-html: Entfernt die gespeicherten HTML-Reports (scans.report_html)
+und verkleinert die Datenbank. Reports werden bei Bedarf aus den Scan-Daten
+gerendert; mit --archive werden die alten HTML-Reports vorher gesichert.
+
+split-query-results: Überführt die JSON-Liste scans.query_results in die
+Tabelle scan_results (eine Zeile pro Query × Plattform) und entfernt die
+Spalte. Muss vor dem ersten Scan mit der neuen Version laufen.
+
+store-texts: Verschiebt Antworttexte (scan_results.response_text) und
+Query-Texte (api_call_costs.query) in den inhaltsadressierten Text-Store
+(text_blobs, dedupliziert und komprimiert) und verkleinert die Datenbank.
+"""
+import sys
+
+from rich.console import Console
+
+from app.database import engine
+from app.migrations import (
+    add_active_job_indexes,
+    add_cost_cache_columns,
+    drop_report_html,
+    migrate_query_results,
+    migrate_texts_to_store,
+)
+
+console = Console()
+
+
+def cmd_cost_cache_columns():
+    """Ergänzt die Cache-Spalten in api_call_costs."""
+    stats = add_cost_cache_columns(engine)
+    if not stats["added"]:
+        console.print("[dim]api_call_costs hat die Cache-Spalten bereits — nichts zu tun.[/dim]")
+        return
+    console.print(f"[green]api_call_costs ergänzt: {', '.join(stats['added'])}[/green]")
+
+
+def cmd_active_job_indexes():
+    """Legt die Unique-Indexe auf aktive scan_jobs an."""
+    stats = add_active_job_indexes(engine)
+    if not stats["created"]:
+        console.print("[dim]scan_jobs hat die Indexe bereits — nichts zu tun.[/dim]")
+        return
+    if stats["failed_duplicates"]:
+        console.print(f"  Doppelte Jobs: [bold]{stats['failed_duplicates']}[/bold] als fehlgeschlagen markiert")
+    console.print(f"[green]scan_jobs ergänzt: {', '.join(stats['created'])}[/green]")
+
+
+def cmd_drop_report_html(archive_path: str | None = None):
+    """Archiviert (optional) und entfernt scans.report_html."""
+    stats = drop_report_html(engine, archive_path=archive_path)
+    if not stats["dropped"]:
+        console.print("[dim]scans.report_html existiert nicht mehr — nichts zu tun.[/dim]")
+        return
+    if archive_path:
+        console.print(f"  Archiviert:  [bold]{stats['archived']}[/bold] Reports → {archive_path}")
+    console.print("[green]scans.report_html entfernt.[/green]")
+
+
+def cmd_split_query_results():
+    """Überführt scans.query_results in scan_results."""
+    stats = migrate_query_results(engine)
+    if not stats["migrated"]:
+        console.print("[dim]scans.query_results existiert nicht mehr — nichts zu tun.[/dim]")
+        return
+    console.print(f"  Scans:       [bold]{stats['scans']}[/bold]")
+    console.print(f"  Ergebnisse:  [bold]{stats['results']}[/bold]")
+    console.print("[green]scans.query_results in scan_results überführt und entfernt.[/green]")
+
+
+def cmd_store_texts():
+    """Verschiebt Antwort- und Query-Texte in den Text-Store."""
+    stats = migrate_texts_to_store(engine)
+    if not stats["migrated"]:
+        console.print("[dim]Texte liegen bereits im Text-Store — nichts zu tun.[/dim]")
+        return
+    console.print(f"  Zeilen:      [bold]{stats['rows']}[/bold]")
+    console.print(f"  Texte:       [bold]{stats['texts']}[/bold] (dedupliziert)")
+    console.print("[green]Texte in text_blobs überführt.[/green]")
+
+
+def main():
+    args = sys.argv[1:]
+
+    if not args or args[0] == "help":
+        console.print(__doc__)
+        return
+
+    if args[0] == "cost-cache-columns":
+        cmd_cost_cache_columns()
+    elif args[0] == "active-job-indexes":
+        cmd_active_job_indexes()
+    elif args[0] == "drop-report-html":
+        archive_path = None
+        if "--archive" in args:
+            archive_path = args[args.index("--archive") + 1]
+        cmd_drop_report_html(archive_path)
+    elif args[0] == "split-query-results":
+        cmd_split_query_results()
+    elif args[0] == "store-texts":
+        cmd_store_texts()
+    else:
+        console.print(f"[red]Unbekannte Migration: {args[0]}[/red]")
+        console.print(__doc__)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
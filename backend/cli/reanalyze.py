@@ -0,0 +1,61 @@
+"""
+CLI Tool für die Offline-Re-Analyse gespeicherter Antworten.
+
+Usage:
+    python -m cli.reanalyze [<industry_id>] [--workers N] [--force]
+
+Berechnet Analyse, Scores und Recommendations abgeschlossener Scans neu,
+ohne neue LLM-Calls (z.B. nach neuen Analyzer-Regeln oder zusätzlichen
+known_competitors). Ergebnisse mit aktueller Analyzer-Version werden
+übersprungen, --force analysiert alles neu.
+"""
+import sys
+import time
+
+from rich.console import Console
+
+from app.config import Settings
+from app.database import SessionLocal, create_tables
+from app.workers.reanalysis import reanalyze_scans
+
+console = Console()
+
+
+def cmd_reanalyze(industry_id: str | None = None, workers: int | None = None, force: bool = False):
+    """Führt die Re-Analyse aus und zeigt die Statistik."""
+    create_tables()
+    scope = industry_id or "alle Industries"
+    console.print(f"[cyan]Re-Analyse ({scope}) gestartet…[/cyan]")
+
+    started = time.monotonic()
+    db = SessionLocal()
+    try:
+        stats = reanalyze_scans(db, Settings(), industry_id=industry_id, workers=workers, force=force)
+    finally:
+        db.close()
+
+    console.print(f"  Scans:       [bold]{stats['updated']}[/bold] aktualisiert / {stats['scans']} geprüft")
+    console.print(f"  Antworten:   [bold]{stats['analyzed']}[/bold] analysiert, {stats['memoized']} aus Memo")
+    console.print(f"  Dauer:       [bold]{time.monotonic() - started:.1f}s[/bold]")
+
+
+def main():
+    args = sys.argv[1:]
+
+    if args and args[0] == "help":
+        console.print(__doc__)
+        return
+
+    workers = None
+    if "--workers" in args:
+        position = args.index("--workers")
+        workers = int(args[position + 1])
+        del args[position:position + 2]
+
+    force = "--force" in args
+    positional = [arg for arg in args if not arg.startswith("--")]
+    cmd_reanalyze(positional[0] if positional else None, workers=workers, force=force)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+CLI Tool für geplante Industry-Sweeps (z.B. nächtliches/monatliches Re-Ranking).
+
+Usage:
+    python -m cli.sweep <industry_id> [--batch]
+
+--batch nutzt die Batch-APIs von OpenAI/Anthropic (ca. halber Preis,
+Ergebnisse nach bis zu 24h). Gemini/Perplexity laufen normal parallel.
+"""
+import asyncio
+import sys
+
+from rich.console import Console
+
+from app.config import Settings
+from app.database import SessionLocal, create_tables
+from app.models import Scan
+from app.services.provider_clients import ProviderClients
+from app.workers.scan_worker import run_industry_sweep
+
+console = Console()
+
+
+async def _sweep(industry_id: str, batch: bool) -> list[str]:
+    settings = Settings()
+    clients = ProviderClients(settings)
+    db = SessionLocal()
+    try:
+        return await run_industry_sweep(industry_id, db, settings, clients, batch=batch)
+    finally:
+        db.close()
+        await clients.aclose()
+
+
+def cmd_sweep(industry_id: str, batch: bool = False):
+    """Führt einen Sweep aus und zeigt das Ergebnis pro Scan."""
+    create_tables()
+    mode = "Batch" if batch else "Echtzeit"
+    console.print(f"[cyan]Sweep {industry_id} ({mode}) gestartet…[/cyan]")
+
+    scan_ids = asyncio.run(_sweep(industry_id, batch))
+
+    db = SessionLocal()
+    try:
+        scans = db.query(Scan.status, Scan.total_cost_usd).filter(Scan.id.in_(scan_ids)).all()
+        completed = sum(1 for s in scans if s.status == "completed")
+        cost = sum(s.total_cost_usd or 0.0 for s in scans)
+        console.print(f"  Scans:       [bold]{len(scans)}[/bold] ({completed} completed)")
+        console.print(f"  Kosten:      [bold green]${cost:.4f}[/bold green]")
+    finally:
+        db.close()
+
+
+def main():
+    args = sys.argv[1:]
+
+    if not args or args[0] == "help":
+        console.print(__doc__)
+        return
+
+    cmd_sweep(args[0], batch="--batch" in args[1:])
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,11 @@
-"""Führt Test-Scans für 5 Firmen durch."""
+"""Führt Test-Scans für 5 Firmen durch (benötigt laufenden Worker: python -m app.workers)."""
 import time
 import httpx
 
 API = "http://localhost:8000/api/v1"
-TIMEOUT = httpx.Timeout(600.0, connect=10.0)
+TIMEOUT = httpx.Timeout(30.0, connect=10.0)
+POLL_INTERVAL_S = 5
+MAX_WAIT_S = 900
 
 COMPANIES = [
     {"name": "Hornetsecurity", "domain": "hornetsecurity.com", "description": "E-Mail Security", "location": "Hannover"},
@@ -48,10 +50,18 @@ def main():
 
         try:
             r = client.post(f"{API}/scans/{scan_id}/run")
+            if r.status_code != 202:
+                print(f"  FEHLER {r.status_code}: {r.text[:150]}")
+                continue
+
+            # Scan läuft im Worker → Status pollen
+            d = client.get(f"{API}/scans/{scan_id}").json()
+            while d["status"] in ("pending", "running") and time.time() - start < MAX_WAIT_S:
+                time.sleep(POLL_INTERVAL_S)
+                d = client.get(f"{API}/scans/{scan_id}").json()
             elapsed = time.time() - start
 
-            if r.status_code == 200:
-                d = r.json()
+            if d["status"] == "completed":
                 print(f"  Done in {elapsed:.0f}s | Score: {d['overall_score']}")
                 if d.get("platform_scores"):
                     for p, s in d["platform_scores"].items():
@@ -59,7 +69,8 @@ def main():
                 if d.get("recommendations"):
                     print(f"  {len(d['recommendations'])} Empfehlungen")
             else:
-                print(f"  FEHLER {r.status_code}: {r.text[:150]}")
+                job = client.get(f"{API}/scans/jobs/{r.json()['id']}").json()
+                print(f"  FEHLER nach {elapsed:.0f}s: Status {d['status']} {job.get('error_message') or ''}")
         except Exception as e:
             elapsed = time.time() - start
             print(f"  FEHLER nach {elapsed:.0f}s: {e}")
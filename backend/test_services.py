@@ -369,6 +369,8 @@ async def test_llm_client():
     except Exception as e:
         print(f"\n  ✗ LLMClient-Test fehlgeschlagen: {e}")
         print(f"  (Dies ist normal wenn keine API-Keys konfiguriert sind)")
+    finally:
+        await llm_client.aclose()
 
 
 def main():
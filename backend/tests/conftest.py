@@ -7,6 +7,8 @@ from app.models import Base
 from app.main import app
 from app.dependencies import get_db, get_settings
 from app.config import Settings
+from app.services import http_cache, rendered_reports
+from app.services.industry_stats import invalidate_industry_stats_cache
 
 
 @pytest.fixture
@@ -18,6 +20,10 @@ def test_db():
         poolclass=StaticPool,
     )
     Base.metadata.create_all(engine)
+    # Prozess-Caches gehören zur vorherigen Test-DB
+    invalidate_industry_stats_cache()
+    http_cache._http_cache = None
+    rendered_reports._rendered = None
     TestSession = sessionmaker(bind=engine)
     session = TestSession()
     try:
@@ -0,0 +1,189 @@
+import asyncio
+import json
+
+import httpx
+
+from app.services.batch_client import AnthropicBatchAPI, OpenAIBatchAPI
+from app.services.query_scheduler import BatchScheduler
+
+
+class BatchStubServer:
+    """Lokaler Stub für die Batch-Endpoints von OpenAI und Anthropic (via httpx.MockTransport)."""
+
+    def __init__(self, polls_until_done=2):
+        self.polls_until_done = polls_until_done
+        self.files: dict[str, list[dict]] = {}
+        self.batches: dict[str, dict] = {}
+        self.polls: dict[str, int] = {}
+
+    def client(self, base_url):
+        return httpx.AsyncClient(base_url=base_url, transport=httpx.MockTransport(self.handle))
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+
+        # OpenAI: Datei-Upload (multipart) → JSONL-Zeilen extrahieren
+        if path == "/v1/files" and request.method == "POST":
+            lines = [
+                json.loads(line) for line in request.content.decode().splitlines()
+                if line.startswith('{"custom_id"')
+            ]
+            file_id = f"file-{len(self.files)}"
+            self.files[file_id] = lines
+            return httpx.Response(200, json={"id": file_id})
+
+        if path == "/v1/batches" and request.method == "POST":
+            body = json.loads(request.content)
+            batch_id = f"batch-{len(self.batches)}"
+            self.batches[batch_id] = {"kind": "openai", "requests": self.files[body["input_file_id"]]}
+            return httpx.Response(200, json={"id": batch_id, "status": "validating"})
+
+        if path.startswith("/v1/batches/"):
+            batch_id = path.rsplit("/", 1)[-1]
+            if not self._poll(batch_id):
+                return httpx.Response(200, json={"id": batch_id, "status": "in_progress"})
+            output_id = f"out-{batch_id}"
+            self.files[output_id] = [self._openai_result(r) for r in self.batches[batch_id]["requests"]]
+            return httpx.Response(200, json={"id": batch_id, "status": "completed", "output_file_id": output_id})
+
+        if path.startswith("/v1/files/") and path.endswith("/content"):
+            file_id = path.split("/")[3]
+            return httpx.Response(200, text="\n".join(json.dumps(line) for line in self.files[file_id]))
+
+        # Anthropic Message Batches
+        if path == "/v1/messages/batches" and request.method == "POST":
+            batch_id = f"msgbatch-{len(self.batches)}"
+            self.batches[batch_id] = {"kind": "anthropic", "requests": json.loads(request.content)["requests"]}
+            return httpx.Response(200, json={"id": batch_id, "processing_status": "in_progress"})
+
+        if path.startswith("/v1/messages/batches/") and path.endswith("/results"):
+            batch_id = path.split("/")[4]
+            lines = [self._anthropic_result(r) for r in self.batches[batch_id]["requests"]]
+            return httpx.Response(200, text="\n".join(json.dumps(line) for line in lines))
+
+        if path.startswith("/v1/messages/batches/"):
+            batch_id = path.rsplit("/", 1)[-1]
+            if not self._poll(batch_id):
+                return httpx.Response(200, json={"id": batch_id, "processing_status": "in_progress"})
+            return httpx.Response(200, json={
+                "id": batch_id,
+                "processing_status": "ended",
+                "results_url": f"https://api.anthropic.com/v1/messages/batches/{batch_id}/results",
+            })
+
+        return httpx.Response(404, json={"error": {"message": f"Unbekannter Pfad {path}"}})
+
+    def _poll(self, batch_id):
+        self.polls[batch_id] = self.polls.get(batch_id, 0) + 1
+        return self.polls[batch_id] >= self.polls_until_done
+
+    def _openai_result(self, request):
+        question = request["body"]["messages"][-1]["content"]
+        if "FEHLER" in question:
+            return {"custom_id": request["custom_id"], "response": {"status_code": 400, "body": {
+                "error": {"message": "invalid request"}}}}
+        return {"custom_id": request["custom_id"], "response": {"status_code": 200, "body": {
+            "choices": [{"message": {"content": f"GPT: {question}"}}],
+            "usage": {"prompt_tokens": 10, "completion_tokens": 20, "total_tokens": 30},
+        }}}
+
+    def _anthropic_result(self, request):
+        question = request["params"]["messages"][-1]["content"]
+        return {"custom_id": request["custom_id"], "result": {"type": "succeeded", "message": {
+            "content": [{"type": "text", "text": f"Claude: {question}"}],
+            "usage": {"input_tokens": 11, "output_tokens": 22},
+        }}}
+
+
+def _requests(*queries):
+    return [
+        {"custom_id": f"job-{i}", "model": "test-model", "system_prompt": "System", "query": q}
+        for i, q in enumerate(queries)
+    ]
+
+
+def test_openai_batch_roundtrip():
+    """Upload, Batch anlegen, pollen, Ergebnisdatei parsen — inkl. Fehlerzeilen"""
+    stub = BatchStubServer()
+    api = OpenAIBatchAPI(stub.client("https://api.openai.com/v1"))
+
+    results = asyncio.run(api.run(_requests("Frage A", "FEHLER"), poll_interval_s=0))
+
+    assert results["job-0"]["success"] is True
+    assert results["job-0"]["response_text"] == "GPT: Frage A"
+    assert results["job-0"]["total_tokens"] == 30
+    assert results["job-1"]["success"] is False
+    assert results["job-1"]["error"] == "invalid request"
+
+
+def test_anthropic_batch_roundtrip():
+    """Message Batch anlegen, bis processing_status=ended pollen, Ergebnisse laden"""
+    stub = BatchStubServer(polls_until_done=3)
+    api = AnthropicBatchAPI(stub.client("https://api.anthropic.com"))
+
+    results = asyncio.run(api.run(_requests("Frage B"), poll_interval_s=0))
+
+    assert results["job-0"]["response_text"] == "Claude: Frage B"
+    assert results["job-0"]["total_tokens"] == 33
+    assert stub.polls["msgbatch-0"] == 3
+
+
+def test_batch_times_out_with_error_results():
+    """Nicht fertige Batches werden nach max_wait_s abgebrochen"""
+    stub = BatchStubServer(polls_until_done=1000)
+    api = OpenAIBatchAPI(stub.client("https://api.openai.com/v1"))
+
+    results = asyncio.run(api.run(_requests("Frage C"), poll_interval_s=0, max_wait_s=0))
+
+    assert results["job-0"]["success"] is False
+
+
+class FakeLLMClient:
+    system_prompt = "System"
+
+    def __init__(self):
+        self.realtime_calls = []
+        self.stored = []
+
+    def available_platforms(self, platforms):
+        return platforms
+
+    def timeout_for(self, platform_config):
+        return 60.0
+
+    async def cached_response(self, platform, query, model):
+        return None
+
+    async def store_response(self, platform, query, model, category, response_text, usage):
+        self.stored.append((platform, query))
+
+    async def query_platform(self, platform, query, model, category=None, timeout_s=None):
+        self.realtime_calls.append((platform, query))
+        return {"platform": platform, "query": query, "model": model, "response_text": "Gemini",
+                "success": True, "input_tokens": 1, "output_tokens": 1, "total_tokens": 2}
+
+
+def test_batch_scheduler_mixes_batch_and_realtime():
+    """Batch-fähige Plattformen gehen in Provider-Batches, der Rest läuft in Echtzeit"""
+    stub = BatchStubServer()
+    llm_client = FakeLLMClient()
+    scheduler = BatchScheduler(
+        llm_client,
+        {
+            "chatgpt": OpenAIBatchAPI(stub.client("https://api.openai.com/v1")),
+            "claude": AnthropicBatchAPI(stub.client("https://api.anthropic.com")),
+        },
+        poll_interval_s=0,
+    )
+    platforms = {"chatgpt": {"model": "gpt-4o"}, "claude": {"model": "claude-sonnet-4-6"}, "gemini": {"model": "g"}}
+    jobs = scheduler.build_jobs([{"query": "Frage 1"}, {"query": "Frage 2"}], platforms)
+    received = []
+
+    asyncio.run(scheduler.run(jobs, lambda job, response: received.append((job["index"], response))))
+
+    by_index = dict(received)
+    assert len(received) == len(jobs) == 6
+    assert by_index[0]["response_text"] == "GPT: Frage 1" and by_index[0]["batch"] is True
+    assert by_index[4]["response_text"] == "Claude: Frage 2"
+    assert llm_client.realtime_calls == [("gemini", "Frage 1"), ("gemini", "Frage 2")]
+    assert len(llm_client.stored) == 4
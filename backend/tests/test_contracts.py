@@ -25,10 +25,8 @@ def test_ranking_entries_include_scan_id_and_stable_platform_scores(client, test
         status="completed",
         overall_score=55.0,
         platform_scores={"chatgpt": 60.0, "claude": 50.0, "gemini": 55.0},
-        query_results=[],
         analysis={},
         recommendations=[],
-        report_html=None,
         error_message=None,
         started_at=datetime.now(timezone.utc),
         completed_at=datetime.now(timezone.utc),
@@ -73,10 +71,8 @@ def test_report_exposes_competitors_contract(client, test_db):
         status="completed",
         overall_score=70.0,
         platform_scores={"chatgpt": 80.0},
-        query_results=[],
         analysis=analysis,
         recommendations=[],
-        report_html="<html></html>",
         error_message=None,
         started_at=datetime.now(timezone.utc),
         completed_at=datetime.now(timezone.utc),
@@ -118,10 +114,8 @@ def test_scan_endpoint_exposes_competitors_contract(client, test_db):
         status="completed",
         overall_score=42.0,
         platform_scores={"claude": 42.0},
-        query_results=[],
         analysis=analysis,
         recommendations=[],
-        report_html=None,
         error_message=None,
         started_at=datetime.now(timezone.utc),
         completed_at=datetime.now(timezone.utc),
@@ -41,3 +41,13 @@ class TestCostCalculator:
         assert "gpt-4o" in pricing
         assert "input" in pricing["gpt-4o"]
         assert "output" in pricing["gpt-4o"]
+
+    def test_calculate_cost_batch_uses_batch_pricing(self):
+        cost = self.calc.calculate_cost(model="gpt-4o", input_tokens=500, output_tokens=300, batch=True)
+        expected = (500 * 1.25 / 1_000_000) + (300 * 5.00 / 1_000_000)
+        assert abs(cost - expected) < 0.0001
+
+    def test_calculate_cost_batch_without_batch_prices_uses_discount(self):
+        cost = self.calc.calculate_cost(model="unknown-xyz", input_tokens=1000, output_tokens=500, batch=True)
+        expected = ((1000 * 5.00 / 1_000_000) + (500 * 15.00 / 1_000_000)) * 0.5
+        assert abs(cost - expected) < 0.0001
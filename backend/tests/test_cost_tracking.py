@@ -1,8 +1,11 @@
 """Integration tests for cost tracking."""
 import pytest
 from datetime import datetime, timezone
-from app.models import ApiCallCost, CostBudget, Scan, Company
+from sqlalchemy import create_engine, inspect, text
+from app.migrations import add_cost_cache_columns
+from app.models import ApiCallCost, CostBudget, Scan, ScanResult, Company
 from app.services.cost_calculator import CostCalculator
+from app.services.text_store import TextStore
 
 
 class TestCostModels:
@@ -21,7 +24,7 @@ class TestCostModels:
             scan_id=scan.id,
             platform="chatgpt",
             model="gpt-4o",
-            query="Test query",
+            query_hash=TextStore(test_db).put("Test query"),
             input_tokens=500,
             output_tokens=300,
             total_tokens=800,
@@ -35,6 +38,7 @@ class TestCostModels:
         saved = test_db.query(ApiCallCost).first()
         assert saved is not None
         assert saved.platform == "chatgpt"
+        assert saved.query == "Test query"
         assert saved.total_tokens == 800
         assert saved.cost_usd == pytest.approx(0.004250)
 
@@ -84,7 +88,7 @@ class TestCostModels:
                 scan_id=scan.id,
                 platform="chatgpt",
                 model="gpt-4o",
-                query=f"Query {i}",
+                query_hash=TextStore(test_db).put(f"Query {i}"),
                 input_tokens=100,
                 output_tokens=50,
                 total_tokens=150,
@@ -132,3 +136,70 @@ class TestCostApiEndpoints:
     def test_get_scan_costs_not_found(self, client):
         response = client.get("/api/v1/costs/by-scan/nonexistent")
         assert response.status_code == 404
+
+    def test_scan_cost_list_aggregates_per_scan(self, client, test_db):
+        company = Company(domain="test.de", name="TestCo", industry_id="test")
+        test_db.add(company)
+        test_db.flush()
+        started = datetime(2026, 10, 5, tzinfo=timezone.utc)
+        scans = [Scan(company_id=company.id, industry_id="test", status="completed", started_at=started)
+                 for _ in range(2)]
+        test_db.add_all(scans)
+        test_db.flush()
+        query_hash = TextStore(test_db).put("q")
+        for platform, cost in [("chatgpt", 0.01), ("chatgpt", 0.02), ("claude", 0.03)]:
+            test_db.add(ApiCallCost(scan_id=scans[0].id, platform=platform, model="m", query_hash=query_hash,
+                                    total_tokens=100, cost_usd=cost, success=True))
+        test_db.commit()
+
+        entries = {e["scan_id"]: e for e in client.get("/api/v1/costs/scans?month=2026-10").json()}
+
+        assert entries[scans[0].id]["total_calls"] == 3
+        assert entries[scans[0].id]["total_tokens"] == 300
+        assert entries[scans[0].id]["platform_breakdown"] == {"chatgpt": 0.03, "claude": 0.03}
+        assert entries[scans[1].id]["total_calls"] == 0
+        assert entries[scans[1].id]["company_name"] == "TestCo"
+
+
+class TestDeferredScanColumns:
+    """Antworttexte und Analysen werden nur bei Bedarf geladen."""
+
+    def test_heavy_columns_not_loaded_by_default(self, test_db):
+        company = Company(domain="test.de", name="TestCo", industry_id="test")
+        test_db.add(company)
+        test_db.flush()
+        scan = Scan(company_id=company.id, industry_id="test", status="completed",
+                    results=[ScanResult.from_result(0, {"platform": "chatgpt"},
+                                                    response_hash=TextStore(test_db).put("x" * 1000))],
+                    analysis={"a": 1}, recommendations=["r"])
+        test_db.add(scan)
+        test_db.commit()
+        test_db.expunge_all()
+
+        loaded = test_db.query(Scan).one()
+        assert {"results", "analysis", "recommendations"} <= inspect(loaded).unloaded
+
+        # Zugriff lädt die Gruppe gemeinsam nach
+        assert loaded.analysis == {"a": 1}
+        assert "recommendations" not in inspect(loaded).unloaded
+
+        # Antworttexte der Ergebnisse ebenfalls erst bei Zugriff
+        result = loaded.results[0]
+        assert "response_blob" in inspect(result).unloaded
+        assert result.response_text == "x" * 1000
+
+
+class TestCostCacheMigration:
+    """Bestehende api_call_costs-Tabellen erhalten die Cache-Spalten."""
+
+    def test_add_cost_cache_columns(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+        with engine.begin() as connection:
+            connection.execute(text("CREATE TABLE api_call_costs (id TEXT PRIMARY KEY, cost_usd FLOAT)"))
+            connection.execute(text("INSERT INTO api_call_costs VALUES ('c1', 0.01)"))
+
+        assert add_cost_cache_columns(engine) == {"added": ["cache_hit", "saved_cost_usd"]}
+        with engine.connect() as connection:
+            row = connection.execute(text("SELECT cache_hit, saved_cost_usd FROM api_call_costs")).one()
+        assert tuple(row) == (0, 0)
+        assert add_cost_cache_columns(engine) == {"added": []}
@@ -0,0 +1,143 @@
+from datetime import datetime
+
+from app.api import rankings
+from app.config import Settings
+from app.models import Company, Scan
+from app.services.http_cache import (
+    CachedResponse,
+    HttpResponseCache,
+    MemoryCacheBackend,
+    SharedCacheBackend,
+    notify_scan_completed,
+)
+from app.services.ranking_snapshot import update_snapshot_for_scan
+
+
+class FakeRedis:
+    """Lokaler Stand-in für redis.Redis (get/set/incr)"""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1).encode()
+        return int(self.data[key])
+
+
+def test_memory_backend_evicts_least_recently_used():
+    backend = MemoryCacheBackend(max_entries=2)
+    backend.set("a", b"1", ttl_s=60)
+    backend.set("b", b"2", ttl_s=60)
+    backend.get("a")
+    backend.set("c", b"3", ttl_s=60)
+
+    assert backend.get("a") == b"1"
+    assert backend.get("b") is None
+    assert backend.get("c") == b"3"
+
+
+def test_memory_backend_expires_entries():
+    backend = MemoryCacheBackend()
+    backend.set("a", b"1", ttl_s=0)
+    assert backend.get("a") is None
+
+
+def test_tag_invalidation_across_replicas():
+    """Zwei Replicas am selben Store sehen Einträge und Invalidierungen des anderen"""
+    store = FakeRedis()
+    replica_a = HttpResponseCache(SharedCacheBackend(store))
+    replica_b = HttpResponseCache(SharedCacheBackend(store))
+    response = CachedResponse(b'{"ok": true}', "application/json")
+
+    replica_a.set(replica_a.resolve_key("report:1", ["scan:1"]), response, ttl_s=60)
+    cached = replica_b.get(replica_b.resolve_key("report:1", ["scan:1"]))
+    assert (cached.body, cached.etag) == (response.body, response.etag)
+
+    replica_b.invalidate("scan:1")
+    assert replica_a.get(replica_a.resolve_key("report:1", ["scan:1"])) is None
+
+
+def test_invalidation_during_build_is_not_cached_as_fresh(client, test_db, monkeypatch):
+    """Wird während build() invalidiert, baut der nächste Abruf die Antwort neu"""
+    scan = _completed_scan(test_db)
+    original = rankings._build_ranking
+    builds = []
+
+    def build_then_invalidate(*args, **kwargs):
+        result = original(*args, **kwargs)
+        if not builds:
+            notify_scan_completed(Settings(), scan.id, scan.industry_id)
+        builds.append(1)
+        return result
+
+    monkeypatch.setattr(rankings, "_build_ranking", build_then_invalidate)
+    client.get("/api/v1/rankings/cybersecurity")
+    client.get("/api/v1/rankings/cybersecurity")
+
+    assert len(builds) == 2
+
+
+def test_if_none_match():
+    response = CachedResponse(b"body", "text/plain")
+    assert response.matches(response.etag)
+    assert response.matches(f'"other", W/{response.etag}')
+    assert not response.matches('"other"')
+    assert not response.matches(None)
+
+
+def _completed_scan(db):
+    company = Company(domain="alpha.de", name="Alpha GmbH", industry_id="cybersecurity")
+    db.add(company)
+    db.flush()
+    scan = Scan(
+        company_id=company.id, industry_id="cybersecurity", status="completed",
+        overall_score=42.0, completed_at=datetime(2026, 10, 1),
+    )
+    db.add(scan)
+    db.commit()
+    return scan
+
+
+def test_report_etag_and_304(client, test_db):
+    """Wiederholte Report-Abrufe mit If-None-Match → 304 ohne DB-Zugriff"""
+    scan = _completed_scan(test_db)
+    # Erster Abruf wird gestreamt, danach kommt der Report mit ETag aus dem Cache
+    streamed = client.get(f"/api/v1/reports/{scan.id}/html")
+    first = client.get(f"/api/v1/reports/{scan.id}/html")
+    assert streamed.status_code == first.status_code == 200
+    assert streamed.text == first.text
+    assert first.headers["cache-control"].startswith("public, max-age=")
+    etag = first.headers["etag"]
+
+    # Aus dem Cache: auch ohne Scan in der DB
+    test_db.delete(scan)
+    test_db.commit()
+    second = client.get(f"/api/v1/reports/{scan.id}/html", headers={"If-None-Match": etag})
+
+    assert second.status_code == 304
+    assert second.headers["etag"] == etag
+    assert second.content == b""
+
+
+def test_scan_completion_invalidates_ranking(client, test_db):
+    scan = _completed_scan(test_db)
+    first = client.get("/api/v1/rankings/cybersecurity")
+    assert first.json()["entries"][0]["overall_score"] == 42.0
+
+    scan.overall_score = 80.0
+    test_db.commit()
+    assert client.get("/api/v1/rankings/cybersecurity").headers["etag"] == first.headers["etag"]
+
+    update_snapshot_for_scan(test_db, scan)
+    test_db.commit()
+    notify_scan_completed(Settings(), scan.id, scan.industry_id)
+
+    updated = client.get("/api/v1/rankings/cybersecurity", headers={"If-None-Match": first.headers["etag"]})
+    assert updated.status_code == 200
+    assert updated.json()["entries"][0]["overall_score"] == 80.0
@@ -0,0 +1,88 @@
+import os
+
+import pytest
+import yaml
+
+from app.dependencies import get_settings
+from app.main import app
+from app.services import industry_registry
+from app.services.industry_registry import IndustryConfigError, IndustryRegistry
+
+
+def _write(path, config):
+    path.write_text(yaml.safe_dump(config, allow_unicode=True))
+
+
+def _bump_mtime(path):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_parses_once_and_reloads_on_change(tmp_path, sample_industry_config, monkeypatch):
+    """YAML wird nur beim ersten Zugriff und nach Dateiänderung geparst"""
+    path = tmp_path / "test_industry.yaml"
+    _write(path, sample_industry_config)
+    calls = []
+    original = industry_registry.yaml.safe_load
+    monkeypatch.setattr(industry_registry.yaml, "safe_load", lambda f: calls.append(1) or original(f))
+
+    registry = IndustryRegistry(str(tmp_path))
+    first = registry.get("test_industry")
+    assert registry.get("test_industry") is first
+    assert len(calls) == 1
+
+    _write(path, {**sample_industry_config, "display_name": "Geändert"})
+    _bump_mtime(path)
+
+    reloaded = registry.get("test_industry")
+    assert len(calls) == 2
+    assert reloaded.display_name == "Geändert"
+
+
+def test_validated_model(tmp_path, sample_industry_config):
+    """Die Config liegt validiert und mit Defaults als Modell vor"""
+    _write(tmp_path / "test_industry.yaml", sample_industry_config)
+
+    entry = IndustryRegistry(str(tmp_path)).get("test_industry")
+
+    assert entry.config.queries.version == "test-v1"
+    assert entry.config.known_competitors == ["CrowdStrike", "Sophos"]
+    assert entry.raw == sample_industry_config
+
+
+@pytest.mark.parametrize("patch", [
+    {"platforms": {"chatgpt": {"weight": -1}}},
+    {"scoring": {"mention_types": {"direct_recommendation": 2.0}}},
+    {"queries": {"version": "v", "brand": [{"query": "Ist {firma} gut?"}]}},
+])
+def test_invalid_config_rejected(tmp_path, sample_industry_config, patch):
+    """Ungültige Configs fallen beim Laden auf, nicht erst im Scan"""
+    _write(tmp_path / "broken.yaml", {**sample_industry_config, **patch})
+
+    with pytest.raises(IndustryConfigError, match="broken"):
+        IndustryRegistry(str(tmp_path)).get("broken")
+
+
+def test_missing_config(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        IndustryRegistry(str(tmp_path)).get("unknown")
+
+
+def test_repo_industries_validate(test_settings):
+    """Alle mitgelieferten Industry Configs sind gültig"""
+    registry = IndustryRegistry(test_settings.INDUSTRY_CONFIG_DIR)
+    for industry_id in registry.industry_ids():
+        assert registry.get(industry_id).config.queries.version != "unknown"
+
+
+def test_invalid_config_is_clear_api_error(client, tmp_path, test_settings):
+    """Eine kaputte YAML liefert einen verständlichen Fehler statt eines unbehandelten 500"""
+    _write(tmp_path / "broken.yaml", {"platforms": {"chatgpt": {"weight": -1}}})
+    app.dependency_overrides[get_settings] = lambda: test_settings.model_copy(
+        update={"INDUSTRY_CONFIG_DIR": str(tmp_path)}
+    )
+
+    response = client.get("/api/v1/rankings/broken")
+
+    assert response.status_code == 500
+    assert "Invalid industry config 'broken'" in response.json()["detail"]
@@ -0,0 +1,82 @@
+from datetime import datetime, timedelta
+
+from app.models import Company, IndustryStats, Scan
+from app.services.industry_stats import get_industry_stats, refresh_industry_stats
+from app.services.ranking_snapshot import update_snapshot_for_scan
+
+
+def _completed_scan(db, company, score, days_ago=0):
+    scan = Scan(
+        company_id=company.id, industry_id=company.industry_id, status="completed",
+        overall_score=score, query_version="v1",
+        completed_at=datetime(2026, 10, 1) - timedelta(days=days_ago),
+    )
+    db.add(scan)
+    db.flush()
+    return scan
+
+
+def test_average_uses_latest_scan_per_company(test_db):
+    """Ältere Scans fließen nicht mehr in den Durchschnitt ein"""
+    alpha = Company(domain="alpha.de", name="Alpha GmbH", industry_id="cybersecurity")
+    beta = Company(domain="beta.de", name="Beta AG", industry_id="cybersecurity")
+    idle = Company(domain="idle.de", name="Idle KG", industry_id="cybersecurity")
+    other = Company(domain="other.de", name="Other AG", industry_id="fintech")
+    test_db.add_all([alpha, beta, idle, other])
+    test_db.flush()
+    _completed_scan(test_db, alpha, 10.0, days_ago=5)
+    _completed_scan(test_db, alpha, 50.0)
+    _completed_scan(test_db, beta, 70.0)
+    test_db.commit()
+
+    # Bestehende Datenbank ohne Rollup/Snapshot: einmaliger Aufbau beim ersten Zugriff
+    stats = get_industry_stats(test_db, max_age_s=0)
+
+    assert stats["cybersecurity"] == {"total_companies": 3, "scored_companies": 2, "avg_score": 60.0}
+    assert stats["fintech"] == {"total_companies": 1, "scored_companies": 0, "avg_score": None}
+
+
+def test_rollup_updated_on_scan_completion(test_db):
+    company = Company(domain="alpha.de", name="Alpha GmbH", industry_id="cybersecurity")
+    test_db.add(company)
+    test_db.flush()
+
+    update_snapshot_for_scan(test_db, _completed_scan(test_db, company, 42.0))
+    test_db.commit()
+
+    row = test_db.get(IndustryStats, "cybersecurity")
+    assert (row.total_companies, row.avg_score) == (1, 42.0)
+
+
+def test_list_industries_reflects_import(client, test_db):
+    """Company-Import aktualisiert Rollup und Cache sofort"""
+    before = {i["id"]: i for i in client.get("/api/v1/industries").json()}
+    assert before["cybersecurity"]["total_companies"] == 0
+
+    client.post(
+        "/api/v1/companies/import?industry_id=cybersecurity",
+        json=[{"domain": "alpha.de", "name": "Alpha GmbH"}, {"domain": "beta.de", "name": "Beta AG"}],
+    )
+
+    after = {i["id"]: i for i in client.get("/api/v1/industries").json()}
+    assert after["cybersecurity"]["total_companies"] == 2
+    assert after["cybersecurity"]["avg_score"] is None
+
+
+def test_partial_refresh_backfills_other_industries(test_db):
+    """Nach einer ersten Teil-Aktualisierung fehlen keine Altbestand-Industries"""
+    alpha = Company(domain="alpha.de", name="Alpha GmbH", industry_id="cybersecurity")
+    other = Company(domain="other.de", name="Other AG", industry_id="fintech")
+    test_db.add_all([alpha, other])
+    test_db.flush()
+    _completed_scan(test_db, alpha, 40.0)
+    _completed_scan(test_db, other, 80.0)
+    test_db.commit()
+
+    # z.B. Company-Anlage in einer Industry, bevor die Übersicht je geladen wurde
+    refresh_industry_stats(test_db, ["cybersecurity"])
+    test_db.commit()
+    assert test_db.get(IndustryStats, "cybersecurity").avg_score == 40.0
+
+    stats = get_industry_stats(test_db, max_age_s=0)
+    assert stats["fintech"] == {"total_companies": 1, "scored_companies": 1, "avg_score": 80.0}
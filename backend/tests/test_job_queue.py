@@ -0,0 +1,189 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import sessionmaker
+
+from app.migrations import add_active_job_indexes
+from app.models import Company, Scan, ScanJob
+from app.services.job_queue import JobQueue
+from app.workers import job_worker
+from app.workers.job_worker import JobWorker
+
+
+@pytest.fixture
+def pending_scan(test_db):
+    company = Company(domain="secureit.de", name="SecureIT GmbH", industry_id="cybersecurity")
+    test_db.add(company)
+    test_db.commit()
+    scan = Scan(company_id=company.id, industry_id="cybersecurity", status="pending")
+    test_db.add(scan)
+    test_db.commit()
+    return scan
+
+
+def test_run_endpoint_enqueues_job(client, pending_scan):
+    """/run antwortet sofort mit 202 und einem Job-Handle"""
+    response = client.post(f"/api/v1/scans/{pending_scan.id}/run")
+
+    assert response.status_code == 202
+    job = response.json()
+    assert job["status"] == "queued"
+    assert job["scan_id"] == pending_scan.id
+
+    again = client.post(f"/api/v1/scans/{pending_scan.id}/run")
+    assert again.json()["id"] == job["id"]
+
+    status = client.get(f"/api/v1/scans/jobs/{job['id']}")
+    assert status.status_code == 200
+    assert status.json()["kind"] == "scan"
+
+
+def test_claim_is_exclusive(test_db, pending_scan):
+    """Ein Job wird genau einmal geclaimt"""
+    queue = JobQueue(test_db)
+    job = queue.enqueue_scan(pending_scan.id)
+
+    claimed = queue.claim("worker-a")
+    assert claimed.id == job.id
+    assert claimed.status == "running"
+    assert claimed.attempts == 1
+    assert queue.claim("worker-b") is None
+
+
+def test_only_one_active_job_per_scan(test_db, pending_scan):
+    """Die DB lässt keinen zweiten aktiven Job für denselben Scan zu"""
+    JobQueue(test_db).enqueue_scan(pending_scan.id)
+
+    test_db.add(ScanJob(kind="scan", scan_id=pending_scan.id, status="queued"))
+    with pytest.raises(IntegrityError):
+        test_db.commit()
+    test_db.rollback()
+
+    # Abgeschlossene Jobs zählen nicht: ein neuer Lauf ist erlaubt
+    test_db.query(ScanJob).update({"status": "completed"})
+    test_db.add(ScanJob(kind="scan", scan_id=pending_scan.id, status="queued"))
+    test_db.commit()
+
+
+def test_concurrent_enqueue_returns_existing_job(test_db, pending_scan, monkeypatch):
+    """Verliert ein Request das Rennen, bekommt er den Job des anderen statt eines Duplikats"""
+    first = JobQueue(test_db).enqueue_scan(pending_scan.id)
+    sweep = JobQueue(test_db).enqueue_sweep("cybersecurity")
+
+    # Vorab-Prüfung des zweiten Requests sieht den parallelen Insert noch nicht
+    queue = JobQueue(test_db)
+    original = queue._active_job
+    calls = []
+
+    def racing_active_job(*active_filter):
+        calls.append(active_filter)
+        return None if len(calls) % 2 else original(*active_filter)
+
+    monkeypatch.setattr(queue, "_active_job", racing_active_job)
+
+    assert queue.enqueue_scan(pending_scan.id).id == first.id
+    assert queue.enqueue_sweep("cybersecurity").id == sweep.id
+    assert len(calls) == 4
+    assert test_db.query(ScanJob).count() == 2
+
+
+def test_add_active_job_indexes(tmp_path):
+    """Bestehende scan_jobs-Tabellen erhalten die Indexe, doppelte aktive Jobs werden bereinigt"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as connection:
+        connection.execute(text(
+            "CREATE TABLE scan_jobs (id TEXT PRIMARY KEY, kind TEXT, scan_id TEXT, industry_id TEXT, "
+            "status TEXT, error_message TEXT, created_at DATETIME)"
+        ))
+        connection.execute(text(
+            "INSERT INTO scan_jobs VALUES "
+            "('j1', 'scan', 's1', NULL, 'queued', NULL, '2026-01-01'), "
+            "('j2', 'scan', 's1', NULL, 'running', NULL, '2026-01-02'), "
+            "('j3', 'sweep', NULL, 'cyber', 'queued', NULL, '2026-01-01')"
+        ))
+
+    stats = add_active_job_indexes(engine)
+
+    assert stats == {"created": ["ux_scan_jobs_active_scan", "ux_scan_jobs_active_sweep"], "failed_duplicates": 1}
+    with engine.connect() as connection:
+        statuses = dict(connection.execute(text("SELECT id, status FROM scan_jobs")).all())
+    assert statuses == {"j1": "failed", "j2": "running", "j3": "queued"}
+    assert {"ux_scan_jobs_active_scan", "ux_scan_jobs_active_sweep"} <= {
+        index["name"] for index in inspect(engine).get_indexes("scan_jobs")
+    }
+    assert add_active_job_indexes(engine) == {"created": [], "failed_duplicates": 0}
+
+
+def test_stale_jobs_are_requeued(test_db, pending_scan):
+    """Jobs ohne Heartbeat (z.B. nach Neustart) werden neu eingereiht"""
+    queue = JobQueue(test_db, max_attempts=2)
+    job = queue.enqueue_scan(pending_scan.id)
+    queue.claim("worker-a")
+    job.heartbeat_at = job.heartbeat_at - timedelta(minutes=10)
+    test_db.commit()
+
+    assert queue.requeue_stale(stale_after_s=60) == 1
+    assert job.status == "queued"
+
+    queue.claim("worker-b")
+    job.heartbeat_at = job.heartbeat_at - timedelta(minutes=10)
+    test_db.commit()
+
+    assert queue.requeue_stale(stale_after_s=60) == 0
+    assert job.status == "failed"
+
+
+def test_orphaned_running_scans_are_requeued(test_db, pending_scan):
+    """Startup-Sweep: "running"-Scans ohne aktiven Job werden wieder eingereiht"""
+    pending_scan.status = "running"
+    test_db.commit()
+    queue = JobQueue(test_db)
+
+    assert queue.requeue_orphaned_scans() == 1
+    job = test_db.query(ScanJob).filter(ScanJob.scan_id == pending_scan.id).one()
+    assert job.status == "queued"
+
+    # Aktiver Job vorhanden → nichts doppelt einreihen
+    assert queue.requeue_orphaned_scans() == 0
+
+
+def test_worker_processes_job(test_db, test_settings, pending_scan, monkeypatch):
+    """Der Worker führt den Scan aus und schließt den Job ab"""
+    executed = []
+
+    async def fake_run_scan(scan_id, db, settings, clients=None, batch=False):
+        executed.append((scan_id, batch))
+
+    monkeypatch.setattr(job_worker, "run_scan", fake_run_scan)
+    job = JobQueue(test_db).enqueue_scan(pending_scan.id, batch=True)
+
+    session_factory = sessionmaker(bind=test_db.get_bind())
+    worker = JobWorker(test_settings, clients=None, session_factory=session_factory, worker_id="test")
+
+    assert asyncio.run(worker.process_next()) is True
+    assert asyncio.run(worker.process_next()) is False
+
+    test_db.refresh(job)
+    assert executed == [(pending_scan.id, True)]
+    assert job.status == "completed"
+    assert job.result == {"scan_id": pending_scan.id}
+
+
+def test_worker_marks_failed_job(test_db, test_settings, pending_scan, monkeypatch):
+    """Fehler im Scan landen als error_message am Job"""
+    async def failing_run_scan(scan_id, db, settings, clients=None, batch=False):
+        raise RuntimeError("Provider down")
+
+    monkeypatch.setattr(job_worker, "run_scan", failing_run_scan)
+    job = JobQueue(test_db).enqueue_scan(pending_scan.id)
+
+    worker = JobWorker(test_settings, clients=None, session_factory=sessionmaker(bind=test_db.get_bind()))
+    asyncio.run(worker.process_next())
+
+    test_db.refresh(job)
+    assert job.status == "failed"
+    assert job.error_message == "Provider down"
+    assert test_db.query(ScanJob).count() == 1
@@ -0,0 +1,61 @@
+from app.services.analyzer import Analyzer
+from app.services.lexicon import (
+    NEGATIVE_SENTIMENT,
+    POSITIVE_SENTIMENT,
+    RECOMMENDATION,
+    CompiledLexicon,
+    lexicon_categories,
+)
+
+
+def test_lexicon_respects_word_boundaries():
+    """'top' trifft nicht 'Topologie', 'führend*' trifft 'führender'"""
+    lexicon = CompiledLexicon({RECOMMENDATION: ["top", "führend*"]})
+
+    assert lexicon.categories_in("Netzwerk-Topologie und Desktop") == set()
+    assert lexicon.categories_in("Ein führender Anbieter") == {RECOMMENDATION}
+    assert lexicon.categories_in("TOP Anbieter") == {RECOMMENDATION}
+
+
+def test_longer_phrase_wins():
+    """'nicht empfehlenswert' ist negativ, keine Empfehlung"""
+    lexicon = CompiledLexicon({
+        RECOMMENDATION: ["empfehlenswert*"],
+        NEGATIVE_SENTIMENT: ["nicht   empfehlenswert"],
+    })
+
+    assert lexicon.categories_in("Das Produkt ist nicht\nempfehlenswert.") == {NEGATIVE_SENTIMENT}
+
+
+def test_lexicons_from_industry_config(sample_industry_config):
+    """Lexikon der Industry-Sprache aus der Config, Englisch aus den Defaults"""
+    config = {**sample_industry_config, "lexicons": {"de": {POSITIVE_SENTIMENT: ["spitze"]}}}
+    analyzer = Analyzer(lexicons=lexicon_categories(config))
+
+    result = analyzer.analyze_response(
+        "SecureIT GmbH", "secureit.de", "q", "chatgpt", "SecureIT GmbH ist spitze."
+    )
+    assert result["sentiment"] == "positive"
+
+    result = analyzer.analyze_response(
+        "SecureIT GmbH", "secureit.de", "q", "chatgpt", "SecureIT GmbH has poor support."
+    )
+    assert result["sentiment"] == "negative"
+
+
+def test_german_recommendation_inflections():
+    """'empfehl*' deckt alle Formen ab, die der frühere Teilstring-Vergleich erkannte"""
+    analyzer = Analyzer()
+
+    for sentence in (
+        "Wir empfehlen SecureIT GmbH für den Mittelstand.",
+        "SecureIT GmbH kann ich empfehlen.",
+        "Experten empfehlen SecureIT GmbH.",
+        "Ich empfehle SecureIT GmbH.",
+    ):
+        result = analyzer.analyze_response("SecureIT GmbH", "secureit.de", "q", "chatgpt", sentence)
+        assert result["mention_type"] == "direct_recommendation", sentence
+        assert result["sentiment"] == "positive", sentence
+
+    lexicon = CompiledLexicon(lexicon_categories(None))
+    assert lexicon.categories_in("SecureIT ist empfehlenswert") == {RECOMMENDATION, POSITIVE_SENTIMENT}
@@ -0,0 +1,123 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+
+from app.models import LLMResponseCache, ApiCallCost, Company, Scan
+from app.services.llm_cache import ResponseCache
+from app.services.llm_client import LLMClient
+from app.services.cost_calculator import CostCalculator
+from app.workers.scan_worker import _record_api_cost
+
+USAGE = {"input_tokens": 100, "output_tokens": 400, "total_tokens": 500}
+
+
+@pytest.fixture
+def cache(test_db):
+    return ResponseCache(test_db, default_ttl_hours=24, ttl_hours={"brand": 0}, max_entries=3)
+
+
+def test_put_and_get_roundtrip(cache):
+    """Gespeicherte Antwort wird für denselben Key zurückgegeben"""
+    cache.put("chatgpt", "gpt-4o", "system", "Beste Anbieter?", "service", "Antwort", USAGE)
+
+    entry = cache.get("chatgpt", "gpt-4o", "system", "Beste Anbieter?")
+
+    assert entry is not None
+    assert entry.response_text == "Antwort"
+    assert entry.output_tokens == 400
+    assert entry.hit_count == 1
+
+
+def test_key_includes_model_and_system_prompt(cache):
+    """Anderes Modell oder anderer System Prompt → kein Treffer"""
+    cache.put("chatgpt", "gpt-4o", "system", "Beste Anbieter?", "service", "Antwort", USAGE)
+
+    assert cache.get("chatgpt", "gpt-4.1", "system", "Beste Anbieter?") is None
+    assert cache.get("chatgpt", "gpt-4o", "anderer prompt", "Beste Anbieter?") is None
+
+
+def test_zero_ttl_category_not_cached(cache):
+    """TTL 0 für eine Kategorie deaktiviert den Cache"""
+    cache.put("chatgpt", "gpt-4o", "system", "SecureIT Erfahrungen", "brand", "Antwort", USAGE)
+
+    assert cache.get("chatgpt", "gpt-4o", "system", "SecureIT Erfahrungen") is None
+
+
+def test_expired_entry_is_removed(cache, test_db):
+    """Abgelaufene Einträge werden nicht ausgeliefert"""
+    cache.put("chatgpt", "gpt-4o", "system", "Beste Anbieter?", "service", "Antwort", USAGE)
+    entry = test_db.query(LLMResponseCache).one()
+    entry.expires_at = entry.expires_at - timedelta(hours=48)
+    test_db.flush()
+
+    assert cache.get("chatgpt", "gpt-4o", "system", "Beste Anbieter?") is None
+    assert test_db.query(LLMResponseCache).count() == 0
+
+
+def test_lru_eviction(cache, test_db):
+    """Über max_entries wird der am längsten nicht genutzte Eintrag verdrängt"""
+    for i in range(3):
+        cache.put("chatgpt", "gpt-4o", "system", f"Query {i}", "service", "Antwort", USAGE)
+
+    entry = test_db.query(LLMResponseCache).filter(LLMResponseCache.query == "Query 0").one()
+    entry.last_accessed_at = entry.last_accessed_at + timedelta(hours=1)
+    entry = test_db.query(LLMResponseCache).filter(LLMResponseCache.query == "Query 1").one()
+    entry.last_accessed_at = entry.last_accessed_at - timedelta(hours=1)
+    test_db.flush()
+
+    cache.put("chatgpt", "gpt-4o", "system", "Query 3", "service", "Antwort", USAGE)
+
+    queries = {e.query for e in test_db.query(LLMResponseCache).all()}
+    assert queries == {"Query 0", "Query 2", "Query 3"}
+
+
+def test_llm_client_serves_from_cache(cache, test_settings, monkeypatch):
+    """Zweiter Call derselben Query geht nicht mehr an den Provider"""
+    client = LLMClient(test_settings, cache=cache)
+    calls = []
+
+    async def fake_chatgpt(query, model):
+        calls.append(query)
+        return "CrowdStrike ist führend.", USAGE
+
+    monkeypatch.setattr(client, "_query_chatgpt", fake_chatgpt)
+
+    first = asyncio.run(client.query_platform("chatgpt", "Beste Anbieter?", "gpt-4o", "service"))
+    second = asyncio.run(client.query_platform("chatgpt", "Beste Anbieter?", "gpt-4o", "service"))
+
+    assert len(calls) == 1
+    assert first["cache_hit"] is False
+    assert second["cache_hit"] is True
+    assert second["response_text"] == "CrowdStrike ist führend."
+    assert second["total_tokens"] == 0
+    assert second["cached_usage"] == USAGE
+
+
+def test_cache_hit_recorded_with_zero_cost(test_db):
+    """Cache-Hits werden mit Kosten 0 und der Ersparnis erfasst"""
+    company = Company(domain="cache.de", name="CacheCo", industry_id="test")
+    test_db.add(company)
+    test_db.flush()
+    scan = Scan(company_id=company.id, industry_id="test", status="running")
+    test_db.add(scan)
+    test_db.flush()
+
+    calculator = CostCalculator()
+    response = {
+        "platform": "chatgpt",
+        "model": "gpt-4o",
+        "success": True,
+        "input_tokens": 0,
+        "output_tokens": 0,
+        "total_tokens": 0,
+        "cache_hit": True,
+        "cached_usage": USAGE,
+    }
+    _record_api_cost(test_db, scan.id, "Beste Anbieter?", response, calculator)
+    test_db.commit()
+
+    saved = test_db.query(ApiCallCost).one()
+    assert saved.cache_hit is True
+    assert saved.cost_usd == 0.0
+    assert saved.saved_cost_usd == pytest.approx(calculator.calculate_cost("gpt-4o", 100, 400))
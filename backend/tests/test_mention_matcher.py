@@ -0,0 +1,82 @@
+import re
+
+from app.services.analyzer import Analyzer
+from app.services.mention_matcher import MentionMatcher, get_industry_matcher
+
+
+def test_matcher_finds_all_entities_in_one_pass():
+    """Namen, Domains, Varianten und Wettbewerber werden mit Offsets gefunden"""
+    matcher = MentionMatcher(
+        companies=[("CrowdStrike", "www.crowdstrike.com"), ("SecureIT GmbH", "secureit.de")],
+        competitors=["Sophos", "CrowdStrike"],
+    )
+    text = "Crowd Strike und SOPHOS; mehr auf crowdstrike.com oder bei secureit-gmbh"
+
+    hits = {(h["entity"], h["kind"], h["start"]) for h in matcher.find(text)}
+
+    assert ("CrowdStrike", "variant", 0) in hits
+    assert ("Sophos", "competitor", text.index("SOPHOS")) in hits
+    assert ("CrowdStrike", "name", text.index("crowdstrike.com")) in hits
+    assert ("CrowdStrike", "domain", text.index("crowdstrike.com")) in hits
+    assert ("CrowdStrike", "competitor", text.index("crowdstrike.com")) in hits
+    assert ("SecureIT GmbH", "variant", text.index("secureit-gmbh")) in hits
+
+
+def test_matcher_matches_regex_semantics():
+    """Gleiche Treffer wie re.finditer mit IGNORECASE, auch bei überlappenden Patterns"""
+    patterns = ["aa", "Check Point", "Point", "İnc"]
+    matcher = MentionMatcher(competitors=patterns)
+    text = "aaaa CHECK POINT point İnc aaa"
+
+    for pattern in patterns:
+        expected = [m.start() for m in re.finditer(re.escape(pattern), text, re.IGNORECASE)]
+        found = [h["start"] for h in matcher.find(text) if h["entity"] == pattern]
+        assert found == expected
+
+
+def test_industry_matcher_is_cached_per_version(sample_industry_config):
+    """Neu gebaut wird nur bei geänderten Firmen oder geänderter Config"""
+    companies = [("SecureIT GmbH", "secureit.de")]
+
+    first = get_industry_matcher("cache_test", sample_industry_config, companies)
+    assert get_industry_matcher("cache_test", sample_industry_config, list(companies)) is first
+
+    more = companies + [("Other AG", "other.de")]
+    assert get_industry_matcher("cache_test", sample_industry_config, more) is not first
+
+    changed = {**sample_industry_config, "known_competitors": ["Sophos"]}
+    assert get_industry_matcher("cache_test", changed, more).competitors == ["Sophos"]
+
+
+def test_analyzer_with_shared_matcher_matches_standalone(sample_industry_config):
+    """Geteilter Industry-Matcher liefert dieselbe Analyse wie der Einzel-Matcher"""
+    competitors = sample_industry_config["known_competitors"]
+    matcher = MentionMatcher(
+        companies=[("SecureIT GmbH", "secureit.de"), ("Other AG", "other.de")],
+        competitors=competitors,
+    )
+    text = "1. SecureIT GmbH ist führend\n2. CrowdStrike\n3. Other AG (other.de)"
+
+    for name, domain in [("SecureIT GmbH", "secureit.de"), ("Other AG", "other.de")]:
+        shared = Analyzer(known_competitors=competitors, matcher=matcher)
+        standalone = Analyzer(known_competitors=competitors)
+        assert shared.analyze_response(name, domain, "q", "chatgpt", text) == \
+            standalone.analyze_response(name, domain, "q", "chatgpt", text)
+
+
+def test_analyzer_scans_each_response_once(monkeypatch):
+    """analyze_response durchsucht die Antwort genau einmal (ohne Memo)"""
+    matcher = MentionMatcher(companies=[("SecureIT GmbH", "secureit.de")], competitors=["Sophos"])
+    calls = []
+    find = matcher.find
+    monkeypatch.setattr(matcher, "find", lambda text: calls.append(text) or find(text))
+    analyzer = Analyzer(known_competitors=["Sophos"], matcher=matcher)
+
+    result = analyzer.analyze_response(
+        "SecureIT GmbH", "secureit.de", "Beste Anbieter?", "chatgpt",
+        "1. SecureIT GmbH – empfehlenswert\n2. Sophos",
+    )
+
+    assert result["mentioned"] is True
+    assert result["competitors_mentioned"] == ["Sophos"]
+    assert len(calls) == 1
@@ -0,0 +1,49 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.llm_client import LLMClient
+from app.services.provider_clients import ProviderClients
+
+
+def test_llm_clients_share_provider_pools(test_settings):
+    """Mehrere LLMClients (Scans) nutzen dieselben Provider-Clients"""
+    clients = ProviderClients(test_settings)
+
+    first = LLMClient(test_settings, clients=clients)
+    second = LLMClient(test_settings, clients=clients)
+
+    assert first.openai_client is second.openai_client
+    assert first.perplexity_client is second.perplexity_client
+    assert str(clients.perplexity.base_url).startswith("https://api.perplexity.ai")
+
+    asyncio.run(clients.aclose())
+    assert clients.perplexity.is_closed
+
+
+def test_api_opens_no_provider_clients():
+    """Die API reiht Scans nur ein — Provider-Pools gibt es nur im Worker"""
+    with TestClient(app):
+        assert not hasattr(app.state, "provider_clients")
+
+
+def test_worker_module_import_does_not_start_worker():
+    """python -m app.workers startet den Worker, ein Import nicht"""
+    import app.workers.__main__ as worker_main
+
+    assert callable(worker_main.main)
+
+
+def test_llm_client_closes_only_own_clients(test_settings):
+    """aclose() schließt selbst erstellte Clients, geteilte bleiben offen"""
+    shared = ProviderClients(test_settings)
+    borrowing = LLMClient(test_settings, clients=shared)
+    owning = LLMClient(test_settings)
+
+    asyncio.run(borrowing.aclose())
+    asyncio.run(owning.aclose())
+
+    assert not shared.perplexity.is_closed
+    assert all(c.is_closed for c in owning.clients._http_clients)
+    asyncio.run(shared.aclose())
@@ -0,0 +1,82 @@
+import asyncio
+
+from app.services.query_scheduler import QueryScheduler
+
+
+class SlowLLMClient:
+    """Simuliert Provider-Latenz und misst die gleichzeitigen Calls."""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.in_flight_by_platform: dict[str, int] = {}
+        self.max_by_platform: dict[str, int] = {}
+
+    def available_platforms(self, platforms):
+        return {name: config for name, config in platforms.items() if name != "perplexity"}
+    def timeout_for(self, platform_config):
+        return platform_config.get("timeout_s", 60.0)
+
+    async def query_platform(self, platform, query, model, category=None, timeout_s=None):
+        self.in_flight += 1
+        self.in_flight_by_platform[platform] = self.in_flight_by_platform.get(platform, 0) + 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        self.max_by_platform[platform] = max(
+            self.max_by_platform.get(platform, 0), self.in_flight_by_platform[platform]
+        )
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        self.in_flight_by_platform[platform] -= 1
+        return {"platform": platform, "query": query, "model": model, "success": True}
+
+
+PLATFORMS = {
+    "chatgpt": {"model": "gpt-4o"},
+    "claude": {"model": "claude-sonnet-4-6"},
+    "perplexity": {"model": "sonar"},
+}
+
+QUERIES = [{"query": f"Query {i}", "category": "service"} for i in range(10)]
+
+
+def test_build_jobs_skips_platforms_without_key():
+    """Nur Plattformen mit API-Key werden eingeplant"""
+    scheduler = QueryScheduler(SlowLLMClient())
+
+    jobs = scheduler.build_jobs(QUERIES, PLATFORMS)
+
+    assert len(jobs) == 20
+    assert {job["platform"] for job in jobs} == {"chatgpt", "claude"}
+    assert [job["index"] for job in jobs] == list(range(20))
+
+
+def test_run_respects_global_and_platform_limits():
+    """Nie mehr Calls in Flight als global bzw. pro Plattform erlaubt"""
+    client = SlowLLMClient()
+    scheduler = QueryScheduler(client, max_concurrency=5, platform_limits={"claude": 1}, default_platform_limit=4)
+    jobs = scheduler.build_jobs(QUERIES, PLATFORMS)
+    received = []
+
+    asyncio.run(scheduler.run(jobs, lambda job, response: received.append(job["index"])))
+
+    assert sorted(received) == list(range(20))
+    assert client.max_in_flight <= 5
+    assert client.max_by_platform["claude"] == 1
+    assert client.max_by_platform["chatgpt"] == 4
+
+
+def test_run_is_faster_than_sequential():
+    """Mit Parallelität sinkt die Laufzeit deutlich unter die Summe der Latenzen"""
+    client = SlowLLMClient()
+    scheduler = QueryScheduler(client, max_concurrency=8, default_platform_limit=4)
+    jobs = scheduler.build_jobs(QUERIES, PLATFORMS)
+
+    async def timed():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await scheduler.run(jobs, lambda job, response: None)
+        return loop.time() - start
+
+    elapsed = asyncio.run(timed())
+
+    assert elapsed < len(jobs) * 0.01 / 2
@@ -0,0 +1,83 @@
+from datetime import datetime, timedelta
+
+from app.models import Company, RankingSnapshot, Scan
+from app.services.ranking_snapshot import (
+    latest_completed_scans,
+    rebuild_industry_snapshot,
+    update_snapshot_for_scan,
+)
+
+
+def _company(db, name):
+    company = Company(domain=f"{name.split()[0].lower()}.de", name=name, industry_id="cybersecurity")
+    db.add(company)
+    db.flush()
+    return company
+
+
+def _scan(db, company, score, version="v2", days_ago=0, status="completed"):
+    scan = Scan(
+        company_id=company.id, industry_id="cybersecurity", status=status, overall_score=score,
+        platform_scores={"chatgpt": score}, query_version=version,
+        completed_at=datetime(2026, 10, 1) - timedelta(days=days_ago),
+    )
+    db.add(scan)
+    db.flush()
+    return scan
+
+
+def test_latest_scan_prefers_current_query_version(test_db):
+    """Pro Company gewinnt der neueste Scan der aktuellen query_version"""
+    alpha = _company(test_db, "Alpha GmbH")
+    current = _scan(test_db, alpha, 40.0, version="v2", days_ago=3)
+    _scan(test_db, alpha, 90.0, version="v1", days_ago=1)
+    _scan(test_db, alpha, 70.0, version="v2", days_ago=5)
+    _scan(test_db, alpha, 99.0, version="v2", days_ago=0, status="failed")
+
+    latest = latest_completed_scans(test_db, "cybersecurity", "v2")
+
+    assert [(company.name, scan.id) for company, scan in latest] == [("Alpha GmbH", current.id)]
+
+
+def test_snapshot_updated_on_scan_completion(test_db):
+    """Ein neuer completed Scan ersetzt nur die Zeile seiner Company"""
+    alpha, beta = _company(test_db, "Alpha GmbH"), _company(test_db, "Beta AG")
+    _scan(test_db, alpha, 40.0, days_ago=2)
+    _scan(test_db, beta, 60.0, days_ago=2)
+    assert rebuild_industry_snapshot(test_db, "cybersecurity") == 2
+
+    newer = _scan(test_db, alpha, 80.0, days_ago=0)
+    update_snapshot_for_scan(test_db, newer)
+
+    rows = {row.company_name: row for row in test_db.query(RankingSnapshot)}
+    assert rows["Alpha GmbH"].scan_id == newer.id
+    assert rows["Alpha GmbH"].overall_score == 80.0
+    assert rows["Beta AG"].overall_score == 60.0
+
+
+def test_ranking_endpoint_paginates_snapshot(client, test_db):
+    """Ranking kommt sortiert und paginiert aus dem Snapshot, Total über alle Seiten"""
+    for name, score in [("Alpha GmbH", 40.0), ("Beta AG", 80.0), ("Gamma SE", 60.0)]:
+        _scan(test_db, _company(test_db, name), score)
+    # Scans ohne Snapshot (z.B. Altbestand) werden beim ersten Aufruf nachgezogen
+    test_db.commit()
+
+    first = client.get("/api/v1/rankings/cybersecurity?limit=2").json()
+    second = client.get("/api/v1/rankings/cybersecurity?limit=2&offset=2").json()
+
+    assert first["total_companies"] == 3
+    assert [(e["rank"], e["company_name"]) for e in first["entries"]] == [(1, "Beta AG"), (2, "Gamma SE")]
+    assert [(e["rank"], e["company_name"]) for e in second["entries"]] == [(3, "Alpha GmbH")]
+    assert test_db.query(RankingSnapshot).count() == 3
+
+
+def test_first_completion_builds_whole_industry(test_db):
+    """Ohne Snapshot baut der erste abgeschlossene Scan die ganze Industry auf (Altbestand)"""
+    alpha, beta, gamma = (_company(test_db, name) for name in ("Alpha GmbH", "Beta AG", "Gamma SE"))
+    _scan(test_db, beta, 60.0, days_ago=5)
+    _scan(test_db, gamma, 70.0, days_ago=5)
+
+    update_snapshot_for_scan(test_db, _scan(test_db, alpha, 80.0))
+
+    rows = {row.company_name: row.overall_score for row in test_db.query(RankingSnapshot)}
+    assert rows == {"Alpha GmbH": 80.0, "Beta AG": 60.0, "Gamma SE": 70.0}
@@ -0,0 +1,145 @@
+import asyncio
+
+import httpx
+
+from app.services.llm_client import LLMClient
+from app.services.provider_errors import is_rate_limit_error, retry_after_of
+from app.services.rate_limiter import ModelLimiter, ProviderRateLimiter, TokenBucket
+from app.services.resilience import RetryPolicy
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _rate_limit_error(headers):
+    request = httpx.Request("POST", "https://api.example.com/v1/chat")
+    response = httpx.Response(429, headers=headers, request=request)
+    return httpx.HTTPStatusError("rate limited", request=request, response=response)
+
+
+def test_token_bucket_waits_for_refill():
+    """Leerer Bucket liefert die Wartezeit bis zur Nachfüllung"""
+    clock = FakeClock()
+    bucket = TokenBucket(60, clock=clock)
+
+    bucket.consume(60)
+    assert bucket.wait_time(1) == 1.0
+
+    clock.now += 1.0
+    assert bucket.wait_time(1) == 0.0
+
+
+def test_model_limiter_refunds_unused_tokens():
+    """Überschätzte Token-Reservierung wird bei release() zurückgebucht"""
+    clock = FakeClock()
+    limiter = ModelLimiter(rpm=100, tpm=1000, clock=clock)
+
+    assert limiter.try_acquire(800) == 0.0
+    assert limiter.try_acquire(800) > 0
+
+    limiter.release(800, 200)
+    assert limiter.try_acquire(800) == 0.0
+
+
+def test_model_limiter_aimd():
+    """429 halbiert das In-Flight-Limit, Erfolge erhöhen es wieder langsam"""
+    clock = FakeClock()
+    limiter = ModelLimiter(rpm=1000, tpm=1_000_000, max_in_flight=8, clock=clock)
+
+    limiter.on_rate_limited()
+    limiter.on_rate_limited()
+    assert limiter.limit == 2.0
+
+    for _ in range(4):
+        limiter.on_success()
+    assert 3.0 < limiter.limit < 4.0
+
+    for _ in range(200):
+        limiter.on_success()
+    assert limiter.limit == 8.0
+
+
+def test_model_limiter_honours_retry_after():
+    """Retry-After blockiert neue Calls bis zum angegebenen Zeitpunkt"""
+    clock = FakeClock()
+    limiter = ModelLimiter(rpm=1000, tpm=1_000_000, clock=clock)
+
+    limiter.on_rate_limited(retry_after=5.0)
+    assert limiter.try_acquire(10) == 5.0
+
+    clock.now += 5.0
+    assert limiter.try_acquire(10) == 0.0
+
+
+def test_provider_limiter_shares_state_per_model():
+    """Alle Scans teilen sich denselben Limiter pro (Plattform, Modell)"""
+    limiter = ProviderRateLimiter(default_rpm=10, platform_limits={"claude": {"rpm": 50}})
+
+    assert limiter.for_model("chatgpt", "gpt") is limiter.for_model("chatgpt", "gpt")
+    assert limiter.for_model("claude", "sonnet").requests.rate_per_minute == 50
+
+    limiter.configure_platforms({"chatgpt": {"model": "gpt", "rpm": 30, "max_in_flight": 2}})
+    assert limiter.for_model("chatgpt", "gpt").requests.rate_per_minute == 30
+    assert limiter.for_model("chatgpt", "gpt").limit == 2.0
+
+
+def test_retry_after_parsing():
+    """Retry-After als Sekunden und retry-after-ms werden erkannt"""
+    assert is_rate_limit_error(_rate_limit_error({}))
+    assert retry_after_of(_rate_limit_error({"retry-after": "7"})) == 7.0
+    assert retry_after_of(_rate_limit_error({"retry-after-ms": "1500"})) == 1.5
+    assert retry_after_of(_rate_limit_error({})) is None
+
+
+def test_llm_client_reports_rate_limit(test_settings, monkeypatch):
+    """Ein 429 vom Provider senkt das Limit und gibt die Token-Reservierung frei"""
+    clock = FakeClock()
+    rate_limiter = ProviderRateLimiter(default_rpm=100, default_tpm=100_000, max_in_flight=4, clock=clock)
+    client = LLMClient(test_settings, rate_limiter=rate_limiter, retry_policy=RetryPolicy(max_attempts=1))
+
+    async def rate_limited(query, model):
+        raise _rate_limit_error({"retry-after": "3"})
+
+    monkeypatch.setattr(client, "_query_chatgpt", rate_limited)
+    result = asyncio.run(client.query_platform("chatgpt", "Test?", "gpt-test"))
+
+    limiter = rate_limiter.for_model("chatgpt", "gpt-test")
+    assert result["success"] is False
+    assert limiter.limit == 2.0
+    assert limiter.in_flight == 0
+    assert limiter.tokens.tokens == 100_000
+    assert limiter.blocked_until == clock.now + 3.0
+
+
+def test_gemini_uses_async_api_and_shared_limiter(test_settings, monkeypatch):
+    """Gemini läuft über client.aio (kein Threadpool) und belegt Slots im selben Limiter"""
+    rate_limiter = ProviderRateLimiter(default_rpm=100, default_tpm=100_000, max_in_flight=4)
+    client = LLMClient(test_settings, rate_limiter=rate_limiter, retry_policy=RetryPolicy(max_attempts=1))
+    limiter = rate_limiter.for_model("gemini", "gemini-test")
+    seen_in_flight = []
+
+    class FakeUsage:
+        prompt_token_count = 12
+        candidates_token_count = 30
+        total_token_count = 42
+
+    class FakeResponse:
+        text = "Gemini Antwort"
+        usage_metadata = FakeUsage()
+
+    async def generate_content(model, contents):
+        seen_in_flight.append(limiter.in_flight)
+        return FakeResponse()
+
+    monkeypatch.setattr(client.gemini_client.aio.models, "generate_content", generate_content)
+    result = asyncio.run(client.query_platform("gemini", "Test?", "gemini-test"))
+
+    assert result["success"] is True
+    assert result["total_tokens"] == 42
+    assert seen_in_flight == [1]
+    assert limiter.in_flight == 0
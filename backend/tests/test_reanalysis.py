@@ -0,0 +1,79 @@
+import pytest
+import yaml
+
+from app.models import Company, Scan, ScanResult
+from app.services.text_store import TextStore
+from app.workers.reanalysis import reanalyze_scans
+
+RESPONSE = "1. SecureIT GmbH ist führend\n2. CrowdStrike\n3. Sophos"
+
+
+@pytest.fixture
+def reanalysis_settings(test_settings, sample_industry_config, tmp_path):
+    config_path = tmp_path / "test_industry.yaml"
+    config_path.write_text(yaml.safe_dump(sample_industry_config, allow_unicode=True))
+    return test_settings.model_copy(update={"INDUSTRY_CONFIG_DIR": str(tmp_path)})
+
+
+@pytest.fixture
+def stale_scans(test_db):
+    """Abgeschlossene Scans mit veralteter Analyse (Firma nicht erkannt)"""
+    scans = []
+    for domain, name in [("secureit.de", "SecureIT GmbH"), ("other.de", "Other AG")]:
+        company = Company(domain=domain, name=name, industry_id="test_industry")
+        test_db.add(company)
+        test_db.flush()
+        stale = {
+            "query": "Beste Anbieter", "category": "service", "intent": "",
+            "model": "m", "response_text": RESPONSE, "mentioned": False, "mention_type": "not_mentioned",
+            "position": None, "sentiment": "neutral", "competitors_mentioned": [],
+        }
+        scan = Scan(
+            company_id=company.id, industry_id="test_industry", status="completed",
+            overall_score=0.0,
+            results=[
+                ScanResult.from_result(i, {**stale, "platform": p}, response_hash=TextStore(test_db).put(RESPONSE))
+                for i, p in enumerate(("chatgpt", "claude"))
+            ],
+        )
+        test_db.add(scan)
+        scans.append(scan)
+    test_db.commit()
+    return scans
+
+
+def test_reanalysis_rewrites_scores(test_db, reanalysis_settings, stale_scans):
+    """Gespeicherte Antworten werden neu analysiert, Scores neu berechnet"""
+    stats = reanalyze_scans(test_db, reanalysis_settings, workers=0)
+
+    secureit, other = stale_scans
+    assert stats["updated"] == 2
+    # Beide Plattformen liefern denselben Text → pro Firma nur eine Analyse
+    assert stats["analyzed"] == 2
+    assert stats["memoized"] == 2
+    assert all(r.mentioned for r in secureit.results)
+    assert secureit.results[0].competitors_mentioned == ["CrowdStrike", "Sophos"]
+    assert secureit.overall_score > 0
+    assert secureit.analysis["total_mentions"] == 2
+    assert secureit.recommendations
+    assert not other.results[0].mentioned
+
+
+def test_reanalysis_skips_current_results(test_db, reanalysis_settings, stale_scans):
+    """Ein zweiter Lauf überspringt alles; force analysiert erneut"""
+    reanalyze_scans(test_db, reanalysis_settings, workers=0)
+
+    again = reanalyze_scans(test_db, reanalysis_settings, workers=0)
+    assert again["updated"] == 0
+    assert again["analyzed"] == 0
+
+    forced = reanalyze_scans(test_db, reanalysis_settings, workers=0, force=True)
+    assert forced["updated"] == 2
+
+
+def test_reanalysis_in_process_pool(test_db, reanalysis_settings, stale_scans):
+    """Mit Prozess-Pool identische Ergebnisse wie im Prozess"""
+    stats = reanalyze_scans(test_db, reanalysis_settings, workers=2)
+
+    assert stats["updated"] == 2
+    assert stale_scans[0].results[0].position == 1
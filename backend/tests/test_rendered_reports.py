@@ -0,0 +1,96 @@
+import gzip
+import json
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, inspect, text
+
+from app.api.reports import _accepts_gzip
+from app.config import Settings
+from app.migrations import drop_report_html
+from app.models import Company, Scan
+from app.services.http_cache import notify_scan_completed
+from app.services.rendered_reports import get_rendered_reports, rendered_report_key
+
+
+def _completed_scan(db, score=42.0):
+    company = Company(domain="alpha.de", name="Alpha <GmbH>", industry_id="cybersecurity")
+    db.add(company)
+    db.flush()
+    scan = Scan(
+        company_id=company.id, industry_id="cybersecurity", status="completed", overall_score=score,
+        platform_scores={"chatgpt": score}, completed_at=datetime(2026, 10, 1),
+    )
+    db.add(scan)
+    db.commit()
+    return scan
+
+
+def test_report_rendered_on_demand_and_cached_gzipped(client, test_db):
+    """HTML wird aus den Scan-Daten gerendert und komprimiert im LRU abgelegt"""
+    scan = _completed_scan(test_db)
+
+    rendered = client.get(f"/api/v1/reports/{scan.id}/html")
+    assert rendered.status_code == 200
+    assert "Alpha &lt;GmbH&gt;" in rendered.text
+
+    key = rendered_report_key(Settings(), scan.id)
+    cached = get_rendered_reports(Settings()).get(key)
+    assert cached is not None
+    assert len(cached) < len(rendered.content)
+
+    plain = client.get(f"/api/v1/reports/{scan.id}/html", headers={"Accept-Encoding": "identity"})
+    zipped = client.get(f"/api/v1/reports/{scan.id}/html", headers={"Accept-Encoding": "gzip"})
+    assert plain.text == zipped.text == rendered.text
+    assert zipped.headers["content-encoding"] == "gzip"
+    assert plain.headers["etag"] != zipped.headers["etag"]
+
+    refused = client.get(f"/api/v1/reports/{scan.id}/html", headers={"Accept-Encoding": "gzip;q=0, *"})
+    assert "content-encoding" not in refused.headers
+    assert refused.headers["etag"] == plain.headers["etag"]
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip", True),
+    ("deflate, gzip;q=0.5", True),
+    ("GZIP; Q=1.0", True),
+    ("*", True),
+    ("gzip;q=0", False),
+    ("gzip;q=0.000, *", False),
+    ("*;q=0", False),
+    ("identity", False),
+    ("", False),
+    (None, False),
+])
+def test_accepts_gzip(header, expected):
+    assert _accepts_gzip(header) is expected
+
+
+def test_reanalysis_rerenders_report(client, test_db):
+    """Eine Invalidierung des Scans erzeugt einen neuen Cache-Key"""
+    scan = _completed_scan(test_db)
+    client.get(f"/api/v1/reports/{scan.id}/html")
+    key = rendered_report_key(Settings(), scan.id)
+
+    scan.overall_score = 88.5
+    test_db.commit()
+    notify_scan_completed(Settings(), scan.id, scan.industry_id)
+
+    assert rendered_report_key(Settings(), scan.id) != key
+    assert "88.5" in client.get(f"/api/v1/reports/{scan.id}/html").text
+
+
+def test_drop_report_html_archives_and_drops(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE scans (id TEXT PRIMARY KEY, report_html TEXT)"))
+        connection.execute(text("INSERT INTO scans VALUES ('a', '<html>A</html>'), ('b', NULL)"))
+    archive = tmp_path / "reports.jsonl.gz"
+
+    stats = drop_report_html(engine, archive_path=str(archive))
+
+    assert stats == {"dropped": True, "archived": 1}
+    assert "report_html" not in {c["name"] for c in inspect(engine).get_columns("scans")}
+    with gzip.open(archive, "rt") as f:
+        assert [json.loads(line) for line in f] == [{"scan_id": "a", "report_html": "<html>A</html>"}]
+    assert drop_report_html(engine) == {"dropped": False, "archived": 0}
@@ -1,3 +1,5 @@
+from datetime import datetime
+
 import pytest
 from app.services.report_generator import ReportGenerator
 
@@ -203,3 +205,35 @@ def test_generate_recommendations_platform_specific(report_generator, sample_com
     recommendations_text = " ".join(recommendations).lower()
     # Könnte "claude" oder "anthropic" oder allgemein "plattform" erwähnen
     assert any(keyword in recommendations_text for keyword in ["claude", "plattform", "ki-system"])
+
+
+def test_report_html_escapes_llm_text(report_generator, sample_industry_config):
+    """LLM-Texte (z.B. Wettbewerber, Queries) werden escaped"""
+    scan_data = {
+        "overall_score": 50.0,
+        "platform_scores": {"chatgpt": 50.0},
+        "analysis": {"top_competitors": [{"name": "<script>alert(1)</script>", "mentions": 3}]},
+        "recommendations": ["**Fett** <i>kursiv</i>\nZeile 2"],
+        "query_results": [{"query": "Wer ist <b>gut</b>?", "platform": "chatgpt"}],
+    }
+
+    html = report_generator.generate_report_html("Acme & Co", "acme.de", scan_data, sample_industry_config)
+
+    assert "<script>alert(1)</script>" not in html
+    assert "&lt;script&gt;" in html
+    assert "Acme &amp; Co" in html
+    assert "<strong>Fett</strong> &lt;i&gt;kursiv&lt;/i&gt;<br>Zeile 2" in html
+    assert "Wer ist &lt;b&gt;gut&lt;/b&gt;?" in html
+
+
+def test_stream_report_html_matches_render(report_generator, sample_industry_config):
+    """Gestreamte Chunks ergeben denselben Report"""
+    scan_data = {
+        "overall_score": 42.0, "platform_scores": {"chatgpt": 42.0}, "recommendations": ["A", "B"],
+        "completed_at": datetime(2026, 10, 1, 12, 0),
+    }
+
+    chunks = list(report_generator.stream_report_html("Acme", "acme.de", scan_data, sample_industry_config))
+
+    assert len(chunks) > 1
+    assert "".join(chunks) == report_generator.generate_report_html("Acme", "acme.de", scan_data, sample_industry_config)
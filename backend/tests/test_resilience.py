@@ -0,0 +1,185 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.services import llm_client as llm_client_module
+from app.services.llm_client import LLMClient
+from app.services.resilience import CircuitBreaker, CircuitBreakerRegistry, RetryPolicy
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _status_error(status_code, headers=None):
+    request = httpx.Request("POST", "https://api.example.com/v1/chat")
+    response = httpx.Response(status_code, headers=headers or {}, request=request)
+    return httpx.HTTPStatusError(f"HTTP {status_code}", request=request, response=response)
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Ersetzt asyncio.sleep im LLMClient und protokolliert die Wartezeiten"""
+    recorded = []
+
+    async def fake_sleep(delay):
+        recorded.append(delay)
+
+    monkeypatch.setattr(llm_client_module.asyncio, "sleep", fake_sleep)
+    return recorded
+
+
+def _client(test_settings, breakers=None, **policy):
+    policy.setdefault("rng", lambda low, high: high)
+    return LLMClient(
+        test_settings.model_copy(update={"LLM_RATE_LIMIT_ENABLED": False}),
+        retry_policy=RetryPolicy(**policy),
+        circuit_breakers=breakers or CircuitBreakerRegistry(),
+    )
+
+
+def test_backoff_is_exponential_and_capped():
+    """Obergrenze verdoppelt sich pro Versuch, Retry-After ist Untergrenze"""
+    policy = RetryPolicy(base_delay_s=1.0, max_delay_s=5.0, rng=lambda low, high: high)
+
+    assert [policy.backoff(a) for a in (1, 2, 3, 4)] == [1.0, 2.0, 4.0, 5.0]
+    assert policy.backoff(1, retry_after=10.0) == 10.0
+
+
+def test_transient_errors_are_retried(test_settings, sleeps, monkeypatch):
+    """503 und 429 werden wiederholt, Retry-After bestimmt die Wartezeit"""
+    client = _client(test_settings, max_attempts=4, base_delay_s=0.5)
+    errors = [_status_error(503), _status_error(429, {"retry-after": "2"})]
+
+    async def flaky(query, model):
+        if errors:
+            raise errors.pop(0)
+        return "Antwort", {"input_tokens": 1, "output_tokens": 2, "total_tokens": 3}
+
+    monkeypatch.setattr(client, "_query_chatgpt", flaky)
+    result = asyncio.run(client.query_platform("chatgpt", "Test?", "gpt-test"))
+
+    assert result["success"] is True
+    assert result["attempts"] == 3
+    assert sleeps == [0.5, 2.0]
+
+
+def test_permanent_errors_are_not_retried(test_settings, sleeps, monkeypatch):
+    """401 schlägt sofort fehl"""
+    client = _client(test_settings)
+    calls = []
+
+    async def unauthorized(query, model):
+        calls.append(query)
+        raise _status_error(401)
+
+    monkeypatch.setattr(client, "_query_chatgpt", unauthorized)
+    result = asyncio.run(client.query_platform("chatgpt", "Test?", "gpt-test"))
+
+    assert result["success"] is False
+    assert len(calls) == 1
+    assert sleeps == []
+
+
+def test_retries_stop_at_deadline(test_settings, sleeps, monkeypatch):
+    """Ein Retry-After jenseits der Deadline beendet die Versuche"""
+    client = _client(test_settings, max_attempts=5, deadline_s=10.0)
+
+    async def rate_limited(query, model):
+        raise _status_error(429, {"retry-after": "60"})
+
+    monkeypatch.setattr(client, "_query_chatgpt", rate_limited)
+    result = asyncio.run(client.query_platform("chatgpt", "Test?", "gpt-test"))
+
+    assert result["success"] is False
+    assert result["attempts"] == 1
+    assert sleeps == []
+
+
+def test_circuit_breaker_opens_and_recovers():
+    """Fehlerquote öffnet den Breaker, nach dem Cooldown schließt ein erfolgreicher Probe-Call"""
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_rate=0.5, min_calls=4, cooldown_s=30.0, clock=clock)
+
+    breaker.record_success()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.allow_request()
+
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow_request()
+
+    clock.now += 30.0
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.allow_request()
+
+
+def test_open_circuit_fails_fast(test_settings, sleeps, monkeypatch):
+    """Bei offenem Breaker wird der Provider gar nicht erst angefragt"""
+    breakers = CircuitBreakerRegistry(min_calls=2, cooldown_s=300.0)
+    client = _client(test_settings, breakers=breakers, max_attempts=2)
+    calls = []
+
+    async def unavailable(query, model):
+        calls.append(query)
+        raise _status_error(503)
+
+    monkeypatch.setattr(client, "_query_gemini", unavailable)
+    first = asyncio.run(client.query_platform("gemini", "Frage 1", "gemini-test"))
+    second = asyncio.run(client.query_platform("gemini", "Frage 2", "gemini-test"))
+
+    assert first["success"] is False
+    assert second["success"] is False
+    assert "Circuit Breaker" in second["error"]
+    assert calls == ["Frage 1", "Frage 1"]
+
+
+def test_slow_platform_keeps_other_results(test_settings, monkeypatch):
+    """Ein hängender Provider kostet nur sein eigenes Ergebnis, bekannte Tokens bleiben erhalten"""
+    client = _client(test_settings, max_attempts=1)
+
+    async def fast(query, model):
+        return "Schnelle Antwort", {"input_tokens": 10, "output_tokens": 20, "total_tokens": 30}
+
+    async def hanging(query, model):
+        await asyncio.sleep(10)
+
+    monkeypatch.setattr(client, "_query_chatgpt", fast)
+    monkeypatch.setattr(client, "_query_gemini", hanging)
+    platforms = {
+        "chatgpt": {"model": "gpt-test"},
+        "gemini": {"model": "gemini-test", "timeout_s": 0.05},
+    }
+
+    results = asyncio.run(client.query_all_platforms("Test?", platforms))
+    by_platform = {r["platform"]: r for r in results}
+
+    assert [r["platform"] for r in results] == ["chatgpt", "gemini"]
+    assert by_platform["chatgpt"]["success"] is True
+    assert by_platform["gemini"]["success"] is False
+    assert "Timeout" in by_platform["gemini"]["error"]
+    assert by_platform["gemini"]["input_tokens"] > 0
+    assert by_platform["gemini"]["output_tokens"] == 0
+
+
+def test_timeout_for_prefers_industry_config(test_settings):
+    """timeout_s aus der YAML vor LLM_MODEL_TIMEOUTS vor LLM_CALL_DEADLINE_S"""
+    settings = test_settings.model_copy(update={
+        "LLM_MODEL_TIMEOUTS": {"slow-model": 90.0},
+        "LLM_CALL_DEADLINE_S": 30.0,
+    })
+    client = LLMClient(settings)
+
+    assert client.timeout_for({"model": "slow-model", "timeout_s": 15}) == 15.0
+    assert client.timeout_for({"model": "slow-model"}) == 90.0
+    assert client.timeout_for({"model": "other"}) == 30.0
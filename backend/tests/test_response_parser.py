@@ -0,0 +1,43 @@
+from app.services.analyzer import Analyzer
+from app.services.response_parser import parse_response
+
+
+def test_numbered_list_ranks_and_sections():
+    """Nummerierte Einträge bekommen ihre Nummer, Überschriften den Abschnitt"""
+    text = (
+        "## Endpoint Security\n"
+        "1. CrowdStrike\n"
+        "   Sehr stark bei EDR.\n"
+        "2. Sophos\n"
+        "\n"
+        "**Managed Services:**\n"
+        "- SecureIT GmbH\n"
+        "- Other AG\n"
+        "Fazit: Other AG auf Platz 5.\n"
+    )
+    structure = parse_response(text)
+
+    def at(fragment):
+        return structure.locate(text.index(fragment))
+
+    assert at("CrowdStrike")["rank"] == 1
+    assert at("Sehr stark")["rank"] == 1
+    assert at("Sophos")["rank"] == 2
+    assert at("Sophos")["section"] == "Endpoint Security"
+    assert at("SecureIT")["rank"] == 1
+    assert at("- Other AG")["rank"] == 2
+    assert at("SecureIT")["section"] == "Managed Services"
+    assert at("Fazit")["rank"] == 5
+    assert at("Fazit")["list_item"] is False
+
+
+def test_position_uses_own_list_item_not_neighbour():
+    """Der Rang stammt aus dem eigenen Listeneintrag, nicht aus dem Kontextfenster"""
+    text = "1. CrowdStrike ist Marktführer\n2. Sophos\n3. SecureIT GmbH aus München\n"
+    analyzer = Analyzer(known_competitors=["CrowdStrike", "Sophos"])
+
+    result = analyzer.analyze_response("SecureIT GmbH", "secureit.de", "q", "chatgpt", text)
+
+    assert result["position"] == 3
+    assert result["mention_type"] in ["listed_among_top", "direct_recommendation"]
+    assert result["competitor_positions"] == {"CrowdStrike": 1, "Sophos": 2}
@@ -0,0 +1,106 @@
+import json
+
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import Session
+
+from app.migrations import migrate_query_results
+from app.models import Company, Scan, ScanResult
+from app.services.text_store import TextStore
+
+
+def _result(query, platform, category="service", mentioned=True):
+    return {
+        "query": query, "category": category, "intent": "", "platform": platform, "model": "m",
+        "response_text": f"Antwort {query} {platform}", "mentioned": mentioned,
+        "mention_type": "listed_among_top" if mentioned else "not_mentioned",
+        "position": 1 if mentioned else None, "sentiment": "positive", "competitors_mentioned": [],
+    }
+
+
+@pytest.fixture
+def scan_with_results(test_db):
+    company = Company(domain="secureit.de", name="SecureIT GmbH", industry_id="cybersecurity")
+    test_db.add(company)
+    test_db.flush()
+    results = [
+        _result(f"Query {i}", platform, category="brand" if i == 2 else "service", mentioned=platform == "chatgpt")
+        for i in range(3)
+        for platform in ("chatgpt", "claude")
+    ]
+    scan = Scan(
+        company_id=company.id, industry_id="cybersecurity", status="completed", overall_score=50.0,
+        results=[
+            ScanResult.from_result(index, result, response_hash=TextStore(test_db).put(result["response_text"]))
+            for index, result in enumerate(results)
+        ],
+    )
+    test_db.add(scan)
+    test_db.commit()
+    return scan
+
+
+def test_results_paginated_in_query_order(client, scan_with_results):
+    """GET /scans/{id}/results liefert Seiten in Query-Reihenfolge, ohne Antworttexte"""
+    first = client.get(f"/api/v1/scans/{scan_with_results.id}/results?limit=4").json()
+    second = client.get(f"/api/v1/scans/{scan_with_results.id}/results?limit=4&offset=4").json()
+
+    assert first["total"] == 6
+    assert [item["result_index"] for item in first["items"] + second["items"]] == list(range(6))
+    assert first["items"][0]["response_text"] is None
+    assert first["items"][0]["query_id"] == first["items"][1]["query_id"]
+
+
+def test_results_filters(client, scan_with_results):
+    """Filter nach Plattform, Kategorie und Erwähnung"""
+    base = f"/api/v1/scans/{scan_with_results.id}/results"
+
+    claude = client.get(f"{base}?platform=claude").json()
+    assert claude["total"] == 3
+    assert {item["platform"] for item in claude["items"]} == {"claude"}
+
+    assert client.get(f"{base}?category=brand").json()["total"] == 2
+    assert client.get(f"{base}?mentioned=true").json()["total"] == 3
+
+    with_text = client.get(f"{base}?limit=1&include_response=true").json()
+    assert with_text["items"][0]["response_text"] == "Antwort Query 0 chatgpt"
+
+    assert client.get("/api/v1/scans/missing/results").status_code == 404
+    assert client.get(f"{base}?limit=0").status_code == 422
+
+
+def test_scan_and_report_carry_summary_only(client, scan_with_results):
+    """Scan- und Report-Payloads enthalten Kennzahlen statt der Ergebnisliste"""
+    scan_json = client.get(f"/api/v1/scans/{scan_with_results.id}").json()
+    report_json = client.get(f"/api/v1/reports/{scan_with_results.id}").json()
+
+    for payload in (scan_json, report_json["scan"]):
+        assert "query_results" not in payload
+        assert payload["results_summary"] == {
+            "total": 6,
+            "mentioned": 3,
+            "platforms": {"chatgpt": 3, "claude": 3},
+            "categories": {"service": 4, "brand": 2},
+        }
+
+
+def test_migrate_query_results(tmp_path):
+    """Die JSON-Spalte scans.query_results wird in scan_results überführt und entfernt"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    legacy = [_result("Beste Anbieter", "chatgpt"), _result("Beste Anbieter", "claude", mentioned=False)]
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE scans (id TEXT PRIMARY KEY, query_results JSON)"))
+        connection.execute(
+            text("INSERT INTO scans VALUES ('a', :results), ('b', '[]')"),
+            {"results": json.dumps(legacy)},
+        )
+
+    stats = migrate_query_results(engine)
+
+    assert stats == {"migrated": True, "scans": 2, "results": 2}
+    assert "query_results" not in {c["name"] for c in inspect(engine).get_columns("scans")}
+    with Session(engine) as session:
+        rows = session.query(ScanResult).order_by(ScanResult.result_index).all()
+        assert [(r.scan_id, r.platform, r.mentioned) for r in rows] == [("a", "chatgpt", True), ("a", "claude", False)]
+        assert rows[0].response_text == "Antwort Beste Anbieter chatgpt"
+    assert migrate_query_results(engine) == {"migrated": False, "scans": 0, "results": 0}
@@ -0,0 +1,269 @@
+import asyncio
+
+import pytest
+import yaml
+
+from app.models import ApiCallCost, Company, RankingSnapshot, Scan, ScanJob, ScanResult, TextBlob
+from app.services.job_queue import JobQueue
+from app.workers import scan_worker
+from app.workers.scan_worker import run_industry_sweep, run_scan
+
+
+class FakeLLMClient:
+    """LLMClient-Ersatz ohne Netzwerk: zählt Calls und liefert feste Antworten."""
+
+    calls: list[tuple[str, str]] = []
+
+    def __init__(self, settings, cache=None, clients=None, db_runner=None):
+        self.settings = settings
+        self.rate_limiter = None
+
+    def available_platforms(self, platforms):
+        return platforms
+    def timeout_for(self, platform_config):
+        return platform_config.get("timeout_s", 60.0)
+
+    async def query_platform(self, platform, query, model, category=None, timeout_s=None):
+        FakeLLMClient.calls.append((platform, query))
+        return {
+            "platform": platform,
+            "query": query,
+            "model": model,
+            "response_text": "1. SecureIT GmbH ist führend\n2. CrowdStrike\n3. Sophos",
+            "success": True,
+            "error": None,
+            "latency_ms": 10,
+            "input_tokens": 101,
+            "output_tokens": 200,
+            "total_tokens": 301,
+            "cache_hit": False,
+        }
+
+
+@pytest.fixture
+def sweep_settings(test_settings, sample_industry_config, tmp_path, monkeypatch):
+    config_path = tmp_path / "test_industry.yaml"
+    config_path.write_text(yaml.safe_dump(sample_industry_config, allow_unicode=True))
+    FakeLLMClient.calls = []
+    monkeypatch.setattr(scan_worker, "LLMClient", FakeLLMClient)
+    return test_settings.model_copy(update={"INDUSTRY_CONFIG_DIR": str(tmp_path)})
+
+
+@pytest.fixture
+def industry_companies(test_db):
+    companies = [
+        Company(domain="secureit.de", name="SecureIT GmbH", industry_id="test_industry"),
+        Company(domain="other.de", name="Other AG", industry_id="test_industry"),
+        Company(domain="third.de", name="Third KG", industry_id="test_industry"),
+    ]
+    test_db.add_all(companies)
+    test_db.commit()
+    return companies
+
+
+def test_sweep_asks_generic_queries_once(test_db, sweep_settings, industry_companies, sample_industry_config):
+    """Generic Queries einmal pro Plattform, Brand Queries pro Company"""
+    scan_ids = asyncio.run(run_industry_sweep("test_industry", test_db, sweep_settings))
+
+    n_platforms = len(sample_industry_config["platforms"])
+    n_generic = len(sample_industry_config["queries"]["generic"])
+    n_brand = len(sample_industry_config["queries"]["brand"])
+
+    assert len(scan_ids) == 3
+    assert len(FakeLLMClient.calls) == n_platforms * (n_generic + n_brand * 3)
+
+
+def test_sweep_writes_completed_scan_per_company(test_db, sweep_settings, industry_companies, sample_industry_config):
+    """Jede Company bekommt einen completed Scan mit allen Ergebnissen"""
+    scan_ids = asyncio.run(run_industry_sweep("test_industry", test_db, sweep_settings))
+
+    n_platforms = len(sample_industry_config["platforms"])
+    n_queries = len(sample_industry_config["queries"]["generic"]) + len(sample_industry_config["queries"]["brand"])
+
+    scans = test_db.query(Scan).filter(Scan.id.in_(scan_ids)).all()
+    assert all(s.status == "completed" for s in scans)
+    assert all(len(s.results) == n_platforms * n_queries for s in scans)
+
+    by_company = {s.company_id: s for s in scans}
+    leader = by_company[industry_companies[0].id]
+    assert leader.overall_score > by_company[industry_companies[1].id].overall_score
+
+
+def test_sweep_reuses_pending_scans(test_db, sweep_settings, industry_companies):
+    """Vorhandene pending Scans (z.B. aus /bulk) werden übernommen"""
+    pending = Scan(company_id=industry_companies[0].id, industry_id="test_industry", status="pending")
+    test_db.add(pending)
+    test_db.commit()
+
+    scan_ids = asyncio.run(run_industry_sweep("test_industry", test_db, sweep_settings))
+
+    assert pending.id in scan_ids
+    assert test_db.query(Scan).count() == 3
+
+
+def test_sweep_takes_over_queued_jobs(test_db, sweep_settings, industry_companies):
+    """Wartende Jobs übernommener Scans werden abgebrochen, laufende behalten ihre Company"""
+    queue = JobQueue(test_db)
+    queued = Scan(company_id=industry_companies[0].id, industry_id="test_industry", status="pending")
+    claimed = Scan(company_id=industry_companies[1].id, industry_id="test_industry", status="pending")
+    test_db.add_all([queued, claimed])
+    test_db.commit()
+    queued_job = queue.enqueue_scan(queued.id)
+    claimed_job = queue.enqueue_scan(claimed.id)
+    claimed_job.status = "running"
+    test_db.commit()
+
+    scan_ids = asyncio.run(run_industry_sweep("test_industry", test_db, sweep_settings))
+
+    test_db.expire_all()
+    assert queued.id in scan_ids
+    assert claimed.id not in scan_ids and claimed.status == "pending"
+    assert test_db.get(ScanJob, queued_job.id).status == "cancelled"
+    assert test_db.get(ScanJob, claimed_job.id).status == "running"
+    assert len(scan_ids) == 2
+
+
+def test_sweep_rebuilds_snapshot_once(test_db, sweep_settings, industry_companies, monkeypatch):
+    """Snapshot und Budget werden einmal pro Sweep aktualisiert, nicht pro Company"""
+    rebuilds = []
+    original = scan_worker.rebuild_industry_snapshot
+    monkeypatch.setattr(
+        scan_worker, "rebuild_industry_snapshot",
+        lambda db, industry_id: rebuilds.append(industry_id) or original(db, industry_id),
+    )
+    monkeypatch.setattr(scan_worker, "update_snapshot_for_scan", lambda *args: pytest.fail("per-scan update"))
+
+    asyncio.run(run_industry_sweep("test_industry", test_db, sweep_settings))
+
+    assert rebuilds == ["test_industry"]
+    assert test_db.query(RankingSnapshot).filter(RankingSnapshot.industry_id == "test_industry").count() == 3
+
+
+def test_sweep_resumes_from_checkpoint(test_db, sweep_settings, industry_companies, sample_industry_config):
+    """Ein nach Absturz neu gestarteter Sweep fragt nur fehlende Paare ab und übernimmt die Scans"""
+    scan_ids = asyncio.run(run_industry_sweep("test_industry", test_db, sweep_settings))
+    scans = test_db.query(Scan).filter(Scan.id.in_(scan_ids)).all()
+    full_results = {s.id: [(r.query, r.platform) for r in s.results] for s in scans}
+    generic_query = sample_industry_config["queries"]["generic"][0]["query"]
+
+    # Absturz simulieren: Scans hängen auf "running", einer Company fehlt je ein Generic- und ein Brand-Paar
+    victim = next(s for s in scans if s.company_id == industry_companies[0].id)
+    missing = [
+        next(r for r in victim.results if r.query == generic_query),
+        next(r for r in victim.results if r.query != generic_query and "SecureIT GmbH" in r.query),
+    ]
+    for scan in scans:
+        scan.status = "running"
+    for result in missing:
+        victim.results.remove(result)
+    test_db.commit()
+    FakeLLMClient.calls = []
+
+    resumed_ids = asyncio.run(run_industry_sweep("test_industry", test_db, sweep_settings))
+
+    assert sorted(resumed_ids) == sorted(scan_ids)
+    assert sorted(FakeLLMClient.calls) == sorted((r.platform, r.query) for r in missing)
+    test_db.expire_all()
+    for scan in scans:
+        assert scan.status == "completed"
+        assert [(r.query, r.platform) for r in scan.results] == full_results[scan.id]
+
+
+def test_sweep_splits_shared_costs(test_db, sweep_settings, industry_companies, sample_industry_config):
+    """Kosten der Generic Calls werden auf alle Scans verteilt, Tokens bleiben exakt"""
+    scan_ids = asyncio.run(run_industry_sweep("test_industry", test_db, sweep_settings))
+
+    generic_query = sample_industry_config["queries"]["generic"][0]["query"]
+    rows = (
+        test_db.query(ApiCallCost)
+        .filter(ApiCallCost.query_hash == TextBlob.hash_for(generic_query), ApiCallCost.platform == "chatgpt")
+        .all()
+    )
+
+    assert {r.scan_id for r in rows} == set(scan_ids)
+    assert sum(r.input_tokens for r in rows) == 101
+    assert sum(r.total_tokens for r in rows) == 301
+    assert rows[0].cost_usd == pytest.approx(rows[1].cost_usd)
+
+    scans = test_db.query(Scan).filter(Scan.id.in_(scan_ids)).all()
+    total_calls_cost = sum(r.cost_usd for r in test_db.query(ApiCallCost).all())
+    assert sum(s.total_cost_usd for s in scans) == pytest.approx(total_calls_cost)
+
+
+def test_sweep_stores_shared_texts_once(test_db, sweep_settings, industry_companies, sample_industry_config):
+    """Antwort- und Query-Texte liegen dedupliziert im Text-Store"""
+    scan_ids = asyncio.run(run_industry_sweep("test_industry", test_db, sweep_settings))
+
+    queries = {query for _, query in FakeLLMClient.calls}
+    results = test_db.query(ScanResult).filter(ScanResult.scan_id.in_(scan_ids)).all()
+
+    # FakeLLMClient liefert immer denselben Antworttext: ein Blob pro Query + einer für die Antwort
+    assert test_db.query(TextBlob).count() == len(queries) + 1
+    assert len({r.response_hash for r in results}) == 1
+    assert results[0].response_text.startswith("1. SecureIT GmbH")
+    assert {c.query for c in test_db.query(ApiCallCost)} == queries
+
+
+def test_run_scan_keeps_query_order(test_db, sweep_settings, industry_companies, sample_industry_config):
+    """Parallel abgefragte Ergebnisse landen in der ursprünglichen Query-Reihenfolge"""
+    scan = Scan(company_id=industry_companies[0].id, industry_id="test_industry", status="pending")
+    test_db.add(scan)
+    test_db.commit()
+
+    asyncio.run(run_scan(scan.id, test_db, sweep_settings))
+
+    generic = [q["query"] for q in sample_industry_config["queries"]["generic"]]
+    test_db.expire_all()
+    queries_in_results = [r.query for r in scan.results]
+    n_platforms = len(sample_industry_config["platforms"])
+
+    assert scan.status == "completed"
+    assert queries_in_results[: len(generic) * n_platforms:n_platforms] == generic
+    assert test_db.query(ApiCallCost).filter(ApiCallCost.scan_id == scan.id).count() == len(scan.results)
+
+
+def test_run_scan_resumes_from_checkpoint(test_db, sweep_settings, industry_companies, sample_industry_config):
+    """Ein erneuter Lauf fragt nur die (Query, Plattform)-Paare ab, die noch fehlen"""
+    scan = Scan(company_id=industry_companies[0].id, industry_id="test_industry", status="pending")
+    test_db.add(scan)
+    test_db.commit()
+    asyncio.run(run_scan(scan.id, test_db, sweep_settings))
+    test_db.expire_all()
+    full_results = [(r.query, r.platform) for r in scan.results]
+    total_calls = len(FakeLLMClient.calls)
+
+    # Abbruch simulieren: nur die Hälfte der Ergebnisse ist gespeichert
+    checkpoint = full_results[::2]
+    scan.status = "failed"
+    scan.results = scan.results[::2]
+    test_db.commit()
+    FakeLLMClient.calls = []
+
+    asyncio.run(run_scan(scan.id, test_db, sweep_settings))
+
+    assert len(FakeLLMClient.calls) == total_calls - len(checkpoint)
+    assert set(checkpoint).isdisjoint(
+        {(query, platform) for platform, query in FakeLLMClient.calls}
+    )
+    assert scan.status == "completed"
+    test_db.expire_all()
+    assert [(r.query, r.platform) for r in scan.results] == full_results
+
+
+def test_run_scan_keeps_checkpoint_on_failure(test_db, sweep_settings, industry_companies, monkeypatch):
+    """Bereits analysierte Ergebnisse sind nach einem Fehler in der DB gespeichert"""
+    scan = Scan(company_id=industry_companies[0].id, industry_id="test_industry", status="pending")
+    test_db.add(scan)
+    test_db.commit()
+
+    def broken_finalize(*args, **kwargs):
+        raise RuntimeError("Absturz beim Finalisieren")
+
+    monkeypatch.setattr(scan_worker, "_finalize_scan", broken_finalize)
+    with pytest.raises(RuntimeError):
+        asyncio.run(run_scan(scan.id, test_db, sweep_settings))
+
+    test_db.expire_all()
+    assert scan.status == "failed"
+    assert len(scan.results) == len(FakeLLMClient.calls)
+    assert test_db.query(ApiCallCost).filter(ApiCallCost.scan_id == scan.id).count() == len(FakeLLMClient.calls)
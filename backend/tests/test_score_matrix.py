@@ -0,0 +1,111 @@
+import itertools
+
+import pytest
+
+from app.models import Company, Scan, ScanResult
+from app.services.score_matrix import ScoreMatrix
+from app.services.scorer import Scorer
+
+
+def _results():
+    """Alle Kombinationen aus Mention-Type, Position, Sentiment, Plattform, Kategorie"""
+    combos = itertools.product(
+        ["direct_recommendation", "listed_among_top", "mentioned_neutrally", "not_mentioned", "unknown_type"],
+        [None, 1, 2, 3, 7],
+        ["positive", "neutral", "negative", "weird"],
+        ["chatgpt", "claude", "gemini"],
+        ["brand", "service"],
+    )
+    return [
+        {
+            "mention_type": mention_type, "mentioned": mention_type != "not_mentioned",
+            "position": position, "sentiment": sentiment, "platform": platform, "category": category,
+        }
+        for mention_type, position, sentiment, platform, category in combos
+    ]
+
+
+def test_matrix_matches_single_result_scoring(sample_industry_config):
+    """Vektorisierte Scores entsprechen score_single_result + Mittelwerten"""
+    scorer = Scorer(sample_industry_config)
+    results = _results()
+    scans = [("a", results[::2]), ("b", results[1::3]), ("empty", [])]
+
+    matrix = ScoreMatrix(scans)
+    scores = scorer.score_matrix(matrix)
+
+    for row, (_, scan_results) in enumerate(scans):
+        expected = {}
+        for platform in {r["platform"] for r in scan_results}:
+            single = [scorer.score_single_result(r) for r in scan_results if r["platform"] == platform]
+            expected[platform] = round(sum(single) / len(single), 2)
+        assert matrix.platform_dict(scores["platform"], row) == pytest.approx(expected)
+        assert scores["overall"][row] == pytest.approx(scorer.calculate_overall_score(expected))
+
+
+def test_what_if_weights_change_ranking(sample_industry_config):
+    """Andere Gewichte → andere Gesamt-Scores, ohne die Matrix neu zu bauen"""
+    scorer = Scorer(sample_industry_config)
+    matrix = ScoreMatrix([
+        ("chatgpt_strong", [{"platform": "chatgpt", "mention_type": "direct_recommendation", "mentioned": True}]),
+        ("claude_strong", [{"platform": "claude", "mention_type": "direct_recommendation", "mentioned": True},
+                           {"platform": "chatgpt", "mention_type": "mentioned_neutrally", "mentioned": True}]),
+    ])
+
+    baseline = scorer.score_matrix(matrix)["overall"]
+    scenario = scorer.score_matrix(matrix, platform_weights={"chatgpt": 0.0, "claude": 1.0})["overall"]
+
+    assert baseline[0] > baseline[1]
+    assert scenario[1] > scenario[0]
+
+
+def test_what_if_endpoint(client, test_db):
+    """POST /rankings/{industry}/what-if liefert das neu gewichtete Ranking"""
+    for name, mention_type in [("Alpha GmbH", "mentioned_neutrally"), ("Beta AG", "listed_among_top")]:
+        company = Company(domain=f"{name.split()[0].lower()}.de", name=name, industry_id="cybersecurity")
+        test_db.add(company)
+        test_db.flush()
+        test_db.add(Scan(
+            company_id=company.id, industry_id="cybersecurity", status="completed", overall_score=10.0,
+            results=[ScanResult.from_result(0, {"platform": "chatgpt", "category": "service",
+                                                "mention_type": mention_type, "mentioned": True,
+                                                "sentiment": "positive"})],
+        ))
+    test_db.commit()
+
+    response = client.post(
+        "/api/v1/rankings/cybersecurity/what-if",
+        json={"mention_types": {"mentioned_neutrally": 1.0, "listed_among_top": 0.1}},
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total_companies"] == 2
+    assert [e["company_name"] for e in data["entries"]] == ["Alpha GmbH", "Beta AG"]
+    assert data["entries"][0]["baseline_rank"] == 2
+    assert data["entries"][0]["overall_score"] == 100.0
+    assert data["entries"][0]["category_scores"] == {"service": 100.0}
+
+    invalid = client.post("/api/v1/rankings/cybersecurity/what-if", json={"platform_weights": {"claude": -1}})
+    assert invalid.status_code == 400
+
+
+def test_what_if_ties_match_published_ranking(client, test_db):
+    """Bei unveränderten Gewichten entsprechen die Ränge bei Gleichstand denen von /rankings"""
+    for name in ["Zeta AG", "Alpha GmbH", "Mitte KG"]:
+        company = Company(domain=f"{name.split()[0].lower()}.de", name=name, industry_id="cybersecurity")
+        test_db.add(company)
+        test_db.flush()
+        test_db.add(Scan(
+            company_id=company.id, industry_id="cybersecurity", status="completed", overall_score=10.0,
+            results=[ScanResult.from_result(0, {"platform": "chatgpt", "category": "service",
+                                                "mention_type": "listed_among_top", "mentioned": True,
+                                                "sentiment": "positive"})],
+        ))
+    test_db.commit()
+
+    published = [e["company_name"] for e in client.get("/api/v1/rankings/cybersecurity").json()["entries"]]
+    entries = client.post("/api/v1/rankings/cybersecurity/what-if", json={}).json()["entries"]
+
+    assert [e["company_name"] for e in entries] == published == ["Alpha GmbH", "Mitte KG", "Zeta AG"]
+    assert [e["baseline_rank"] for e in entries] == [1, 2, 3]
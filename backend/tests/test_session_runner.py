@@ -0,0 +1,47 @@
+import asyncio
+import threading
+import time
+
+from app.services.session_runner import SessionRunner
+
+
+def test_db_work_does_not_block_event_loop():
+    """Während ein Runner-Aufruf blockiert, laufen andere Tasks weiter"""
+    ticks = []
+
+    async def ticker():
+        for _ in range(5):
+            ticks.append(time.monotonic())
+            await asyncio.sleep(0.01)
+
+    async def main():
+        await asyncio.gather(SessionRunner().run(time.sleep, 0.2), ticker())
+
+    started = time.monotonic()
+    asyncio.run(main())
+
+    assert len(ticks) == 5
+    assert ticks[-1] - started < 0.15
+
+
+def test_calls_are_serialized():
+    """Aufrufe desselben Runners laufen nie parallel (Session ist nicht threadsicher)"""
+    runner = SessionRunner()
+    active = []
+    overlaps = []
+    lock = threading.Lock()
+
+    def work():
+        with lock:
+            active.append(1)
+            overlaps.append(len(active))
+        time.sleep(0.02)
+        with lock:
+            active.pop()
+
+    async def main():
+        await asyncio.gather(*[runner.run(work) for _ in range(5)])
+
+    asyncio.run(main())
+
+    assert overlaps == [1] * 5
@@ -0,0 +1,74 @@
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import Session
+
+from app.migrations import migrate_texts_to_store
+from app.models import Company, Scan, ScanResult, TextBlob
+from app.services.text_store import TextStore, prune_unreferenced
+
+LONG_TEXT = "1. SecureIT GmbH ist führend in der IT-Sicherheit.\n" * 40
+
+
+def test_put_deduplicates_and_compresses(test_db):
+    """Gleicher Text → gleicher Hash, ein Blob; lange Texte zlib-komprimiert"""
+    store = TextStore(test_db)
+    first = store.put(LONG_TEXT)
+    second = TextStore(test_db).put(LONG_TEXT)
+    test_db.commit()
+
+    assert first == second == TextBlob.hash_for(LONG_TEXT)
+    blob = test_db.get(TextBlob, first)
+    assert test_db.query(TextBlob).count() == 1
+    assert blob.codec == "zlib"
+    assert len(blob.data) < blob.size // 5
+    assert store.get(first) == LONG_TEXT
+
+
+def test_short_texts_stored_raw(test_db):
+    """Kurze Texte (Queries) bleiben unkomprimiert"""
+    store = TextStore(test_db)
+    text_hash = store.put("Beste Anbieter?")
+
+    assert test_db.get(TextBlob, text_hash).codec == "raw"
+    assert store.get_many([text_hash, None, "unbekannt"]) == {text_hash: "Beste Anbieter?"}
+
+
+def test_prune_unreferenced(test_db):
+    """Texte ohne Referenz werden entfernt, referenzierte bleiben"""
+    company = Company(domain="secureit.de", name="SecureIT GmbH", industry_id="test_industry")
+    test_db.add(company)
+    test_db.flush()
+    store = TextStore(test_db)
+    scan = Scan(company_id=company.id, industry_id="test_industry",
+                results=[ScanResult.from_result(0, {"platform": "chatgpt"}, response_hash=store.put("behalten"))])
+    test_db.add(scan)
+    store.put("verworfen")
+    test_db.commit()
+
+    assert prune_unreferenced(test_db) == 1
+    assert store.get_many([TextBlob.hash_for("behalten"), TextBlob.hash_for("verworfen")]) == {
+        TextBlob.hash_for("behalten"): "behalten"
+    }
+
+
+def test_migrate_texts_to_store(tmp_path):
+    """Inline-Texte werden durch Hashes ersetzt, gleiche Texte nur einmal gespeichert"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE scan_results (id TEXT PRIMARY KEY, response_text TEXT)"))
+        connection.execute(text("CREATE TABLE api_call_costs (id TEXT PRIMARY KEY, query TEXT NOT NULL)"))
+        connection.execute(
+            text("INSERT INTO scan_results VALUES ('r1', :answer), ('r2', :answer), ('r3', 'Kurz')"),
+            {"answer": LONG_TEXT},
+        )
+        connection.execute(text("INSERT INTO api_call_costs VALUES ('c1', 'Beste Anbieter'), ('c2', 'Beste Anbieter')"))
+
+    stats = migrate_texts_to_store(engine)
+
+    assert stats == {"migrated": True, "rows": 5, "texts": 3}
+    assert "response_text" not in {c["name"] for c in inspect(engine).get_columns("scan_results")}
+    assert "query" not in {c["name"] for c in inspect(engine).get_columns("api_call_costs")}
+    with Session(engine) as session:
+        hashes = dict(session.execute(text("SELECT id, response_hash FROM scan_results")).all())
+        assert hashes["r1"] == hashes["r2"] == TextBlob.hash_for(LONG_TEXT)
+        assert TextStore(session).get(hashes["r3"]) == "Kurz"
+    assert migrate_texts_to_store(engine) == {"migrated": False, "rows": 0, "texts": 0}
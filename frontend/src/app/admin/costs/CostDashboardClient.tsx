@@ -519,7 +519,11 @@ export default function CostDashboardClient() {
 
       {/* KPI Cards */}
       <div className="grid grid-cols-1 sm:grid-cols-2 lg:grid-cols-4 gap-4 mb-8">
-        <KpiCard label="Monatskosten" value={formatUSD(summary.total_cost_usd)} />
+        <KpiCard
+          label="Monatskosten"
+          value={formatUSD(summary.total_cost_usd)}
+          subtitle={summary.cache_hits > 0 ? `${formatUSD(summary.cache_savings_usd)} gespart (${summary.cache_hits.toLocaleString()} Cache-Hits)` : undefined}
+        />
         <KpiCard
           label="API-Calls"
           value={summary.total_calls.toLocaleString()}
@@ -186,9 +186,9 @@ export default function ReportPageClient({ scanId, initialReport, initialError }
           </div>
         )}
 
-        {scan.query_results && scan.query_results.length > 0 && (
+        {scan.results_summary && scan.results_summary.total > 0 && (
           <div className="mb-16">
-            <QueryTable queries={scan.query_results} />
+            <QueryTable scanId={scan.id} total={scan.results_summary.total} />
           </div>
         )}
 
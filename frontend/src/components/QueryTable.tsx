@@ -1,12 +1,16 @@
 'use client';
 
-import { useState, useMemo } from 'react';
-import type { QueryResult } from '@/lib/api';
+import { useState, useMemo, useEffect } from 'react';
+import { fetchScanResults } from '@/lib/api';
+import type { QueryResult, QueryResultFilters } from '@/lib/api';
 import { platformNames, platformColors } from '@/lib/utils';
 import InfoTooltip from './InfoTooltip';
 
+const PAGE_SIZE = 50;
+
 interface QueryTableProps {
-  queries: QueryResult[];
+  scanId: string;
+  total: number;
 }
 
 type FilterPlatform = 'all' | 'chatgpt' | 'claude' | 'gemini' | 'perplexity';
@@ -26,30 +30,51 @@ function SentimentIcon({ sentiment }: { sentiment: string }) {
   return <span className="text-gray-400 text-xs" title="Neutral">&#9679;</span>;
 }
 
-export default function QueryTable({ queries }: QueryTableProps) {
+export default function QueryTable({ scanId, total }: QueryTableProps) {
   const [platformFilter, setPlatformFilter] = useState<FilterPlatform>('all');
   const [mentionFilter, setMentionFilter] = useState<FilterMentioned>('all');
   const [expandedIndex, setExpandedIndex] = useState<number | null>(null);
+  const [loaded, setLoaded] = useState<QueryResult[]>([]);
+  const [filteredTotal, setFilteredTotal] = useState(total);
+  const [loading, setLoading] = useState(false);
+  const [error, setError] = useState<string | null>(null);
 
-  const filtered = useMemo(() => {
-    return queries.filter((q) => {
-      if (platformFilter !== 'all' && q.platform !== platformFilter) return false;
-      if (mentionFilter === 'yes' && !q.mentioned) return false;
-      if (mentionFilter === 'no' && q.mentioned) return false;
-      return true;
-    });
-  }, [queries, platformFilter, mentionFilter]);
+  const filters = useMemo<QueryResultFilters>(() => ({
+    platform: platformFilter === 'all' ? undefined : platformFilter,
+    mentioned: mentionFilter === 'all' ? undefined : mentionFilter === 'yes',
+  }), [platformFilter, mentionFilter]);
+
+  // Ergebnisse seitenweise vom Server laden; Filter setzen die Liste zurück
+  const loadPage = async (offset: number) => {
+    setLoading(true);
+    setError(null);
+    try {
+      const page = await fetchScanResults(scanId, offset, PAGE_SIZE, filters);
+      setLoaded((previous) => (offset === 0 ? page.items : [...previous, ...page.items]));
+      setFilteredTotal(page.total);
+    } catch (e) {
+      setError(e instanceof Error ? e.message : 'Fehler beim Laden der Ergebnisse');
+    } finally {
+      setLoading(false);
+    }
+  };
+
+  useEffect(() => {
+    setExpandedIndex(null);
+    loadPage(0);
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [scanId, filters]);
 
   // Group by unique query text
   const grouped = useMemo(() => {
     const map = new Map<string, QueryResult[]>();
-    filtered.forEach((q) => {
+    loaded.forEach((q) => {
       const existing = map.get(q.query) || [];
       existing.push(q);
       map.set(q.query, existing);
     });
     return Array.from(map.entries());
-  }, [filtered]);
+  }, [loaded]);
 
   return (
     <div>
@@ -84,7 +109,7 @@ export default function QueryTable({ queries }: QueryTableProps) {
       </div>
 
       <div className="text-sm text-gray-500 dark:text-gray-400 mb-4">
-        {filtered.length} Ergebnis{filtered.length !== 1 ? 'se' : ''} von {queries.length}
+        {filteredTotal} Ergebnis{filteredTotal !== 1 ? 'se' : ''} von {total}
       </div>
 
       {/* Query List */}
@@ -141,7 +166,22 @@ export default function QueryTable({ queries }: QueryTableProps) {
         })}
       </div>
 
-      {grouped.length === 0 && (
+      {loaded.length < filteredTotal && !error && (
+        <div className="mt-4 text-center">
+          <button type="button" onClick={() => loadPage(loaded.length)} disabled={loading}
+            className="px-4 py-2 border border-gray-300 dark:border-gray-600 rounded-lg text-sm text-gray-700 dark:text-gray-200 hover:bg-gray-50 dark:hover:bg-gray-800 font-medium transition-colors disabled:opacity-50">
+            {loading ? 'Lädt\u2026' : `Weitere laden (${filteredTotal - loaded.length})`}
+          </button>
+        </div>
+      )}
+
+      {error && (
+        <div className="text-center py-8 text-rose-600 dark:text-rose-400 text-sm">
+          {error}
+        </div>
+      )}
+
+      {grouped.length === 0 && !loading && !error && (
         <div className="text-center py-8 text-gray-500 dark:text-gray-400 text-sm">
           Keine Ergebnisse für die gewählten Filter.
         </div>
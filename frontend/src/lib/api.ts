@@ -42,19 +42,39 @@ export interface CompanyInfo {
 }
 
 export interface QueryResult {
+  id: string;
+  result_index: number;
+  query_id: string;
   query: string;
   category: string;
   intent: string;
   platform: string;
   model: string;
-  response_text: string;
+  response_text?: string | null;
   mentioned: boolean;
   mention_type: string;
   mention_count: number;
   position: number | null;
+  section?: string | null;
   context: string;
   sentiment: string;
   competitors_mentioned: string[];
+  competitor_positions?: Record<string, number | null>;
+}
+
+export interface QueryResultPage {
+  scan_id: string;
+  total: number;
+  limit: number;
+  offset: number;
+  items: QueryResult[];
+}
+
+export interface ResultsSummary {
+  total: number;
+  mentioned: number;
+  platforms: Record<string, number>;
+  categories: Record<string, number>;
 }
 
 export interface PlatformPerformance {
@@ -86,7 +106,7 @@ export interface ScanInfo {
   id: string;
   overall_score: number;
   platform_scores: PlatformScores;
-  query_results: QueryResult[];
+  results_summary: ResultsSummary;
   analysis: ScanAnalysis;
   competitors?: Array<{ name: string; mentions: number }>;
   started_at?: string;
@@ -126,6 +146,29 @@ export async function fetchReport(scanId: string): Promise<ReportResponse> {
   return response.json();
 }
 
+export interface QueryResultFilters {
+  platform?: string;
+  category?: string;
+  mentioned?: boolean;
+}
+
+export async function fetchScanResults(
+  scanId: string,
+  offset = 0,
+  limit = 50,
+  filters: QueryResultFilters = {}
+): Promise<QueryResultPage> {
+  const params = new URLSearchParams({ offset: String(offset), limit: String(limit) });
+  if (filters.platform) params.set('platform', filters.platform);
+  if (filters.category) params.set('category', filters.category);
+  if (filters.mentioned !== undefined) params.set('mentioned', String(filters.mentioned));
+  const response = await fetch(`${API_BASE}/scans/${scanId}/results?${params}`);
+  if (!response.ok) {
+    throw new Error(`Failed to fetch scan results: ${response.statusText}`);
+  }
+  return response.json();
+}
+
 export async function fetchIndustries(): Promise<Industry[]> {
   const response = await fetch(`${API_BASE}/industries/`);
   if (!response.ok) {
@@ -164,6 +207,8 @@ export interface ApiCallCostEntry {
   cost_usd: number;
   latency_ms: number;
   success: boolean;
+  cache_hit: boolean;
+  saved_cost_usd: number;
   created_at: string;
 }
 
@@ -175,6 +220,8 @@ export interface CostSummary {
   avg_cost_per_scan: number;
   platform_breakdown: Record<string, number>;
   daily_costs: Array<{ date: string; cost: number }>;
+  cache_hits: number;
+  cache_savings_usd: number;
 }
 
 export interface ScanCostDetail {